@@ -1,12 +1,17 @@
+import os
+import random
 from abc import abstractmethod
 
+import numpy as np
+import torch
+
 from leaspy.algo.abstract_algo import AbstractAlgo
 from leaspy.io.data.dataset import Dataset
 from leaspy.models.abstract_model import AbstractModel
 from leaspy.io.realizations.collection_realization import CollectionRealization
 from leaspy.algo.utils.algo_with_device import AlgoWithDeviceMixin
 
-from leaspy.utils.typing import DictParamsTorch
+from leaspy.utils.typing import DictParamsTorch, KwargsType, Optional
 from leaspy.exceptions import LeaspyAlgoInputError
 
 
@@ -29,6 +34,9 @@ class AbstractFitAlgo(AlgoWithDeviceMixin, AbstractAlgo):
     sufficient_statistics : dict[str, `torch.FloatTensor`] or None
         The previous step sufficient statistics.
         It is None during all the burn-in phase.
+    checkpoint_path : str or None
+        Path of the file where the state of the algorithm is periodically saved (every `checkpoint.periodicity`
+        iterations), so to be able to resume it (cf. `resume_from` in :meth:`.Leaspy.fit`). None to disable.
     Inherited attributes
         From :class:`.AbstractAlgo`
 
@@ -55,11 +63,19 @@ class AbstractFitAlgo(AlgoWithDeviceMixin, AbstractAlgo):
 
         self.sufficient_statistics: DictParamsTorch = None
 
+        checkpoint_params = self.algo_parameters.get('checkpoint', {})
+        self.checkpoint_path: Optional[str] = checkpoint_params.get('path', None)
+        self._checkpoint_periodicity: int = checkpoint_params.get('periodicity', None)
+        if self.checkpoint_path is not None and not (isinstance(self._checkpoint_periodicity, int)
+                                                     and self._checkpoint_periodicity > 0):
+            raise LeaspyAlgoInputError("The parameter `checkpoint.periodicity` should be a positive integer, "
+                                       f"not {self._checkpoint_periodicity}.")
+
     ###########################
     # Core
     ###########################
 
-    def run_impl(self, model: AbstractModel, dataset: Dataset):
+    def run_impl(self, model: AbstractModel, dataset: Dataset, *, resume_from: str = None):
         """
         Main method, run the algorithm.
 
@@ -74,6 +90,10 @@ class AbstractFitAlgo(AlgoWithDeviceMixin, AbstractAlgo):
             The used model.
         dataset : :class:`.Dataset`
             Contains the subjects' observations in torch format to speed up computation.
+        resume_from : str, optional
+            Path to a checkpoint of the algorithm (cf. `checkpoint` algorithm parameters) to resume it from.
+            The run then continues exactly as the one that saved the checkpoint would have
+            (provided model, data and algorithm settings are the same).
 
         Returns
         -------
@@ -84,37 +104,237 @@ class AbstractFitAlgo(AlgoWithDeviceMixin, AbstractAlgo):
         """
 
         with self._device_manager(model, dataset):
+            # Dataset the algorithm actually runs on (e.g. individuals repeated once per chain)
+            run_dataset = self._get_run_dataset(dataset)
+
             # Initialize the `CollectionRealization` (from the random variables of the model)
-            realizations = model.initialize_realizations_for_model(dataset.n_individuals)
+            realizations = model.initialize_realizations_for_model(run_dataset.n_individuals)
 
             # Smart init the realizations
-            realizations = model.smart_initialization_realizations(dataset, realizations)
+            realizations = model.smart_initialization_realizations(run_dataset, realizations)
 
             # Initialize Algo
-            self._initialize_algo(dataset, model, realizations)
+            self._initialize_algo(run_dataset, model, realizations)
+
+            # Restore the full state of the algorithm (including model & realizations) from a checkpoint
+            first_iteration = 1
+            if resume_from is not None:
+                self._restore_checkpoint(self._load_checkpoint(resume_from), run_dataset, model, realizations)
+                first_iteration = self.current_iteration + 1
 
             if self.algo_parameters['progress_bar']:
-                self._display_progress_bar(-1, self.algo_parameters['n_iter'], suffix='iterations')
+                self._display_progress_bar(first_iteration - 2, self.algo_parameters['n_iter'], suffix='iterations')
 
             # Iterate
-            for self.current_iteration in range(1, self.algo_parameters['n_iter']+1):
+            try:
+                for self.current_iteration in range(first_iteration, self.algo_parameters['n_iter']+1):
 
-                self.iteration(dataset, model, realizations)
+                    self.iteration(run_dataset, model, realizations)
 
-                if self.output_manager is not None:
-                    # print/plot first & last iteration!
-                    # <!> everything that will be printed/saved is AFTER iteration N (including temperature when annealing...)
-                    self.output_manager.iteration(self, dataset, model, realizations)
+                    if self.output_manager is not None:
+                        # print/plot first & last iteration!
+                        # <!> everything that will be printed/saved is AFTER iteration N (including temperature when annealing...)
+                        # <!> only the individuals of the initial dataset are logged
+                        self.output_manager.iteration(self, dataset, model,
+                                                      self._get_dataset_realizations(realizations, dataset))
+
+                    if self.algo_parameters['progress_bar']:
+                        self._display_progress_bar(self.current_iteration - 1, self.algo_parameters['n_iter'], suffix='iterations')
 
-                if self.algo_parameters['progress_bar']:
-                    self._display_progress_bar(self.current_iteration - 1, self.algo_parameters['n_iter'], suffix='iterations')
+                    if self._check_convergence(model):
+                        break
+
+                    if self.checkpoint_path is not None and self.current_iteration % self._checkpoint_periodicity == 0:
+                        self._save_checkpoint(self.checkpoint_path, run_dataset, model, realizations)
+            finally:
+                if self.output_manager is not None:
+                    # write the buffered traces on disk (even if the algorithm failed, so to investigate it)
+                    self.output_manager.close()
 
             # Finally we compute model attributes once converged
             model.attributes.update(['all'], model.parameters)
 
         loss = model.parameters['log-likelihood'] if model.noise_model in ['bernoulli', 'ordinal', 'ordinal_ranking'] else model.parameters['noise_std']
 
-        return realizations, loss
+        return self._get_dataset_realizations(realizations, dataset), loss
+
+    def _get_run_dataset(self, dataset: Dataset) -> Dataset:
+        """
+        Dataset the algorithm actually iterates on (the dataset itself by default).
+
+        Parameters
+        ----------
+        dataset : :class:`.Dataset`
+
+        Returns
+        -------
+        :class:`.Dataset`
+        """
+        return dataset
+
+    def _get_dataset_realizations(self, realizations: CollectionRealization, dataset: Dataset) -> CollectionRealization:
+        """
+        Realizations restricted to the individuals of the initial dataset (the realizations themselves by default).
+
+        Parameters
+        ----------
+        realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+            Current realizations (for the individuals of the dataset returned by :meth:`._get_run_dataset`).
+        dataset : :class:`.Dataset`
+            The initial dataset.
+
+        Returns
+        -------
+        :class:`~.io.realizations.collection_realization.CollectionRealization`
+        """
+        return realizations
+
+    def _check_convergence(self, model: AbstractModel) -> bool:
+        """
+        Whether the algorithm should stop now, before `n_iter` iterations (never by default).
+
+        Parameters
+        ----------
+        model : :class:`~.models.abstract_model.AbstractModel`
+
+        Returns
+        -------
+        bool
+        """
+        return False
+
+    ###########################
+    # Checkpoints
+    ###########################
+
+    _checkpoint_format_version = 1
+
+    def _get_checkpoint(self, dataset: Dataset, model: AbstractModel, realizations: CollectionRealization) -> KwargsType:
+        """
+        Get the full state of the algorithm at the end of current iteration (to be extended in children classes).
+
+        Parameters
+        ----------
+        dataset : :class:`.Dataset`
+        model : :class:`~.models.abstract_model.AbstractModel`
+        realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+
+        Returns
+        -------
+        dict[str, Any]
+        """
+        rng_states = {
+            'random': random.getstate(),
+            'numpy': np.random.get_state(),
+            'torch': torch.get_rng_state(),
+        }
+        if torch.cuda.is_available():
+            rng_states['torch_cuda'] = torch.cuda.get_rng_state_all()
+
+        return {
+            'format_version': self._checkpoint_format_version,
+            'algorithm': self.name,
+            'n_individuals': dataset.n_individuals,
+            'current_iteration': self.current_iteration,
+            'n_burn_in_iter': self.algo_parameters.get('n_burn_in_iter', None),
+            'model_parameters': {k: v.clone() for k, v in model.parameters.items()},
+            'realizations': {var_name: real.tensor_realizations.clone() for var_name, real in realizations.items()},
+            'sufficient_statistics': self.sufficient_statistics,
+            'rng_states': rng_states,
+        }
+
+    def _restore_checkpoint(self, checkpoint: KwargsType, dataset: Dataset, model: AbstractModel,
+                            realizations: CollectionRealization) -> None:
+        """
+        Restore the full state of the algorithm from a checkpoint (to be extended in children classes).
+
+        <!> It should be called after the algorithm was initialized, since it overwrites this initial state.
+
+        Parameters
+        ----------
+        checkpoint : dict[str, Any]
+            As returned by :meth:`._get_checkpoint`.
+        dataset : :class:`.Dataset`
+        model : :class:`~.models.abstract_model.AbstractModel`
+        realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+
+        Raises
+        ------
+        :exc:`.LeaspyAlgoInputError`
+            If checkpoint is not consistent with algorithm, model or data.
+        """
+        if checkpoint['algorithm'] != self.name:
+            raise LeaspyAlgoInputError(f"The checkpoint was saved by '{checkpoint['algorithm']}' algorithm, "
+                                       f"it can not be resumed with '{self.name}'.")
+        if checkpoint['n_individuals'] != dataset.n_individuals:
+            raise LeaspyAlgoInputError(f"The checkpoint was saved with {checkpoint['n_individuals']} individuals, "
+                                       f"not {dataset.n_individuals}: please use the same data.")
+        # (model parameters may legitimately differ, e.g. 'log-likelihood' is only set during calibration)
+        if set(realizations.keys()) != set(checkpoint['realizations']):
+            raise LeaspyAlgoInputError("The checkpoint is not consistent with the model: please use the same model (and hyperparameters).")
+
+        self.current_iteration = checkpoint['current_iteration']
+        if checkpoint['n_burn_in_iter'] is not None:
+            self.algo_parameters['n_burn_in_iter'] = checkpoint['n_burn_in_iter']
+        self.sufficient_statistics = checkpoint['sufficient_statistics']
+
+        model.parameters = {k: v.clone() for k, v in checkpoint['model_parameters'].items()}
+        for var_name, tensor_realizations in checkpoint['realizations'].items():
+            realizations[var_name].tensor_realizations = tensor_realizations.clone()
+
+        rng_states = checkpoint['rng_states']
+        random.setstate(rng_states['random'])
+        np.random.set_state(rng_states['numpy'])
+        torch.set_rng_state(rng_states['torch'])
+        if 'torch_cuda' in rng_states and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all(rng_states['torch_cuda'])
+
+    def _save_checkpoint(self, path: str, dataset: Dataset, model: AbstractModel, realizations: CollectionRealization) -> None:
+        """
+        Save the full state of the algorithm at the end of current iteration.
+
+        The file is written atomically (through a temporary file), so that a previous checkpoint
+        is never corrupted by an interruption of the algorithm during the save.
+
+        Parameters
+        ----------
+        path : str
+        dataset : :class:`.Dataset`
+        model : :class:`~.models.abstract_model.AbstractModel`
+        realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+        """
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        torch.save(self._get_checkpoint(dataset, model, realizations), tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _load_checkpoint(cls, path: str) -> KwargsType:
+        """
+        Load a checkpoint saved with :meth:`._save_checkpoint`.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        dict[str, Any]
+
+        Raises
+        ------
+        :exc:`.LeaspyAlgoInputError`
+            If there is no checkpoint (in a supported format) at `path`.
+        """
+        if not os.path.isfile(path):
+            raise LeaspyAlgoInputError(f"No checkpoint could be found at '{path}'.")
+        # <!> checkpoints contain non-tensor objects (RNG states, MCMC toolbox...)
+        checkpoint = torch.load(path, weights_only=False)
+        if not isinstance(checkpoint, dict) or checkpoint.get('format_version') != cls._checkpoint_format_version:
+            raise LeaspyAlgoInputError(f"The file '{path}' is not a checkpoint in a supported format.")
+        return checkpoint
 
     @abstractmethod
     def iteration(self, dataset: Dataset, model: AbstractModel, realizations: CollectionRealization):
@@ -1,14 +1,22 @@
+from copy import deepcopy
 from random import shuffle
 
+import torch
+
 from leaspy.algo.fit.abstract_fit_algo import AbstractFitAlgo
 from leaspy.algo.utils.samplers import AlgoWithSamplersMixin
 from leaspy.algo.utils.algo_with_annealing import AlgoWithAnnealingMixin
+from leaspy.algo.utils.algo_with_convergence import AlgoWithConvergenceMixin
 from leaspy.io.data.dataset import Dataset
 from leaspy.models.abstract_model import AbstractModel
 from leaspy.io.realizations.collection_realization import CollectionRealization
+from leaspy.io.realizations.realization import Realization
+
+from leaspy.utils.typing import Dict, KwargsType, Optional
+from leaspy.exceptions import LeaspyAlgoInputError
 
 
-class AbstractFitMCMC(AlgoWithAnnealingMixin, AlgoWithSamplersMixin, AbstractFitAlgo):
+class AbstractFitMCMC(AlgoWithAnnealingMixin, AlgoWithSamplersMixin, AlgoWithConvergenceMixin, AbstractFitAlgo):
     """
     Abstract class containing common method for all `fit` algorithm classes based on `Monte-Carlo Markov Chains` (MCMC).
 
@@ -31,11 +39,44 @@ class AbstractFitMCMC(AlgoWithAnnealingMixin, AlgoWithSamplersMixin, AbstractFit
     temperature_inv : float
         Temperature and its inverse (modified during algorithm when using annealing)
 
+    n_chains : int (default 1)
+        Number of MCMC chains for individual variables, that are run in parallel in the same tensors:
+        individuals are repeated once per chain (chain-major order, cf. :meth:`.Dataset.repeat`)
+        so that the maximization step naturally averages sufficient statistics over chains.
+        Population variables are shared by all chains and sampled given the mean attachment over chains.
+        The 'log-likelihood' model parameter (if any) is also averaged over chains (not summed).
+
+    diagnostics : dict[str, dict[str, `torch.FloatTensor`]] or None
+        Convergence diagnostics of the individual variables, computed on post burn-in iterations at end of algorithm
+        when `n_chains` > 1 (None otherwise):
+            * 'r_hat': potential scale reduction factor (Gelman-Rubin), per individual and per variable coordinate
+              (1 for constant chains all at the same value, +inf for constant chains at different values)
+            * 'ess': rough effective sample size (from between- and within-chain variances, as in Gelman et al. BDA, 2nd ed.)
+
+    convergence_criterion : :class:`.AbstractConvergenceCriterion` or None
+    convergence_iterations : dict[str, int or None]
+        Optional convergence monitoring, to end burn-in phase and/or stop algorithm early (cf. :class:`.AlgoWithConvergenceMixin`)
+
     See Also
     --------
     :mod:`leaspy.algo.utils.samplers`
     """
 
+    def __init__(self, settings):
+
+        super().__init__(settings)
+
+        self.n_chains: int = self.algo_parameters.get('n_chains', 1)
+        if not (isinstance(self.n_chains, int) and self.n_chains >= 1):
+            raise LeaspyAlgoInputError(f"The parameter `n_chains` should be a positive integer, not {self.n_chains}.")
+
+        self.diagnostics: Optional[Dict[str, Dict[str, torch.FloatTensor]]] = None
+
+        # streaming (post burn-in) statistics of individual variables, per chain, for diagnostics
+        self._chains_n_samples: int = 0
+        self._chains_mean: Dict[str, torch.FloatTensor] = {}
+        self._chains_m2: Dict[str, torch.FloatTensor] = {}
+
     ###########################
     ## Initialization
     ###########################
@@ -62,10 +103,64 @@ class AbstractFitMCMC(AlgoWithAnnealingMixin, AlgoWithSamplersMixin, AbstractFit
         # Annealing mixin
         self._initialize_annealing()
 
+        # Convergence mixin
+        self._initialize_convergence()
+
     ###########################
     ## Core
     ###########################
 
+    def run_impl(self, model: AbstractModel, dataset: Dataset, *, resume_from: str = None):
+        """
+        Main method, run the algorithm (on `n_chains` parallel chains for individual variables).
+
+        Parameters
+        ----------
+        model : :class:`~.models.abstract_model.AbstractModel`
+        dataset : :class:`.Dataset`
+        resume_from : str, optional
+            Path to a checkpoint of the algorithm to resume it from (cf. :meth:`.AbstractFitAlgo.run_impl`).
+
+        Returns
+        -------
+        2-tuple:
+            * realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+                The optimized parameters (<!> individual variables of the first chain only).
+            * loss
+        """
+        self._chains_n_samples = 0
+        self._chains_mean, self._chains_m2 = {}, {}
+        self.diagnostics = None
+
+        realizations, loss = super().run_impl(model, dataset, resume_from=resume_from)
+
+        if self.n_chains > 1:
+            self.diagnostics = self._compute_chains_diagnostics()
+
+        return realizations, loss
+
+    def _get_run_dataset(self, dataset: Dataset) -> Dataset:
+        # individuals are repeated once per chain (chain-major order)
+        if self.n_chains == 1:
+            return dataset
+        return dataset.repeat(self.n_chains)
+
+    def _get_dataset_realizations(self, realizations: CollectionRealization, dataset: Dataset) -> CollectionRealization:
+        if self.n_chains == 1:
+            return realizations
+
+        # individual variables of the first chain (views, no copy), population variables are shared by all chains
+        first_chain_realizations = CollectionRealization()
+        first_chain_realizations.reals_pop_variable_names = list(realizations.reals_pop_variable_names)
+        first_chain_realizations.reals_ind_variable_names = list(realizations.reals_ind_variable_names)
+        for var_name, realization in realizations.items():
+            if realization.variable_type == 'individual':
+                first_chain_realization = Realization(realization.name, realization.shape, realization.variable_type)
+                first_chain_realization.tensor_realizations = realization.tensor_realizations[:dataset.n_individuals]
+                realization = first_chain_realization
+            first_chain_realizations.realizations[var_name] = realization
+        return first_chain_realizations
+
     def iteration(self, dataset: Dataset, model: AbstractModel, realizations: CollectionRealization):
         """
         MCMC-SAEM iteration.
@@ -85,8 +180,12 @@ class AbstractFitMCMC(AlgoWithAnnealingMixin, AlgoWithSamplersMixin, AbstractFit
         if self.random_order_variables:
             shuffle(vars_order)  # shuffle order in-place!
 
+        # population variables are shared by all chains: they are sampled given the mean attachment over chains
+        pop_sampling_kws = {'attachment_scale': 1. / self.n_chains} if self.n_chains > 1 else {}
+
         for key in vars_order:
-            self.samplers[key].sample(dataset, model, realizations, self.temperature_inv)
+            sampling_kws = pop_sampling_kws if key in realizations.reals_pop_variable_names else {}
+            self.samplers[key].sample(dataset, model, realizations, self.temperature_inv, **sampling_kws)
 
         # Maximization step
         self._maximization_step(dataset, model, realizations)
@@ -96,3 +195,115 @@ class AbstractFitMCMC(AlgoWithAnnealingMixin, AlgoWithSamplersMixin, AbstractFit
 
         # Annealing mixin
         self._update_temperature()
+
+        if self.n_chains > 1 and not self._is_burn_in():
+            self._update_chains_statistics(realizations)
+
+    def _maximization_step(self, dataset: Dataset, model: AbstractModel, realizations: CollectionRealization):
+        super()._maximization_step(dataset, model, realizations)
+
+        if self.n_chains > 1 and 'log-likelihood' in model.parameters:
+            # the attachment is summed over the individuals of all chains: average it over chains
+            # so that the log-likelihood is comparable to the one of a single-chain fit
+            model.parameters['log-likelihood'] = model.parameters['log-likelihood'] / self.n_chains
+
+    ###########################
+    ## Checkpoints
+    ###########################
+
+    def _get_checkpoint(self, dataset: Dataset, model: AbstractModel, realizations: CollectionRealization) -> KwargsType:
+        checkpoint = super()._get_checkpoint(dataset, model, realizations)
+        checkpoint['mcmc'] = {
+            # <!> the MCMC toolbox is copied as is (including its priors & derived attributes) for an exact resume
+            'MCMC_toolbox': deepcopy(model.MCMC_toolbox),
+            'samplers': {var_name: sampler.state_dict() for var_name, sampler in self.samplers.items()},
+            'temperature': self.temperature,
+            'temperature_inv': self.temperature_inv,
+            'chains_n_samples': self._chains_n_samples,
+            'chains_mean': {k: v.clone() for k, v in self._chains_mean.items()},
+            'chains_m2': {k: v.clone() for k, v in self._chains_m2.items()},
+            'convergence_iterations': dict(self.convergence_iterations),
+            'convergence_monitored_burn_in': self._convergence_monitored_burn_in,
+            'convergence_criterion': None if self.convergence_criterion is None else self.convergence_criterion.state_dict(),
+        }
+        return checkpoint
+
+    def _restore_checkpoint(self, checkpoint: KwargsType, dataset: Dataset, model: AbstractModel,
+                            realizations: CollectionRealization) -> None:
+        super()._restore_checkpoint(checkpoint, dataset, model, realizations)
+        mcmc_checkpoint = checkpoint['mcmc']
+
+        if set(mcmc_checkpoint['samplers']) != set(self.samplers):
+            raise LeaspyAlgoInputError("The checkpoint is not consistent with the samplers of the algorithm.")
+        if (mcmc_checkpoint['convergence_criterion'] is None) != (self.convergence_criterion is None):
+            raise LeaspyAlgoInputError("The checkpoint is not consistent with the `convergence` parameters of the algorithm.")
+
+        model.MCMC_toolbox = deepcopy(mcmc_checkpoint['MCMC_toolbox'])
+        for var_name, sampler in self.samplers.items():
+            sampler.load_state_dict(mcmc_checkpoint['samplers'][var_name])
+        self.temperature = mcmc_checkpoint['temperature']
+        self.temperature_inv = mcmc_checkpoint['temperature_inv']
+        self._chains_n_samples = mcmc_checkpoint['chains_n_samples']
+        self._chains_mean = {k: v.clone() for k, v in mcmc_checkpoint['chains_mean'].items()}
+        self._chains_m2 = {k: v.clone() for k, v in mcmc_checkpoint['chains_m2'].items()}
+        self.convergence_iterations = dict(mcmc_checkpoint['convergence_iterations'])
+        self._convergence_monitored_burn_in = mcmc_checkpoint['convergence_monitored_burn_in']
+        if self.convergence_criterion is not None:
+            self.convergence_criterion.load_state_dict(mcmc_checkpoint['convergence_criterion'])
+
+    ###########################
+    ## Multi-chain diagnostics
+    ###########################
+
+    def _update_chains_statistics(self, realizations: CollectionRealization) -> None:
+        """
+        Update the streaming per-chain mean and sum of squared deviations (Welford) of individual variables.
+
+        Parameters
+        ----------
+        realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+        """
+        self._chains_n_samples += 1
+        for var_name in realizations.reals_ind_variable_names:
+            reals = realizations[var_name].tensor_realizations.detach()
+            reals = reals.view(self.n_chains, -1, *reals.shape[1:])
+            if self._chains_n_samples == 1:
+                self._chains_mean[var_name] = reals.clone()
+                self._chains_m2[var_name] = torch.zeros_like(reals)
+            else:
+                delta = reals - self._chains_mean[var_name]
+                self._chains_mean[var_name] += delta / self._chains_n_samples
+                self._chains_m2[var_name] += delta * (reals - self._chains_mean[var_name])
+
+    def _compute_chains_diagnostics(self) -> Optional[Dict[str, Dict[str, torch.FloatTensor]]]:
+        """
+        Compute the Gelman-Rubin potential scale reduction factor and a rough effective sample size
+        of individual variables, from the per-chain statistics on post burn-in iterations.
+
+        Returns
+        -------
+        dict[str, dict[str, `torch.FloatTensor`]] or None
+            {'r_hat': {var_name: tensor}, 'ess': {var_name: tensor}} with tensors of shape (n_individuals, *var_shape).
+            None if there are not enough post burn-in iterations (< 2).
+        """
+        n = self._chains_n_samples
+        if n < 2:
+            return None
+
+        diagnostics = {'r_hat': {}, 'ess': {}}
+        for var_name, chains_mean in self._chains_mean.items():
+            within_var = (self._chains_m2[var_name] / (n - 1)).mean(dim=0)
+            between_var = n * chains_mean.var(dim=0)  # unbiased on chains
+            var_plus = (n - 1) / n * within_var + between_var / n
+            # constant chains (e.g. frozen variable): R-hat is 1 if all chains are at the same value, +inf otherwise
+            diagnostics['r_hat'][var_name] = torch.where(
+                within_var > 0, torch.sqrt(var_plus / within_var.clamp(min=torch.finfo(within_var.dtype).tiny)),
+                torch.where(between_var > 0, float('inf'), 1.)
+            )
+            # no between-chain variance: chains are deemed independent (maximal effective sample size)
+            diagnostics['ess'][var_name] = torch.where(
+                between_var > 0, self.n_chains * n * var_plus / between_var.clamp(min=torch.finfo(between_var.dtype).tiny),
+                float(self.n_chains * n)
+            ).clamp(max=self.n_chains * n)
+
+        return diagnostics
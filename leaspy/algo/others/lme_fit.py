@@ -94,16 +94,53 @@ class LMEFitAlgorithm(AbstractAlgo): # AbstractFitAlgo not so generic (EM)
 
         # get data
         ages = self._get_reformated(dataset, 'timepoints')
-        ages_mean, ages_std = np.mean(ages).item(), np.std(ages).item()
-        ages_norm = (ages - ages_mean) / ages_std
-
         y = self._get_reformated(dataset, 'values')
         subjects_with_repeat = self._get_reformated_subjects(dataset)
 
+        parameters = self.fit_lme(ages, y, subjects_with_repeat, with_random_slope_age=model.with_random_slope_age)
+
+        # update model parameters
+        model.load_parameters(parameters)
+
+        # return `(fitted_lme.resid ** 2).mean() ** .5` instead of scale?
+        return None, parameters['noise_std']
+
+    def fit_lme(self, ages: np.ndarray, y: np.ndarray, subjects: np.ndarray, *, with_random_slope_age: bool) -> dict:
+        """
+        Fit the statsmodels LME on (flat) arrays of observations, with the settings of algorithm.
+
+        It does not depend on any `Leaspy` data container so that it can be cheaply used on each feature
+        of a multivariate dataset (cf. :func:`.get_lme_results`).
+
+        Parameters
+        ----------
+        ages : :class:`numpy.ndarray` [float, 1D]
+            Ages of observations (not normalized).
+        y : :class:`numpy.ndarray` [float, 1D]
+            Observed values (no nans).
+        subjects : :class:`numpy.ndarray` [1D]
+            Identifiers (or integer codes) of individuals of observations.
+        with_random_slope_age : bool
+            Has LME model a random slope per age (otherwise only a random intercept).
+
+        Returns
+        -------
+        parameters : dict[str, Any]
+            The parameters of :class:`~.models.lme_model.LMEModel`.
+
+        Raises
+        ------
+        :exc:`.LeaspyDataInputError`
+            If random effects cannot be predicted due to a singular covariance structure.
+        """
+        ages_mean, ages_std = np.mean(ages).item(), np.std(ages).item()
+        ages_norm = (ages - ages_mean) / ages_std
+
         # model
         X = sm.add_constant(ages_norm, prepend=True, has_constant='add')
+        sm_fit_parameters = self.sm_fit_parameters.copy()
 
-        if model.with_random_slope_age:
+        if with_random_slope_age:
             exog_re = X
 
             if self.force_independent_random_effects:
@@ -111,15 +148,15 @@ class LMEFitAlgorithm(AbstractAlgo): # AbstractFitAlgo not so generic (EM)
                     fe_params=np.ones(2),
                     cov_re=np.eye(2)
                 )
-                self.sm_fit_parameters['free'] = free
-                methods_not_compat_with_free = {'powell','nm'}.intersection(self.sm_fit_parameters['method']) # cf. statsmodels doc
+                sm_fit_parameters['free'] = free
+                methods_not_compat_with_free = {'powell','nm'}.intersection(sm_fit_parameters['method']) # cf. statsmodels doc
                 if len(methods_not_compat_with_free) > 0:
                     warnings.warn("<!> Methods {'powell','nm'} are not compatible with `force_independent_random_effects`")
         else:
             exog_re = None # random_intercept only
 
-        lme = MixedLM(y, X, subjects_with_repeat, exog_re, missing='raise')
-        fitted_lme = lme.fit(**self.sm_fit_parameters)
+        lme = MixedLM(y, X, subjects, exog_re, missing='raise')
+        fitted_lme = lme.fit(**sm_fit_parameters)
 
         try:
             cov_re_unscaled_inv = np.linalg.inv(fitted_lme.cov_re_unscaled)
@@ -127,7 +164,7 @@ class LMEFitAlgorithm(AbstractAlgo): # AbstractFitAlgo not so generic (EM)
             raise LeaspyDataInputError("Cannot predict random effects from "
                                        "singular covariance structure.")
 
-        parameters = {
+        return {
             "ages_mean": ages_mean,
             "ages_std": ages_std,
             "fe_params": fitted_lme.fe_params,
@@ -138,12 +175,6 @@ class LMEFitAlgorithm(AbstractAlgo): # AbstractFitAlgo not so generic (EM)
             "bse_re": fitted_lme.bse_re
         }
 
-        # update model parameters
-        model.load_parameters(parameters)
-
-        # return `(fitted_lme.resid ** 2).mean() ** .5` instead of scale?
-        return None, parameters['noise_std']
-
     @staticmethod
     def _get_reformated(dataset, elem):
         # reformat ages
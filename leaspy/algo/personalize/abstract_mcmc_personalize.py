@@ -5,16 +5,15 @@ from random import shuffle
 from copy import copy
 from abc import abstractmethod
 
-import torch
-
 from leaspy.algo.personalize.abstract_personalize_algo import AbstractPersonalizeAlgo
 from leaspy.algo.utils.samplers import AlgoWithSamplersMixin
 from leaspy.algo.utils.algo_with_device import AlgoWithDeviceMixin
 from leaspy.algo.utils.algo_with_annealing import AlgoWithAnnealingMixin
 from leaspy.io.outputs.individual_parameters import IndividualParameters
-from leaspy.utils.typing import DictParamsTorch
+from leaspy.utils.typing import List
 
 if TYPE_CHECKING:
+    from leaspy.algo.personalize.realizations_accumulators import AbstractRealizationsAccumulator
     from leaspy.models.abstract_model import AbstractModel
     from leaspy.io.data.dataset import Dataset
 
@@ -32,34 +31,24 @@ class AbstractMCMCPersonalizeAlgo(AlgoWithAnnealingMixin, AlgoWithSamplersMixin,
     """
 
     @abstractmethod
-    def _compute_individual_parameters_from_samples_torch(self,
-            realizations: DictParamsTorch,
-            attachments: torch.FloatTensor,
-            regularities: torch.FloatTensor) -> DictParamsTorch:
+    def _initialize_realizations_accumulator(self, ind_vars_names: List[str]) -> AbstractRealizationsAccumulator:
         """
-        Compute dictionary of individual parameters from stacked realizations, attachments and regularities.
+        Initialize the online accumulator of realizations from which individual parameters are derived.
+
+        It is updated in-place at each iteration after the burn-in phase, so no history of realizations is kept.
 
         Parameters
         ----------
-        realizations : dict[ind_var_name: str, `torch.FloatTensor` of shape (n_iter, n_individuals, *ind_var.shape)]
-            The stacked history of realizations for individual variables.
-        attachments : `torch.FloatTensor` of shape (n_iter, n_individuals)
-            The stacked history of attachments.
-        regularities : `torch.FloatTensor` of shape (n_iter, n_individuals)
-            The stacked history of regularities (sum on all individual variables / dimensions).
+        ind_vars_names : list[str]
+            Names of the individual variables of model.
 
         Returns
         -------
-        dict[ind_var_name: str, `torch.FloatTensor` of shape (n_individuals, *ind_var.shape)]
+        :class:`.AbstractRealizationsAccumulator`
         """
 
     def _get_individual_parameters(self, model: AbstractModel, dataset: Dataset):
 
-        # Initialize realizations storage object
-        realizations_history = []
-        attachment_history = []
-        regularity_history = []
-
         # We are not in a calibration any more so attribute_type=None (NOT using MCMC toolbox, since it is undefined!)
         computation_kws = dict(attribute_type=None)
 
@@ -79,6 +68,9 @@ class AbstractMCMCPersonalizeAlgo(AlgoWithAnnealingMixin, AlgoWithSamplersMixin,
             )
             ind_vars_names = copy(realizations.reals_ind_variable_names)
 
+            # Initialize the online accumulator of realizations (memory does not depend on `n_iter`)
+            accumulator = self._initialize_realizations_accumulator(realizations.reals_ind_variable_names)
+
             n_iter = self.algo_parameters['n_iter']
             if self.algo_parameters.get('progress_bar', True):
                 self._display_progress_bar(-1, n_iter, suffix='iterations')
@@ -96,11 +88,9 @@ class AbstractMCMCPersonalizeAlgo(AlgoWithAnnealingMixin, AlgoWithSamplersMixin,
                                                                                          self.temperature_inv, **computation_kws)
                     tot_regularities += regularity_var
 
-                # Append current realizations if "burn-in phase" is finished
+                # Accumulate current realizations if "burn-in phase" is finished
                 if not self._is_burn_in():
-                    realizations_history.append(realizations.clone_realizations())
-                    attachment_history.append(last_attachment.clone().detach())
-                    regularity_history.append(tot_regularities.clone().detach())
+                    accumulator.update(realizations, last_attachment, tot_regularities)
 
                 # Annealing
                 self._update_temperature()
@@ -110,18 +100,8 @@ class AbstractMCMCPersonalizeAlgo(AlgoWithAnnealingMixin, AlgoWithSamplersMixin,
                 if self.algo_parameters.get('progress_bar', True):
                     self._display_progress_bar(self.current_iteration - 1, n_iter, suffix='iterations')
 
-            # Stack tensor realizations as well as attachments and tot_regularities
-            torch_realizations = {
-                ind_var_name: torch.stack([realizations[ind_var_name].tensor_realizations
-                                           for realizations in realizations_history])
-                for ind_var_name in realizations.reals_ind_variable_names
-            }
-            torch_attachments = torch.stack(attachment_history)
-            torch_tot_regularities = torch.stack(regularity_history)
-
-            # Derive individual parameters from `realizations_history` list
-            individual_parameters_torch = self._compute_individual_parameters_from_samples_torch(
-                                                    torch_realizations, torch_attachments, torch_tot_regularities)
+            # Derive individual parameters from the accumulated realizations
+            individual_parameters_torch = accumulator.get_individual_parameters()
 
             # Create the IndividualParameters object
             return IndividualParameters.from_pytorch(dataset.indices, individual_parameters_torch)
@@ -1,7 +1,6 @@
-import torch
-
 from leaspy.algo.personalize.abstract_mcmc_personalize import AbstractMCMCPersonalizeAlgo
-from leaspy.utils.typing import DictParamsTorch
+from leaspy.algo.personalize.realizations_accumulators import MeanRealizationsAccumulator
+from leaspy.utils.typing import List
 
 
 class MeanReal(AbstractMCMCPersonalizeAlgo):
@@ -17,28 +16,17 @@ class MeanReal(AbstractMCMCPersonalizeAlgo):
     """
     name = 'mean_real'
 
-    def _compute_individual_parameters_from_samples_torch(self,
-            realizations: DictParamsTorch,
-            attachments: torch.FloatTensor,
-            regularities: torch.FloatTensor) -> DictParamsTorch:
+    def _initialize_realizations_accumulator(self, ind_vars_names: List[str]) -> MeanRealizationsAccumulator:
         """
-        Compute dictionary of individual parameters from stacked realizations, attachments and regularities.
+        Initialize the online accumulator of realizations from which individual parameters are derived.
 
         Parameters
         ----------
-        realizations : dict[ind_var_name: str, `torch.FloatTensor` of shape (n_iter, n_individuals, *ind_var.shape)]
-            The stacked history of realizations for individual variables.
-        attachments : `torch.FloatTensor` of shape (n_iter, n_individuals)
-            The stacked history of attachments.
-        regularities : `torch.FloatTensor` of shape (n_iter, n_individuals)
-            The stacked history of regularities (sum on all individual variables / dimensions).
+        ind_vars_names : list[str]
+            Names of the individual variables of model.
 
         Returns
         -------
-        dict[ind_var_name: str, `torch.FloatTensor` of shape (n_individuals, *ind_var.shape)]
+        :class:`.MeanRealizationsAccumulator`
         """
-        # Only compute the mean of realizations (attachments & regularities not taken into account)
-        return {
-            ind_var_name: reals_var.mean(dim=0)
-            for ind_var_name, reals_var in realizations.items()
-        }
+        return MeanRealizationsAccumulator(ind_vars_names)
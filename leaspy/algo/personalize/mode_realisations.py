@@ -1,7 +1,6 @@
-import torch
-
 from leaspy.algo.personalize.abstract_mcmc_personalize import AbstractMCMCPersonalizeAlgo
-from leaspy.utils.typing import DictParamsTorch
+from leaspy.algo.personalize.realizations_accumulators import ModeRealizationsAccumulator
+from leaspy.utils.typing import List
 
 
 class ModeReal(AbstractMCMCPersonalizeAlgo):
@@ -19,32 +18,17 @@ class ModeReal(AbstractMCMCPersonalizeAlgo):
     """
     name = 'mode_real'
 
-    def _compute_individual_parameters_from_samples_torch(self,
-            realizations: DictParamsTorch,
-            attachments: torch.FloatTensor,
-            regularities: torch.FloatTensor) -> DictParamsTorch:
+    def _initialize_realizations_accumulator(self, ind_vars_names: List[str]) -> ModeRealizationsAccumulator:
         """
-        Compute dictionary of individual parameters from stacked realizations, attachments and regularities.
+        Initialize the online accumulator of realizations from which individual parameters are derived.
 
         Parameters
         ----------
-        realizations : dict[ind_var_name: str, `torch.FloatTensor` of shape (n_iter, n_individuals, *ind_var.shape)]
-            The stacked history of realizations for individual variables.
-        attachments : `torch.FloatTensor` of shape (n_iter, n_individuals)
-            The stacked history of attachments.
-        regularities : `torch.FloatTensor` of shape (n_iter, n_individuals)
-            The stacked history of regularities (sum on all individual variables / dimensions).
+        ind_vars_names : list[str]
+            Names of the individual variables of model.
 
         Returns
         -------
-        dict[ind_var_name: str, `torch.FloatTensor` of shape (n_individuals, *ind_var.shape)]
+        :class:`.ModeRealizationsAccumulator`
         """
-        # Indices of iterations where loss (= negative log-likelihood) was minimal
-        # (per individual, but tradeoff on ALL individual parameters)
-        indices_iter_best = torch.argmin(attachments + regularities, dim=0)  # shape (n_individuals,)
-
-        return {
-            ind_var_name: torch.stack([reals_var[ind_best_iter, ind]
-                                       for ind, ind_best_iter in enumerate(indices_iter_best)])
-            for ind_var_name, reals_var in realizations.items()
-        }
+        return ModeRealizationsAccumulator(ind_vars_names)
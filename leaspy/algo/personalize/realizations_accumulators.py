@@ -0,0 +1,144 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from abc import ABC, abstractmethod
+
+import torch
+
+from leaspy.exceptions import LeaspyAlgoInputError
+from leaspy.utils.typing import Dict, DictParamsTorch, List
+
+if TYPE_CHECKING:
+    from leaspy.io.realizations.collection_realization import CollectionRealization
+
+
+class AbstractRealizationsAccumulator(ABC):
+    """
+    Online accumulator of the realizations of individual variables along MCMC iterations.
+
+    It is updated in-place at each iteration (no history of realizations is kept),
+    so that its memory footprint does not depend on the number of iterations.
+
+    Parameters
+    ----------
+    ind_vars_names : list[str]
+        Names of the individual variables to accumulate.
+    """
+
+    def __init__(self, ind_vars_names: List[str]):
+        self.ind_vars_names = list(ind_vars_names)
+        self.n_samples = 0
+
+    def update(self, realizations: CollectionRealization,
+               attachments: torch.FloatTensor, regularities: torch.FloatTensor) -> None:
+        """
+        Update the accumulator with the realizations of the current iteration.
+
+        Parameters
+        ----------
+        realizations : :class:`.CollectionRealization`
+            The current realizations of (at least) the individual variables.
+        attachments : `torch.FloatTensor` of shape (n_individuals,)
+            The current attachments.
+        regularities : `torch.FloatTensor` of shape (n_individuals,)
+            The current regularities (sum on all individual variables / dimensions).
+        """
+        with torch.no_grad():
+            self._update({ind_var_name: realizations[ind_var_name].tensor_realizations
+                          for ind_var_name in self.ind_vars_names},
+                         attachments.detach(), regularities.detach())
+        self.n_samples += 1
+
+    @abstractmethod
+    def _update(self, realizations: DictParamsTorch,
+                attachments: torch.FloatTensor, regularities: torch.FloatTensor) -> None:
+        """Update the accumulator in-place (the realizations tensors must not be stored as is since they may be modified later)."""
+
+    def get_individual_parameters(self) -> DictParamsTorch:
+        """
+        Individual parameters derived from all the realizations accumulated so far.
+
+        Returns
+        -------
+        dict[ind_var_name: str, `torch.FloatTensor` of shape (n_individuals, *ind_var.shape)]
+
+        Raises
+        ------
+        :exc:`.LeaspyAlgoInputError`
+            If no realization was accumulated (e.g. all iterations were burn-in iterations).
+        """
+        if self.n_samples == 0:
+            raise LeaspyAlgoInputError('No realization was accumulated: please check that the number of iterations '
+                                       'is greater than the number of burn-in iterations.')
+        return self._get_individual_parameters()
+
+    @abstractmethod
+    def _get_individual_parameters(self) -> DictParamsTorch:
+        """Individual parameters derived from the (non-empty) accumulator."""
+
+
+class MeanRealizationsAccumulator(AbstractRealizationsAccumulator):
+    """
+    Running mean of realizations of individual variables (attachments & regularities are not taken into account).
+
+    <!> Sums are accumulated in double precision (to avoid any loss of precision over many iterations),
+    and the means are cast back to the dtype of realizations.
+
+    Parameters
+    ----------
+    ind_vars_names : list[str]
+        Names of the individual variables to accumulate.
+    """
+
+    def __init__(self, ind_vars_names: List[str]):
+        super().__init__(ind_vars_names)
+        self.sums: DictParamsTorch = {}
+        self.dtypes: Dict[str, torch.dtype] = {}
+
+    def _update(self, realizations, attachments, regularities):
+        for ind_var_name, reals_var in realizations.items():
+            if ind_var_name in self.sums:
+                self.sums[ind_var_name] += reals_var
+            else:
+                self.dtypes[ind_var_name] = reals_var.dtype
+                self.sums[ind_var_name] = reals_var.to(torch.float64, copy=True)
+
+    def _get_individual_parameters(self):
+        return {
+            ind_var_name: (sum_var / self.n_samples).to(self.dtypes[ind_var_name])
+            for ind_var_name, sum_var in self.sums.items()
+        }
+
+
+class ModeRealizationsAccumulator(AbstractRealizationsAccumulator):
+    """
+    Running argmin of the loss (attachment + regularity) of each individual, with the corresponding realizations.
+
+    The tradeoff is made on ALL individual variables at once, and the first iteration reaching the minimal loss is kept.
+
+    Parameters
+    ----------
+    ind_vars_names : list[str]
+        Names of the individual variables to accumulate.
+    """
+
+    def __init__(self, ind_vars_names: List[str]):
+        super().__init__(ind_vars_names)
+        self.best_loss: torch.FloatTensor = None
+        self.best_realizations: DictParamsTorch = {}
+
+    def _update(self, realizations, attachments, regularities):
+        loss = attachments + regularities  # shape (n_individuals,)
+
+        if self.best_loss is None:
+            self.best_loss = loss.clone()
+            self.best_realizations = {ind_var_name: reals_var.clone() for ind_var_name, reals_var in realizations.items()}
+            return
+
+        improved = loss < self.best_loss  # strict, to keep the first iteration in case of ties
+        self.best_loss = torch.where(improved, loss, self.best_loss)
+        for ind_var_name, reals_var in realizations.items():
+            self.best_realizations[ind_var_name][improved] = reals_var[improved]
+
+    def _get_individual_parameters(self):
+        return {ind_var_name: best_var.clone() for ind_var_name, best_var in self.best_realizations.items()}
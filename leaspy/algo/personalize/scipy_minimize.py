@@ -3,7 +3,7 @@ import warnings
 
 import torch
 from joblib import Parallel, delayed
-from scipy.optimize import minimize
+from scipy.optimize import minimize, OptimizeResult
 
 from leaspy.io.outputs.individual_parameters import IndividualParameters
 from leaspy.algo.personalize.abstract_personalize_algo import AbstractPersonalizeAlgo
@@ -32,6 +32,9 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         Settings of the algorithm.
         In particular the parameter `custom_scipy_minimize_params` may contain
         keyword arguments passed to :func:`scipy.optimize.minimize`.
+        If the parameter `batched` is True (and jacobian is used), all subjects are personalized
+        at once with an in-house BFGS vectorized over subjects instead of calling
+        :func:`scipy.optimize.minimize` subject by subject (`n_jobs` is then ignored).
 
     Attributes
     ----------
@@ -76,6 +79,9 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
     }
     DEFAULT_FORMAT_CONVERGENCE_ISSUES = "<!> {patient_id}:\n{optimization_result_pformat}"
 
+    # maximum number of step halvings in backtracking line-search of batched personalization
+    _BATCHED_LINE_SEARCH_MAXITER = 30
+
     def __init__(self, settings):
 
         super().__init__(settings)
@@ -136,6 +142,15 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         """
         tensorized_params = torch.tensor(x, dtype=torch.float32).view((1,-1)) # 1 individual
 
+        return self._pull_individual_parameters_tensorized(tensorized_params, model)
+
+    def _pull_individual_parameters_tensorized(self, tensorized_params, model):
+        """
+        Get individual parameters as a dict[param_name: str, :class:`torch.Tensor` [n_individuals,n_dims_param]]
+        from a condensed tensor of shape [n_individuals, n_dims_params]
+
+        (based on the conventional order defined in :meth:`._initialize_parameters`)
+        """
         # <!> order + rescaling of parameters
         individual_parameters = {
             'xi': tensorized_params[:,[0]] * model.parameters['xi_std'],
@@ -160,7 +175,7 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         if 'univariate' not in model.name and model.source_dimension > 0:
             to_cat.append( dict_grad_tensors['sources'] * model.parameters['sources_std'] )
 
-        return torch.cat(to_cat, dim=-1).squeeze(0) # 1 individual at a time
+        return torch.cat(to_cat, dim=-1)
 
     def _get_reconstruction_error(self, model, times, values, individual_parameters):
         """
@@ -266,18 +281,61 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         ------
         :exc:`.LeaspyAlgoInputError`
             if noise model is not currently supported by algorithm.
-            TODO: everything that is not generic here concerning noise structure should be handle by model/NoiseModel directly!!!!
         """
 
         # Extra arguments passed by scipy minimize
         model, times, values, with_gradient = args
-        nans = torch.isnan(values)
 
-        ## Attachment term
         individual_parameters = self._pull_individual_parameters(x, model)
 
-        # compute 1 individual at a time (1st dimension is squeezed)
-        predicted = model.compute_individual_tensorized(times, individual_parameters).squeeze(0)
+        # compute 1 individual at a time (individual dimension is squeezed at the end)
+        objective, gradient = self._get_objective_tensorized(model, times, values.unsqueeze(0), individual_parameters,
+                                                             with_gradient=with_gradient)
+
+        if with_gradient:
+            # result tuple (objective, jacobian)
+            return (objective.squeeze(0).item(), gradient.squeeze(0).detach())
+        else:
+            # result is objective only
+            return objective.squeeze(0).item()
+
+    def _get_objective_tensorized(self, model, times, values, individual_parameters, *, with_gradient: bool):
+        """
+        Objective loss function (and its gradient w.r.t. standardized individual parameters) for a batch of individuals.
+
+        The objective is separable across individuals, so we compute it (and its gradient) per individual.
+
+        Parameters
+        ----------
+        model : :class:`.AbstractModel`
+            Model used to compute the group average parameters.
+        times : :class:`torch.Tensor` [n_individuals, n_tpts]
+            Contains the individual ages corresponding to the given ``values``.
+        values : :class:`torch.Tensor` [n_individuals, n_tpts, n_fts [, extra_dim_for_ordinal_model]]
+            Contains the individual true scores corresponding to the given ``times``, with nans
+            (in particular for padded visits).
+        individual_parameters : dict[str, :class:`torch.Tensor` [n_individuals, n_dims_param]]
+            Individual parameters as a dict
+        with_gradient : bool
+            Should we also compute the gradient of objective?
+
+        Returns
+        -------
+        objective : :class:`torch.Tensor` [n_individuals]
+            Value of the loss function (opposite of log-likelihood), per individual.
+        gradient : :class:`torch.Tensor` [n_individuals, n_dims_params] or None (if not `with_gradient`)
+            Gradient of the loss function w.r.t. standardized individual parameters, per individual.
+
+        Raises
+        ------
+        :exc:`.LeaspyAlgoInputError`
+            if noise model is not currently supported by algorithm.
+            TODO: everything that is not generic here concerning noise structure should be handle by model/NoiseModel directly!!!!
+        """
+        nans = torch.isnan(values)
+
+        ## Attachment term
+        predicted = model.compute_individual_tensorized(times, individual_parameters)
 
         # we clamp the predictions for log-based losses (safety before taking the log)
         # cf. torch.finfo(torch.float32).eps ~= 1.19e-7
@@ -287,15 +345,15 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
 
         diff = None
         if model.noise_model != 'ordinal':
-            diff = predicted - values # tensor j,k[,l] (j=visits, k=features [, l=ordinal_ranking_level])
+            diff = predicted - values # tensor i,j,k[,l] (i=individuals, j=visits, k=features [, l=ordinal_ranking_level])
             diff[nans] = 0.  # set nans to zero, not to count in the sum
 
         # compute gradient of model with respect to individual parameters
         grads = None
         if with_gradient:
             grads = model.compute_jacobian_tensorized(times, individual_parameters)
-            # put derivatives consecutively in the right order and drop ind level
-            # --> output shape [n_tpts, n_fts [, n_ordinal_lvls], n_dims_params]
+            # put derivatives consecutively in the right order
+            # --> output shape [n_inds, n_tpts, n_fts [, n_ordinal_lvls], n_dims_params]
             grads = self._get_normalized_grad_tensor_from_grad_dict(grads, model)
 
         # Placeholder for result (objective and, if needed, gradient)
@@ -305,20 +363,20 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         # TODO: should be directly handled in model or NoiseModel (probably in NoiseModel)
         if 'gaussian' in model.noise_model:
             noise_var = model.parameters['noise_std'] * model.parameters['noise_std']
-            noise_var = noise_var.expand((1, model.dimension)) # tensor 1,n_fts (works with diagonal noise or scalar noise)
-            res['objective'] = torch.sum((0.5 / noise_var) @ (diff * diff).t()) # <!> noise per feature
+            noise_var = noise_var.expand((model.dimension,)) # tensor n_fts (works with diagonal noise or scalar noise)
+            res['objective'] = torch.sum((0.5 / noise_var) * diff * diff, dim=(1, 2)) # <!> noise per feature
 
             if with_gradient:
-                res['gradient'] = torch.sum((diff / noise_var).unsqueeze(-1) * grads, dim=(0,1))
+                res['gradient'] = torch.sum((diff / noise_var).unsqueeze(-1) * grads, dim=(1, 2))
 
         elif model.noise_model == 'bernoulli':
             neg_crossentropy = values * torch.log(predicted) + (1. - values) * torch.log(1. - predicted)
             neg_crossentropy[nans] = 0. # set nans to zero, not to count in the sum
-            res['objective'] = -torch.sum(neg_crossentropy)
+            res['objective'] = -torch.sum(neg_crossentropy, dim=(1, 2))
 
             if with_gradient:
                 crossentropy_fact = diff / (predicted * (1. - predicted))
-                res['gradient'] = torch.sum(crossentropy_fact.unsqueeze(-1) * grads, dim=(0,1))
+                res['gradient'] = torch.sum(crossentropy_fact.unsqueeze(-1) * grads, dim=(1, 2))
 
         elif model.is_ordinal:
 
@@ -334,7 +392,7 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
             else:
                 # Compute the cross-entropy for each P(X>=k)
                 # values (`sf`) are already masked for impossible ordinal levels but not `cdf`
-                mask_ordinal_lvls = model.ordinal_infos['mask'].squeeze(0) # squeeze individual dimension to preserve shape
+                mask_ordinal_lvls = model.ordinal_infos['mask'] # shape (1, 1, n_fts, n_ordinal_lvls)
                 cdf = (1. - values) * mask_ordinal_lvls
                 LL = (values * torch.log(predicted) + cdf * torch.log(1. - predicted)).sum(dim=-1)
 
@@ -345,11 +403,11 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
 
             # we squeeze the last dimension of nans (raw int value is nan <=> all the ordinal levels are nan)
             LL[nans[..., 0]] = 0.
-            res['objective'] = -torch.sum(LL)
+            res['objective'] = -torch.sum(LL, dim=(1, 2))
 
             if with_gradient:
-                grad = torch.sum(LL_grad_fact.unsqueeze(-1) * grads, dim=2)
-                res['gradient'] = -grad.sum(dim=(0,1))
+                grad = torch.sum(LL_grad_fact.unsqueeze(-1) * grads, dim=3)
+                res['gradient'] = -grad.sum(dim=(1, 2))
 
         else:
             raise LeaspyAlgoInputError(f"'{model.noise_model}' noise is currently not implemented in 'scipy_minimize' algorithm. "
@@ -358,18 +416,13 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         ## Regularity term
         regularity, regularity_grads = self._get_regularity(model, individual_parameters)
 
-        res['objective'] += regularity.squeeze(0)
+        res['objective'] += regularity
 
         if with_gradient:
-            # add regularity term, shape (n_dims_params, )
+            # add regularity term, shape (n_inds, n_dims_params)
             res['gradient'] += self._get_normalized_grad_tensor_from_grad_dict(regularity_grads, model)
 
-            # result tuple (objective, jacobian)
-            return (res['objective'].item(), res['gradient'].detach())
-
-        else:
-            # result is objective only
-            return res['objective'].item()
+        return res['objective'], res.get('gradient', None)
 
     def _get_individual_parameters_patient(self, model, times, values, *, with_jac: bool, patient_id=None):
         """
@@ -408,21 +461,31 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         err_f = self._get_reconstruction_error(model, times, values, individual_params_f)
 
         if not res.success and self.logger:
-            # log full results if optimization failed
-            # including mean of reconstruction error for this suject on all his personalization visits, but per feature
-            res['reconstruction_mae'] = torch_nanmean(err_f.abs(), dim=0)
-            res['reconstruction_rmse'] = torch_nanmean(err_f ** 2, dim=0) ** .5
-            res['individual_parameters'] = individual_params_f
-
-            cvg_issue = self.format_convergence_issues.format(
-                patient_id=patient_id,
-                optimization_result_obj=res,
-                optimization_result_pformat=pformat(res, indent=1),
-            )
-            self.logger(cvg_issue)
+            self._log_convergence_issue(res, model, times, values, individual_params_f,
+                                        patient_id=patient_id, err_f=err_f)
 
         return individual_params_f, err_f
 
+    def _log_convergence_issue(self, res, model, times, values, individual_params_f, *, patient_id=None, err_f=None):
+        """
+        Log full results of a failed optimization for a patient (with :attr:`logger`).
+
+        Including mean of reconstruction error for this subject on all his personalization visits, but per feature.
+        """
+        if err_f is None:
+            err_f = self._get_reconstruction_error(model, times, values, individual_params_f)
+
+        res['reconstruction_mae'] = torch_nanmean(err_f.abs(), dim=0)
+        res['reconstruction_rmse'] = torch_nanmean(err_f ** 2, dim=0) ** .5
+        res['individual_parameters'] = individual_params_f
+
+        cvg_issue = self.format_convergence_issues.format(
+            patient_id=patient_id,
+            optimization_result_obj=res,
+            optimization_result_pformat=pformat(res, indent=1),
+        )
+        self.logger(cvg_issue)
+
     def _get_individual_parameters_patient_master(self, it, data, model, *, with_jac: bool, patient_id=None):
         """
         Compute individual parameters of all patients given a leaspy model & a leaspy dataset.
@@ -469,6 +532,168 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
         except NotImplementedError:
             return False
 
+    def _get_batched_times_and_values(self, model, dataset):
+        """
+        Get padded times & values of all patients of dataset, suited for a batched computation of objective.
+
+        Padded visits get the last real age of their patient (so that model computations stay finite on them)
+        and nan values (so that they never count in the objective).
+
+        Parameters
+        ----------
+        model : :class:`.AbstractModel`
+        dataset : :class:`.Dataset`
+
+        Returns
+        -------
+        times : :class:`torch.Tensor` [n_individuals, n_visits_max]
+        values : :class:`torch.Tensor` [n_individuals, n_visits_max, n_fts [, extra_dim_for_ordinal_model]]
+            With nans for missing values and padded visits.
+        """
+        n_visits = torch.tensor(dataset.n_visits_per_individual, dtype=torch.long)
+        is_padded = torch.arange(dataset.n_visits_max).unsqueeze(0) >= n_visits.unsqueeze(1)
+
+        last_times = dataset.timepoints.gather(1, (n_visits - 1).unsqueeze(1))
+        times = torch.where(is_padded, last_times, dataset.timepoints)
+
+        if getattr(model, 'is_ordinal', False):
+            values = dataset.get_one_hot_encoding(sf=model.noise_model == 'ordinal_ranking',
+                                                  ordinal_infos=model.ordinal_infos).float().clone()
+        else:
+            values = dataset.values.clone()
+        values[dataset.mask == 0, ...] = float('nan')
+
+        return times, values
+
+    def _get_individual_parameters_batched(self, model, dataset):
+        """
+        Compute individual parameters of all patients at once, with a BFGS algorithm vectorized over patients.
+
+        Objective is separable across patients, so each patient has its own BFGS state (inverse hessian approximation,
+        backtracking line-search & convergence check) but all objectives & gradients are computed in batch.
+
+        Only the `gtol` & `maxiter` options of `scipy_minimize_params` are taken into account (convergence is reached
+        when the sup-norm of gradient w.r.t. standardized parameters is below `gtol`, as in :func:`scipy.optimize.minimize`).
+
+        Parameters
+        ----------
+        model : :class:`.AbstractModel`
+            Model used to compute the group average parameters.
+        dataset : :class:`.Dataset` class object
+            Contains the individual scores.
+
+        Returns
+        -------
+        :class:`.IndividualParameters`
+            Contains the individual parameters of all patients.
+        """
+        options = self.scipy_minimize_params.get('options', {})
+        gtol = options.get('gtol', self.DEFAULT_SCIPY_MINIMIZE_PARAMS_WITH_JACOBIAN['options']['gtol'])
+        maxiter = options.get('maxiter', self.DEFAULT_SCIPY_MINIMIZE_PARAMS_WITH_JACOBIAN['options']['maxiter'])
+
+        times, values = self._get_batched_times_and_values(model, dataset)
+
+        def obj_batched(ix, x):
+            ind_params = self._pull_individual_parameters_tensorized(x, model)
+            with torch.no_grad():
+                return self._get_objective_tensorized(model, times[ix], values[ix], ind_params, with_gradient=True)
+
+        n_inds = dataset.n_individuals
+        x0 = torch.tensor(self._initialize_parameters(model), dtype=torch.float32)
+        n_dims_params = len(x0)
+        eye = torch.eye(n_dims_params)
+
+        x = x0.expand(n_inds, -1).clone()
+        f, g = obj_batched(slice(None), x)
+        H = eye.expand(n_inds, -1, -1).clone()  # inverse hessian approximations
+        nit = torch.zeros(n_inds, dtype=torch.long)
+        message = ['Optimization terminated successfully.'] * n_inds
+
+        active = g.abs().max(dim=1).values > gtol
+        for _ in range(maxiter):
+            ix = active.nonzero(as_tuple=False).squeeze(1)
+            if len(ix) == 0:
+                break
+
+            g_ix = g[ix]
+            p = -(H[ix] @ g_ix.unsqueeze(-1)).squeeze(-1)
+            slope = (p * g_ix).sum(dim=1)
+            # restart from steepest descent if direction is not a descent one
+            not_descent = ~(slope < 0)
+            if not_descent.any():
+                H[ix[not_descent]] = eye
+                p[not_descent] = -g_ix[not_descent]
+                slope[not_descent] = -(g_ix[not_descent] ** 2).sum(dim=1)
+
+            # vectorized backtracking line-search (Armijo condition)
+            step = torch.ones(len(ix))
+            f_new, g_new = torch.empty(len(ix)), torch.empty_like(g_ix)
+            searching = torch.arange(len(ix))
+            for _ in range(self._BATCHED_LINE_SEARCH_MAXITER):
+                x_try = x[ix[searching]] + step[searching].unsqueeze(1) * p[searching]
+                f_try, g_try = obj_batched(ix[searching], x_try)
+                ok = torch.isfinite(f_try) & (f_try <= f[ix[searching]] + 1e-4 * step[searching] * slope[searching])
+                f_new[searching[ok]] = f_try[ok]
+                g_new[searching[ok]] = g_try[ok]
+                searching = searching[~ok]
+                if len(searching) == 0:
+                    break
+                step[searching] *= .5
+
+            # patients for which line-search failed are stopped (as scipy does with "precision loss")
+            failed = torch.zeros(len(ix), dtype=torch.bool)
+            failed[searching] = True
+            for i in ix[failed].tolist():
+                message[i] = 'Desired error not necessarily achieved due to precision loss.'
+            active[ix[failed]] = False
+
+            # BFGS update for the others
+            ok = ~failed
+            ix, step, p, g_ix, f_new, g_new = ix[ok], step[ok], p[ok], g_ix[ok], f_new[ok], g_new[ok]
+            s = step.unsqueeze(1) * p
+            y = g_new - g_ix
+            x[ix] += s
+            f[ix] = f_new
+            g[ix] = g_new
+            nit[ix] += 1
+
+            sy = (s * y).sum(dim=1)
+            upd = sy > 1e-10
+            if upd.any():
+                s, y, rho, H_ix = s[upd], y[upd], 1. / sy[upd], H[ix[upd]]
+                A = eye - rho[:, None, None] * s.unsqueeze(2) * y.unsqueeze(1)
+                H[ix[upd]] = A @ H_ix @ A.transpose(1, 2) + rho[:, None, None] * s.unsqueeze(2) * s.unsqueeze(1)
+
+            active[ix] = g_new.abs().max(dim=1).values > gtol
+
+        for i in active.nonzero(as_tuple=False).squeeze(1).tolist():
+            message[i] = 'Maximum number of iterations has been exceeded.'
+        not_converged = g.abs().max(dim=1).values > gtol
+
+        individual_params_all = self._pull_individual_parameters_tensorized(x, model)
+
+        if self.logger:
+            for i in not_converged.nonzero(as_tuple=False).squeeze(1).tolist():
+                res = OptimizeResult(x=x[i].numpy(), fun=f[i].item(), jac=g[i].numpy(), hess_inv=H[i].numpy(),
+                                     nit=nit[i].item(), success=False, message=message[i])
+                individual_params_f = {k: v[[i]] for k, v in individual_params_all.items()}
+                times_i = dataset.get_times_patient(i)
+                values_i = dataset.get_values_patient(i, adapt_for_model=model)
+                self._log_convergence_issue(res, model, times_i, values_i, individual_params_f,
+                                            patient_id=dataset.indices[i])
+
+        if self.algo_parameters.get('progress_bar', True):
+            self._display_progress_bar(n_inds - 1, n_inds, suffix='subjects')
+
+        individual_parameters = IndividualParameters()
+        for i, id_pat in enumerate(dataset.indices):
+            # transformation is needed because of IndividualParameters expectations...
+            ind_params_pat = {k: v[i].item() if k != 'sources' else v[i].tolist()
+                              for k, v in individual_params_all.items()}
+            individual_parameters.add_individual_parameters(str(id_pat), ind_params_pat)
+
+        return individual_parameters
+
     def _get_individual_parameters(self, model, dataset):
         """
         Compute individual parameters of all patients given a leaspy model & a leaspy dataset.
@@ -502,6 +727,12 @@ class ScipyMinimize(AbstractPersonalizeAlgo):
                 self.scipy_minimize_params = self.DEFAULT_SCIPY_MINIMIZE_PARAMS_WITHOUT_JACOBIAN
             # TODO? change default logger as well?
 
+        if self.algo_parameters.get('batched', False):
+            if with_jac:
+                return self._get_individual_parameters_batched(model, dataset)
+            warnings.warn('In `scipy_minimize` you requested `batched=True` but it requires the jacobian of model. '
+                          'Falling back to the personalization of subjects one by one...')
+
         ind_p_all = Parallel(n_jobs=self.algo_parameters['n_jobs'])(
             delayed(self._get_individual_parameters_patient_master)(it_pat, dataset, model, with_jac=with_jac, patient_id=id_pat)
             for it_pat, id_pat in enumerate(dataset.indices)
@@ -1,9 +1,15 @@
 from __future__ import annotations
+import os
 from typing import TYPE_CHECKING
 from collections.abc import Sized, Callable
 from dataclasses import dataclass
+from functools import partial
+from glob import glob
+from importlib.util import find_spec
+from itertools import chain, compress
 
 import numpy as np
+import pandas as pd
 import torch
 from scipy import stats
 from sklearn.preprocessing import StandardScaler
@@ -48,6 +54,7 @@ class SimulationAlgorithm(AbstractAlgo):
             * `prefix`
             * `features_bounds`
             * `features_bounds_nb_subjects_factor`
+            * `output_path`, `output_format`, `output_chunk_size`
 
     Attributes
     ----------
@@ -81,6 +88,8 @@ class SimulationAlgorithm(AbstractAlgo):
     features_bounds_nb_subjects_factor : float > 1 (default 10)
         Only used if `features_bounds` is not False.
         The ratio of simulated subjects (> 1) so that there is at least `number_of_subjects` that comply to features bounds constraint.
+        If there are not enough of them, extra subjects are simulated by chunks (sized from the observed ratio
+        of subjects in bounds, and never bigger than this first chunk) until there are.
     mean_number_of_visits : int or float (default 6)
         Average number of visits of the simulated patients.
         Examples - choose 5 => in average, a simulated patient will have 5 visits.
@@ -110,6 +119,18 @@ class SimulationAlgorithm(AbstractAlgo):
             (or use 'model', which is the same in this case since there are no scaling parameter for ordinal noise)
     number_of_subjects : int > 0
         Number of subject to simulate.
+    output_path : str, optional (default None)
+        If set, the simulated subjects are not returned but written, chunk by chunk, in this folder (created if needed)
+        so that memory used does not depend on `number_of_subjects` (streaming mode):
+            * with `output_format` = ``'csv'``: ``simulated_data.csv`` (ID, TIME & features)
+              and ``simulated_individual_parameters.csv`` (ID & individual parameters)
+            * with `output_format` = ``'parquet'``: ``simulated_data`` and ``simulated_individual_parameters`` sub-folders,
+              with one ``part-xxxxx.parquet`` file per chunk (can be read at once with :func:`pandas.read_parquet`).
+        Existing outputs are overwritten.
+    output_format : str in {'csv', 'parquet'} (default 'csv')
+        Only used if `output_path` is set. Format of files written (parquet format needs `pyarrow` or `fastparquet`).
+    output_chunk_size : int > 0 (default 10000)
+        Only used if `output_path` is set. Number of subjects simulated and written at once.
     reparametrized_age_bounds : tuple[float, float], optional (default None)
         Define the minimum and maximum reparametrized ages of subjects included in the kernel estimation. See Notes section.
         Example: reparametrized_age_bounds = (65, 70)
@@ -165,6 +186,10 @@ class SimulationAlgorithm(AbstractAlgo):
         self.features_bounds = settings.parameters['features_bounds']
         self.features_bounds_nb_subjects_factor = settings.parameters['features_bounds_nb_subjects_factor']
 
+        self.output_path = settings.parameters['output_path']
+        self.output_format = settings.parameters['output_format']
+        self.output_chunk_size = settings.parameters['output_chunk_size']
+
         self.mean_number_of_visits = settings.parameters['mean_number_of_visits']
         self.std_number_of_visits = settings.parameters['std_number_of_visits']
         self.min_number_of_visits = settings.parameters['min_number_of_visits']
@@ -289,6 +314,20 @@ class SimulationAlgorithm(AbstractAlgo):
             if len(self.cofactor) != len(self.cofactor_state):
                 raise LeaspyAlgoInputError("`cofactor` and `cofactor_state` should have equal length (exactly 1 state per cofactor)")
 
+    def _validate_output_parameters(self):
+
+        self._validate_parameter_has_type('output_path', str, 'a string')
+        self._validate_parameter_has_type('output_chunk_size', int, 'an integer')
+
+        if self.output_chunk_size < 1:
+            raise LeaspyAlgoInputError('The "output_chunk_size" should be >= 1')
+
+        if self.output_format not in ('csv', 'parquet'):
+            raise LeaspyAlgoInputError('The "output_format" parameter must be "csv" or "parquet"!')
+
+        if self.output_format == 'parquet' and not any(find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+            raise LeaspyAlgoInputError('Writing simulated subjects in "parquet" format requires `pyarrow` or `fastparquet` package.')
+
     def _validate_algo_parameters(self):
 
         # complex checks in separate methods for clarity
@@ -306,6 +345,9 @@ class SimulationAlgorithm(AbstractAlgo):
         if self.features_bounds_nb_subjects_factor <= 1:
             raise LeaspyAlgoInputError('The "features_bounds_nb_subjects_factor" parameter should be > 1 so to simulate extra subjects to be filtered out.')
 
+        if self.output_path is not None:
+            self._validate_output_parameters()
+
         if self.sources_method not in ("full_kde", "normal_sources"):
             raise LeaspyAlgoInputError('The "sources_method" parameter must be "full_kde" or "normal_sources"!')
 
@@ -380,16 +422,19 @@ class SimulationAlgorithm(AbstractAlgo):
         """
         Simulate individual sources given baseline age bl, time-shift tau, log-acceleration xi & sources dimension.
 
+        The sources are sampled from the Gaussian distribution of sources conditioned on (bl, tau, xi),
+        all subjects at once (the conditional covariance is shared by all subjects).
+
         Parameters
         ----------
-        bl : float
-            Baseline age of the simulated patient.
-        tau : float
-            Time-shift of the simulated patient.
-        xi : float
-            Log-acceleration of the simulated patient.
+        bl : float or array-like[float], shape = (n_subjects,)
+            Baseline age of the simulated patients.
+        tau : float or array-like[float], shape = (n_subjects,)
+            Time-shift of the simulated patients.
+        xi : float or array-like[float], shape = (n_subjects,)
+            Log-acceleration of the simulated patients.
         source_dimension : int
-            Sources' dimension of the simulated patient.
+            Sources' dimension of the simulated patients.
         df_mean : :class:`torch.Tensor`, shape = (n_individual_parameters,)
             Mean values per individual parameter type (bl_mean, tau_mean, xi_mean & sources_means) (1-dimensional).
         df_cov : :class:`torch.Tensor`, shape = (n_individual_parameters, n_individual_parameters)
@@ -398,20 +443,25 @@ class SimulationAlgorithm(AbstractAlgo):
         Returns
         -------
         :class:`torch.Tensor`
-            Sources of the simulated patient, shape = (n_sources, ).
+            Sources of the simulated patients, shape = (n_subjects, n_sources), or (n_sources,) for scalar inputs.
         """
-        x_1 = torch.tensor([bl, tau, xi], dtype=torch.float32)
+        # shape = (n_subjects, 3) or (3,)
+        x_1 = torch.stack([torch.as_tensor(v, dtype=df_mean.dtype) for v in (bl, tau, xi)], dim=-1)
 
-        mu_1 = df_mean[:3].clone()
-        mu_2 = df_mean[3:].clone()
+        mu_1 = df_mean[:3]
+        mu_2 = df_mean[3:]
 
-        sigma_11 = df_cov.narrow(0, 0, 3).narrow(1, 0, 3).clone()
-        sigma_22 = df_cov.narrow(0, 3, source_dimension).narrow(1, 3, source_dimension).clone()
-        sigma_12 = df_cov.narrow(0, 3, source_dimension).narrow(1, 0, 3).clone()
+        sigma_11 = df_cov[:3, :3]
+        sigma_22 = df_cov[3:3+source_dimension, 3:3+source_dimension]
+        sigma_12 = df_cov[3:3+source_dimension, :3]
 
-        mean_cond = mu_2 + sigma_12 @ sigma_11.inverse() @ (x_1 - mu_1)
-        cov_cond = sigma_22 - sigma_12 @ sigma_11.inverse() @ sigma_12.transpose(0, -1)
+        # regression coefficients of sources on (bl, tau, xi), shape = (n_sources, 3)
+        coefs = sigma_12 @ sigma_11.inverse()
 
+        mean_cond = mu_2 + (x_1 - mu_1) @ coefs.transpose(0, 1)
+        cov_cond = sigma_22 - coefs @ sigma_12.transpose(0, 1)
+
+        # one sample per row of `mean_cond`
         return torch.distributions.multivariate_normal.MultivariateNormal(mean_cond, cov_cond).sample()
 
     def _get_number_of_visits(self) -> int:
@@ -637,15 +687,11 @@ class SimulationAlgorithm(AbstractAlgo):
                 assert df_mean is not None
                 assert df_cov is not None
 
-                # Generate sources
-                def simulate_sources(x: np.ndarray) -> np.ndarray:
-                    return self._sample_sources(x[0], x[1], x[2], model.source_dimension, df_mean, df_cov).cpu().numpy()
-
-                # sources is np.ndarray of shape (n_subjects, n_sources)
-                sources = np.apply_along_axis(simulate_sources, axis=1, arr=samples)
+                # Generate sources of all subjects at once - shape (n_subjects, n_sources)
+                sources = self._sample_sources(samples[:, 0], samples[:, 1], samples[:, 2],
+                                               model.source_dimension, df_mean, df_cov)
 
-            # torch.tensor
-            simulated_parameters['sources'] = torch.from_numpy(sources)
+            simulated_parameters['sources'] = torch.as_tensor(sources)
 
         return _SimulatedSubjects(simulated_parameters, timepoints)
 
@@ -669,13 +715,24 @@ class SimulationAlgorithm(AbstractAlgo):
             Contains the scores of all the subjects for all their visits.
             One entry per subject, each of them is a 2D `torch.Tensor` of shape (n_visits, n_features).
         """
+        # mean values of all visits of all subjects are computed at once, in a packed layout (one row per visit,
+        # with the individual parameters of its subject), so that no computation is wasted on padded visits
+        n_visits_per_subject = [len(tpts) for tpts in subjects.timepoints]
+        visits_subject_index = torch.repeat_interleave(torch.arange(subjects.n), torch.tensor(n_visits_per_subject, dtype=torch.long))
+        visits_timepoints = torch.tensor(list(chain.from_iterable(subjects.timepoints)), dtype=torch.float32).unsqueeze(-1)
+
+        # checks on individual parameters (all subjects at once)
+        ips = model.tensorize_individual_parameters(subjects.individual_parameters)
+        visits_ips = {k: v[visits_subject_index] for k, v in ips.items()}
+
+        mean_observations = model.compute_individual_tensorized(visits_timepoints, visits_ips)
+
         features_values = []
-        # TODO : parallelize this for loop on individuals
-        for i in range(subjects.n):
-            indiv_param = {key: val[[i], :] for key, val in subjects.individual_parameters.items()}
-            mean_observations = model.compute_individual_trajectory(subjects.timepoints[i], indiv_param)
+        # <!> noise is still sampled subject after subject, on their (1, n_visits_i, n_features) mean values,
+        # so that the random stream is drawn in the same order (reproducibility of seeded simulations)
+        for subject_mean_observations in mean_observations.split(n_visits_per_subject):
             # Sample observations as realizations of the noise model
-            observations = noise_model.sample_around(mean_observations)
+            observations = noise_model.sample_around(subject_mean_observations.transpose(0, 1))
             # Clip in 0-1 for logistic models (could be out because of noise!), except for ordinal case
             if 'logistic' in model.name and not getattr(model, 'is_ordinal', False):
                 observations = observations.clamp(0, 1)
@@ -686,9 +743,9 @@ class SimulationAlgorithm(AbstractAlgo):
         return features_values
 
     @staticmethod
-    def _get_subjects_in_features_bounds(features_values: List[torch.Tensor], features_min: torch.Tensor, features_max: torch.Tensor):
+    def _get_subjects_in_features_bounds(features_values: List[torch.Tensor], features_min: torch.Tensor, features_max: torch.Tensor) -> torch.BoolTensor:
         """
-        Select the subject whose scores are within the features boundaries.
+        Select the subject whose baseline scores are within the features boundaries.
 
         Parameters
         ----------
@@ -700,53 +757,130 @@ class SimulationAlgorithm(AbstractAlgo):
 
         Returns
         -------
-        list [int]
-            Indices of accepted simulated subjects
+        :class:`torch.BoolTensor`, shape = (n_subjects,)
+            Mask of accepted simulated subjects
+        """
+        baseline_scores = torch.stack([scores[0] for scores in features_values])
+        return ((features_min <= baseline_scores) & (baseline_scores <= features_max)).all(dim=1)
+
+    def _simulate_subjects_in_features_bounds(self, simulate_subjects: Callable[[int], _SimulatedSubjects], n_target: int, *,
+                                              features_min: torch.Tensor, features_max: torch.Tensor) -> _SimulatedSubjects:
         """
+        Simulate subjects, by chunks, until `n_target` of them have their baseline scores within the features bounds.
 
-        def _test_subject(bl_scores: torch.Tensor, features_min: torch.Tensor, features_max: torch.Tensor) -> bool:
-            return ((features_min <= bl_scores) & (bl_scores <= features_max)).all()
+        The first chunk contains `n_target` x `features_bounds_nb_subjects_factor` subjects; the following ones
+        are sized from the acceptance ratio observed so far (never bigger than the first chunk).
 
-        baseline_scores = torch.stack([scores[0] for scores in features_values])
-        indices_of_accepted_simulated_subjects = [i for i, bl_scores in enumerate(baseline_scores)
-                                                  if _test_subject(bl_scores, features_min, features_max)]
-        return indices_of_accepted_simulated_subjects
+        Parameters
+        ----------
+        simulate_subjects : callable int -> _SimulatedSubjects
+            Function to simulate the given number of subjects (individual parameters, timepoints and values).
+        n_target : int
+            Number of subjects to simulate within features bounds.
+        features_min, features_max : :class:`torch.Tensor`
+            Lowest (resp. highest) score allowed per feature - sorted accordingly to the features in ``data.headers``.
+
+        Returns
+        -------
+        _SimulatedSubjects
+            The `n_target` first simulated subjects that are within the features bounds.
+
+        Raises
+        ------
+        :exc:`.LeaspyAlgoInputError`
+            If no subject at all was within the features bounds in the first chunk.
+        """
+        max_chunk_size = int(np.ceil(n_target * self.features_bounds_nb_subjects_factor))
+        chunk_size = max_chunk_size
+        n_simulated = 0
+        accepted_chunks = []
+
+        while True:
+            chunk = simulate_subjects(chunk_size)
+            # Test the conditions & filter subjects with features' scores outside the bounds.
+            accepted_chunks.append(chunk.select(self._get_subjects_in_features_bounds(chunk.values, features_min, features_max)))
+            n_simulated += chunk.n
+
+            n_accepted = sum(c.n for c in accepted_chunks)
+            if n_accepted >= n_target:
+                break
+            if n_accepted == 0:
+                raise LeaspyAlgoInputError(f'Your features bounds are too stringent: none of the {n_simulated} simulated subjects '
+                        'were in bounds. Please remove `features_bounds` or increase `features_bounds_nb_subjects_factor` to simulate more subjects.')
+
+            # Oversample (by 20%) the number of subjects that are expected to be needed given the observed acceptance ratio
+            ratio_accepted = n_accepted / n_simulated
+            chunk_size = min(max_chunk_size, int(np.ceil(1.2 * (n_target - n_accepted) / ratio_accepted)))
+
+        # Take only the `n_target` first generated subjects
+        return _SimulatedSubjects.concatenate(accepted_chunks).select(slice(n_target))
+
+    def _simulate_subjects(self, n: int, model: AbstractModel, kernel, ss, df_mean, df_cov,
+                           noise_model: NoiseModel, *, get_sources: bool) -> _SimulatedSubjects:
+        """
+        Simulate `n` subjects: their individual parameters, timepoints and features' scores.
 
-    def _subselect_individuals_in_features_bounds(self, subjects: _SimulatedSubjects, data: Data, n_target: int) -> float:
-        # <!> in-place
+        Refer to :meth:`._simulate_individual_parameters` and :meth:`._simulate_subjects_values` for parameters.
 
-        # Fetch bounds on the features
-        features_min, features_max = self._get_features_bounds(data)
+        Returns
+        -------
+        _SimulatedSubjects
+        """
+        subjects = self._simulate_individual_parameters(model, n, kernel, ss, df_mean, df_cov, get_sources=get_sources)
+        subjects.values = self._simulate_subjects_values(subjects, model, noise_model)
+        return subjects
 
-        # Population before filtering
-        n_before = subjects.n
+    def _get_simulated_subjects_indices(self, start: int, end: int) -> List[str]:
+        """
+        Get the identifiers of simulated subjects, given their (0-based) range ``start:end``.
 
-        #  Test the  conditions & filter subjects with features' scores outside the bounds.
-        indices_of_accepted_subjects = self._get_subjects_in_features_bounds(subjects.values, features_min, features_max)
+        Ex - for 10 subjects, indices = ["Generated_subject_01", "Generated_subject_02", ..., "Generated_subject_10"]
+        """
+        len_subj_id = len(str(self.number_of_subjects))
+        return [self.prefix + str(i).rjust(len_subj_id, '0') for i in range(start + 1, end + 1)]
 
-        for key, val in subjects.individual_parameters.items():
-            subjects.individual_parameters[key] = val[indices_of_accepted_subjects, :]
-        subjects.timepoints = [v for i, v in enumerate(subjects.timepoints)
-                               if i in indices_of_accepted_subjects]
-        subjects.values = [v for i, v in enumerate(subjects.values)
-                           if i in indices_of_accepted_subjects]
+    def _write_dataframe_chunk(self, df: pd.DataFrame, name: str, i_chunk: int) -> None:
+        """
+        Write a chunk of simulated subjects (dataframe indexed by ID) in the output folder.
 
-        # Compute the ratio of selected subjects
-        ratio_selected = subjects.n / n_before
+        The first chunk overwrites existing outputs, the following ones are appended.
+        """
+        if self.output_format == 'csv':
+            first_chunk = i_chunk == 0
+            df.to_csv(os.path.join(self.output_path, f'{name}.csv'), mode='w' if first_chunk else 'a', header=first_chunk)
+        else:
+            # one parquet file per chunk
+            folder = os.path.join(self.output_path, name)
+            if i_chunk == 0:
+                os.makedirs(folder, exist_ok=True)
+                # remove parts of a previous simulation
+                for f in glob(os.path.join(folder, 'part-*.parquet')):
+                    os.remove(f)
+            df.to_parquet(os.path.join(folder, f'part-{i_chunk:05d}.parquet'))
+
+    def _write_simulated_subjects_by_chunks(self, simulate_subjects: Callable[[int], _SimulatedSubjects], *,
+                                            headers: List[str]) -> None:
+        """
+        Simulate `number_of_subjects` subjects by chunks of `output_chunk_size` subjects, and write each chunk
+        (simulated data & individual parameters) in `output_path` before simulating the next one.
 
-        # If not enough subjects after filtering raise
-        if subjects.n < n_target:
-            raise LeaspyAlgoInputError(f'Your features bounds are too stringent: only {subjects.n}/{n_target} ({ratio_selected:.1%} subjects '
-                    'were in bounds. Please remove `features_bounds` or increase `features_bounds_nb_subjects_factor` to simulate more subjects.')
+        Parameters
+        ----------
+        simulate_subjects : callable int -> _SimulatedSubjects
+            Function to simulate the given number of subjects (individual parameters, timepoints and values).
+        headers : list[str]
+            Features names.
+        """
+        os.makedirs(self.output_path, exist_ok=True)
 
-        # --------- Take only the `n_target` first generated subjects
-        # Needed because of feature_bounds trick...
-        subjects.values = subjects.values[:n_target]
-        subjects.timepoints = subjects.timepoints[:n_target]
-        for key, val in subjects.individual_parameters.items():
-            subjects.individual_parameters[key] = val[:n_target, :]
+        n_target = self.number_of_subjects
+        for i_chunk, start in enumerate(range(0, n_target, self.output_chunk_size)):
+            end = min(start + self.output_chunk_size, n_target)
+            subjects = simulate_subjects(end - start)
+            indices = self._get_simulated_subjects_indices(start, end)
 
-        return ratio_selected
+            self._write_dataframe_chunk(subjects.get_dataframe_data(indices, headers), 'simulated_data', i_chunk)
+            self._write_dataframe_chunk(subjects.get_dataframe_individual_parameters(indices), 'simulated_individual_parameters', i_chunk)
 
     def run_impl(self, model: AbstractModel, individual_parameters: IndividualParameters, data: Data) -> Tuple[Result, Optional[torch.FloatTensor]]:
         """
@@ -768,8 +902,9 @@ class SimulationAlgorithm(AbstractAlgo):
 
         Returns
         -------
-        :class:`~.io.outputs.result.Result`
+        :class:`~.io.outputs.result.Result` or None
             Contains the simulated individual parameters & individual scores.
+            None in streaming mode (i.e. when `output_path` is set), since they were written on disk.
 
         Notes
         -----
@@ -842,33 +977,34 @@ class SimulationAlgorithm(AbstractAlgo):
         # --------- Simulate new subjects - individual parameters, timepoints and features' scores
         n_target = self.number_of_subjects  # target number of simulated subjects
 
-        # ~Trick: Simulate more subjects in order to have enough of them after filtering that respect features bounds
-        number_of_simulated_subjects = self.number_of_subjects
+        simulate_subjects = partial(self._simulate_subjects, model=model, kernel=kernel, ss=ss, df_mean=df_mean, df_cov=df_cov,
+                                    noise_model=noise_model, get_sources=get_sources)
+
         if self.features_bounds:
-            number_of_simulated_subjects *= self.features_bounds_nb_subjects_factor
+            # --------- If one wants to constrain baseline scores of generated subjects
+            # ~Trick: Simulate more subjects in order to have enough of them after filtering that respect features bounds
+            features_min, features_max = self._get_features_bounds(data)
+            simulate_subjects = partial(self._simulate_subjects_in_features_bounds, simulate_subjects,
+                                        features_min=features_min, features_max=features_max)
 
-        simulated_subjects = self._simulate_individual_parameters(
-            model, number_of_simulated_subjects, kernel, ss, df_mean, df_cov, get_sources=get_sources)
+        # Output of simulation algorithm
+        noise_std_used = noise_model.scale  # will be not None iff Gaussian noise model
 
-        simulated_subjects.values = self._simulate_subjects_values(simulated_subjects, model, noise_model)
+        if self.output_path is not None:
+            # --------- Streaming mode: subjects are simulated and written chunk by chunk (nothing is returned)
+            self._write_simulated_subjects_by_chunks(simulate_subjects, headers=data.headers)
+            return (None, noise_std_used)
 
-        # --------- If one wants to constrain baseline scores of generated subjects
-        if self.features_bounds:
-            self._subselect_individuals_in_features_bounds(simulated_subjects, data, n_target)
+        simulated_subjects = simulate_subjects(n_target)
 
         # --------- Generate results object
-        # Ex - for 10 subjects, indices = ["Generated_subject_01", "Generated_subject_02", ..., "Generated_subject_10"]
-        len_subj_id = len(str(n_target))
-        indices = [self.prefix + str(i).rjust(len_subj_id, '0') for i in range(1, n_target + 1)]
+        indices = self._get_simulated_subjects_indices(0, n_target)
 
         simulated_data = Data.from_individual_values(indices=indices,
                                                      timepoints=simulated_subjects.timepoints,
                                                      values=[ind_obs.tolist() for ind_obs in simulated_subjects.values],
                                                      headers=data.headers)
 
-        # Output of simulation algorithm
-        noise_std_used = noise_model.scale  # will be not None iff Gaussian noise model
-
         result_obj = Result(data=simulated_data,
                             individual_parameters=simulated_subjects.individual_parameters,
                             noise_std=noise_std_used)
@@ -899,3 +1035,97 @@ class _SimulatedSubjects:
     def n(self) -> int:
         """Number of subjects."""
         return len(self.timepoints)
+
+    def select(self, indices) -> _SimulatedSubjects:
+        """
+        Sub-select subjects (new object, tensors of individual parameters are not copied if possible).
+
+        Parameters
+        ----------
+        indices : :class:`torch.BoolTensor` (mask of subjects) or slice
+            The subjects to select.
+
+        Returns
+        -------
+        _SimulatedSubjects
+        """
+        if isinstance(indices, slice):
+            select_list = lambda l: None if l is None else l[indices]
+        else:
+            mask = indices.tolist()
+            select_list = lambda l: None if l is None else list(compress(l, mask))
+
+        return _SimulatedSubjects(
+            individual_parameters={k: v[indices] for k, v in self.individual_parameters.items()},
+            timepoints=select_list(self.timepoints),
+            values=select_list(self.values),
+        )
+
+    def get_dataframe_data(self, indices: List[str], headers: List[str]) -> pd.DataFrame:
+        """
+        Simulated scores of subjects, as a dataframe indexed by (ID, TIME) with one column per feature.
+
+        Parameters
+        ----------
+        indices : list[str]
+            Identifiers of subjects.
+        headers : list[str]
+            Features names.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+        """
+        n_visits_per_subject = [len(tpts) for tpts in self.timepoints]
+        df = pd.DataFrame(torch.cat(self.values).numpy(), columns=headers)
+        df.insert(0, 'ID', np.repeat(indices, n_visits_per_subject))
+        df.insert(1, 'TIME', np.fromiter(chain.from_iterable(self.timepoints), dtype=float, count=sum(n_visits_per_subject)))
+        return df.set_index(['ID', 'TIME'])
+
+    def get_dataframe_individual_parameters(self, indices: List[str]) -> pd.DataFrame:
+        """
+        Simulated individual parameters of subjects, as a dataframe indexed by ID
+        (one column per individual parameter, named as in :meth:`.Result.get_dataframe_individual_parameters`).
+
+        Parameters
+        ----------
+        indices : list[str]
+            Identifiers of subjects.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+        """
+        columns = {}
+        for ip_name, ip_vals in self.individual_parameters.items():
+            if ip_vals.shape[1] == 1:
+                columns[ip_name] = ip_vals[:, 0].numpy()
+            else:
+                for dim in range(ip_vals.shape[1]):
+                    columns[f'{ip_name}_{dim}'] = ip_vals[:, dim].numpy()
+
+        return pd.DataFrame(columns, index=pd.Index(indices, name='ID'))
+
+    @staticmethod
+    def concatenate(subjects_list: List[_SimulatedSubjects]) -> _SimulatedSubjects:
+        """
+        Concatenate several groups of simulated subjects (with same individual parameters), in order.
+
+        Parameters
+        ----------
+        subjects_list : list[_SimulatedSubjects]
+            Non-empty list of simulated subjects.
+
+        Returns
+        -------
+        _SimulatedSubjects
+        """
+        if len(subjects_list) == 1:
+            return subjects_list[0]
+
+        return _SimulatedSubjects(
+            individual_parameters={k: torch.cat([s.individual_parameters[k] for s in subjects_list])
+                                   for k in subjects_list[0].individual_parameters},
+            timepoints=list(chain.from_iterable(s.timepoints for s in subjects_list)),
+            values=list(chain.from_iterable(s.values for s in subjects_list)),
+        )
@@ -0,0 +1,306 @@
+from abc import ABC, abstractmethod
+
+import torch
+
+from leaspy.exceptions import LeaspyAlgoInputError
+from leaspy.utils.typing import DictParamsTorch, KwargsType, Optional, Tuple
+
+
+class AbstractConvergenceCriterion(ABC):
+    """
+    Convergence criterion on the traces of (flattened) model parameters, updated at each iteration.
+
+    Only the last `window` values of traces are kept, in a pre-allocated ring buffer.
+
+    Parameters
+    ----------
+    window : int > 1
+        Number of iterations of the window of traces on which convergence is assessed.
+
+    Attributes
+    ----------
+    name : str
+        Name of the criterion (in algorithm settings).
+    settings_keys : tuple[str, ...]
+        Keys of `convergence` algorithm settings that are parameters of the criterion.
+    """
+
+    name: str = None
+    settings_keys: Tuple[str, ...] = ()
+
+    def __init__(self, window: int):
+        if not (isinstance(window, int) and window > 1):
+            raise LeaspyAlgoInputError(f"The `convergence.window` should be an integer > 1, not {window}.")
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all the traces seen so far."""
+        self._buffer: torch.Tensor = None
+        self._n_seen: int = 0
+
+    def state_dict(self) -> KwargsType:
+        """
+        Get the state of the criterion (e.g. to checkpoint an algorithm).
+
+        Returns
+        -------
+        dict[str, Any]
+        """
+        return {'buffer': None if self._buffer is None else self._buffer.clone(), 'n_seen': self._n_seen}
+
+    def load_state_dict(self, state: KwargsType) -> None:
+        """
+        Restore the state of the criterion, as returned by :meth:`.state_dict`.
+
+        Parameters
+        ----------
+        state : dict[str, Any]
+        """
+        self._buffer = None if state['buffer'] is None else state['buffer'].clone()
+        self._n_seen = state['n_seen']
+
+    @staticmethod
+    def _flatten_parameters(parameters: DictParamsTorch) -> torch.Tensor:
+        return torch.cat([torch.as_tensor(v, dtype=torch.float64).detach().reshape(-1).cpu()
+                          for v in parameters.values()])
+
+    def update(self, parameters: DictParamsTorch) -> bool:
+        """
+        Append the current model parameters to traces and check convergence.
+
+        Parameters
+        ----------
+        parameters : dict[str, `torch.Tensor`]
+            Current model parameters.
+
+        Returns
+        -------
+        bool
+            Whether convergence is reached (always False until the window is complete).
+        """
+        values = self._flatten_parameters(parameters)
+        if self._buffer is None:
+            self._buffer = values.new_empty((self.window, len(values)))
+        self._buffer[self._n_seen % self.window] = values
+        self._n_seen += 1
+
+        if self._n_seen < self.window:
+            return False
+
+        # chronological order of the traces in window
+        traces = torch.roll(self._buffer, -(self._n_seen % self.window), dims=0)
+        return self._is_converged(traces)
+
+    @abstractmethod
+    def _is_converged(self, traces: torch.Tensor) -> bool:
+        """Whether convergence is reached given the (chronological) traces of shape (window, n_flattened_parameters)."""
+
+
+class RelativeChangeConvergenceCriterion(AbstractConvergenceCriterion):
+    """
+    Convergence when the mean of traces on the last half of window did not move (relatively) from the first half.
+
+    Convergence is reached when, for all model parameters: ``|mean_2 - mean_1| <= atol + rtol * |mean_1|``.
+
+    Parameters
+    ----------
+    window : int > 1
+        Number of iterations of the window of traces (split in 2 halves).
+    rtol : float >= 0
+        Relative tolerance on the change of the mean of traces.
+    atol : float >= 0
+        Absolute tolerance on the change of the mean of traces (for parameters close to 0).
+    """
+
+    name = 'relative_change'
+    settings_keys = ('window', 'rtol', 'atol')
+
+    def __init__(self, window: int, rtol: float = 1e-3, atol: float = 1e-5):
+        if rtol < 0 or atol < 0:
+            raise LeaspyAlgoInputError("The `convergence.rtol` and `convergence.atol` should be non-negative.")
+        self.rtol = rtol
+        self.atol = atol
+        super().__init__(window)
+
+    def _is_converged(self, traces):
+        half = self.window // 2
+        mean_1, mean_2 = traces[:half].mean(dim=0), traces[-half:].mean(dim=0)
+        return bool(((mean_2 - mean_1).abs() <= self.atol + self.rtol * mean_1.abs()).all())
+
+
+class GewekeConvergenceCriterion(AbstractConvergenceCriterion):
+    """
+    Geweke-style convergence diagnostic on the traces of model parameters.
+
+    The means of traces on the first `first_frac` and on the last `last_frac` of window are compared with a z-score;
+    convergence is reached when ``|z| < z_threshold`` for all model parameters.
+
+    Variances of these means are estimated with batch means (instead of spectral densities at zero as in the
+    original diagnostic), so to account for the auto-correlation of traces.
+
+    Parameters
+    ----------
+    window : int > 1
+        Number of iterations of the window of traces.
+    z_threshold : float > 0
+        Threshold on absolute z-scores.
+    first_frac : float in ]0, 1[
+        Fraction of window at its beginning.
+    last_frac : float in ]0, 1[
+        Fraction of window at its end (`first_frac + last_frac` should be <= 1).
+    n_batches : int > 1
+        Number of batches (in both parts of window) to estimate variances of means.
+    """
+
+    name = 'geweke'
+    settings_keys = ('window', 'z_threshold')
+
+    def __init__(self, window: int, z_threshold: float = 2., first_frac: float = 0.1, last_frac: float = 0.5,
+                 n_batches: int = 5):
+        if z_threshold <= 0:
+            raise LeaspyAlgoInputError(f"The `convergence.z_threshold` should be positive, not {z_threshold}.")
+        if not (0 < first_frac < 1 and 0 < last_frac < 1 and first_frac + last_frac <= 1):
+            raise LeaspyAlgoInputError("Fractions of window for Geweke diagnostic should be in ]0, 1[ and sum to <= 1.")
+        if int(first_frac * window) < 2 * n_batches:
+            raise LeaspyAlgoInputError(f"The `convergence.window` is too small for Geweke diagnostic: "
+                                       f"its first part should contain at least {2 * n_batches} iterations.")
+        self.z_threshold = z_threshold
+        self.first_frac = first_frac
+        self.last_frac = last_frac
+        self.n_batches = n_batches
+        super().__init__(window)
+
+    def _mean_and_var_of_mean(self, traces: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        batch_size = len(traces) // self.n_batches
+        batch_means = traces[-batch_size * self.n_batches:].reshape(self.n_batches, batch_size, -1).mean(dim=1)
+        return batch_means.mean(dim=0), batch_means.var(dim=0) / self.n_batches
+
+    def _is_converged(self, traces):
+        mean_first, var_first = self._mean_and_var_of_mean(traces[:int(self.first_frac * self.window)])
+        mean_last, var_last = self._mean_and_var_of_mean(traces[-int(self.last_frac * self.window):])
+        mean_diff = (mean_first - mean_last).abs()
+        var_diff = var_first + var_last
+        # constant traces: converged iff same constant
+        z = torch.where(var_diff > 0, mean_diff / var_diff.clamp(min=1e-300).sqrt(),
+                        torch.where(mean_diff > 0, float('inf'), 0.))
+        return bool((z < self.z_threshold).all())
+
+
+class AlgoWithConvergenceMixin:
+    """
+    Mixin for MCMC fit algorithms that may end their burn-in phase and/or stop before `n_iter` iterations,
+    when a convergence criterion on the traces of model parameters is met; inherit from this class first.
+
+    Note that this mixin is to be used with a class inheriting from `AbstractFitAlgo` and `AlgoWithSamplersMixin`
+    (and in particular that have `algo_parameters`, `current_iteration` attributes and a `_is_burn_in` method)
+
+    Parameters
+    ----------
+    settings : :class:`.AlgorithmSettings`
+        The specifications of the algorithm as a :class:`.AlgorithmSettings` instance.
+
+        Convergence is monitored depending on `convergence` parameters:
+            * `criterion`: None (no convergence monitoring, default), 'relative_change' or 'geweke'
+            * `parameters`: names of model parameters to monitor (None for all of them, default)
+            * `window`: number of iterations on which convergence is assessed
+            * `rtol` & `atol`: tolerances of 'relative_change' criterion
+            * `z_threshold`: threshold on z-scores of 'geweke' criterion
+            * `end_burn_in`: end the burn-in phase when convergence is reached during it
+            * `stop`: stop the algorithm when convergence is reached after the burn-in phase
+
+        Convergence is never assessed while annealing temperature is above 1,
+        and traces are reset at the end of the burn-in phase.
+
+    Attributes
+    ----------
+    convergence_criterion : :class:`.AbstractConvergenceCriterion` or None
+        The convergence criterion (None if convergence is not monitored).
+    convergence_iterations : dict[str, int or None]
+        Iterations at which convergence was reached, during ('burn_in') and after ('stop') the burn-in phase.
+    """
+
+    convergence_criteria = {
+        criterion_cls.name: criterion_cls
+        for criterion_cls in (RelativeChangeConvergenceCriterion, GewekeConvergenceCriterion)
+    }
+
+    def __init__(self, settings):
+        super().__init__(settings)
+
+        self.convergence_criterion: Optional[AbstractConvergenceCriterion] = None
+        self.convergence_iterations = {'burn_in': None, 'stop': None}
+        self._convergence_monitored_burn_in: Optional[bool] = None
+
+        convergence_params = self.algo_parameters.get('convergence', {})
+        criterion_name = convergence_params.get('criterion', None)
+        if criterion_name is None:
+            return
+
+        criterion_cls = self.convergence_criteria.get(criterion_name, None)
+        if criterion_cls is None:
+            raise LeaspyAlgoInputError(f"Unknown convergence criterion '{criterion_name}', "
+                                       f"should be in {set(self.convergence_criteria)}.")
+        self.convergence_criterion = criterion_cls(**{k: convergence_params[k] for k in criterion_cls.settings_keys
+                                                      if k in convergence_params})
+
+    def _initialize_convergence(self) -> None:
+        """
+        Initialize convergence monitoring (reset traces).
+        """
+        self.convergence_iterations = {'burn_in': None, 'stop': None}
+        if self.convergence_criterion is None:
+            return
+
+        self.convergence_criterion.reset()
+        self._convergence_monitored_burn_in = None
+
+    def _check_convergence(self, model) -> bool:
+        """
+        Update the convergence criterion with current model parameters, end burn-in phase if relevant,
+        and tell whether the algorithm should stop.
+
+        Parameters
+        ----------
+        model : :class:`~.models.abstract_model.AbstractModel`
+
+        Returns
+        -------
+        bool
+            Whether the algorithm should stop now.
+        """
+        if self.convergence_criterion is None or getattr(self, 'temperature', 1.) > 1.:
+            return False
+
+        burn_in = self._is_burn_in()
+        if not self.algo_parameters['convergence'].get('end_burn_in' if burn_in else 'stop', True):
+            return False
+
+        if burn_in is not self._convergence_monitored_burn_in:
+            # traces of model parameters are not comparable during & after the burn-in phase
+            self.convergence_criterion.reset()
+            self._convergence_monitored_burn_in = burn_in
+
+        monitored_parameters = self.algo_parameters['convergence'].get('parameters', None)
+        if monitored_parameters is None:
+            parameters = model.parameters
+        else:
+            unknown_parameters = set(monitored_parameters).difference(model.parameters)
+            if unknown_parameters:
+                raise LeaspyAlgoInputError(f"Unknown model parameters to monitor convergence: {unknown_parameters}.")
+            parameters = {k: model.parameters[k] for k in monitored_parameters}
+
+        if not self.convergence_criterion.update(parameters):
+            return False
+
+        if burn_in:
+            self.convergence_iterations['burn_in'] = self.current_iteration
+            self.algo_parameters['n_burn_in_iter'] = self.current_iteration
+            if self.algo_parameters.get('progress_bar', True):
+                print(f"\nConvergence reached at iteration {self.current_iteration}: end of burn-in phase.")
+            return False
+
+        self.convergence_iterations['stop'] = self.current_iteration
+        if self.algo_parameters.get('progress_bar', True):
+            print(f"\nConvergence reached at iteration {self.current_iteration}: stopping the algorithm.")
+        return True
@@ -118,9 +118,10 @@ class AbstractSampler(ABC):
             Inverse of the temperature used in tempered MCMC-SAEM
         **attachment_computation_kws
             Optional keyword arguments for attachment computations.
-            As of now, we only use it for individual variables, and only `attribute_type`.
+            For individual variables, we only use `attribute_type`.
             It is used to know whether to compute attachments from the MCMC toolbox (esp. during fit)
             or to compute it from regular model parameters (esp. during personalization in mean/mode realization)
+            For population variables, :class:`.GibbsSampler` supports `attachment_scale` (esp. for multi-chain fit).
 
         Returns
         -------
@@ -133,6 +134,26 @@ class AbstractSampler(ABC):
         else:
             return self._sample_individual_realizations(dataset, model, realizations, temperature_inv, **attachment_computation_kws)
 
+    def state_dict(self) -> KwargsType:
+        """
+        Get the adaptive state of the sampler (e.g. to checkpoint an algorithm).
+
+        Returns
+        -------
+        dict[str, Any]
+        """
+        return {'acceptation_history': self.acceptation_history.clone()}
+
+    def load_state_dict(self, state: KwargsType) -> None:
+        """
+        Restore the adaptive state of the sampler, as returned by :meth:`.state_dict`.
+
+        Parameters
+        ----------
+        state : dict[str, Any]
+        """
+        self.acceptation_history = state['acceptation_history'].clone()
+
     @abstractmethod
     def _sample_population_realizations(self, data, model, realizations, temperature_inv, **attachment_computation_kws) -> Tuple[torch.FloatTensor, torch.FloatTensor]:
         """Sample population variables"""
@@ -112,8 +112,8 @@ class AlgoWithSamplersMixin:
             raise NotImplementedError("Only 'Gibbs' sampler is supported for individual variables for now, "
                                       "please open an issue on Gitlab if needed.")
 
-        if sampler_pop not in [None, 'Gibbs', 'FastGibbs', 'Metropolis-Hastings']:
-            raise NotImplementedError("Only 'Gibbs', 'FastGibbs' and 'Metropolis-Hastings' sampler is supported for population variables for now, "
+        if sampler_pop not in [None, 'Gibbs', 'FastGibbs', 'Metropolis-Hastings', 'BlockMetropolis']:
+            raise NotImplementedError("Only 'Gibbs', 'FastGibbs', 'Metropolis-Hastings' and 'BlockMetropolis' sampler is supported for population variables for now, "
                                       "please open an issue on Gitlab if needed.")
 
         self.samplers = {}
@@ -138,7 +138,7 @@ class AlgoWithSamplersMixin:
                 # We have priors which should be better than the variable initial value no ? model.MCMC_toolbox['priors'][f'{variable}_std']
                 scale_param = info.get('scale', model.parameters[variable].abs())
 
-                if sampler_pop in ['Gibbs', 'FastGibbs', 'Metropolis-Hastings']:
+                if sampler_pop in ['Gibbs', 'FastGibbs', 'Metropolis-Hastings', 'BlockMetropolis']:
                     self.samplers[variable] = GibbsSampler(info, dataset.n_individuals, scale=scale_param,
                                                            sampler_type=sampler_pop, **sampler_pop_kws)
                 #elif self.algo_parameters['sampler_pop'] == 'HMC':  # legacy
@@ -7,7 +7,7 @@ from numpy import ndindex
 from .abstract_sampler import AbstractSampler
 from leaspy.exceptions import LeaspyInputError
 from leaspy.utils.docs import doc_with_super
-from leaspy.utils.typing import Union, Tuple
+from leaspy.utils.typing import KwargsType, Union, Tuple, Optional
 
 
 @doc_with_super()
@@ -51,6 +51,12 @@ class GibbsSampler(AbstractSampler):
         Speeds up sampling process for 2 dimensional parameters
         If 'Metropolis-Hastings', sampling is done for all values at once.
         Speeds up considerably sampling but usually requires more iterations
+        If 'BlockMetropolis', all values are proposed at once but each block of values along the first dimension
+        is accepted or rejected independently of the others (using the attachment per feature).
+        It is only valid when the first dimension of the variable corresponds to the features and the model
+        likelihood factorizes across features for this variable (cf. :meth:`.AbstractModel.get_features_impacted_by_population_variable`);
+        otherwise we fall back to a sequential sampling of the blocks (as for 'FastGibbs').
+        Gibbs-like mixing for a single model evaluation.
         <!> Types other than 'Gibbs' are only supported for population variables for now since;
             individual variables are handled with a grouped Gibbs sampler.
     **base_sampler_kws
@@ -64,7 +70,7 @@ class GibbsSampler(AbstractSampler):
     std : torch.FloatTensor
         Adaptative std-dev of variable
     sampler_type : str
-        Sampler type : Gibbs, FastGibbs or Metropolis-Hastings
+        Sampler type : Gibbs, FastGibbs, Metropolis-Hastings or BlockMetropolis
 
     Raises
     ------
@@ -96,7 +102,7 @@ class GibbsSampler(AbstractSampler):
         if info["type"] == "population":
             # Proposition variance is adapted independently on each coordinate of the population variable by default ('Gibbs' sampler)
             shape_adapted_std = self.shape
-            if self.sampler_type == 'FastGibbs':
+            if self.sampler_type in ('FastGibbs', 'BlockMetropolis'):
                 # Proposition variance is adapted independently for each first-dimension
                 shape_adapted_std = (self.shape[0],)
             elif self.sampler_type == 'Metropolis-Hastings':
@@ -126,6 +132,10 @@ class GibbsSampler(AbstractSampler):
         # Internal counter to trigger adaptation of std based on mean acceptation rate
         self._counter: int = 0
 
+        # Whether blocks of the population variable (along first dimension) are independent in model likelihood
+        # (lazily set at first sampling, only for 'BlockMetropolis' sampler)
+        self._independent_blocks: Optional[bool] = None
+
         # Torch distribution: all modifications will be in-place on `self.std`
         # So there will be no need to update this distribution!
         # (we do not validate args since `std` may contain some zeros for masked elements)
@@ -147,6 +157,15 @@ class GibbsSampler(AbstractSampler):
             raise LeaspyInputError(f"`adaptive_std_factor` should be a float in ]0, 1[, not '{adaptive_std_factor}'")
         self._adaptive_std_factor = adaptive_std_factor
 
+    def state_dict(self) -> KwargsType:
+        return {**super().state_dict(), 'std': self.std.clone(), 'counter': self._counter}
+
+    def load_state_dict(self, state: KwargsType) -> None:
+        super().load_state_dict(state)
+        # <!> in-place since our distribution relies on `self.std`
+        self.std.copy_(state['std'])
+        self._counter = state['counter']
+
     def __str__(self):
 
         meaningful_indices = ()  # all indices are meaningful by default
@@ -199,19 +218,26 @@ class GibbsSampler(AbstractSampler):
             self.std[idx_toolow] *= (1 - self._adaptive_std_factor)
             self.std[idx_toohigh] *= (1 + self._adaptive_std_factor)
 
-    def _sample_population_realizations(self, data, model, realizations, temperature_inv, **attachment_computation_kws):
+    def _sample_population_realizations(self, data, model, realizations, temperature_inv, *,
+                                        attachment_scale: float = 1., **attachment_computation_kws):
         """
         For each dimension (1D or 2D) of the population variable, compute current attachment and regularity.
         Propose a new value for the given dimension of the given population variable,
         and compute new attachment and regularity.
         Do a MH step, keeping if better, or if worse with a probability.
 
+        The attachment is cached per individual and per feature, so that only the attachment of the features
+        impacted by the proposal (cf. :meth:`.AbstractModel.get_features_impacted_by_population_variable`) is recomputed.
+
         Parameters
         ----------
         data : :class:`.Dataset`
         model : :class:`~.models.abstract_model.AbstractModel`
         realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
         temperature_inv : float > 0
+        attachment_scale : float > 0 (default 1.)
+            Factor applied to the attachment (e.g. `1 / n_chains` when individuals are repeated once per chain,
+            so that the population variable is sampled given the mean attachment over chains).
         **attachment_computation_kws
             Currently not used for population parameters.
 
@@ -220,6 +246,16 @@ class GibbsSampler(AbstractSampler):
         attachment, regularity_var : `torch.FloatTensor` 0D (scalars)
             The attachment and regularity (only for the current variable) at the end of this sampling step (summed on all individuals).
         """
+        if self.sampler_type == 'BlockMetropolis':
+            if self._independent_blocks is None:
+                self._independent_blocks = all(
+                    model.get_features_impacted_by_population_variable(self.name, (k,)) == [k]
+                    for k in range(self.shape[0])
+                )
+            if self._independent_blocks:
+                return self._sample_population_realizations_independent_blocks(data, model, realizations, temperature_inv,
+                                                                               attachment_scale=attachment_scale)
+
         realization = realizations[self.name]
         accepted_array = torch.zeros_like(self.std)
 
@@ -245,26 +281,33 @@ class GibbsSampler(AbstractSampler):
         # since they are fixed during the sampling of this population variable!
         ind_params = model.get_param_from_real(realizations)
 
-        def compute_attachment_regularity():
+        def compute_attachment_per_ft(features=None):
             # model attributes used are the ones from the MCMC toolbox that we are currently changing!
-            attachment = model.compute_individual_attachment_tensorized(data, ind_params, attribute_type='MCMC').sum()
+            return attachment_scale * model.compute_individual_attachment_per_ft_tensorized(data, ind_params, attribute_type='MCMC',
+                                                                                            features=features)
+
+        def compute_regularity():
             # regularity is always computed with model.parameters (not "temporary MCMC parameters")
             regularity = model.compute_regularity_realization(realization)
             # mask regularity of masked terms (needed for nan/inf terms such as inf deltas when batched)
             if self.mask is not None:
                 regularity[~(self.mask.to(bool))] = 0
 
-            return attachment, regularity.sum()
+            return regularity.sum()
 
-        previous_attachment = previous_regularity = None
+        # Cache of the attachment per individual & per feature, that we only update on the features
+        # impacted by each proposal (when model can tell us so), since the other features are left unchanged.
+        # (nothing to roll back on rejection since cache is only updated when proposal is accepted)
+        attachment_per_ft = previous_regularity = None
 
         for idx in iterator_indices:
             # Compute the attachment and regularity
-            if previous_attachment is None:
-                previous_attachment, previous_regularity = compute_attachment_regularity()
+            if attachment_per_ft is None:
+                attachment_per_ft, previous_regularity = compute_attachment_per_ft(), compute_regularity()
 
-            # Keep previous realizations and sample new ones
+            # Keep previous realizations (and derived model attributes) and sample new ones
             old_val_idx = realization.tensor_realizations[idx].clone()
+            MCMC_toolbox_checkpoint = model.checkpoint_MCMC_toolbox()
             # the previous version with `_proposal` was not incorrect but computationnally inefficient:
             # because we were sampling on the full shape of `std` whereas we only needed `std[idx]` (smaller)
             change_idx = self.std[idx] * torch.randn(old_val_idx.shape)
@@ -276,34 +319,116 @@ class GibbsSampler(AbstractSampler):
             # Update derived model attributes if necessary (orthonormal basis, ...)
             model.update_MCMC_toolbox([self.name], realizations)
 
-            # Compute the attachment and regularity
-            new_attachment, new_regularity = compute_attachment_regularity()
+            # Compute the attachment (only on impacted features) and regularity
+            impacted_fts = model.get_features_impacted_by_population_variable(self.name, idx)
+            new_attachment_impacted_fts = compute_attachment_per_ft(impacted_fts)
+            previous_attachment_impacted_fts = attachment_per_ft if impacted_fts is None else attachment_per_ft[:, impacted_fts]
+            new_regularity = compute_regularity()
 
             alpha = torch.exp(-((new_regularity - previous_regularity) * temperature_inv +
-                                (new_attachment - previous_attachment)))
+                                (new_attachment_impacted_fts.sum() - previous_attachment_impacted_fts.sum())))
 
             accepted = self._metropolis_step(alpha)
             accepted_array[idx] = accepted
 
             if accepted:
-                previous_attachment, previous_regularity = new_attachment, new_regularity
+                if impacted_fts is None:
+                    attachment_per_ft = new_attachment_impacted_fts
+                else:
+                    attachment_per_ft[:, impacted_fts] = new_attachment_impacted_fts
+                previous_regularity = new_regularity
 
             else:
                 # Revert modification of realization at idx and its consequences
                 realization.set_tensor_realizations_element(old_val_idx, idx)
-                # Update (back) derived model attributes if necessary
-                # TODO: Shouldn't we backup the old MCMC toolbox instead to avoid heavy computations?
+                # Restore (back) derived model attributes, without re-computing them
                 # (e.g. orthonormal basis re-computation just for a single change)
-                model.update_MCMC_toolbox([self.name], realizations)
+                model.restore_MCMC_toolbox(MCMC_toolbox_checkpoint)
                 # force re-compute on next iteration:
                 # not performed since it is useless, since we rolled back to the starting state!
                 # self._previous_attachment = self._previous_regularity = None
+        previous_attachment = attachment_per_ft.sum() if attachment_per_ft is not None else None
+
         self._update_acceptation_rate(accepted_array)
         self._update_std()
 
         # Return last attachment and regularity_var
         return previous_attachment, previous_regularity
 
+    def _sample_population_realizations_independent_blocks(self, data, model, realizations, temperature_inv, *,
+                                                           attachment_scale: float = 1.):
+        """
+        Propose new values for all blocks (along first dimension, i.e. the features) of the population variable at once,
+        and do a MH step independently for each block, based on the attachment per feature.
+
+        <!> Only valid when model likelihood factorizes across features for this variable.
+
+        Parameters
+        ----------
+        data : :class:`.Dataset`
+        model : :class:`~.models.abstract_model.AbstractModel`
+        realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
+        temperature_inv : float > 0
+        attachment_scale : float > 0 (default 1.)
+            Factor applied to the attachment.
+
+        Returns
+        -------
+        attachment, regularity_var : `torch.FloatTensor` 0D (scalars)
+            The attachment and regularity (only for the current variable) at the end of this sampling step (summed on all individuals).
+        """
+        realization = realizations[self.name]
+
+        # the individual parameters are fixed during the sampling of this population variable
+        ind_params = model.get_param_from_real(realizations)
+        # shape to broadcast a tensor of shape (n_blocks,) along the other dimensions of the variable
+        block_shape = (-1,) + (1,) * (len(self.shape) - 1)
+
+        def compute_attachment_regularity_per_block():
+            # model attributes used are the ones from the MCMC toolbox that we are currently changing!
+            attachment = attachment_scale * model.compute_individual_attachment_per_ft_tensorized(data, ind_params, attribute_type='MCMC').sum(dim=0)
+            # regularity is always computed with model.parameters (not "temporary MCMC parameters")
+            regularity = model.compute_regularity_realization(realization)
+            # mask regularity of masked terms (needed for nan/inf terms such as inf deltas when batched)
+            if self.mask is not None:
+                regularity[~(self.mask.to(bool))] = 0
+
+            return attachment, regularity.view(self.shape[0], -1).sum(dim=1)
+
+        previous_attachment, previous_regularity = compute_attachment_regularity_per_block()
+
+        # Keep previous realizations and sample new ones (for all blocks at once)
+        previous_reals = realization.tensor_realizations.clone()
+        change = self.std.view(block_shape) * torch.randn(self.shape)
+        # (we don't directly mask the new values since they may be infinite, producing nans when trying to multiply them by 0)
+        if self.mask is not None:
+            change = change * self.mask
+        realization.tensor_realizations = previous_reals + change
+        model.update_MCMC_toolbox([self.name], realizations)
+
+        new_attachment, new_regularity = compute_attachment_regularity_per_block()
+
+        # alpha is per block, shape = (n_blocks,)
+        alpha = torch.exp(-((new_regularity - previous_regularity) * temperature_inv +
+                            (new_attachment - previous_attachment)))
+
+        accepted = self._group_metropolis_step(alpha)
+        self._update_acceptation_rate(accepted)
+        self._update_std()
+
+        # we only keep the accepted blocks
+        # (since blocks are independent, the model attributes are then the ones of the accepted blocks)
+        accepted_blocks = accepted.to(bool)
+        if not accepted_blocks.all():
+            realization.tensor_realizations = torch.where(accepted_blocks.view(block_shape),
+                                                          realization.tensor_realizations, previous_reals)
+            model.update_MCMC_toolbox([self.name], realizations)
+
+        attachment = torch.where(accepted_blocks, new_attachment, previous_attachment)
+        regularity = torch.where(accepted_blocks, new_regularity, previous_regularity)
+
+        return attachment.sum(), regularity.sum()
+
     def _sample_individual_realizations(self, data, model, realizations, temperature_inv, **attachment_computation_kws):
         """
         For each individual variable, compute current patient-batched attachment and regularity.
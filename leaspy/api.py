@@ -3,20 +3,20 @@ from typing import TYPE_CHECKING
 
 import pandas as pd
 import numpy as np
+import torch
 
 from leaspy.io.data.dataset import Dataset
+from leaspy.models.abstract_model import AbstractModel
 from leaspy.models.model_factory import ModelFactory
 from leaspy.io.settings.model_settings import ModelSettings
 from leaspy.algo.algo_factory import AlgoFactory
+from leaspy.algo.fit.abstract_fit_algo import AbstractFitAlgo
 from leaspy.io.outputs.individual_parameters import IndividualParameters
 
-from leaspy.exceptions import LeaspyTypeError, LeaspyInputError
-from leaspy.utils.typing import FeatureType, IDType, Dict, Union, List, Tuple
+from leaspy.exceptions import LeaspyTypeError, LeaspyInputError, LeaspyIndividualParamsInputError
+from leaspy.utils.typing import FeatureType, IDType, Dict, Union, List, Tuple, Optional
 
 if TYPE_CHECKING:
-    import numpy as np
-    import torch
-
     from leaspy.io.data.data import Data
     from leaspy.io.settings.algorithm_settings import AlgorithmSettings
     from leaspy.io.outputs.result import Result  # for simulate only
@@ -91,7 +91,7 @@ class Leaspy:
     def type(self) -> str:
         return self.model.name
 
-    def fit(self, data: Data, settings: AlgorithmSettings) -> None:
+    def fit(self, data: Data, settings: AlgorithmSettings, *, resume_from: str = None) -> None:
         r"""
         Estimate the model's parameters :math:`\theta` for a given dataset and a given algorithm.
 
@@ -103,6 +103,11 @@ class Leaspy:
             Contains the information of the individuals, in particular the time-points :math:`(t_{i,j})` and the observations :math:`(y_{i,j})`.
         settings : :class:`.AlgorithmSettings`
             Contains the algorithm's settings.
+        resume_from : str, optional
+            Path to a checkpoint of a previous (interrupted) run of the algorithm, to resume it from.
+            Checkpoints are periodically saved by MCMC-SAEM when its `checkpoint.path` parameter is set.
+            Provided the same data, model and algorithm settings are used, the resumed run is exactly the same
+            as the original one would have been.
 
         See Also
         --------
@@ -141,8 +146,18 @@ class Leaspy:
             # it will only be set at the beginning of `algorithm.run` just afterwards
             # so a `initialization_method='random'` won't be reproducible for now, TODO?
             initialization_method = settings.model_initialization_method
-            self.model.initialize(dataset, initialization_method)
-        algorithm.run(self.model, dataset)
+            initialization_kws = {}
+            if initialization_method == 'lme':
+                # LME of the different features may be fitted in parallel
+                initialization_kws['n_jobs'] = settings.parameters.get('n_jobs', 1)
+            self.model.initialize(dataset, initialization_method, **initialization_kws)
+
+        run_kws = {}
+        if resume_from is not None:
+            if not isinstance(algorithm, AbstractFitAlgo):
+                raise LeaspyInputError(f"The algorithm '{algorithm.name}' can not be resumed from a checkpoint.")
+            run_kws['resume_from'] = resume_from
+        algorithm.run(self.model, dataset, **run_kws)
 
 
     def calibrate(self, data: Data, settings: AlgorithmSettings) -> None:
@@ -260,8 +275,6 @@ class Leaspy:
         >>> timepoints = df_train.sort_index().groupby('ID').tail(2).index  # as pandas (ID, TIME) MultiIndex
         >>> estimations = leaspy_logistic.estimate(timepoints, individual_parameters)
         """
-        estimations = {}
-
         ix = None
         # get timepoints to estimate from index
         if isinstance(timepoints, pd.MultiIndex):
@@ -271,41 +284,102 @@ class Leaspy:
                 to_dataframe = True
 
             ix = timepoints # keep for future
-            timepoints = {subj_id: tpts.values for subj_id, tpts in timepoints.to_frame()['TIME'].groupby('ID')}
+            visits_subjects_codes, subjects_ids = pd.factorize(ix.get_level_values('ID'), sort=True)
+            visits_timepoints = ix.get_level_values('TIME').values
+        else:
+            timepoints = {subj_id: np.asarray(tpts).reshape(-1) for subj_id, tpts in timepoints.items()}
+            subjects_ids = np.array(list(timepoints.keys()), dtype=object)
+            visits_subjects_codes = np.repeat(np.arange(len(timepoints)), [len(tpts) for tpts in timepoints.values()])
+            visits_timepoints = np.concatenate(list(timepoints.values())) if timepoints else np.array([])
+
+        # all visits of all individuals are estimated at once: shape is (n_visits, 1, n_features[, ...])
+        estimations = self._estimate_visits(subjects_ids, visits_subjects_codes, visits_timepoints, individual_parameters)
 
         # special post-processing function for some models (only `ordinal` for now)
-        estimation_postprocessor_kws = dict(ordinal_method=ordinal_method)
         estimation_postprocessor = getattr(self.model, 'postprocess_model_estimation', None)
+        if estimation_postprocessor is not None:
+            estimations = estimation_postprocessor(estimations, ordinal_method=ordinal_method)
 
-        for subj_id, tpts in timepoints.items():
-            ip = individual_parameters[subj_id]
-            est = self.model.compute_individual_trajectory(tpts, ip).cpu().numpy()
-            if estimation_postprocessor is not None:
-                est = estimation_postprocessor(est, **estimation_postprocessor_kws)
-            # 1 individual at a time --> squeeze the first dimension of the array
-            if isinstance(est, dict):
-                # can occur due to `estimation_postprocessor` (cf. `ordinal_method='probabilities'``)
-                estimations[subj_id] = {k: v[0] for k, v in est.items()}
-            else:
-                estimations[subj_id] = est[0]
+        # 1 visit at a time --> squeeze the second dimension of the array
+        if isinstance(estimations, dict):
+            # can occur due to `estimation_postprocessor` (cf. `ordinal_method='probabilities'``)
+            estimations = {k: v[:, 0] for k, v in estimations.items()}
+        else:
+            estimations = estimations[:, 0]
 
         # convert to proper dataframe
         if to_dataframe:
-            estimations = pd.concat({
-                subj_id: pd.DataFrame(# columns names may be directly embedded in the dictionary after a `postprocess_model_estimation`
-                                      ests, columns=None if isinstance(ests, dict) else self.model.features,
-                                      index=timepoints[subj_id])
-                for subj_id, ests in estimations.items()
-            }, names=['ID', 'TIME'])
-
-            # reindex back to given index being careful to index order (join so to handle multi-levels cases)
-            if ix is not None:
-                # we need to explicitly pass `on` to preserve order of index levels
-                # and to explicitly pass columns to preserve 2D columns when they are
-                empty_df_like_ests = pd.DataFrame([], index=ix, columns=estimations.columns)
-                estimations = empty_df_like_ests[[]].join(estimations, on=['ID', 'TIME'])
-
-        return estimations
+            if ix is None:
+                ix = pd.MultiIndex.from_arrays([np.asarray(subjects_ids)[visits_subjects_codes], visits_timepoints],
+                                               names=['ID', 'TIME'])
+            # columns names may be directly embedded in the dictionary after a `postprocess_model_estimation`
+            return pd.DataFrame(estimations, index=ix,
+                                columns=None if isinstance(estimations, dict) else self.model.features)
+
+        # group visits by individual (they are already grouped, except when input was a `pandas.MultiIndex`)
+        visits_order = np.argsort(visits_subjects_codes, kind='stable')
+        visits_bounds = np.concatenate([[0], np.cumsum(np.bincount(visits_subjects_codes, minlength=len(subjects_ids)))])
+
+        def get_individual_estimations(ests: np.ndarray, i: int) -> np.ndarray:
+            return ests[visits_order[visits_bounds[i]:visits_bounds[i+1]]]
+
+        if isinstance(estimations, dict):
+            return {subj_id: {k: get_individual_estimations(v, i) for k, v in estimations.items()}
+                    for i, subj_id in enumerate(subjects_ids)}
+        return {subj_id: get_individual_estimations(estimations, i) for i, subj_id in enumerate(subjects_ids)}
+
+    def _estimate_visits(self, subjects_ids: List[IDType], visits_subjects_codes: np.ndarray, visits_timepoints: np.ndarray,
+                         individual_parameters: IndividualParameters) -> np.ndarray:
+        """
+        Compute the model values at a batch of visits (possibly of different individuals).
+
+        For models with tensorized computations, all visits are estimated at once,
+        with visits (not individuals) along the first dimension.
+
+        Parameters
+        ----------
+        subjects_ids : list[IDType]
+            Identifiers of individuals.
+        visits_subjects_codes : :class:`numpy.ndarray` [int, 1D]
+            Index of the individual of each visit (in `subjects_ids`).
+        visits_timepoints : :class:`numpy.ndarray` [float, 1D]
+            Timepoint of each visit.
+        individual_parameters : :class:`.IndividualParameters`
+            Individual parameters of (at least) all individuals of visits.
+
+        Returns
+        -------
+        :class:`numpy.ndarray` [float] of shape (n_visits, 1, n_features[, ...])
+
+        Raises
+        ------
+        :exc:`.LeaspyIndividualParamsInputError`
+            if some individuals are unknown or if individual parameters are not valid for model
+        """
+
+        if not isinstance(self.model, AbstractModel):
+            # generic models (no tensorized computations): one individual at a time
+            estimations = np.empty((len(visits_timepoints), 1, len(self.model.features)), dtype=np.float32)
+            for i, subj_id in enumerate(subjects_ids):
+                visits_subj = np.flatnonzero(visits_subjects_codes == i)
+                est = self.model.compute_individual_trajectory(visits_timepoints[visits_subj], individual_parameters[subj_id])
+                estimations[visits_subj, 0] = est[0].cpu().numpy()
+            return estimations
+
+        indices, ips = individual_parameters.to_pytorch()
+        subjects_rows = pd.Index(indices).get_indexer(subjects_ids)
+        if (subjects_rows < 0).any():
+            unknown_ids = [subj_id for subj_id, row in zip(subjects_ids, subjects_rows) if row < 0]
+            raise LeaspyIndividualParamsInputError(f'The indices {unknown_ids} are unknown')
+
+        # checks on individual parameters (all individuals at once)
+        ips = self.model.tensorize_individual_parameters(ips)
+
+        visits_rows = torch.tensor(subjects_rows[visits_subjects_codes], dtype=torch.long)
+        visits_ips = {k: v[visits_rows] for k, v in ips.items()}
+        visits_timepoints = torch.tensor(visits_timepoints, dtype=torch.float32).unsqueeze(-1)  # 1 visit per "individual"
+
+        return self.model.compute_individual_tensorized(visits_timepoints, visits_ips).cpu().numpy()
 
     def estimate_ages_from_biomarker_values(self, individual_parameters: IndividualParameters,
                                             biomarker_values: Dict[IDType, Union[List[float], float]],
@@ -354,6 +428,44 @@ class Leaspy:
         >>> feature='PUTAMEN')
         """
         # check input
+        self._check_feature_of_biomarker_values(feature)
+
+        if not isinstance(biomarker_values, dict):
+            raise LeaspyTypeError(f"The 'biomarker_values' parameter must be a dict, not {type(biomarker_values)} !")
+
+        if not isinstance(individual_parameters, IndividualParameters):
+            raise LeaspyTypeError("The 'individual_parameters' parameter must be type IndividualParameters, "
+                                  f"not {type(individual_parameters)} !")
+
+        # precondition on input
+        for index, value in biomarker_values.items():
+            if not isinstance(value, (float, list)):
+                raise LeaspyTypeError(f"`biomarker_values` of individual '{index}' should be a float or a list, not {type(value)}.")
+
+        if len(biomarker_values) == 0:
+            return {}
+
+        # pack values of all individuals in a single (padded) array
+        subjects_ids = list(biomarker_values.keys())
+        subjects_values = [np.ravel(np.asarray(value, dtype=np.float32)) for value in biomarker_values.values()]
+        n_values = np.array([len(values) for values in subjects_values])
+        values_mask = np.arange(n_values.max()) < n_values[:, np.newaxis]
+        values = np.full(values_mask.shape, np.nan, dtype=np.float32)
+        values[values_mask] = np.concatenate(subjects_values)
+
+        # compute biomarker ages of all individuals at once
+        biomarker_ages = self.estimate_ages_from_biomarker_values_tensorized(
+            individual_parameters.subset(subjects_ids), torch.tensor(values), feature
+        ).cpu().numpy()
+
+        # convert arrays to initial type (float or list)
+        return {
+            index: float(ages[0]) if isinstance(value, float) else ages[:n_values_ind].tolist()
+            for index, value, ages, n_values_ind in zip(subjects_ids, biomarker_values.values(), biomarker_ages, n_values)
+        }
+
+    def _check_feature_of_biomarker_values(self, feature: Optional[FeatureType]) -> None:
+        """Check the `feature` argument of methods estimating ages from biomarker values."""
         model_features = self.model.features
 
         if feature is not None:
@@ -365,37 +477,65 @@ class Leaspy:
         if len(model_features) > 1 and not feature:
             raise LeaspyInputError('Feature argument must not be None for a multivariate model !')
 
-        if not isinstance(biomarker_values, dict):
-            raise LeaspyTypeError(f"The 'biomarker_values' parameter must be a dict, not {type(biomarker_values)} !")
+    def estimate_ages_from_biomarker_values_tensorized(self, individual_parameters: IndividualParameters,
+                                                       biomarker_values: torch.Tensor,
+                                                       feature: FeatureType = None) -> torch.Tensor:
+        r"""
+        Batched version of :meth:`.Leaspy.estimate_ages_from_biomarker_values`, for whole cohorts.
 
-        if not isinstance(individual_parameters, IndividualParameters):
-            raise LeaspyTypeError("The 'individual_parameters' parameter must be type IndividualParameters, "
-                                  f"not {type(individual_parameters)} !")
+        For all individuals at once, returns the ages at which the given feature values are reached,
+        with a closed-form inversion of the model (logistic & linear models) or a broadcasted grid search (ordinal models).
 
-        # compute biomarker ages
-        biomarker_ages = {}
+        Parameters
+        ----------
+        individual_parameters : :class:`.IndividualParameters`
+            Individual parameters of the individuals, in the same order as the rows of `biomarker_values`.
 
-        for index, value in biomarker_values.items():
+        biomarker_values : :class:`torch.Tensor` of shape (n_individuals, n_values)
+            Feature values of each individual (use nan to pad rows if individuals have different numbers of values).
 
-            # precondition on input
-            if not isinstance(value, (float, list)):
-                raise LeaspyTypeError(f"`biomarker_values` of individual '{index}' should be a float or a list, not {type(value)}.")
+        feature : str
+            For multivariate models only: feature name (indicates to which model feature the biomarker values belongs)
+
+        Returns
+        -------
+        :class:`torch.Tensor` of shape (n_individuals, n_values)
+            Estimated ages at which the values of `biomarker_values` are reached.
+
+        Raises
+        ------
+        :exc:`.LeaspyTypeError`
+            bad type for `feature`
+        :exc:`.LeaspyInputError`
+            inconsistent inputs (e.g. unknown `feature`, or no `feature` for a multivariate model)
+        :exc:`.LeaspyIndividualParamsInputError`
+            if individual parameters are not valid for model
+
+        Examples
+        --------
+        Estimate the ages at which all individuals reach the value of 0.5 of feature 'PUTAMEN'.
 
-            # get the individual parameters dict
-            ip = individual_parameters[index]
+        >>> import torch
+        >>> from leaspy.datasets import Loader
+        >>> leaspy_logistic = Loader.load_leaspy_instance('parkinson-putamen-train')
+        >>> individual_parameters = Loader.load_individual_parameters('parkinson-putamen-train')
+        >>> indices, _ = individual_parameters.to_pytorch()
+        >>> biomarker_values = torch.full((len(indices), 1), 0.5)
+        >>> estimated_ages = leaspy_logistic.estimate_ages_from_biomarker_values_tensorized(individual_parameters,
+        >>> biomarker_values, feature='PUTAMEN')
+        """
+        self._check_feature_of_biomarker_values(feature)
 
-            # compute individual ages from the value array and individual parameter dict
-            est = self.model.compute_individual_ages_from_biomarker_values(value, ip, feature).cpu().numpy().reshape(-1)
+        indices, ips = individual_parameters.to_pytorch()
 
-            # convert array to initial type (int or list)
-            if isinstance(value, float):
-                est = float(est)
-            else:
-                est = est.tolist()
+        if biomarker_values.dim() != 2 or len(biomarker_values) != len(indices):
+            raise LeaspyInputError(f"The biomarker values should be a 2D tensor with a row per individual ({len(indices)}), "
+                                   f"not of shape {tuple(biomarker_values.shape)}.")
 
-            biomarker_ages[index] = est
+        # checks on individual parameters (all individuals at once)
+        ips = self.model.tensorize_individual_parameters(ips)
 
-        return biomarker_ages
+        return self.model.compute_individual_ages_from_biomarker_values_tensorized(biomarker_values.float(), ips, feature)
 
     def simulate(self, individual_parameters: IndividualParameters, data: Data, settings: AlgorithmSettings):
         r"""
@@ -419,8 +559,9 @@ class Leaspy:
 
         Returns
         -------
-        simulated_data : :class:`~.io.outputs.result.Result`
+        simulated_data : :class:`~.io.outputs.result.Result` or None
             Contains the generated individual parameters & the corresponding generated scores.
+            None if the simulated subjects were written on disk by chunks (cf. `output_path` parameter of simulation).
 
         See Also
         --------
@@ -504,7 +645,7 @@ class Leaspy:
 
         algorithm = AlgoFactory.algo("simulate", settings)
         # <!> The `AbstractAlgo.run` signature is not respected for simulation algorithm...
-        simulated_data: Result = algorithm.run(self.model, individual_parameters, data)
+        simulated_data: Optional[Result] = algorithm.run(self.model, individual_parameters, data)
         return simulated_data
 
     @classmethod
@@ -0,0 +1,175 @@
+import json
+import os
+
+import numpy as np
+
+from leaspy.io.data.individual_data import IndividualData
+from leaspy.exceptions import LeaspyDataInputError
+from leaspy.utils.typing import Any, Dict, List, FeatureType, IDType
+
+
+class ColumnarDataReader:
+    """
+    Methods to load `Leaspy`-compliant data containers from a columnar bundle on disk
+    (as written by :meth:`.Data.save_columnar`).
+
+    A columnar bundle is a folder with:
+        * `subject_codes.npy`: integer index of the individual of each visit, shape ``(n_visits,)``
+        * `timepoints.npy`: timepoints of each visit, shape ``(n_visits,)``
+        * `values.npy`: observations of each visit, shape ``(n_visits, n_features)``
+        * `metadata.json`: format version, features names, individuals identifiers and cofactors
+
+    Visits are grouped by individual and the bundle was validated when it was saved,
+    so no validation of the data is performed here (except for cheap consistency checks on shapes).
+
+    Parameters
+    ----------
+    path : str
+        Path to the folder of the columnar bundle.
+    mmap : bool, default True
+        Should we memory-map the arrays (read-only) instead of loading them in memory?
+        The individuals' data are views on these arrays, so nothing is copied at loading.
+
+    Raises
+    ------
+    :exc:`.LeaspyDataInputError`
+    """
+    format_version = 1
+
+    arrays_names = ('subject_codes', 'timepoints', 'values')
+    metadata_file = 'metadata.json'
+
+    def __init__(self, path: str, *, mmap: bool = True):
+
+        self.individuals: Dict[IDType, IndividualData] = {}
+        self.iter_to_idx: Dict[int, IDType] = {}
+        self.headers: List[FeatureType] = None
+        self.n_individuals: int = 0
+        self.n_visits: int = 0
+
+        # columnar storage of all visits (individuals' data are views on it)
+        self.subject_codes: np.ndarray = None
+        self.timepoints: np.ndarray = None
+        self.values: np.ndarray = None
+
+        self._read(path, mmap=mmap)
+
+    @property
+    def dimension(self):
+        """Number of features in dataset."""
+        if self.headers is None:
+            return None
+        return len(self.headers)
+
+    @classmethod
+    def _get_array_path(cls, path: str, array_name: str) -> str:
+        return os.path.join(path, f'{array_name}.npy')
+
+    @staticmethod
+    def _to_json_compatible(v: Any) -> Any:
+        # numpy scalars are not serializable by `json`
+        return v.item() if isinstance(v, np.generic) else v
+
+    @classmethod
+    def write(cls, path: str, *, subject_codes: np.ndarray, timepoints: np.ndarray, values: np.ndarray,
+              headers: List[FeatureType], indices: List[IDType], cofactors: Dict[FeatureType, List[Any]]) -> None:
+        """
+        Write a columnar bundle to disk.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder of the columnar bundle (created if needed).
+        subject_codes : :class:`numpy.ndarray` [int, 1D]
+            Integer index of the individual of each visit (visits grouped by individual).
+        timepoints : :class:`numpy.ndarray` [float, 1D]
+        values : :class:`numpy.ndarray` [float, 2D]
+        headers : list[FeatureType]
+            Features names.
+        indices : list[IDType]
+            Identifiers of individuals, in the order of `subject_codes`.
+        cofactors : dict[FeatureType, list]
+            Values of cofactors for each individual, in the order of `subject_codes`.
+            They should be JSON-serializable.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        arrays = dict(
+            subject_codes=np.ascontiguousarray(subject_codes, dtype=np.int64),
+            timepoints=np.ascontiguousarray(timepoints),
+            values=np.ascontiguousarray(values),
+        )
+        for array_name, array in arrays.items():
+            np.save(cls._get_array_path(path, array_name), array, allow_pickle=False)
+
+        metadata = {
+            'format_version': cls.format_version,
+            'headers': list(headers),
+            'indices': [cls._to_json_compatible(idx) for idx in indices],
+            'cofactors': {k: [cls._to_json_compatible(v) for v in l] for k, l in cofactors.items()},
+        }
+        with open(os.path.join(path, cls.metadata_file), 'w') as fp:
+            json.dump(metadata, fp)
+
+    def _read(self, path: str, *, mmap: bool):
+        """
+        The method that effectively reads the columnar bundle (automatically called in __init__).
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder of the columnar bundle.
+        mmap : bool
+            Should we memory-map the arrays?
+        """
+        metadata_path = os.path.join(path, self.metadata_file)
+        if not os.path.isfile(metadata_path):
+            raise LeaspyDataInputError(f"No columnar data could be found in '{path}' (missing '{self.metadata_file}').")
+
+        with open(metadata_path, 'r') as fp:
+            metadata = json.load(fp)
+
+        if metadata.get('format_version') != self.format_version:
+            raise LeaspyDataInputError(f"Unsupported version of columnar data: {metadata.get('format_version')} "
+                                       f"(expected {self.format_version}).")
+
+        try:
+            # <!> we use plain numpy arrays on top of the memory-mapped buffers (no copy),
+            # since slicing `numpy.memmap` objects is much slower
+            self.subject_codes, self.timepoints, self.values = (
+                np.asarray(np.load(self._get_array_path(path, array_name), mmap_mode='r' if mmap else None, allow_pickle=False))
+                for array_name in self.arrays_names
+            )
+        except OSError as e:
+            raise LeaspyDataInputError(f"Columnar data in '{path}' is incomplete or corrupted.") from e
+
+        self.headers = metadata['headers']
+        indices = metadata['indices']
+        cofactors = metadata['cofactors']
+
+        self.n_individuals = len(indices)
+        self.n_visits = len(self.subject_codes)
+
+        # cheap consistency checks (data was fully validated at saving)
+        if not (
+            self.timepoints.shape == (self.n_visits,)
+            and self.values.shape == (self.n_visits, self.dimension)
+            and all(len(v) == self.n_individuals for v in cofactors.values())
+        ):
+            raise LeaspyDataInputError(f"Columnar data in '{path}' has inconsistent shapes.")
+
+        # visits are grouped by individual so we only need the bounds of visits of each individual
+        n_visits_per_individual = np.bincount(self.subject_codes, minlength=self.n_individuals)
+        if len(n_visits_per_individual) != self.n_individuals:
+            raise LeaspyDataInputError(f"Columnar data in '{path}' has inconsistent individuals.")
+        visits_bounds = np.concatenate([[0], np.cumsum(n_visits_per_individual)]).tolist()
+
+        for i, idx_subj in enumerate(indices):
+            start, end = visits_bounds[i], visits_bounds[i + 1]
+            individual = IndividualData(idx_subj)
+            individual.timepoints = self.timepoints[start:end]
+            individual.observations = self.values[start:end]
+            if cofactors:
+                individual.cofactors = {k: v[i] for k, v in cofactors.items()}
+            self.individuals[idx_subj] = individual
+        self.iter_to_idx = dict(enumerate(indices))
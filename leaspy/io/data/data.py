@@ -5,12 +5,13 @@ from collections.abc import Iterable, Iterator
 import numpy as np
 import pandas as pd
 
+from leaspy.io.data.columnar_data_reader import ColumnarDataReader
 from leaspy.io.data.csv_data_reader import CSVDataReader
 from leaspy.io.data.dataframe_data_reader import DataframeDataReader
 from leaspy.io.data.individual_data import IndividualData
 
 from leaspy.exceptions import LeaspyDataInputError, LeaspyTypeError
-from leaspy.utils.typing import FeatureType, IDType, Dict, List, Optional, Union
+from leaspy.utils.typing import FeatureType, IDType, Dict, List, Optional, Tuple, Union
 
 
 class Data(Iterable):
@@ -36,12 +37,22 @@ class Data(Iterable):
         Total number of visits
     cofactors : List[FeatureType]
         Feature names corresponding to cofactors
+
+    See Also
+    --------
+    :meth:`.Data.to_columnar`
+        To get all the visits of all individuals as contiguous columnar arrays.
     """
     def __init__(self):
         self.individuals: Dict[IDType, IndividualData] = {}
         self.iter_to_idx: Dict[int, IDType] = {}
         self.headers: Optional[List[FeatureType]] = None
 
+        # columnar storage of all visits, when available (cf. `to_columnar`)
+        self._columnar: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # individuals (in iteration order) & their versions when columnar storage was built (to invalidate it)
+        self._columnar_key: Optional[List[Tuple[IndividualData, int]]] = None
+
     @property
     def dimension(self) -> Optional[int]:
         """Number of features"""
@@ -110,6 +121,61 @@ class Data(Iterable):
             raise LeaspyTypeError("Cannot test Data membership for "
                                   "an element of this type")
 
+    def to_columnar(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get all the visits of all individuals as contiguous columnar arrays.
+
+        Visits are grouped by individual (in the order of iteration on `Data`)
+        and in the same order as in individuals' data (i.e. sorted by time when read from a dataframe).
+
+        <!> When `Data` was read from a dataframe or a CSV file, the columnar arrays are the ones
+        that the individuals' `timepoints` and `observations` are views on, so they are not copied.
+        Otherwise they are built by concatenating the individuals' data.
+        They are cached, and re-built as soon as individuals were added, removed, re-ordered or had their
+        `timepoints` or `observations` replaced (e.g. with :meth:`.IndividualData.add_observations`);
+        but in-place modifications of these arrays are not tracked.
+
+        Returns
+        -------
+        subject_codes : :class:`numpy.ndarray` [int, 1D]
+            Integer index (in iteration order) of the individual of each visit, shape ``(n_visits,)``
+        timepoints : :class:`numpy.ndarray` [float, 1D]
+            Timepoints of each visit, shape ``(n_visits,)``
+        values : :class:`numpy.ndarray` [float, 2D]
+            Observations of each visit, shape ``(n_visits, n_features)``
+        """
+        individuals = list(self)
+
+        # check that the columnar arrays are still consistent with individuals (they may have been modified)
+        if self._columnar is not None and not self._is_columnar_key_valid(individuals):
+            self._columnar = None
+
+        if self._columnar is None:
+            n_visits_per_individual = np.array([len(indiv.timepoints) for indiv in individuals], dtype=int)
+            subject_codes = np.repeat(np.arange(len(individuals)), n_visits_per_individual)
+            if len(individuals):
+                timepoints = np.concatenate([indiv.timepoints for indiv in individuals])
+                values = np.concatenate([indiv.observations for indiv in individuals], axis=0)
+            else:
+                timepoints = np.zeros((0,))
+                values = np.zeros((0, self.dimension or 0))
+            self._columnar = (subject_codes, timepoints, values)
+            self._columnar_key = self._get_columnar_key(individuals)
+
+        return self._columnar
+
+    @staticmethod
+    def _get_columnar_key(individuals: List[IndividualData]) -> List[Tuple[IndividualData, int]]:
+        return [(indiv, indiv._version) for indiv in individuals]
+
+    def _is_columnar_key_valid(self, individuals: List[IndividualData]) -> bool:
+        return (
+            self._columnar_key is not None
+            and len(self._columnar_key) == len(individuals)
+            and all(indiv is indiv_key and indiv._version == version
+                    for indiv, (indiv_key, version) in zip(individuals, self._columnar_key))
+        )
+
     def load_cofactors(self, df: pd.DataFrame, *, cofactors: Optional[List[FeatureType]] = None) -> None:
         """
         Load cofactors from a `pandas.DataFrame` to the `Data` object
@@ -183,6 +249,54 @@ class Data(Iterable):
         reader = CSVDataReader(path, **kws)
         return Data._from_reader(reader)
 
+    def save_columnar(self, path: str) -> None:
+        """
+        Save the `Data` object (including its cofactors) as a columnar bundle of `.npy` files in a folder.
+
+        It can be loaded back very efficiently with :meth:`.Data.load_columnar`:
+        arrays are memory-mapped and no validation of the data is repeated.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder where to save the data (created if needed).
+
+        Raises
+        ------
+        :exc:`.LeaspyDataInputError`
+            If `Data` has no features.
+        """
+        if self.headers is None:
+            raise LeaspyDataInputError("Cannot save a `Data` object without any features.")
+
+        subject_codes, timepoints, values = self.to_columnar()
+        individuals = list(self)
+        cofactors = {cofactor: [indiv.cofactors[cofactor] for indiv in individuals] for cofactor in self.cofactors}
+
+        ColumnarDataReader.write(path, subject_codes=subject_codes, timepoints=timepoints, values=values,
+                                 headers=self.headers, indices=[indiv.idx for indiv in individuals],
+                                 cofactors=cofactors)
+
+    @staticmethod
+    def load_columnar(path: str, **kws) -> Data:
+        """
+        Create a `Data` object from a columnar bundle saved with :meth:`.Data.save_columnar`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder of the columnar bundle
+        **kws
+            Keyword arguments that are sent to :class:`.ColumnarDataReader` (e.g. `mmap`)
+
+        Returns
+        -------
+        :class:`.Data`
+            <!> By default, the individuals' data are read-only views on memory-mapped arrays.
+        """
+        reader = ColumnarDataReader(path, **kws)
+        return Data._from_reader(reader)
+
     def to_dataframe(self, *, cofactors: Union[List[FeatureType], str, None] = None) -> pd.DataFrame:
         """
         Convert the Data object to a :class:`pandas.DataFrame`
@@ -225,24 +339,12 @@ class Data(Iterable):
             raise LeaspyDataInputError(f'These cofactors are not part of '
                                        f'your Data: {unknown_cofactors}')
 
-        # Build the dataframe, one individual at a time
-        def get_individual_block(individual: IndividualData):
-            individual_product = [[individual.idx], individual.timepoints]
-            individual_index = pd.MultiIndex.from_product(individual_product)
-            individual_values = individual.observations
-            return individual_index, individual_values
-
-        index = None
-        values = None
-        for i in self.individuals.values():
-            if index is None:
-                index, values = get_individual_block(i)
-            else:
-                index_i, values_i = get_individual_block(i)
-                index = index.union(index_i, sort=False)
-                values = np.concatenate([values, values_i], axis=0)
+        # Build the dataframe directly from columnar arrays
+        subject_codes, timepoints, values = self.to_columnar()
+        ids = pd.Index([indiv.idx for indiv in self])
+        index = pd.MultiIndex.from_arrays([ids[subject_codes], timepoints])
 
-        df = pd.DataFrame(data=values, index=index, columns=self.headers)
+        df = pd.DataFrame(data=values, index=index, columns=self.headers, copy=True)
         df.index.names = ['ID', 'TIME']
 
         for cofactor in cofactors_list:
@@ -277,6 +379,8 @@ class Data(Iterable):
         data.individuals = reader.individuals
         data.iter_to_idx = reader.iter_to_idx
         data.headers = reader.headers
+        data._columnar = (reader.subject_codes, reader.timepoints, reader.values)
+        data._columnar_key = data._get_columnar_key(list(data))
         return data
 
     @staticmethod
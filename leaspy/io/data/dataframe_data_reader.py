@@ -5,7 +5,7 @@ import pandas as pd
 
 from leaspy.io.data.individual_data import IndividualData
 from leaspy.exceptions import LeaspyDataInputError
-from leaspy.utils.typing import Dict, List, FeatureType, IDType
+from leaspy.utils.typing import Dict, List, FeatureType, IDType, Optional
 
 
 class DataframeDataReader:
@@ -24,6 +24,11 @@ class DataframeDataReader:
     warn_empty_column : bool, default True
         Should we warn when there are empty columns?
         (It may be redundant when the user already knows it - for instance in ablation studies)
+    trusted : bool, default False
+        Should we trust the input dataframe, so to read it faster?
+        If True, the input dataframe is not copied and visits are not checked for duplicates.
+        <!> Only use it on dataframes that were already validated (e.g. exports of a `Data` object),
+        since duplicated visits would silently lead to inconsistent data.
 
     Raises
     ------
@@ -34,7 +39,8 @@ class DataframeDataReader:
     def __init__(self, df: pd.DataFrame, *,
                  drop_full_nan: bool = True,
                  sort_index: bool = False,
-                 warn_empty_column: bool = True):
+                 warn_empty_column: bool = True,
+                 trusted: bool = False):
 
         self.individuals: Dict[IDType, IndividualData] = {}
         self.iter_to_idx: Dict[int, IDType] = {}
@@ -42,7 +48,13 @@ class DataframeDataReader:
         self.n_individuals: int = 0
         self.n_visits: int = 0
 
-        self._read(df, drop_full_nan=drop_full_nan, sort_index=sort_index, warn_empty_column=warn_empty_column)
+        # columnar storage of all visits (individuals' data are views on it)
+        self.subject_codes: np.ndarray = None
+        self.timepoints: np.ndarray = None
+        self.values: np.ndarray = None
+
+        self._read(df, drop_full_nan=drop_full_nan, sort_index=sort_index, warn_empty_column=warn_empty_column,
+                   trusted=trusted)
 
     @property
     def dimension(self):
@@ -82,7 +94,7 @@ class DataframeDataReader:
                 raise LeaspyDataInputError('All `ID` should be >= 0 when subjects are identified as integers, '
                                            'use string identifiers if you need more flexibility.')
         elif inferred_dtype == 'string':
-            if (s.str.len() == 0).any():
+            if (s == '').any():
                 raise LeaspyDataInputError('No `ID` should be empty when subjects are identified as strings.')
 
     @classmethod
@@ -91,12 +103,10 @@ class DataframeDataReader:
         if not cls._check_numeric_type(s):
             raise LeaspyDataInputError(f'The `TIME` column should contain numeric values (not {s.dtype}).')
 
-        # changed to work with newer versions of Pandas
-        # `mode.use_inf_as_na` as been deprecated
-        s.replace([np.inf, -np.inf], np.nan, inplace=True)
-        if s.isna().any():
-            individuals_with_at_least_1_bad_tpt = s.isna().groupby('ID').any()
-            individuals_with_at_least_1_bad_tpt = individuals_with_at_least_1_bad_tpt[individuals_with_at_least_1_bad_tpt].index.tolist()
+        # <!> no in-place modification since input dataframe may not have been copied
+        bad_tpts = ~np.isfinite(s.to_numpy(dtype=float, na_value=np.nan))
+        if bad_tpts.any():
+            individuals_with_at_least_1_bad_tpt = s.index[bad_tpts].unique().sort_values().tolist()
             raise LeaspyDataInputError('The `TIME` column should NOT contain any nan nor inf, '
                                         f'please double check these individuals:\n{individuals_with_at_least_1_bad_tpt}.')
 
@@ -128,7 +138,22 @@ class DataframeDataReader:
         # dataframe that can safely be used downstream
         return df
 
-    def _read(self, df: pd.DataFrame, *, drop_full_nan: bool, sort_index: bool, warn_empty_column: bool):
+    @staticmethod
+    def _get_visits_order(subject_codes: np.ndarray, timepoints: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Order of visits so that they are grouped by individual and sorted by time for each individual.
+
+        Returns None if visits are already ordered (no need to reorder them), which is checked in linear time.
+        """
+        same_subject = subject_codes[1:] == subject_codes[:-1]
+        if (
+            (subject_codes[1:] >= subject_codes[:-1]).all()
+            and (timepoints[1:][same_subject] >= timepoints[:-1][same_subject]).all()
+        ):
+            return None
+        return np.lexsort((timepoints, subject_codes))
+
+    def _read(self, df: pd.DataFrame, *, drop_full_nan: bool, sort_index: bool, warn_empty_column: bool, trusted: bool):
         """
         The method that effectively reads the input dataframe (automatically called in __init__).
 
@@ -143,13 +168,16 @@ class DataframeDataReader:
             (Keep False as default so not to break many of the downstream tests that check order...)
         warn_empty_column : bool
             Should we warn when there are empty columns?
+        trusted : bool
+            Should we trust input dataframe (no copy and no check for duplicated visits)?
         """
 
         if not isinstance(df, pd.DataFrame):
             # TODO? accept series? (for univariate dataset, with index already set)
             raise LeaspyDataInputError('Input should be a pandas.DataFrame not anything else.')
 
-        df = df.copy(deep=True)  # No modification on the input dataframe !
+        if not trusted:
+            df = df.copy(deep=True)  # No modification on the input dataframe !
         columns = df.columns.tolist()
         # Try to read the raw dataframe
         try:
@@ -157,44 +185,74 @@ class DataframeDataReader:
 
         # If we do not find 'ID' and 'TIME' columns, check the Index
         except LeaspyDataInputError:
-            df.reset_index(inplace=True)
+            df = df.reset_index()
             columns = df.columns.tolist()
             self._check_headers(columns)
 
-        # Check index & set it
+        # Check index (we never set it since it is costly: we directly work on columns)
         self._check_ID(df['ID'])
-        self._check_TIME(df.set_index('ID')['TIME'])
-        df['TIME'] = round(df['TIME'], self.time_rounding_digits)  # avoid missing duplicates due to rounding errors
+        self._check_TIME(df['TIME'].set_axis(df['ID']))
+        timepoints = df['TIME'].round(self.time_rounding_digits).to_numpy()  # avoid missing duplicates due to rounding errors
+
+        # individuals are ordered by first appearance (or by ID when sorting index)
+        # & visits are sorted by time for each individual
+        subject_ids_per_visit = df['ID'].to_numpy()
+        subject_codes, subject_ids = pd.factorize(subject_ids_per_visit, sort=sort_index)
+        visits_order = self._get_visits_order(subject_codes, timepoints)
+
+        if not trusted:
+            # duplicated visits are consecutive once visits are ordered
+            sorted_codes, sorted_timepoints = (
+                (subject_codes, timepoints) if visits_order is None
+                else (subject_codes[visits_order], timepoints[visits_order])
+            )
+            if ((sorted_codes[1:] == sorted_codes[:-1]) & (sorted_timepoints[1:] == sorted_timepoints[:-1])).any():
+                # get lines number as well as ID & TIME for duplicates (original line numbers)
+                df_dup = pd.DataFrame({'ID': subject_ids_per_visit, 'TIME': timepoints}).duplicated(keep=False)
+                df_dup = df_dup[df_dup]
+                raise LeaspyDataInputError(f'Some visits are duplicated:\n{df_dup}')
 
-        df.set_index(['ID', 'TIME'], inplace=True)
-        if not df.index.is_unique:
-            # get lines number as well as ID & TIME for duplicates (original line numbers)
-            df_dup = df[[]].reset_index().duplicated(keep=False)
-            df_dup = df_dup[df_dup]
-            raise LeaspyDataInputError(f'Some visits are duplicated:\n{df_dup}')
+        df = df.drop(columns=['ID', 'TIME'])
 
         # Drop visits full of nans so to get a correct number of total visits
         if drop_full_nan:
-            df = df.dropna(how='all')
-        self.n_visits = len(df)
+            visits_not_full_nan = df.notna().any(axis=1).to_numpy()
+            self.n_visits = int(visits_not_full_nan.sum())
+        else:
+            self.n_visits = len(df)
         if self.n_visits == 0:
             raise LeaspyDataInputError('Dataframe should have at least 1 row (not full of nans)...')
 
-        # sort after duplicate checks and full of nans dropped
-        if sort_index:
-            df.sort_index(inplace=True)
-
         self.headers = df.columns.tolist()
         if self.dimension < 1:
             raise LeaspyDataInputError('Dataframe should have at least 1 feature...')
 
         df = self._check_features(df, warn_empty_column=warn_empty_column)
+        values = df.to_numpy(dtype=float)
 
-        for idx_subj, df_subj in df.groupby(level="ID", sort=False):
-            self.individuals[idx_subj] = IndividualData(idx_subj)
-            self.individuals[idx_subj].add_observations(
-                timepoints = df_subj.index.get_level_values('TIME').to_list(),
-                observations = df_subj.values.tolist()
+        if self.n_visits != len(values):
+            # (rare) some visits were full of nans: individuals are re-indexed from remaining visits only
+            subject_ids_per_visit, timepoints, values = (
+                subject_ids_per_visit[visits_not_full_nan], timepoints[visits_not_full_nan], values[visits_not_full_nan]
             )
-            self.iter_to_idx[self.n_individuals] = idx_subj
-            self.n_individuals += 1
+            subject_codes, subject_ids = pd.factorize(subject_ids_per_visit, sort=sort_index)
+            visits_order = self._get_visits_order(subject_codes, timepoints)
+
+        if visits_order is not None:
+            subject_codes, timepoints, values = subject_codes[visits_order], timepoints[visits_order], values[visits_order]
+
+        self.subject_codes = subject_codes
+        self.timepoints = timepoints
+        self.values = np.ascontiguousarray(values)
+
+        subject_ids = subject_ids.tolist()
+        self.n_individuals = len(subject_ids)
+        visits_bounds = np.concatenate([[0], np.cumsum(np.bincount(self.subject_codes, minlength=self.n_individuals))]).tolist()
+
+        for i, idx_subj in enumerate(subject_ids):
+            start, end = visits_bounds[i], visits_bounds[i + 1]
+            individual = IndividualData(idx_subj)
+            individual.timepoints = self.timepoints[start:end]
+            individual.observations = self.values[start:end]
+            self.individuals[idx_subj] = individual
+        self.iter_to_idx = dict(enumerate(subject_ids))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
+import copy
 
 import numpy as np
 import pandas as pd
@@ -7,8 +8,8 @@ import torch
 import warnings
 
 from leaspy.exceptions import LeaspyInputError
-from leaspy.utils.typing import KwargsType, List, Dict
-from leaspy.models.utils.ordinal import OrdinalModelMixin
+from leaspy.utils.typing import KwargsType, List, Dict, DictParamsTorch, Iterator, Tuple, Optional
+from leaspy.models.utils.ordinal import OrdinalModelMixin, OrdinalLevelsLayout
 
 if TYPE_CHECKING:
     from leaspy.io.data.data import Data
@@ -28,6 +29,13 @@ class Dataset:
         If not None, will check compatibility of model and data
     algo : :class:`.AbstractAlgo` (optional)
         If not None, will check compatibility of algo and data
+    packed : bool (default False)
+        Whether model computations on this dataset should use the packed layout of visits
+        (cf. `visits_*` attributes) instead of the padded one.
+        It is opt-in: it saves memory and computations on datasets with very heterogeneous numbers of visits per individual,
+        with the same results as the padded layout (up to float rounding).
+        <!> In packed layout, the padded `timepoints`, `values` and `mask` tensors are only built on first access
+        (model computations never need them).
 
     Attributes
     ----------
@@ -55,11 +63,11 @@ class Dataset:
         Total number of observations
 
     timepoints : :class:`torch.FloatTensor`, shape (n_individuals, n_visits_max)
-        Ages of patients at their different visits
+        Ages of patients at their different visits (padded layout, lazily built for packed datasets)
     values : :class:`torch.FloatTensor`, shape (n_individuals, n_visits_max, dimension)
-        Values of patients for each visit for each feature
+        Values of patients for each visit for each feature (padded layout, lazily built for packed datasets)
     mask : :class:`torch.FloatTensor`, shape (n_individuals, n_visits_max, dimension)
-        Binary mask associated to values.
+        Binary mask associated to values (padded layout, lazily built for packed datasets).
         If 1: value is meaningful
         If 0: value is meaningless (either was nan or does not correspond to a real visit - only here for padding)
 
@@ -68,9 +76,24 @@ class Dataset:
     L2_norm : scalar :class:`torch.FloatTensor`
         Sum of all non-nan squared values
 
-    _one_hot_encoding : Dict[sf: bool, :class:`torch.LongTensor`]
+    _one_hot_encoding : Dict[(sf: bool, packed_levels: bool), :class:`torch.Tensor`]
         Values of patients for each visit for each feature, but tensorized into a one-hot encoding (pdf or sf)
-        Shapes of tensors are (n_individuals, n_visits_max, dimension, max_ordinal_level [-1 when `sf=True`])
+        Shapes of tensors are (n_individuals, n_visits_max, dimension, max_ordinal_level [-1 when `sf=True`]),
+        or (n_individuals, n_visits_max, n_ordinal_levels) in the packed layout of ordinal levels.
+
+    packed : bool
+        Whether the layout of the `visits_*` tensors, to be used for model computations, is packed or padded.
+    visits_subject_index : :class:`torch.LongTensor`, shape (n_visits,) or None
+        Index of the individual of each (real) visit, in packed layout only (None for padded layout)
+    visits_timepoints : :class:`torch.FloatTensor`, shape (n_visits, 1) or (n_individuals, n_visits_max)
+    visits_values : :class:`torch.FloatTensor`, shape (n_visits, 1, dimension) or (n_individuals, n_visits_max, dimension)
+    visits_mask : :class:`torch.FloatTensor`, shape (n_visits, 1, dimension) or (n_individuals, n_visits_max, dimension)
+        Time-points, values and mask to be used for model computations:
+            * in packed layout, there is one row per (real) visit, as if each visit was a pseudo-individual with a single visit
+              (no memory nor computations wasted on padded visits);
+            * in padded layout, they are the same tensors as `timepoints`, `values` and `mask`.
+        Use :meth:`.get_visits_individual_parameters` and :meth:`.sum_visits_per_individual` to go from individuals
+        to `visits_*` rows and back, whatever the layout.
 
     Raises
     ------
@@ -78,7 +101,7 @@ class Dataset:
         if data, model or algo are not compatible together.
     """
 
-    def __init__(self, data: Data, model: AbstractModel = None, algo: AbstractAlgo = None):
+    def __init__(self, data: Data, model: AbstractModel = None, algo: AbstractAlgo = None, *, packed: bool = False):
 
         self.headers = data.headers
         self.dimension = data.dimension
@@ -86,9 +109,10 @@ class Dataset:
         self.n_visits = data.n_visits
         self.indices = list(data.individuals.keys())
 
-        self.timepoints: torch.FloatTensor = None
-        self.values: torch.FloatTensor = None
-        self.mask: torch.FloatTensor = None
+        # padded tensors (cf. properties: lazily built from `visits_*` tensors in packed layout)
+        self._timepoints: torch.FloatTensor = None
+        self._values: torch.FloatTensor = None
+        self._mask: torch.FloatTensor = None
 
         self.n_observations: int = None
         self.n_observations_per_ft: torch.LongTensor = None
@@ -101,60 +125,316 @@ class Dataset:
         self.L2_norm: torch.FloatTensor = None
 
         # internally used by ordinal models only
-        self._one_hot_encoding: Dict[bool, torch.LongTensor] = None
+        self._ordinal_values_checked_with: KwargsType = None
+        self._one_hot_encoding: Dict[Tuple[bool, bool], torch.Tensor] = None
+        self._visits_one_hot_encoding: Dict[Tuple[bool, bool], torch.Tensor] = None
+
+        # layout of tensors used for model computations
+        self.packed: bool = None
+        self.visits_subject_index: torch.LongTensor = None
+        self.visits_timepoints: torch.FloatTensor = None
+        self.visits_values: torch.FloatTensor = None
+        self.visits_mask: torch.FloatTensor = None
 
         if model is not None:
             self._check_model_compatibility(data, model)
         if algo is not None:
             self._check_algo_compatibility(data, algo)
 
-        self._construct_values(data)
-        self._construct_timepoints(data)
+        self._construct_values(data, packed)
         self._compute_L2_norm()
 
-    def _construct_values(self, data: Data):
+    @property
+    def timepoints(self) -> torch.FloatTensor:
+        if self._timepoints is None:
+            self._timepoints = self._unpack_visits(self.visits_timepoints[:, 0])
+        return self._timepoints
 
-        self.n_visits_per_individual = [len(_.timepoints) for _ in data]
-        self.n_visits_max = max(self.n_visits_per_individual) if self.n_visits_per_individual else 0  # handle case when empty dataset
+    @timepoints.setter
+    def timepoints(self, t: torch.FloatTensor):
+        self._timepoints = t
 
-        values = torch.zeros((self.n_individuals, self.n_visits_max, self.dimension))
-        padding_mask = torch.zeros_like(values)
+    @property
+    def values(self) -> torch.FloatTensor:
+        if self._values is None:
+            self._values = self._unpack_visits(self.visits_values[:, 0])
+        return self._values
 
-        # TODO missing values in mask ?
+    @values.setter
+    def values(self, t: torch.FloatTensor):
+        self._values = t
 
-        for i, nb_vis in enumerate(self.n_visits_per_individual):
-            # PyTorch 1.10 warns: Creating a tensor from a list of numpy.ndarrays is extremely slow.
-            # Please consider converting the list to a single numpy.ndarray with numpy.array() before converting to a tensor.
-            # TODO: IndividualData.observations is really badly constructed (list of numpy 1D arrays), we should change this...
-            indiv_values = torch.tensor(np.array(data[i].observations), dtype=torch.float32)
-            values[i, 0:nb_vis, :] = indiv_values
-            padding_mask[i, 0:nb_vis, :] = 1.
+    @property
+    def mask(self) -> torch.FloatTensor:
+        if self._mask is None:
+            self._mask = self._unpack_visits(self.visits_mask[:, 0])
+        return self._mask
 
-        mask_missingvalues = (~torch.isnan(values)).float()
-        # mask should be 0 on visits outside individual's existing visits (he may have fewer visits than the individual with maximum nb of visits)
-        # (we need to enforce it here because we padded values with 0, not with nan, so actual mask is 1 on these fictive values)
-        mask = padding_mask * mask_missingvalues
+    @mask.setter
+    def mask(self, t: torch.FloatTensor):
+        self._mask = t
 
-        values[torch.isnan(values)] = 0.  # Set values of missing values to 0.
+    def _construct_values(self, data: Data, packed: bool):
+
+        subject_codes, data_timepoints, data_values = data.to_columnar()
+        self.n_visits_per_individual = np.bincount(subject_codes, minlength=self.n_individuals).tolist()
+        self.n_visits_max = max(self.n_visits_per_individual) if self.n_visits_per_individual else 0  # handle case when empty dataset
+
+        # one row per (real) visit, ordered by individual (as in padded tensors)
+        visits_subject_index = torch.tensor(subject_codes, dtype=torch.long)
+        timepoints = torch.tensor(data_timepoints, dtype=torch.float32)
+        values = torch.tensor(data_values, dtype=torch.float32).reshape(-1, self.dimension)
 
-        self.values = values
-        self.mask = mask
+        mask = (~torch.isnan(values)).float()
+        values[torch.isnan(values)] = 0.  # Set values of missing values to 0.
 
         # number of non-nan observations (different levels of aggregation)
-        self.n_observations_per_ind_per_ft = mask.sum(dim=1).int()
+        self.n_observations_per_ind_per_ft = torch.zeros((self.n_individuals, self.dimension)).index_add_(0, visits_subject_index, mask).int()
         self.n_observations_per_ft = self.n_observations_per_ind_per_ft.sum(dim=0)
         self.n_observations = self.n_observations_per_ft.sum().item()
 
-    def _construct_timepoints(self, data: Data):
-        self.timepoints = torch.zeros((self.n_individuals, self.n_visits_max))
-        nbs_vis = [len(_.timepoints) for _ in data]
-        for i, nb_vis in enumerate(nbs_vis):
-            self.timepoints[i, 0:nb_vis] = torch.tensor(data[i].timepoints)
+        self.packed = bool(packed)
+        if self.packed:
+            # padded tensors are never allocated unless explicitly requested
+            self.visits_subject_index = visits_subject_index
+            self.visits_timepoints, self.visits_values, self.visits_mask = timepoints.unsqueeze(1), values.unsqueeze(1), mask.unsqueeze(1)
+        else:
+            # mask is 0 on padded visits (values were padded with 0, not with nan)
+            self.timepoints, self.values, self.mask = map(self._unpack_visits, (timepoints, values, mask))
+            self._set_padded_visits_layout()
 
     def _compute_L2_norm(self):
-        self.L2_norm_per_ft = torch.sum(self.mask.float() * self.values * self.values, dim=(0,1)) # 1D tensor of shape (dimension,)
+        # same results with padded or packed visits (padded visits are masked)
+        self.L2_norm_per_ft = torch.sum(self.visits_mask * self.visits_values * self.visits_values, dim=(0,1)) # 1D tensor of shape (dimension,)
         self.L2_norm = self.L2_norm_per_ft.sum() # sum on all features
 
+    def _set_padded_visits_layout(self):
+        """Use the padded tensors (no copy) for model computations."""
+        self.visits_subject_index = None
+        self.visits_timepoints, self.visits_values, self.visits_mask = self.timepoints, self.values, self.mask
+
+    def _get_real_visits_mask(self) -> torch.BoolTensor:
+        """Boolean mask of real (i.e. not padded) visits, shape (n_individuals, n_visits_max)."""
+        device = self.n_observations_per_ind_per_ft.device
+        n_visits_per_individual = torch.tensor(self.n_visits_per_individual, dtype=torch.long, device=device)
+        return torch.arange(self.n_visits_max, device=device) < n_visits_per_individual.unsqueeze(-1)
+
+    def _unpack_visits(self, t: torch.Tensor) -> torch.Tensor:
+        """Get the padded tensor (n_individuals, n_visits_max, ...) from the rows of real visits (n_visits, ...), padded with 0."""
+        padded = torch.zeros((self.n_individuals, self.n_visits_max, *t.shape[1:]), dtype=t.dtype, device=t.device)
+        padded[self._get_real_visits_mask()] = t
+        return padded
+
+    def get_visits_individual_parameters(self, individual_parameters: DictParamsTorch) -> DictParamsTorch:
+        """
+        Get the individual parameters for the rows of the `visits_*` tensors.
+
+        Parameters
+        ----------
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` of shape (n_individuals, n_dims_param)]
+
+        Returns
+        -------
+        dict[param_name: str, :class:`torch.Tensor` of shape (n_visits, n_dims_param) or (n_individuals, n_dims_param)]
+            Depending on layout (the input individual parameters, as is, for padded layout).
+        """
+        if not self.packed:
+            return individual_parameters
+        return {k: v[self.visits_subject_index] for k, v in individual_parameters.items()}
+
+    def sum_visits_per_individual(self, t: torch.Tensor) -> torch.Tensor:
+        """
+        Sum a tensor computed on the `visits_*` tensors over the visits of each individual.
+
+        Parameters
+        ----------
+        t : :class:`torch.Tensor` of shape (n_visits, 1, ...) or (n_individuals, n_visits_max, ...)
+            Depending on layout (padded visits are expected to be already masked).
+
+        Returns
+        -------
+        :class:`torch.Tensor` of shape (n_individuals, ...)
+        """
+        t = t.sum(dim=1)
+        if not self.packed:
+            return t
+        return torch.zeros((self.n_individuals, *t.shape[1:]), dtype=t.dtype, device=t.device).index_add_(0, self.visits_subject_index, t)
+
+    def get_visits_one_hot_encoding(self, *, sf: bool, ordinal_infos: KwargsType, packed_levels: bool = False) -> torch.Tensor:
+        """
+        Get the one-hot encoding of ordinal data values (cf. :meth:`.get_one_hot_encoding`) with the layout of `visits_*` tensors.
+
+        Parameters
+        ----------
+        sf : bool
+        ordinal_infos : dict[str, Any]
+        packed_levels : bool (default False)
+
+        Returns
+        -------
+        One-hot encoding of data values, shape (n_visits, 1, dimension, ...) or (n_individuals, n_visits_max, dimension, ...)
+        (with a single flat dimension of ordinal levels instead of `dimension, ...` when `packed_levels` is True)
+        """
+        if not self.packed:
+            return self.get_one_hot_encoding(sf=sf, ordinal_infos=ordinal_infos, packed_levels=packed_levels)
+        if self._visits_one_hot_encoding is None:
+            self._visits_one_hot_encoding = {}
+        key = (sf, packed_levels)
+        if key not in self._visits_one_hot_encoding:
+            # directly built from packed values (no padded tensor)
+            self._visits_one_hot_encoding[key] = self._compute_one_hot_encoding(self.visits_values, sf=sf, ordinal_infos=ordinal_infos,
+                                                                                packed_levels=packed_levels)
+        return self._visits_one_hot_encoding[key]
+
+    def repeat(self, n_repeats: int) -> Dataset:
+        """
+        Get a new dataset where all individuals are repeated `n_repeats` times (block-wise).
+
+        The individual of index `i` in the new dataset is the individual of index `i % n_individuals`
+        in the current dataset, so that the `k`-th copy of all individuals is stored in rows
+        `k * n_individuals` to `(k+1) * n_individuals - 1` (e.g. one copy per chain in multi-chain MCMC).
+
+        <!> All aggregated statistics of the new dataset (number of observations, L2 norms, ...)
+        are the ones of the current dataset multiplied by `n_repeats`.
+
+        Parameters
+        ----------
+        n_repeats : int >= 1
+            Number of copies of the individuals.
+
+        Returns
+        -------
+        :class:`.Dataset`
+            A new dataset (tensors are not shared with current dataset unless `n_repeats` is 1).
+
+        Raises
+        ------
+        :exc:`.LeaspyInputError`
+            if `n_repeats` is not a positive integer.
+        """
+        if not (isinstance(n_repeats, int) and n_repeats >= 1):
+            raise LeaspyInputError(f"Number of repeats should be a positive integer, not {n_repeats}.")
+
+        repeated = copy.copy(self)
+        if n_repeats == 1:
+            return repeated
+
+        def repeat_ind(t: Optional[torch.Tensor]) -> Optional[torch.Tensor]:
+            return None if t is None else t.repeat(n_repeats, *([1] * (t.ndim - 1)))
+
+        repeated.n_individuals = n_repeats * self.n_individuals
+        repeated.n_visits = n_repeats * self.n_visits
+        repeated.indices = n_repeats * self.indices
+        repeated.n_visits_per_individual = n_repeats * self.n_visits_per_individual
+
+        # padded tensors may not be built yet (packed layout)
+        repeated.timepoints = repeat_ind(self._timepoints)
+        repeated.values = repeat_ind(self._values)
+        repeated.mask = repeat_ind(self._mask)
+
+        repeated.n_observations_per_ind_per_ft = repeat_ind(self.n_observations_per_ind_per_ft)
+        repeated.n_observations_per_ft = n_repeats * self.n_observations_per_ft
+        repeated.n_observations = n_repeats * self.n_observations
+
+        repeated.L2_norm_per_ft = n_repeats * self.L2_norm_per_ft
+        repeated.L2_norm = n_repeats * self.L2_norm
+
+        if self._one_hot_encoding is not None:
+            repeated._one_hot_encoding = {k: repeat_ind(t) for k, t in self._one_hot_encoding.items()}
+
+        if not self.packed:
+            repeated._set_padded_visits_layout()
+        else:
+            # packed visits of the `k`-th copy of individuals are stored after the ones of the `k-1`-th copy
+            repeated.visits_subject_index = torch.cat([self.visits_subject_index + k * self.n_individuals for k in range(n_repeats)])
+            repeated.visits_timepoints = repeat_ind(self.visits_timepoints)
+            repeated.visits_values = repeat_ind(self.visits_values)
+            repeated.visits_mask = repeat_ind(self.visits_mask)
+            if self._visits_one_hot_encoding is not None:
+                repeated._visits_one_hot_encoding = {k: repeat_ind(t) for k, t in self._visits_one_hot_encoding.items()}
+
+        return repeated
+
+    def iter_subjects_chunks(self, chunk_size: int) -> Iterator[Tuple[slice, Dataset]]:
+        """
+        Iterate over consecutive blocks of (at most) `chunk_size` individuals of the dataset.
+
+        It is used by models to bound the memory used by their computations on large datasets.
+
+        <!> The tensors of each chunk are views on the tensors of current dataset (no copy),
+        except for the one-hot encoding of ordinal values that is computed chunk per chunk
+        when it was not already cached in current dataset.
+
+        Parameters
+        ----------
+        chunk_size : int >= 1
+            Maximum number of individuals per chunk.
+
+        Yields
+        ------
+        individuals_slice : slice
+            Indices of the individuals of the chunk in current dataset.
+        chunk : :class:`.Dataset`
+            Dataset restricted to the individuals of the chunk.
+
+        Raises
+        ------
+        :exc:`.LeaspyInputError`
+            if `chunk_size` is not a positive integer.
+        """
+        if not (isinstance(chunk_size, int) and chunk_size >= 1):
+            raise LeaspyInputError(f"Chunk size should be a positive integer, not {chunk_size}.")
+
+        # bounds of visits of each individual in packed layout
+        visits_bounds = np.concatenate([[0], np.cumsum(self.n_visits_per_individual, dtype=int)]).tolist()
+
+        for start in range(0, self.n_individuals, chunk_size):
+            end = min(start + chunk_size, self.n_individuals)
+            yield slice(start, end), self._get_subjects_chunk(slice(start, end), slice(visits_bounds[start], visits_bounds[end]))
+
+    def _get_subjects_chunk(self, individuals_slice: slice, visits_slice: slice) -> Dataset:
+        """Get a dataset restricted to a block of consecutive individuals (and to their visits in packed layout)."""
+
+        def chunk_ind(t: Optional[torch.Tensor]) -> Optional[torch.Tensor]:
+            return None if t is None else t[individuals_slice]
+
+        def chunk_visits(t: Optional[torch.Tensor]) -> Optional[torch.Tensor]:
+            return None if t is None else t[visits_slice]
+
+        chunk = copy.copy(self)
+
+        chunk.n_individuals = individuals_slice.stop - individuals_slice.start
+        chunk.indices = self.indices[individuals_slice]
+        chunk.n_visits_per_individual = self.n_visits_per_individual[individuals_slice]
+        chunk.n_visits = visits_slice.stop - visits_slice.start
+
+        # padded tensors may not be built yet (packed layout)
+        chunk.timepoints = chunk_ind(self._timepoints)
+        chunk.values = chunk_ind(self._values)
+        chunk.mask = chunk_ind(self._mask)
+
+        chunk.n_observations_per_ind_per_ft = chunk_ind(self.n_observations_per_ind_per_ft)
+        chunk.n_observations_per_ft = chunk.n_observations_per_ind_per_ft.sum(dim=0)
+        chunk.n_observations = chunk.n_observations_per_ft.sum().item()
+
+        if self._one_hot_encoding is not None:
+            chunk._one_hot_encoding = {k: chunk_ind(t) for k, t in self._one_hot_encoding.items()}
+
+        if not self.packed:
+            chunk._set_padded_visits_layout()
+        else:
+            # packed visits are ordered by individual
+            chunk.visits_subject_index = chunk_visits(self.visits_subject_index) - individuals_slice.start
+            chunk.visits_timepoints = chunk_visits(self.visits_timepoints)
+            chunk.visits_values = chunk_visits(self.visits_values)
+            chunk.visits_mask = chunk_visits(self.visits_mask)
+            if self._visits_one_hot_encoding is not None:
+                chunk._visits_one_hot_encoding = {k: chunk_visits(t) for k, t in self._visits_one_hot_encoding.items()}
+
+        chunk._compute_L2_norm()
+
+        return chunk
+
     def get_times_patient(self, i: int) -> torch.FloatTensor:
         """
         Get ages for patient number ``i``
@@ -224,26 +504,29 @@ class Dataset:
         """
         Convert dataset to a `DataFrame`.
 
+        The long-format dataframe (one row per real visit, with nans for missing values) is built at once
+        from the packed (or padded) tensors, without any loop on individuals.
+        Visits are ordered as in dataset (by individual, then by time).
+
         Returns
         -------
         :class:`pandas.DataFrame`
+            With columns 'TIME', features and 'ID'.
         """
+        if self.packed:
+            subject_index = self.visits_subject_index
+            timepoints, values, mask = self.visits_timepoints[:, 0], self.visits_values[:, 0], self.visits_mask[:, 0]
+        else:
+            real_visits = self._get_real_visits_mask()
+            subject_index = real_visits.nonzero(as_tuple=True)[0]
+            timepoints, values, mask = self.timepoints[real_visits], self.values[real_visits], self.mask[real_visits]
 
-        # TODO : @Raphael : On est oblige de garder une dependance pandas ? Je crois que c'est utilise juste pour l'initialisation
-        # TODO : Si fait comme ca, il faut preallouer la memoire du dataframe a l'avance!
-        # du modele multivarie. On peut peut-etre s'en passer?
-        df = pd.DataFrame()
-
-        for i, idx in enumerate(self.indices):
-            times = self.get_times_patient(i).cpu().numpy()
-            x = self.get_values_patient(i).cpu().numpy()
-            df_patient = pd.DataFrame(data=x, index=times.reshape(-1), columns=self.headers)
-            df_patient.index.name = 'TIME'
-            df_patient['ID'] = idx
-            df = pd.concat([df, df_patient])
+        values = torch.where(mask.bool(), values, torch.tensor(float('nan'), dtype=values.dtype, device=values.device))
 
-        # df.columns = ['ID', 'TIME'] + self.headers
-        df.reset_index(inplace=True)
+        # the (contiguous) block of values is not copied by pandas
+        df = pd.DataFrame(values.cpu().numpy(), columns=self.headers, copy=False)
+        df.insert(0, 'TIME', timepoints.cpu().numpy())
+        df['ID'] = np.array(self.indices, dtype=object)[subject_index.cpu().numpy()]
 
         return df
 
@@ -255,20 +538,84 @@ class Dataset:
         ----------
         device : torch.device
         """
-        for attribute_name in dir(self):
-            if attribute_name.startswith('__'):
-                continue
-            attribute = getattr(self, attribute_name)
+        # <!> not `dir(self)` so not to build the padded tensors of a packed dataset
+        for attribute_name, attribute in list(vars(self).items()):
             if isinstance(attribute, torch.Tensor):
                 setattr(self, attribute_name, attribute.to(device))
 
         ## we have to manually put other variables to the new device
 
-        # Dictionary of one-hot encoded values
+        # Dictionaries of one-hot encoded values
         if self._one_hot_encoding is not None:
             self._one_hot_encoding = {k: t.to(device) for k, t in self._one_hot_encoding.items()}
+        if self._visits_one_hot_encoding is not None:
+            self._visits_one_hot_encoding = {k: t.to(device) for k, t in self._visits_one_hot_encoding.items()}
+
+        # keep sharing the padded tensors for model computations (no copy)
+        if not self.packed:
+            self._set_padded_visits_layout()
 
-    def get_one_hot_encoding(self, *, sf: bool, ordinal_infos: KwargsType):
+    def check_ordinal_values(self, ordinal_infos: KwargsType) -> None:
+        """
+        Check, once for all (for given `ordinal_infos`), that data values are consistent with the ordinal levels of features.
+
+        It is automatically called when building the one-hot encoding of ordinal data (cf. :meth:`.get_one_hot_encoding`),
+        but it should be called beforehand on the full dataset when one-hot encodings are built chunk per chunk.
+
+        Parameters
+        ----------
+        ordinal_infos : dict[str, Any]
+            All the hyperparameters concerning ordinal modelling (in particular maximum level per features)
+
+        Raises
+        ------
+        :exc:`.LeaspyInputError`
+            if data values are not integers or if features are not consistent with `ordinal_infos`.
+        """
+        if ordinal_infos is self._ordinal_values_checked_with:
+            return
+
+        # Check for values different than integers
+        # (real visits only in packed layout)
+        if (self.visits_values != self.visits_values.round()).any():
+            raise LeaspyInputError("Please make sure your data contains only integers when using ordinal noise modelling.")
+
+        # First of all check consistency of features given in ordinal_infos compared to the ones in the dataset (names & order!)
+        ordinal_feat_names = [d['name'] for d in ordinal_infos['features']]
+        if ordinal_feat_names != self.headers:
+            raise LeaspyInputError(f"Features stored in ordinal model ({ordinal_feat_names}) are not consistent with features in data ({self.headers})")
+
+        # Now check that integers are within the expected range, per feature [0, max_level_ft]
+        vals = self.visits_values.long()
+        vals_issues = {
+            'unexpected': [],
+            'missing': [],
+        }
+        for ft_i, d_ordinal_ft in enumerate(ordinal_infos['features']):
+            ft = d_ordinal_ft['name']
+            max_level_ft = d_ordinal_ft['max_level']  # included
+            expected_codes = set(range(0, max_level_ft + 1))
+
+            vals_ft = vals[:, :, ft_i]
+            actual_codes = set(vals_ft.unique().tolist())
+            unexpected_codes = sorted(actual_codes.difference(expected_codes))
+            missing_codes = sorted(expected_codes.difference(actual_codes))
+            if len(unexpected_codes) > 0:
+                vals_issues['unexpected'].append(f"- {ft} [[0..{max_level_ft}]]: {unexpected_codes} were unexpected")
+            if len(missing_codes) > 0:
+                # nota: nans are encoded with 0 in values so if the level 0 is missing but they are nans we'll never catch it... TODO fix?
+                vals_issues['missing'].append(f"- {ft} [[0..{max_level_ft}]]: {missing_codes} are missing")
+
+        if len(vals_issues['unexpected']):
+            warnings.warn(f"Some features have unexpected codes (they were clipped to the maximum known level):\n"
+                          + '\n'.join(vals_issues['unexpected']))
+        if len(vals_issues['missing']):
+            warnings.warn(f"Some features have missing codes:\n"
+                          + '\n'.join(vals_issues['missing']))
+
+        self._ordinal_values_checked_with = ordinal_infos
+
+    def get_one_hot_encoding(self, *, sf: bool, ordinal_infos: KwargsType, packed_levels: bool = False):
         """
         Builds the one-hot encoding of ordinal data once and for all and returns it.
 
@@ -281,59 +628,48 @@ class Dataset:
         ordinal_infos : dict[str, Any]
             All the hyperparameters concerning ordinal modelling (in particular maximum level per features)
 
+        packed_levels : bool (default False)
+            Whether to use the packed layout of ordinal levels (cf. :class:`.OrdinalLevelsLayout`),
+            i.e. a single flat dimension with the possible levels of all features (float values),
+            instead of the padded layout (dimension, max_level [+ 1 for pdf]).
+
         Returns
         -------
         One-hot encoding of data values.
         """
 
         if self._one_hot_encoding is None:
-            ## Check the data & construct the one-hot encodings once for all for fast look-up afterwards
-
-            # Check for values different than integers
-            if (self.values != self.values.round()).any():
-                raise LeaspyInputError("Please make sure your data contains only integers when using ordinal noise modelling.")
-
-            # First of all check consistency of features given in ordinal_infos compared to the ones in the dataset (names & order!)
-            ordinal_feat_names = [d['name'] for d in ordinal_infos['features']]
-            if ordinal_feat_names != self.headers:
-                raise LeaspyInputError(f"Features stored in ordinal model ({ordinal_feat_names}) are not consistent with features in data ({self.headers})")
-
-            # Now check that integers are within the expected range, per feature [0, max_level_ft]
-            vals = self.values.long()
-            vals_issues = {
-                'unexpected': [],
-                'missing': [],
-            }
-            for ft_i, d_ordinal_ft in enumerate(ordinal_infos['features']):
-                ft = d_ordinal_ft['name']
-                max_level_ft = d_ordinal_ft['max_level']  # included
-                expected_codes = set(range(0, max_level_ft + 1))
-
-                vals_ft = vals[:, :, ft_i]
-                actual_codes = set(vals_ft.unique().tolist())
-                unexpected_codes = sorted(actual_codes.difference(expected_codes))
-                missing_codes = sorted(expected_codes.difference(actual_codes))
-                if len(unexpected_codes) > 0:
-                    vals_issues['unexpected'].append(f"- {ft} [[0..{max_level_ft}]]: {unexpected_codes} were unexpected")
-                if len(missing_codes) > 0:
-                    # nota: nans are encoded with 0 in values so if the level 0 is missing but they are nans we'll never catch it... TODO fix?
-                    vals_issues['missing'].append(f"- {ft} [[0..{max_level_ft}]]: {missing_codes} are missing")
-
-                # clip the values (per feature)
-                vals[:, :, ft_i] = vals_ft.clamp(0, max_level_ft)
-
-            if len(vals_issues['unexpected']):
-                warnings.warn(f"Some features have unexpected codes (they were clipped to the maximum known level):\n"
-                              + '\n'.join(vals_issues['unexpected']))
-            if len(vals_issues['missing']):
-                warnings.warn(f"Some features have missing codes:\n"
-                              + '\n'.join(vals_issues['missing']))
-
-            # one-hot encode all the values after the checks & clipping
-            vals_pdf = torch.nn.functional.one_hot(vals, num_classes=ordinal_infos['max_level'] + 1)
+            self._one_hot_encoding = {}
+
+        key = (sf, packed_levels)
+        if key not in self._one_hot_encoding:
+            ## Check the data & construct the one-hot encoding once for all for fast look-up afterwards
+            self._one_hot_encoding[key] = self._compute_one_hot_encoding(self.values, sf=sf, ordinal_infos=ordinal_infos,
+                                                                         packed_levels=packed_levels)
+
+        return self._one_hot_encoding[key]
+
+    def _compute_one_hot_encoding(self, values: torch.FloatTensor, *, sf: bool, ordinal_infos: KwargsType,
+                                  packed_levels: bool) -> torch.Tensor:
+        """Compute the one-hot encoding of the given (padded or packed) data values, cf. :meth:`.get_one_hot_encoding`."""
+        self.check_ordinal_values(ordinal_infos)
+
+        # clip the values (per feature)
+        max_level_per_ft = torch.tensor([d['max_level'] for d in ordinal_infos['features']], device=values.device)
+        vals = torch.minimum(values.long().clamp(min=0), max_level_per_ft)
+
+        if packed_levels:
+            # compare values with all possible levels of their feature (no padding)
+            levels = OrdinalLevelsLayout.from_ordinal_infos(ordinal_infos, device=vals.device)
+            if sf:
+                one_hot_encoding = vals[..., levels.sf_feature_index] >= levels.sf_levels
+            else:
+                one_hot_encoding = vals[..., levels.pdf_feature_index] == levels.pdf_levels
+            return one_hot_encoding.float()
+
+        # one-hot encode all the values after the checks & clipping
+        one_hot_encoding = torch.nn.functional.one_hot(vals, num_classes=ordinal_infos['max_level'] + 1)
+        if sf:
             # build the survival function by simple (1 - cumsum) and remove the useless P(X >= 0) = 1
-            vals_sf = OrdinalModelMixin.compute_ordinal_sf_from_ordinal_pdf(vals_pdf)
-            # cache the values to retrive them fast afterwards
-            self._one_hot_encoding = {False: vals_pdf, True: vals_sf}
-
-        return self._one_hot_encoding[sf]
+            one_hot_encoding = OrdinalModelMixin.compute_ordinal_sf_from_ordinal_pdf(one_hot_encoding)
+        return one_hot_encoding
@@ -1,5 +1,3 @@
-from bisect import bisect
-
 import numpy as np
 
 from leaspy.exceptions import LeaspyDataInputError, LeaspyTypeError
@@ -30,10 +28,33 @@ class IndividualData:
 
     def __init__(self, idx: IDType):
         self.idx: IDType = idx
-        self.timepoints: np.ndarray = None
-        self.observations: np.ndarray = None
+        self._timepoints: np.ndarray = None
+        self._observations: np.ndarray = None
         self.cofactors: Dict[FeatureType, Any] = {}
 
+        # incremented each time timepoints or observations are replaced (e.g. to invalidate caches of `Data`)
+        self._version: int = 0
+
+    @property
+    def timepoints(self) -> np.ndarray:
+        """Timepoints associated with the observations"""
+        return self._timepoints
+
+    @timepoints.setter
+    def timepoints(self, timepoints: np.ndarray) -> None:
+        self._timepoints = timepoints
+        self._version += 1
+
+    @property
+    def observations(self) -> np.ndarray:
+        """Observed data points, shape ``(n_timepoints, n_features)``"""
+        return self._observations
+
+    @observations.setter
+    def observations(self, observations: np.ndarray) -> None:
+        self._observations = observations
+        self._version += 1
+
     def add_observations(self, timepoints: List[float], observations: List[List[float]]) -> None:
         """
         Include new observations and associated timepoints
@@ -49,25 +70,24 @@ class IndividualData:
         ------
         :exc:`.LeaspyDataInputError`
         """
-        for t, obs in zip(timepoints, observations):
-            if self.timepoints is None:
-                self.timepoints = np.array([t])
-                self.observations = np.array([obs])
-            elif t in self.timepoints:
-                raise LeaspyDataInputError(f"Trying to overwrite timepoint {t} "
-                                           f"of individual {self.idx}")
-            else:
-                index = bisect(self.timepoints, t)
-                self.timepoints = np.concatenate([
-                    self.timepoints[:index],
-                    [t],
-                    self.timepoints[index:]
-                ])
-                self.observations = np.concatenate([
-                    self.observations[:index],
-                    [obs],
-                    self.observations[index:]
-                ])
+        timepoints = np.asarray(timepoints).reshape(-1)
+        observations = np.asarray(observations)
+
+        # all new observations are checked & inserted at once (no partial insertion on error)
+        new_timepoints = timepoints if self.timepoints is None else np.concatenate([self.timepoints, timepoints])
+        order = np.argsort(new_timepoints, kind='stable')
+        new_timepoints = new_timepoints[order]
+
+        # duplicated timepoints are consecutive once sorted
+        duplicated = new_timepoints[1:] == new_timepoints[:-1]
+        if duplicated.any():
+            t = new_timepoints[1:][duplicated][0]
+            raise LeaspyDataInputError(f"Trying to overwrite timepoint {t} "
+                                       f"of individual {self.idx}")
+
+        new_observations = observations if self.observations is None else np.concatenate([self.observations, observations])
+        self.timepoints = new_timepoints
+        self.observations = new_observations[order]
 
     def add_cofactors(self, d: Dict[FeatureType, Any]) -> None:
         """
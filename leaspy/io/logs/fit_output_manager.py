@@ -1,7 +1,7 @@
-import csv
 import os
 import time
 
+from leaspy.io.logs.trace_store import TraceWriter
 from leaspy.io.logs.visualization.plotter import Plotter
 
 
@@ -29,6 +29,10 @@ class FitOutputManager:
         trajectory by the model
     path_save_model_parameters_convergence : str
         Path of the subfolder of path_output containing the progression of the model's parameters convergence
+    traces_model_parameters : :class:`.TraceWriter` or None
+        Binary trace store of the model's parameters (in subfolder `model_parameters` of path_save_model_parameters_convergence)
+    traces_realizations : :class:`.TraceWriter` or None
+        Binary trace store of the individual realizations (in subfolder `realizations` of path_save_model_parameters_convergence)
     periodicity_plot : int (default 100)
         Set the frequency of the display of the plots
     periodicity_print : int
@@ -73,6 +77,15 @@ class FitOutputManager:
 
         self.save_last_n_realizations = outputs.save_last_n_realizations
 
+        # traces are buffered & written asynchronously (instead of re-opening text files at each save)
+        self.traces_model_parameters = None
+        self.traces_realizations = None
+        if self.path_save_model_parameters_convergence is not None:
+            self.traces_model_parameters = TraceWriter(
+                os.path.join(self.path_save_model_parameters_convergence, 'model_parameters'))
+            self.traces_realizations = TraceWriter(
+                os.path.join(self.path_save_model_parameters_convergence, 'realizations'))
+
     def iteration(self, algo, data, model, realizations):
         """
         Call methods to save state of the running computation, display statistics & plots if the current iteration
@@ -165,7 +178,7 @@ class FitOutputManager:
 
     def save_model_parameters_convergence(self, iteration, model):
         """
-        Save the current state of the model's parameters
+        Save the current state of the model's parameters (buffered, in the binary trace store of model parameters)
 
         Parameters
         ----------
@@ -174,43 +187,11 @@ class FitOutputManager:
         model : :class:`~.models.abstract_model.AbstractModel`
             The model used by the computation
         """
-        model_parameters = model.parameters
-
-        # TODO maybe better way ???
-        model_parameters_save = model_parameters.copy()
-
-        # TODO I Stopped here, 2d array saves should be fixed.
-
-        # Transform the types
-        for key, value in model_parameters.items():
-
-            if value.ndim > 1:
-                if key == "betas":
-                    model_parameters_save.pop(key)
-                    for column in range(value.shape[1]):
-                        model_parameters_save[f"{key}_{column}"] = value[:, column].tolist()
-                if key == "deltas":
-                    model_parameters_save.pop(key)
-                    for line in range(value.shape[0]):
-                        model_parameters_save[f"{key}_{line}"] = value[line].tolist()
-                # P0, V0
-                elif value.shape[0] == 1 and len(value.shape) > 1:
-                    model_parameters_save[key] = value[0].tolist()
-            elif value.ndim == 1:
-                model_parameters_save[key] = value.tolist()
-            else:  # ndim == 0
-                model_parameters_save[key] = [value.tolist()]
-
-        # Save the dictionary
-        for key, value in model_parameters_save.items():
-            path = os.path.join(self.path_save_model_parameters_convergence, key + ".csv")
-            with open(path, 'a', newline='') as filename:
-                writer = csv.writer(filename)
-                writer.writerow([iteration] + value)
+        self.traces_model_parameters.append(iteration, model.parameters)
 
     def save_realizations(self, iteration, realizations):
         """
-        Save the current realizations. The path is given by the attribute path_save_model_parameters_convergence
+        Save the current realizations of all individual variables (buffered, in the binary trace store of realizations)
 
         Parameters
         ----------
@@ -219,22 +200,16 @@ class FitOutputManager:
         realizations : :class:`~.io.realizations.collection_realization.CollectionRealization`
             Current state of the realizations
         """
-        # TODO: not generic at all
-        for name in ['xi', 'tau']:
-            value = realizations[name].tensor_realizations.squeeze(1).detach().tolist()
-            path = os.path.join(self.path_save_model_parameters_convergence, name + ".csv")
-            with open(path, 'a', newline='') as filename:
-                writer = csv.writer(filename)
-                # writer.writerow([iteration]+list(model_parameters.values()))
-                writer.writerow([iteration] + value)
-        if "sources" in realizations.reals_ind_variable_names:
-            for i in range(realizations['sources'].tensor_realizations.shape[1]):
-                value = realizations['sources'].tensor_realizations[:, i].detach().tolist()
-                path = os.path.join(self.path_save_model_parameters_convergence, 'sources' + str(i) + ".csv")
-                with open(path, 'a', newline='') as filename:
-                    writer = csv.writer(filename)
-                    # writer.writerow([iteration]+list(model_parameters.values()))
-                    writer.writerow([iteration] + value)
+        self.traces_realizations.append(iteration, {name: realizations[name].tensor_realizations
+                                                    for name in realizations.reals_ind_variable_names})
+
+    def close(self):
+        """
+        Write all the buffered traces on disk (to be called at the end of the algorithm)
+        """
+        for traces in (self.traces_model_parameters, self.traces_realizations):
+            if traces is not None:
+                traces.close()
 
     ########
     ## Plotting methods
@@ -249,7 +224,8 @@ class FitOutputManager:
         model : :class:`~.models.abstract_model.AbstractModel`
             The model used by the computation
         """
-        self.plotter.plot_convergence_model_parameters(self.path_save_model_parameters_convergence,
+        self.traces_model_parameters.flush(wait=True)
+        self.plotter.plot_convergence_model_parameters(self.traces_model_parameters.path,
                                                        self.path_plot_convergence_model_parameters_1,
                                                        self.path_plot_convergence_model_parameters_2,
                                                        model)
@@ -0,0 +1,289 @@
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import torch
+
+from leaspy.exceptions import LeaspyInputError
+from leaspy.utils.typing import Dict, KwargsType, List, Optional, Tuple
+
+
+class TraceWriter:
+    """
+    Buffered, append-only binary store of traces (e.g. of model parameters along iterations of an algorithm).
+
+    The store is a folder containing:
+        * `metadata.json`: format version, and shape & dtype of each trace
+        * `<name>.bin`: the raw records of trace `name`, appended one after the other
+
+    Each record is made of the iteration (int64) followed by the (flattened) values of the trace at this iteration.
+    Records are first written in pre-allocated in-memory buffers, which are appended to their files
+    (in a background thread) when they are full, or when :meth:`.flush` is called.
+
+    Parameters
+    ----------
+    path : str
+        Path of the folder of the trace store (created if needed).
+    buffer_size : int (default 1 MiB)
+        Size (in bytes) of the buffer of each trace.
+
+    Attributes
+    ----------
+    traces : dict[str, dict]
+        Shape & dtype of each trace (as in metadata file).
+
+    See Also
+    --------
+    :class:`.TraceReader`
+    """
+
+    format_version = 1
+    metadata_file = 'metadata.json'
+    records_extension = '.bin'
+
+    def __init__(self, path: str, buffer_size: int = 2**20):
+        if not (isinstance(buffer_size, int) and buffer_size > 0):
+            raise LeaspyInputError(f"The `buffer_size` of traces should be a positive integer, not {buffer_size}.")
+        self.path = path
+        self.buffer_size = buffer_size
+        os.makedirs(path, exist_ok=True)
+
+        self.traces: Dict[str, KwargsType] = {}
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._n_buffered: Dict[str, int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Future] = []
+
+    @staticmethod
+    def records_dtype(shape: Tuple[int, ...], dtype) -> np.dtype:
+        """
+        Numpy (structured) dtype of the records of a trace.
+
+        Parameters
+        ----------
+        shape : tuple[int, ...]
+            Shape of the trace values at each iteration.
+        dtype : str or :class:`numpy.dtype`
+            Dtype of the trace values.
+
+        Returns
+        -------
+        :class:`numpy.dtype`
+        """
+        return np.dtype([('iter', '<i8'), ('values', np.dtype(dtype).newbyteorder('<'), tuple(shape))])
+
+    def _records_path(self, name: str) -> str:
+        return os.path.join(self.path, name + self.records_extension)
+
+    def _add_trace(self, name: str, values: np.ndarray) -> None:
+        self.traces[name] = {'shape': list(values.shape), 'dtype': values.dtype.str}
+        records_dtype = self.records_dtype(values.shape, values.dtype)
+        self._buffers[name] = np.empty(max(1, self.buffer_size // records_dtype.itemsize), dtype=records_dtype)
+        self._n_buffered[name] = 0
+
+        # new traces are rare: metadata is written synchronously
+        with open(os.path.join(self.path, self.metadata_file), 'w') as fp:
+            json.dump({'format_version': self.format_version, 'traces': self.traces}, fp, indent=2)
+
+    def append(self, iteration: int, values: Dict[str, object]) -> None:
+        """
+        Append the values of some traces at an iteration.
+
+        Parameters
+        ----------
+        iteration : int
+            The current iteration.
+        values : dict[str, array-like]
+            Values of traces at this iteration (`torch.Tensor`, :class:`numpy.ndarray` or scalars),
+            they are copied so they may be safely modified afterwards.
+            The size of values of a given trace should not change across iterations.
+
+        Raises
+        ------
+        :exc:`.LeaspyInputError`
+            If the size of values of a trace changed.
+        """
+        for name, value in values.items():
+            if isinstance(value, torch.Tensor):
+                value = value.detach().cpu().numpy()
+            value = np.asarray(value)
+
+            if name not in self.traces:
+                self._add_trace(name, value)
+
+            buffer = self._buffers[name]
+            shape = buffer.dtype['values'].shape
+            if value.size != np.prod(shape, dtype=int):
+                raise LeaspyInputError(f"The trace '{name}' has values of shape {tuple(shape)}, "
+                                       f"not {value.shape} at iteration {iteration}.")
+
+            i_record = self._n_buffered[name]
+            buffer['iter'][i_record] = iteration
+            buffer['values'][i_record] = value.reshape(shape)
+            self._n_buffered[name] += 1
+
+            if self._n_buffered[name] == len(buffer):
+                self._flush_trace(name)
+
+    def _flush_trace(self, name: str) -> None:
+        n_buffered = self._n_buffered[name]
+        if n_buffered == 0:
+            return
+
+        # the filled buffer is handed over to the writing thread and replaced by a new one
+        records = self._buffers[name][:n_buffered]
+        self._buffers[name] = np.empty_like(self._buffers[name])
+        self._n_buffered[name] = 0
+
+        if self._executor is None:
+            # a single worker so that records are appended in order
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='leaspy-traces')
+        self._pending_writes.append(self._executor.submit(self._write_records, self._records_path(name), records))
+        self._check_pending_writes(wait=False)
+
+    @staticmethod
+    def _write_records(path: str, records: np.ndarray) -> None:
+        with open(path, 'ab') as fp:
+            records.tofile(fp)
+
+    def _check_pending_writes(self, wait: bool) -> None:
+        # raise errors that happened in writing thread, if any
+        still_pending = []
+        for future in self._pending_writes:
+            if wait or future.done():
+                future.result()
+            else:
+                still_pending.append(future)
+        self._pending_writes = still_pending
+
+    def flush(self, wait: bool = True) -> None:
+        """
+        Append all buffered records to their files.
+
+        Parameters
+        ----------
+        wait : bool (default True)
+            Whether to wait for records to be written on disk (e.g. before reading traces).
+        """
+        for name in self.traces:
+            self._flush_trace(name)
+        if wait:
+            self._check_pending_writes(wait=True)
+
+    def close(self) -> None:
+        """
+        Write all buffered records on disk and stop the writing thread (it is restarted if needed afterwards).
+        """
+        self.flush(wait=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TraceReader:
+    """
+    Reader of a trace store written by :class:`.TraceWriter`.
+
+    Records are memory-mapped, and only complete records are read (so traces can be read while they are written).
+
+    Parameters
+    ----------
+    path : str
+        Path of the folder of the trace store.
+
+    Attributes
+    ----------
+    traces : dict[str, dict]
+        Shape & dtype of each trace.
+
+    Raises
+    ------
+    :exc:`.LeaspyInputError`
+        If the folder is not a valid trace store.
+    """
+
+    def __init__(self, path: str):
+        metadata_path = os.path.join(path, TraceWriter.metadata_file)
+        if not os.path.isfile(metadata_path):
+            raise LeaspyInputError(f"'{path}' is not a trace store: '{TraceWriter.metadata_file}' is missing.")
+        with open(metadata_path, 'r') as fp:
+            metadata = json.load(fp)
+        if metadata.get('format_version', None) != TraceWriter.format_version:
+            raise LeaspyInputError(f"Unsupported format version of trace store: {metadata.get('format_version', None)}.")
+
+        self.path = path
+        self.traces: Dict[str, KwargsType] = metadata['traces']
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Names of all traces in store.
+
+        Returns
+        -------
+        list[str]
+        """
+        return list(self.traces)
+
+    def get(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a trace.
+
+        Parameters
+        ----------
+        name : str
+            Name of the trace.
+
+        Returns
+        -------
+        iterations : :class:`numpy.ndarray` of shape (n_records,)
+        values : :class:`numpy.ndarray` of shape (n_records, *trace_shape)
+            Read-only and memory-mapped.
+
+        Raises
+        ------
+        :exc:`.LeaspyInputError`
+            If the trace does not exist.
+        """
+        if name not in self.traces:
+            raise LeaspyInputError(f"Unknown trace '{name}', should be in {self.names}.")
+        trace = self.traces[name]
+        records_dtype = TraceWriter.records_dtype(trace['shape'], trace['dtype'])
+        records_path = os.path.join(self.path, name + TraceWriter.records_extension)
+
+        # ignore an incomplete last record (being written)
+        n_records = os.path.getsize(records_path) // records_dtype.itemsize if os.path.isfile(records_path) else 0
+        if n_records == 0:
+            records = np.empty(0, dtype=records_dtype)
+        else:
+            records = np.memmap(records_path, dtype=records_dtype, mode='r', shape=(n_records,))
+
+        return np.asarray(records['iter']), records['values']
+
+    def to_dataframe(self, name: str) -> pd.DataFrame:
+        """
+        Get a trace as a dataframe (with one column per flattened value).
+
+        Parameters
+        ----------
+        name : str
+            Name of the trace.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+            Indexed by 'iter', with columns `name` for scalar traces or `name_i_j...` otherwise.
+        """
+        iterations, values = self.get(name)
+        shape = tuple(self.traces[name]['shape'])
+        columns = [name] if shape == () else [f"{name}_{'_'.join(map(str, ix))}" for ix in np.ndindex(*shape)]
+        return pd.DataFrame(np.asarray(values).reshape(len(iterations), -1), columns=columns,
+                            index=pd.Index(iterations, name='iter'))
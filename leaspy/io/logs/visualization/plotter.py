@@ -14,6 +14,7 @@ from matplotlib.lines import Line2D
 import matplotlib.backends.backend_pdf
 
 from leaspy.io.data.dataset import Dataset
+from leaspy.io.logs.trace_store import TraceReader
 from leaspy.exceptions import LeaspyInputError
 
 
@@ -411,9 +412,25 @@ class Plotter:
     ## TODO : Refaire avec le path qui est fourni en haut!
     @staticmethod
     def plot_convergence_model_parameters(path, path_saveplot_1, path_saveplot_2, model):
+        """
+        Plot the convergence of the model parameters, from their traces saved during calibration.
+
+        Parameters
+        ----------
+        path : str
+            Path of the trace store of model parameters (cf. :class:`.TraceReader`).
+        path_saveplot_1 : str
+            Path of the first plot (all model parameters but `betas`).
+        path_saveplot_2 : str
+            Path of the second plot (noise or log-likelihood, population variables & individual variables).
+        model : :class:`~.models.abstract_model.AbstractModel`
+            The model being calibrated.
+        """
         # TODO? add legends (color <-> feature, esp. for g/v0/noise_std/deltas)
         # TODO? add loss (log-likelihood) or some information criteria AIC/BIC
 
+        traces = TraceReader(path)
+
         # figure dimensions
         width = 10
         height_per_row = 3.5
@@ -434,9 +451,7 @@ class Plotter:
 
         for i, key in enumerate(params_to_plot_1):
 
-            import_path = os.path.join(path, key + ".csv")
-            df_convergence = pd.read_csv(import_path, index_col=0, header=None)
-            df_convergence.index.rename("iter", inplace=True)
+            df_convergence = traces.to_dataframe(key)
 
             x_position = i // 2
             y_position = i % 2
@@ -471,9 +486,7 @@ class Plotter:
         # Noise std-dev
         model_with_ll = getattr(model, 'is_ordinal', False) or getattr(model, 'noise_model', None) == 'bernoulli'
         if not model_with_ll:
-            import_path = os.path.join(path, 'noise_std.csv')
-            df_convergence = pd.read_csv(import_path, index_col=0, header=None)
-            df_convergence.index.rename("iter", inplace=True)
+            df_convergence = traces.to_dataframe('noise_std')
             y_position = 0
             df_convergence.plot(ax=ax[y_position], legend=False)
             ax[y_position].set_title('noise_std')
@@ -481,9 +494,7 @@ class Plotter:
             plt.grid(True)
         # LL for other models
         else:
-            import_path = os.path.join(path, 'log-likelihood.csv')
-            df_convergence = pd.read_csv(import_path, index_col=0, header=None)
-            df_convergence.index.rename("iter", inplace=True)
+            df_convergence = traces.to_dataframe('log-likelihood')
             y_position = 0
             df_convergence.plot(ax=ax[y_position], legend=False)
             ax[y_position].set_title('log-likelihood')
@@ -493,24 +504,9 @@ class Plotter:
         for i, key in enumerate(reals_pop_name):
             y_position += 1
             ax[y_position].set_title(key)
-            if key == 'deltas' and getattr(model, 'is_ordinal', False):
-                for dim in range(model.dimension):
-                    import_path = os.path.join(path, key + "_" + str(dim) + ".csv")
-                    df_convergence = pd.read_csv(import_path, index_col=0, header=None)
-                    df_convergence.index.rename("iter", inplace=True)
-                    df_convergence.plot(ax=ax[y_position], legend=False)
-            elif key not in ['betas']:
-                import_path = os.path.join(path, key + ".csv")
-                df_convergence = pd.read_csv(import_path, index_col=0, header=None)
-                df_convergence.index.rename("iter", inplace=True)
-                df_convergence.plot(ax=ax[y_position], legend=False)
-            else:
-                for source_dim in range(model.source_dimension):
-                    # TODO: better legend?
-                    import_path = os.path.join(path, key + "_" + str(source_dim) + ".csv")
-                    df_convergence = pd.read_csv(import_path, index_col=0, header=None)
-                    df_convergence.index.rename("iter", inplace=True)
-                    df_convergence.plot(ax=ax[y_position], legend=False)
+            # all (flattened) values of multi-dimensional parameters (e.g. betas or ordinal deltas) on same axis
+            # TODO: better legend?
+            traces.to_dataframe(key).plot(ax=ax[y_position], legend=False)
 
         quartiles_factor = 0.6745 # = scipy.stats.norm.ppf(.75)
 
@@ -519,13 +515,8 @@ class Plotter:
             if skip_sources and key in ['sources']:
                 continue
 
-            import_path_mean = os.path.join(path, f"{key}_mean.csv")
-            df_convergence_mean = pd.read_csv(import_path_mean, index_col=0, header=None)
-            df_convergence_mean.index.rename("iter", inplace=True)
-
-            import_path_std = os.path.join(path, f"{key}_std.csv")
-            df_convergence_std = pd.read_csv(import_path_std, index_col=0, header=None)
-            df_convergence_std.index.rename("iter", inplace=True)
+            df_convergence_mean = traces.to_dataframe(f"{key}_mean")
+            df_convergence_std = traces.to_dataframe(f"{key}_std")
 
             df_convergence_mean.columns = [f"{key}_mean"]
             df_convergence_std.columns = [f"{key}_std"] # is it variance or std-dev??
@@ -9,7 +9,7 @@ import pandas as pd
 import torch
 
 from leaspy.exceptions import LeaspyIndividualParamsInputError
-from leaspy.utils.typing import IDType, ParamType, DictParams, DictParamsTorch, Iterable, List, Callable, Dict, Tuple
+from leaspy.utils.typing import IDType, ParamType, DictParams, DictParamsTorch, Iterable, List, Callable, Dict, Tuple, Optional
 
 
 class IndividualParameters:
@@ -20,12 +20,18 @@ class IndividualParameters:
     There are used as output of the `personalization algorithms` and as input/output of the `simulation algorithm`,
     to provide an initial distribution of individual parameters.
 
+    Individual parameters are stored in a columnar way: one array per parameter (one row per individual),
+    together with an index of rows of individuals (so that look-ups & insertions are in constant time).
+
     Attributes
     ----------
     _indices : list
         List of the patient indices
-    _individual_parameters : dict
-        Individual indices (key) with their corresponding individual parameters {parameter name: parameter value}
+    _index_to_row : dict
+        Row of each individual (key) in the arrays of individual parameters (built lazily when needed)
+    _parameters_values : dict
+        Array of values for each individual parameter {parameter name: array of shape (capacity, *parameter shape)}
+        (only the `len(_indices)` first rows are used, the others are reserved for future insertions)
     _parameters_shape : dict
         Shape of each individual parameter
     _default_saving_type : str
@@ -34,9 +40,18 @@ class IndividualParameters:
 
     VALID_IO_EXTENSIONS = ['csv', 'json']
 
+    # binary columnar format (cf. `save_columnar`)
+    columnar_format_version = 1
+    columnar_metadata_file = 'metadata.json'
+    columnar_indices_file = 'indices.npy'
+
+    # capacity of arrays of individual parameters at first insertion (doubled each time it is exceeded)
+    _initial_capacity = 16
+
     def __init__(self):
         self._indices: List[IDType] = []
-        self._individual_parameters: Dict[IDType, DictParams] = {}
+        self._cached_index_to_row: Optional[Dict[IDType, int]] = {}
+        self._parameters_values: Dict[ParamType, np.ndarray] = {}
         self._parameters_shape = None # {p_name: p_shape as tuple}
         self._default_saving_type = 'csv'
 
@@ -49,6 +64,92 @@ class IndividualParameters:
         return {p: shape_to_size(s)
                 for p,s in self._parameters_shape.items()}
 
+    @property
+    def _index_to_row(self) -> Dict[IDType, int]:
+        # lazily built, since it is not needed to go through all individuals (e.g. after a fast loading)
+        if self._cached_index_to_row is None:
+            self._cached_index_to_row = {idx: i for i, idx in enumerate(self._indices)}
+        return self._cached_index_to_row
+
+    @property
+    def _individual_parameters(self) -> Dict[IDType, DictParams]:
+        """
+        Individual indices (key) with their corresponding individual parameters {parameter name: parameter value}.
+
+        <!> This nested dictionary is built on-the-fly from the columnar storage, so it is a copy.
+        """
+        if self._parameters_shape is None:
+            return {}
+        values = {p: self._get_values(p).tolist() for p in self._parameters_shape}
+        return {idx: {p: p_vals[i] for p, p_vals in values.items()}
+                for i, idx in enumerate(self._indices)}
+
+    def _get_values(self, parameter: ParamType) -> np.ndarray:
+        """Values of the parameter for all individuals (view), shape = (n_individuals, *parameter shape)."""
+        return self._parameters_values[parameter][:len(self._indices)]
+
+    @staticmethod
+    def _get_storage_dtype(values: np.ndarray) -> np.dtype:
+        # integers are kept as such (e.g. for saving), other (real) numbers are stored in double precision
+        return np.dtype(np.int64) if np.issubdtype(values.dtype, np.integer) else np.dtype(np.float64)
+
+    @classmethod
+    def _from_arrays(cls, indices: List[IDType], parameters_values: Dict[ParamType, np.ndarray], *, check: bool = True):
+        """
+        Build an IndividualParameters object at once from arrays of individual parameters.
+
+        Parameters
+        ----------
+        indices : list[ID]
+            List of the patients indices
+        parameters_values : dict[parameter:str, :class:`numpy.ndarray`]
+            Values of each individual parameter, with shape (n_individuals,) for scalar parameters
+            or (n_individuals, n) for 1D parameters (same order as `indices`)
+        check : bool (default True)
+            Should we check indices and values? Only skip checks for data that was already validated.
+
+        Returns
+        -------
+        :class:`.IndividualParameters`
+
+        Raises
+        ------
+        :exc:`.LeaspyIndividualParamsInputError`
+            * If an index is not a string or is duplicated
+            * Or if values are not numeric or have a bad shape.
+        """
+        indices = list(indices)
+        n_inds = len(indices)
+        index_to_row = None
+
+        if check:
+            if not all(isinstance(idx, str) for idx in indices):
+                raise LeaspyIndividualParamsInputError('The indices should be strings')
+
+            index_to_row = {idx: i for i, idx in enumerate(indices)}
+            if len(index_to_row) != n_inds:
+                raise LeaspyIndividualParamsInputError('The indices should be unique')
+
+        ip = cls()
+        if n_inds == 0:
+            return ip
+
+        for p, v in parameters_values.items():
+            v = np.asarray(v)
+            if check:
+                if v.dtype == bool or not np.issubdtype(v.dtype, np.number):
+                    raise LeaspyIndividualParamsInputError(f'Incorrect values. Error for key: {p} -> dtype {v.dtype}')
+                if v.ndim not in (1, 2) or len(v) != n_inds:
+                    raise LeaspyIndividualParamsInputError(f'The parameter {p} should be of same length as the indices '
+                                                           '(1D or 2D array).')
+            ip._parameters_values[p] = np.ascontiguousarray(v, dtype=cls._get_storage_dtype(v))
+
+        ip._indices = indices
+        ip._cached_index_to_row = index_to_row
+        ip._parameters_shape = {p: v.shape[1:] for p, v in ip._parameters_values.items()}
+
+        return ip
+
     def add_individual_parameters(self, index: IDType, individual_parameters: DictParams):
         r"""
         Add the individual parameter of an individual to the IndividualParameters object
@@ -79,7 +180,7 @@ class IndividualParameters:
         if not isinstance(index, str):
             raise LeaspyIndividualParamsInputError(f'The index should be a string ({type(index)} provided instead)')
 
-        if index in self._indices:
+        if index in self._index_to_row:
             raise LeaspyIndividualParamsInputError(f'The index {index} has already been added before')
 
         # Check the dictionary format
@@ -118,9 +219,23 @@ class IndividualParameters:
                     f'Invalid parameter shapes provided: {pshapes}. Expected: {self._parameters_shape}. '
                     'Some parameters may be missing/unknown or have a wrong shape.')
 
-        # Finally: add to internal dict object + indices array
+        # Finally: store values in the row of individual (growing arrays if needed) + indices
+        row = len(self._indices)
+        for p, v in individual_parameters.items():
+            v = np.asarray(v)
+            p_values = self._parameters_values.get(p)
+            if p_values is None:
+                p_values = np.empty((self._initial_capacity, *pshapes[p]), dtype=self._get_storage_dtype(v))
+            elif row == len(p_values):
+                p_values = np.concatenate([p_values, np.empty_like(p_values)])
+            if p_values.dtype != self._get_storage_dtype(v) and np.issubdtype(p_values.dtype, np.integer):
+                # upcast integer parameter as soon as a real value is given
+                p_values = p_values.astype(np.float64)
+            p_values[row] = v
+            self._parameters_values[p] = p_values
+
         self._indices.append(index)
-        self._individual_parameters[index] = individual_parameters
+        self._index_to_row[index] = row
 
 
     def __getitem__(self, item: IDType) -> DictParams:
@@ -134,9 +249,12 @@ class IndividualParameters:
         """
         if not isinstance(item, IDType):
             raise LeaspyIndividualParamsInputError(f'The index should be a string ({type(item)} provided instead)')
-        if item not in self._individual_parameters:
+        if item not in self._index_to_row:
             raise LeaspyIndividualParamsInputError(f'The index {item} is unknown')
-        return self._individual_parameters[item]
+        row = self._index_to_row[item]
+        # python scalars & lists (not numpy objects), as given at insertion
+        return {p: p_values[row].item() if p_values.ndim == 1 else p_values[row].tolist()
+                for p, p_values in self._parameters_values.items()}
 
     def items(self):
         """
@@ -144,7 +262,7 @@ class IndividualParameters:
         """
         return self._individual_parameters.items()
 
-    def subset(self, indices: Iterable[IDType], *, copy: bool = True):
+    def subset(self, indices: Iterable[IDType], *, copy: Optional[bool] = None):
         r"""
         Returns IndividualParameters object with a subset of the initial individuals
 
@@ -152,9 +270,14 @@ class IndividualParameters:
         ----------
         indices : list[ID]
             List of strings that corresponds to the indices of the individuals to return
-        copy : bool, optional (default True)
+        copy : bool, optional
             Should we copy underlying parameters or not?
 
+            .. deprecated:: 1.4
+
+            It is ignored (with a warning): the parameters of selected individuals are always copied
+            (their rows are gathered in new arrays).
+
         Returns
         -------
         `IndividualParameters`
@@ -173,19 +296,18 @@ class IndividualParameters:
         >>> ip.add_individual_parameters('index-3', {"xi": 0.3, "tau": 58, "sources": [-0.6, 0.2]})
         >>> ip_sub = ip.subset(['index-1', 'index-3'])
         """
-        ip = IndividualParameters()
+        if copy is not None:
+            warnings.warn("The `copy` argument of `IndividualParameters.subset` is deprecated and ignored: "
+                          "parameters of individuals are always copied.", DeprecationWarning)
+
+        indices = list(indices)
 
-        unknown_ix = [ix for ix in indices if ix not in self._indices]
+        unknown_ix = [ix for ix in indices if ix not in self._index_to_row]
         if len(unknown_ix) > 0:
             raise LeaspyIndividualParamsInputError(f'The index {unknown_ix} are not in the indices.')
 
-        for idx in indices:
-            p = self[idx]
-            if copy:
-                p = p.copy()  # deepcopy here?
-            ip.add_individual_parameters(idx, p)
-
-        return ip
+        rows = np.array([self._index_to_row[ix] for ix in indices], dtype=np.int64)
+        return self._from_arrays(indices, {p: self._get_values(p)[rows] for p in self._parameters_values})
 
     def get_aggregate(self, parameter: ParamType, function: Callable) -> List:
         r"""
@@ -220,8 +342,7 @@ class IndividualParameters:
         if parameter not in self._parameters_shape.keys():
             raise LeaspyIndividualParamsInputError(f"Parameter '{parameter}' does not exist in the individual parameters")
 
-        p = [v[parameter] for v in self._individual_parameters.values()]
-        p_agg = function(p, axis=0).tolist()
+        p_agg = function(self._get_values(parameter), axis=0).tolist()
 
         return p_agg
 
@@ -297,30 +418,17 @@ class IndividualParameters:
         >>> ip = IndividualParameters.load("path/to/individual_parameters")
         >>> ip_df = ip.to_dataframe()
         """
-        # Get the data, idx per idx
-        arr = []
-        for idx in self._indices:
-            indiv_arr = [idx]
-            indiv_p = self._individual_parameters[idx]
-
-            for p_name, p_shape in self._parameters_shape.items():
-                if p_shape == ():
-                    indiv_arr.append(indiv_p[p_name])
-                else:
-                    indiv_arr += indiv_p[p_name] # 1D array only...
-            arr.append(indiv_arr)
-
-        # Get the column names
-        final_names = ['ID']
-        for p_name, p_shape in self._parameters_shape.items():
+        columns = {}
+        for p_name, p_shape in (self._parameters_shape or {}).items():
+            p_values = self._get_values(p_name)
             if p_shape == ():
-                final_names.append(p_name)
+                columns[p_name] = p_values
             else:
-                final_names += [p_name+'_'+str(i) for i in range(p_shape[0])] # 1D array only...
-
-        df = pd.DataFrame(arr, columns=final_names)
-        return df.set_index('ID')
+                # 1D array only...
+                for i in range(p_shape[0]):
+                    columns[p_name+'_'+str(i)] = p_values[:, i]
 
+        return pd.DataFrame(columns, index=pd.Index(self._indices, name='ID'))
 
     @staticmethod
     def from_dataframe(df: pd.DataFrame):
@@ -350,15 +458,9 @@ class IndividualParameters:
                     final_names[split] = []
                 final_names[split].append(name)
 
-        # Create the individual parameters
-        ip = IndividualParameters()
-
-        for idx, row in df.iterrows():
-            i_d = {param: row[col].tolist() if isinstance(col, list) else row[col]
-                   for param, col in final_names.items()}
-            ip.add_individual_parameters(idx, i_d)
-
-        return ip
+        # Create the individual parameters (all individuals at once)
+        return IndividualParameters._from_arrays(df.index.tolist(), {param: df[col].to_numpy()
+                                                                     for param, col in final_names.items()})
 
     @staticmethod
     def from_pytorch(indices: List[IDType], dict_pytorch: DictParamsTorch):
@@ -396,17 +498,13 @@ class IndividualParameters:
             if v != len(indices):
                 raise LeaspyIndividualParamsInputError(f'The parameter {k} should be of same length as the indices')
 
-        ip = IndividualParameters()
-
-        keys = list(dict_pytorch.keys())
+        # parameters of dimension 1 are scalars (except sources)
+        parameters_values = {}
+        for k, v in dict_pytorch.items():
+            v = v.detach().cpu().numpy()
+            parameters_values[k] = v[:, 0] if v.ndim == 2 and v.shape[1] == 1 and k != 'sources' else v
 
-        for i, idx in enumerate(indices):
-            p = {k: dict_pytorch[k][i].tolist() for k in keys}
-            p = {k: v[0] if len(v) == 1 and k != 'sources' else v for k, v in p.items()}
-
-            ip.add_individual_parameters(idx, p)
-
-        return ip
+        return IndividualParameters._from_arrays(indices, parameters_values)
 
     def to_pytorch(self) -> Tuple[List[IDType], DictParamsTorch]:
         r"""
@@ -430,8 +528,7 @@ class IndividualParameters:
 
         for p_name, p_size in self._parameters_size.items():
 
-            p_val = [self._individual_parameters[idx][p_name] for idx in self._indices]
-            p_val = torch.tensor(p_val, dtype=torch.float32)
+            p_val = torch.tensor(self._get_values(p_name), dtype=torch.float32)
             p_val = p_val.reshape(shape=(len(self._indices), p_size)) # always 2D
 
             ips_pytorch[p_name] = p_val
@@ -516,6 +613,103 @@ class IndividualParameters:
 
         return ip
 
+    def save_columnar(self, path: str) -> None:
+        r"""
+        Saves the individual parameters in a binary columnar format: a folder of `.npy` files.
+
+        The folder contains:
+            * `indices.npy`: identifiers of individuals, shape ``(n_individuals,)``
+            * `<parameter>.npy`: values of each individual parameter, shape ``(n_individuals, *parameter_shape)``
+            * `metadata.json`: format version & shapes of parameters
+
+        It can be loaded back very efficiently with :meth:`.IndividualParameters.load_columnar`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder where to save the individual parameters (created if needed).
+
+        Raises
+        ------
+        :exc:`.LeaspyIndividualParamsInputError`
+            If individual parameters are empty
+
+        Examples
+        --------
+        >>> ip = IndividualParameters.load('/path/to/individual_parameters.csv')
+        >>> ip.save_columnar('/path/to/individual_parameters')
+        """
+        if self._parameters_shape is None:
+            raise LeaspyIndividualParamsInputError('Individual parameters are empty: unable to save them.')
+
+        os.makedirs(path, exist_ok=True)
+
+        np.save(os.path.join(path, self.columnar_indices_file), np.array(self._indices, dtype=str), allow_pickle=False)
+        for p_name in self._parameters_shape:
+            np.save(os.path.join(path, f'{p_name}.npy'), self._get_values(p_name), allow_pickle=False)
+
+        metadata = {
+            'format_version': self.columnar_format_version,
+            'parameters_shape': self._parameters_shape,
+        }
+        with open(os.path.join(path, self.columnar_metadata_file), 'w') as fp:
+            json.dump(metadata, fp)
+
+    @classmethod
+    def load_columnar(cls, path: str, *, mmap: bool = True):
+        r"""
+        Loads the individual parameters saved with :meth:`.IndividualParameters.save_columnar`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder of the individual parameters.
+        mmap : bool, default True
+            Should we memory-map the arrays of individual parameters (read-only) instead of loading them in memory?
+            Only the values of individuals that are accessed are then read from disk.
+
+        Returns
+        -------
+        :class:`.IndividualParameters`
+
+        Raises
+        ------
+        :exc:`.LeaspyIndividualParamsInputError`
+            If the folder does not contain individual parameters in a supported format.
+
+        Examples
+        --------
+        >>> ip = IndividualParameters.load_columnar('/path/to/individual_parameters')
+        >>> ip_sub = ip.subset(['index-1', 'index-3'])  # only reads values of these 2 individuals
+        """
+        metadata_path = os.path.join(path, cls.columnar_metadata_file)
+        if not os.path.isfile(metadata_path):
+            raise LeaspyIndividualParamsInputError(f"No individual parameters could be found in '{path}' "
+                                                   f"(missing '{cls.columnar_metadata_file}').")
+
+        with open(metadata_path, 'r') as fp:
+            metadata = json.load(fp)
+
+        if metadata.get('format_version') != cls.columnar_format_version:
+            raise LeaspyIndividualParamsInputError(f"Unsupported version of individual parameters: {metadata.get('format_version')} "
+                                                   f"(expected {cls.columnar_format_version}).")
+
+        try:
+            indices = np.load(os.path.join(path, cls.columnar_indices_file), allow_pickle=False).tolist()
+            # <!> plain numpy arrays on top of the memory-mapped buffers (no copy)
+            parameters_values = {
+                p_name: np.asarray(np.load(os.path.join(path, f'{p_name}.npy'), mmap_mode='r' if mmap else None, allow_pickle=False))
+                for p_name in metadata['parameters_shape']
+            }
+        except OSError as e:
+            raise LeaspyIndividualParamsInputError(f"Individual parameters in '{path}' are incomplete or corrupted.") from e
+
+        # cheap consistency checks (individual parameters were validated before saving)
+        if not all(len(v) == len(indices) for v in parameters_values.values()):
+            raise LeaspyIndividualParamsInputError(f"Individual parameters in '{path}' have inconsistent shapes.")
+
+        return cls._from_arrays(indices, parameters_values, check=False)
+
     @staticmethod
     def _check_and_get_extension(path: str):
         _, ext = os.path.splitext(path)
@@ -554,12 +748,9 @@ class IndividualParameters:
         with open(path, 'r') as f:
             json_data = json.load(f)
 
-        ip = cls()
-        ip._indices = json_data['indices']
-        ip._individual_parameters = json_data['individual_parameters']
-        ip._parameters_shape = json_data['parameters_shape']
+        indices = json_data['indices']
+        individual_parameters = json_data['individual_parameters']
+        parameters_shape = json_data['parameters_shape'] or {}
 
-        # convert json lists to tuple for shapes
-        ip._parameters_shape = {p: tuple(s) for p,s in ip._parameters_shape.items()}
-
-        return ip
+        return cls._from_arrays(indices, {p: [individual_parameters[idx][p] for idx in indices]
+                                          for p in parameters_shape})
@@ -9,6 +9,7 @@ import torch
 
 from leaspy.io.data.data import Data
 from leaspy.io.data.dataset import Dataset
+from leaspy.io.outputs.individual_parameters import IndividualParameters
 
 from leaspy.exceptions import LeaspyTypeError, LeaspyIndividualParamsInputError, LeaspyInputError
 from leaspy.utils.typing import IDType, ParamType, DictParamsTorch, Dict, List, Union
@@ -307,6 +308,35 @@ class Result:
         dump = self._get_dump(idx)
         torch.save(dump, path, **args)
 
+    def save_individual_parameters_columnar(self, path: str, idx: List[IDType] = None):
+        """
+        Save the individual parameters in a binary columnar format (folder of `.npy` files, that can be memory-mapped).
+
+        Refer to :meth:`.IndividualParameters.save_columnar` for the format.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder where to save the individual parameters (created if needed).
+        idx : list [str], optional (default None)
+            Contain the IDs of the selected subjects. If ``None``, all the subjects are selected.
+
+        Examples
+        --------
+        Save the individual parameters of the twenty first subjects.
+
+        >>> output_path = 'outputs/logistic_seed0-mode_real_seed0-individual_parameters'
+        >>> idx = list(individual_results.individual_parameters.keys())[:20]
+        >>> individual_results.save_individual_parameters_columnar(output_path, idx)
+        """
+        ip = IndividualParameters.from_pytorch(list(self.ID_to_idx), self.individual_parameters)
+        if idx is not None:
+            if not isinstance(idx, list):
+                raise LeaspyIndividualParamsInputError("Input 'idx' must be a list, even if it contains only one element! "
+                                                      f"You gave idx={idx} which is of type {type(idx)}.")
+            ip = ip.subset(idx)
+        ip.save_columnar(path)
+
     @staticmethod
     def _check_folder_existence(path: str):
         # Test path's folder existence (if path contain a folder)
@@ -500,15 +530,40 @@ class Result:
                 individual_parameters[key] = individual_parameters[key].unsqueeze(-1)
         return individual_parameters
 
+    @staticmethod
+    def load_individual_parameters_from_columnar(path: str, *, verbose=True, **kwargs):
+        """
+        Load individual parameters from a folder in binary columnar format.
+
+        Parameters
+        ----------
+        path : str
+            The folder's path (cf. :meth:`.Result.save_individual_parameters_columnar`).
+        verbose : bool (default True)
+            Whether to have verbose output or not
+        **kwargs
+            Parameters to pass to :meth:`.IndividualParameters.load_columnar`.
+
+        Returns
+        -------
+        dict [str, :class:`torch.Tensor`]
+            A dictionary of `torch.Tensor` which contains the individual parameters.
+        """
+        if verbose:
+            print("Load from columnar folder ... conversion to torch")
+        _, individual_parameters = IndividualParameters.load_columnar(path, **kwargs).to_pytorch()
+        return individual_parameters
+
     @classmethod
     def load_individual_parameters(cls, path_or_df, **kwargs):
         """
-        Load individual parameters from a :class:`pandas.DataFrame`, a csv, a json file or a torch file.
+        Load individual parameters from a :class:`pandas.DataFrame`, a csv, a json file, a torch file
+        or a folder in binary columnar format.
 
         Parameters
         ----------
         path_or_df : str or :class:`pandas.DataFrame`
-            The file's path or a DataFrame containing the individual parameters.
+            The file's (or folder's) path or a DataFrame containing the individual parameters.
         **kwargs
             Keyword-arguments to be passed to the corresponding load function.
 
@@ -525,6 +580,8 @@ class Result:
         if isinstance(path_or_df, pd.DataFrame):
             return cls.load_individual_parameters_from_dataframe(path_or_df)
         elif isinstance(path_or_df, str):
+            if os.path.isdir(path_or_df):
+                return cls.load_individual_parameters_from_columnar(path_or_df, **kwargs)
             file_extension = os.path.splitext(path_or_df)[-1]
             if file_extension == '.csv':
                 return cls.load_individual_parameters_from_csv(path_or_df, **kwargs)
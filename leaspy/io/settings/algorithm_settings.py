@@ -46,13 +46,15 @@ class AlgorithmSettings:
                 Personalize the algorithm initialization method,
                 according to those possible for the given algorithm (refer to its documentation in :mod:`leaspy.algo`).
             * n_iter : int, optional
-                Number of iteration. There is no stopping criteria for the all the MCMC SAEM algorithms.
+                Number of iteration. By default, there is no stopping criteria for the all the MCMC SAEM algorithms
+                (but a convergence criterion may be set with `convergence` parameters, cf. :class:`.AlgoWithConvergenceMixin`).
             * n_burn_in_iter : int, optional
                 Number of iteration during burning phase, used for the MCMC SAEM algorithms.
             * use_jacobian : bool, optional, default True
                 Used in ``scipy_minimize`` algorithm to perform a `L-BFGS` instead of a `Powell` algorithm.
             * n_jobs : int, optional, default 1
                 Used in ``scipy_minimize`` algorithm to accelerate calculation with parallel derivation using joblib.
+                Used in ``mcmc_saem`` algorithm to fit the per-feature LME of ``'lme'`` model initialization in parallel.
             * progress_bar : bool, optional, default True
                 Used to display a progress bar during computation.
             * device: str or torch.device, optional
@@ -305,13 +307,13 @@ class AlgorithmSettings:
         Parameters
         ----------
         path : str, optional
-            The path of the folder to store the graphs and csv files.
+            The path of the folder to store the graphs and traces of parameters (binary files, cf. :class:`.TraceReader`).
             No data will be saved if it is None, as well as save_periodicity and plot_periodicity.
         **kwargs
             * console_print_periodicity: int, optional, default 100
                 Display logs in the console/terminal every N iterations.
             * save_periodicity: int, optional, default 50
-                Saves the values in csv files every N iterations.
+                Saves the values of model parameters every N iterations.
             * plot_periodicity: int, optional, default 1000
                 Generates plots from saved values every N iterations.
                 Note that:
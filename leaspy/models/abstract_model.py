@@ -14,7 +14,7 @@ from leaspy.io.realizations.realization import Realization
 from leaspy.models.utils.noise_model import NoiseModel
 
 from leaspy.exceptions import LeaspyConvergenceError, LeaspyIndividualParamsInputError, LeaspyModelInputError
-from leaspy.utils.typing import FeatureType, KwargsType, DictParams, DictParamsTorch, Union, List, Dict, Tuple, Iterable, Optional
+from leaspy.utils.typing import FeatureType, KwargsType, DictParams, DictParamsTorch, Union, List, Dict, Tuple, Iterable, Iterator, Optional, Callable
 
 if TYPE_CHECKING:
     from leaspy.io.data.dataset import Dataset
@@ -50,6 +50,12 @@ class AbstractModel(ABC):
     regularization_distribution_factory : function dist params -> :class:`torch.distributions.Distribution`
         Factory of torch distribution to compute log-likelihoods for regularization (gaussian by default)
         (Not used anymore)
+    subjects_chunk_size : int >= 1 or None (default)
+        Maximum number of individuals for which attachment, sum of squared residuals and sufficient statistics
+        are computed at once (results are streamed over blocks of individuals so to bound memory usage).
+        If None, computations are performed on all individuals at once.
+        It is a hyperparameter of the model (saved only if not None), which does not change the results
+        (up to floating point precision).
     """
 
     def __init__(self, name: str, **kwargs):
@@ -59,6 +65,7 @@ class AbstractModel(ABC):
         self.dimension: int = None  # TODO: to be converted into a read-only property (cf. in GenericModel)
         self.parameters: KwargsType = None
         self.noise_model: str = None
+        self.subjects_chunk_size: Optional[int] = None
 
         ## TODO? shouldn't it belong to each random variable specs?
         # We do not use this anymore as many initializations of the distribution will considerably slow down software
@@ -69,8 +76,63 @@ class AbstractModel(ABC):
         # <!> in children classes with new hyperparameter you should do it manually at end of __init__ to overwrite default values
         self.load_hyperparameters(kwargs)
 
+    @property
+    def subjects_chunk_size(self) -> Optional[int]:
+        """Maximum number of individuals for which some computations are performed at once (None for all individuals)."""
+        return self._subjects_chunk_size
+
+    @subjects_chunk_size.setter
+    def subjects_chunk_size(self, chunk_size: Optional[int]) -> None:
+        if not (chunk_size is None or (isinstance(chunk_size, int) and chunk_size >= 1)):
+            raise LeaspyModelInputError(f"`subjects_chunk_size` should be a positive integer or None, not {chunk_size}.")
+        self._subjects_chunk_size = chunk_size
+
+    def _handle_subjects_chunk_size_hyperparameter(self, hyperparameters: KwargsType) -> tuple:
+        # return a tuple of extra hyperparameters that are recognized
+        if 'subjects_chunk_size' in hyperparameters:
+            self.subjects_chunk_size = hyperparameters['subjects_chunk_size']
+        return ('subjects_chunk_size',)
+
+    def _export_subjects_chunk_size(self, model_settings: KwargsType) -> None:
+        # not exported when not set, so that exported models are unchanged by default
+        if self.subjects_chunk_size is not None:
+            model_settings['subjects_chunk_size'] = self.subjects_chunk_size
+
+    def _iter_subjects_chunks(self, data: Dataset, param_ind: DictParamsTorch) -> Iterator[Tuple[Dataset, DictParamsTorch]]:
+        """
+        Iterate over blocks of (at most) :attr:`subjects_chunk_size` individuals of dataset, with their individual parameters.
+
+        The dataset and individual parameters are yielded as is (a single block) when chunking is disabled or useless.
+
+        Parameters
+        ----------
+        data : :class:`.Dataset`
+        param_ind : dict[param_name: str, :class:`torch.Tensor` [n_individuals, n_dims_param]]
+
+        Yields
+        ------
+        chunk : :class:`.Dataset`
+        chunk_param_ind : dict[param_name: str, :class:`torch.Tensor` [n_individuals_chunk, n_dims_param]]
+        """
+        if self.subjects_chunk_size is None or data.n_individuals <= self.subjects_chunk_size:
+            yield data, param_ind
+            return
+
+        if getattr(self, 'is_ordinal', False):
+            # checks (and warnings) on ordinal values are to be done on full dataset, not chunk per chunk
+            data.check_ordinal_values(self.ordinal_infos)
+
+        for individuals_slice, chunk in data.iter_subjects_chunks(self.subjects_chunk_size):
+            yield chunk, {k: v[individuals_slice] for k, v in param_ind.items()}
+
+    def _concat_on_subjects_chunks(self, func: Callable[..., torch.Tensor], data: Dataset, param_ind: DictParamsTorch,
+                                   **kws) -> torch.Tensor:
+        """Compute `func(data, param_ind, **kws)`, whose first dimension is individuals, by blocks of individuals."""
+        results = [func(chunk, chunk_param_ind, **kws) for chunk, chunk_param_ind in self._iter_subjects_chunks(data, param_ind)]
+        return results[0] if len(results) == 1 else torch.cat(results, dim=0)
+
     @abstractmethod
-    def initialize(self, dataset: Dataset, method: str = 'default') -> None:
+    def initialize(self, dataset: Dataset, method: str = 'default', **init_kwargs) -> None:
         """
         Initialize the model given a dataset and an initialization method.
 
@@ -82,6 +144,9 @@ class AbstractModel(ABC):
             The dataset we want to initialize from.
         method : str
             A custom method to initialize the model
+        **init_kwargs
+            Additional keyword arguments for the initialization method
+            (cf. :func:`~.models.utils.initialization.model_initialization.initialize_parameters`).
         """
 
     def load_parameters(self, parameters: KwargsType) -> None:
@@ -135,7 +200,7 @@ class AbstractModel(ABC):
         """
 
     def compute_sum_squared_per_ft_tensorized(self, dataset: Dataset, param_ind: DictParamsTorch, *,
-                                              attribute_type=None) -> torch.FloatTensor:
+                                              attribute_type=None, features: Optional[List[int]] = None) -> torch.FloatTensor:
         """
         Compute the square of the residuals per subject per feature
 
@@ -147,15 +212,27 @@ class AbstractModel(ABC):
             Contain the individual parameters
         attribute_type : Any (default None)
             Flag to ask for MCMC attributes instead of model's attributes.
+        features : list[int] or None (default)
+            Indices of the features to restrict computations to (all features if None).
 
         Returns
         -------
-        :class:`torch.Tensor` of shape (n_individuals,dimension)
+        :class:`torch.Tensor` of shape (n_individuals, dimension) [or (n_individuals, len(features))]
             Contains L2 residual for each subject and each feature
         """
-        res = self.compute_individual_tensorized(dataset.timepoints, param_ind, attribute_type=attribute_type)
-        r1 = dataset.mask.float() * (res - dataset.values) # ijk tensor (i=individuals, j=visits, k=features)
-        return (r1 * r1).sum(dim=1)  # sum on visits
+        return self._concat_on_subjects_chunks(self._compute_sum_squared_per_ft_tensorized, dataset, param_ind,
+                                               attribute_type=attribute_type, features=features)
+
+    def _compute_sum_squared_per_ft_tensorized(self, dataset: Dataset, param_ind: DictParamsTorch, *,
+                                               attribute_type=None, features: Optional[List[int]] = None) -> torch.FloatTensor:
+        """Compute the square of the residuals per subject per feature, for all individuals of dataset at once."""
+        # <!> computations are performed on the layout of dataset (padded or packed visits)
+        res = self._compute_individual_tensorized_on_visits(dataset, param_ind, features, attribute_type=attribute_type)
+        values, mask = dataset.visits_values, dataset.visits_mask
+        if features is not None:
+            values, mask = values[:, :, features], mask[:, :, features]
+        r1 = mask.float() * (res - values) # ijk tensor (i=individuals or visits, j=visits or 1, k=features)
+        return dataset.sum_visits_per_individual(r1 * r1)  # sum on visits
 
     def compute_sum_squared_tensorized(self, dataset: Dataset, param_ind: DictParamsTorch, *,
                                        attribute_type=None) -> torch.FloatTensor:
@@ -278,6 +355,28 @@ class AbstractModel(ABC):
             'tensorized_ips_gen': ({k: v[i,:].unsqueeze(0) for k,v in t_ips.items()} for i in range(n_inds))
         }
 
+    def tensorize_individual_parameters(self, individual_parameters: DictParams) -> DictParamsTorch:
+        """
+        Check individual parameters of any number of individuals and get their tensorized version,
+        suited for the tensorized computations of the model (e.g. :meth:`.compute_individual_tensorized`).
+
+        Parameters
+        ----------
+        individual_parameters : dict[param: str, Any]
+            Contains some un-trusted individual parameters (cf. :meth:`._audit_individual_parameters`).
+
+        Returns
+        -------
+        dict[param: str, :class:`torch.Tensor`]
+            The 2D tensorized individual parameters, with one row per individual.
+
+        Raises
+        ------
+        :exc:`.LeaspyIndividualParamsInputError`
+            if any of the consistency/compatibility checks fail
+        """
+        return self._audit_individual_parameters(individual_parameters)['tensorized_ips']
+
     @staticmethod
     def _tensorize_2D(x, unsqueeze_dim: int, dtype=torch.float32) -> torch.FloatTensor:
         """
@@ -409,17 +508,19 @@ class AbstractModel(ABC):
                                                                  individual_parameters: DictParamsTorch,
                                                                  feature: Optional[FeatureType]) -> torch.FloatTensor:
         """
-        For one individual, compute age(s) at which the given features values are reached (given the subject's
-        individual parameters), with tensorized inputs
+        For one or several individuals, compute age(s) at which the given features values are reached (given the subjects'
+        individual parameters), with tensorized inputs.
+
+        All individuals are processed at once (closed-form inversion of the model or broadcasted grid search).
 
         Parameters
         ----------
-        value : torch.Tensor of shape (1, n_values)
-            Contains the biomarker value(s) of the subject.
+        value : torch.Tensor of shape (n_individuals, n_values)
+            Contains the biomarker value(s) of the subjects.
 
         individual_parameters : dict
             Contains the individual parameters.
-            Each individual parameter should be a torch.Tensor
+            Each individual parameter should be a torch.Tensor of shape (n_individuals, n_dims_param)
 
         feature : str (or None)
             Name of the considered biomarker (optional for univariate models, compulsory for multivariate models).
@@ -427,8 +528,8 @@ class AbstractModel(ABC):
         Returns
         -------
         :class:`torch.Tensor`
-            Contains the subject's ages computed at the given values(s)
-            Shape of tensor is (n_values, 1)
+            Contains the subjects' ages computed at the given values(s)
+            Shape of tensor is (n_individuals, n_values)
         """
 
     @abstractmethod
@@ -451,6 +552,80 @@ class AbstractModel(ABC):
         :class:`torch.Tensor` of shape (n_individuals, n_timepoints, n_features)
         """
 
+    def _compute_individual_tensorized_on_features(self, timepoints: torch.FloatTensor, individual_parameters: DictParamsTorch,
+                                                   features: Optional[List[int]], *, attribute_type=None, **kws) -> torch.FloatTensor:
+        """
+        Compute the individual values of model, restricted to some features only.
+
+        By default values are computed for all features and then sliced;
+        models should override this method when they can directly compute values for a subset of features.
+
+        Parameters
+        ----------
+        timepoints : :class:`torch.Tensor` [n_individuals, n_timepoints]
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` [n_individuals, n_dims_param]]
+        features : list[int] or None
+            Indices of the features to compute the model values for (all features if None).
+        attribute_type : Any (default None)
+            Flag to ask for MCMC attributes instead of model's attributes.
+        **kws
+            Extra keyword arguments for :meth:`.compute_individual_tensorized` (e.g. `packed_levels` for ordinal models).
+
+        Returns
+        -------
+        :class:`torch.Tensor` [n_individuals, n_timepoints, n_selected_features [, extra_dim_ordinal_models]]
+        """
+        res = self.compute_individual_tensorized(timepoints, individual_parameters, attribute_type=attribute_type, **kws)
+        if features is not None:
+            res = res[:, :, features, ...]
+        return res
+
+    def _compute_individual_tensorized_on_visits(self, dataset: Dataset, individual_parameters: DictParamsTorch,
+                                                 features: Optional[List[int]] = None, *, attribute_type=None, **kws) -> torch.FloatTensor:
+        """
+        Compute the individual values of model at the visits of dataset, with the layout of its `visits_*` tensors.
+
+        Parameters
+        ----------
+        dataset : :class:`.Dataset`
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` [n_individuals, n_dims_param]]
+        features : list[int] or None (default)
+            Indices of the features to compute the model values for (all features if None).
+        attribute_type : Any (default None)
+            Flag to ask for MCMC attributes instead of model's attributes.
+        **kws
+            Extra keyword arguments for :meth:`.compute_individual_tensorized` (e.g. `packed_levels` for ordinal models).
+
+        Returns
+        -------
+        :class:`torch.Tensor` [n_individuals, n_visits_max, n_selected_features [, extra_dim_ordinal_models]]
+        or [n_visits, 1, n_selected_features [, extra_dim_ordinal_models]] for packed dataset
+        """
+        return self._compute_individual_tensorized_on_features(dataset.visits_timepoints,
+                                                               dataset.get_visits_individual_parameters(individual_parameters),
+                                                               features, attribute_type=attribute_type, **kws)
+
+    def get_features_impacted_by_population_variable(self, var_name: str, idx: Tuple[int, ...]) -> Optional[List[int]]:
+        """
+        Get the features whose model values may be changed by a change of a population variable at the given index.
+
+        It is used by samplers to only recompute the attachment of impacted features when sampling population variables.
+        By default, we conservatively assume that all features are impacted.
+
+        Parameters
+        ----------
+        var_name : str
+            Name of the population variable.
+        idx : tuple[int, ...]
+            Index of the coordinate(s) of the variable that are changed (possibly partial, e.g. `()` for all of them).
+
+        Returns
+        -------
+        list[int] or None
+            Indices of the impacted features (None if all features may be impacted).
+        """
+        return None
+
     @abstractmethod
     def compute_jacobian_tensorized(self, timepoints: torch.FloatTensor, individual_parameters: DictParamsTorch, *,
                                     attribute_type=None) -> torch.FloatTensor:
@@ -503,6 +678,50 @@ class AbstractModel(ABC):
         :exc:`.LeaspyModelInputError`
             If invalid `noise_model` for model
         """
+        attachment_per_ft = self.compute_individual_attachment_per_ft_tensorized(data, param_ind, attribute_type=attribute_type)
+
+        # 1D tensor of shape(n_individuals,)
+        return attachment_per_ft.sum(dim=1).reshape((data.n_individuals,))
+
+    def compute_individual_attachment_per_ft_tensorized(self, data: Dataset, param_ind: DictParamsTorch, *,
+                                                        attribute_type, features: Optional[List[int]] = None) -> torch.FloatTensor:
+        """
+        Compute attachment term (per subject and per feature)
+
+        Parameters
+        ----------
+        data : :class:`.Dataset`
+            Contains the data of the subjects, in particular the subjects' time-points and the mask for nan values & padded visits
+
+        param_ind : dict
+            Contain the individual parameters
+
+        attribute_type : Any
+            Flag to ask for MCMC attributes instead of model's attributes.
+
+        features : list[int] or None (default)
+            Indices of the features to restrict computations to (all features if None).
+
+        Returns
+        -------
+        attachment : :class:`torch.Tensor`
+            Negative Log-likelihood, shape = (n_subjects, n_features) [or (n_subjects, len(features))]
+
+        Raises
+        ------
+        :exc:`.LeaspyModelInputError`
+            If invalid `noise_model` for model
+        """
+        return self._concat_on_subjects_chunks(self._compute_individual_attachment_per_ft_tensorized, data, param_ind,
+                                               attribute_type=attribute_type, features=features)
+
+    def _compute_individual_attachment_per_ft_tensorized(self, data: Dataset, param_ind: DictParamsTorch, *,
+                                                         attribute_type, features: Optional[List[int]] = None) -> torch.FloatTensor:
+        """Compute attachment term (per subject and per feature), for all individuals of dataset at once."""
+
+        def restrict_to_features(t: torch.Tensor) -> torch.Tensor:
+            # features are always the 3rd dimension (i=individuals, j=visits, k=features [, l=ordinal_level])
+            return t if features is None else t[:, :, features, ...]
 
         # TODO: this snippet could be implemented directly in NoiseModel (or subclasses depending on noise structure)
         if self.noise_model is None:
@@ -512,40 +731,61 @@ class AbstractModel(ABC):
             # diagonal noise (squared) [same for all features if it's forced to be a scalar]
             # TODO? shouldn't 'noise_std' be part of the "MCMC_toolbox" to use the one we want??
             noise_var = self.parameters['noise_std'] * self.parameters['noise_std'] # slight perf improvement over ** 2, k tensor (or scalar tensor)
-            noise_var = noise_var.expand((1, data.dimension)) # 1,k tensor (for scalar products just after) # <!> this formula works with scalar noise as well
+            noise_var = noise_var.expand((1, data.dimension)) # 1,k tensor <!> this formula works with scalar noise as well
+            n_obs_per_ind_per_ft = data.n_observations_per_ind_per_ft.float()
+            if features is not None:
+                noise_var, n_obs_per_ind_per_ft = noise_var[:, features], n_obs_per_ind_per_ft[:, features]
 
-            L2_res_per_ind_per_ft = self.compute_sum_squared_per_ft_tensorized(data, param_ind, attribute_type=attribute_type) # ik tensor
+            L2_res_per_ind_per_ft = self._compute_sum_squared_per_ft_tensorized(data, param_ind, attribute_type=attribute_type,
+                                                                                features=features) # ik tensor
 
-            attachment = (0.5 / noise_var) @ L2_res_per_ind_per_ft.t()
-            attachment += 0.5 * torch.log(TWO_PI * noise_var) @ data.n_observations_per_ind_per_ft.float().t()
+            attachment = (0.5 / noise_var) * L2_res_per_ind_per_ft
+            attachment += 0.5 * torch.log(TWO_PI * noise_var) * n_obs_per_ind_per_ft
 
         else:
             # log-likelihood based models
-            pred = self.compute_individual_tensorized(data.timepoints, param_ind, attribute_type=attribute_type)
-            # safety before taking logarithms
-            pred = torch.clamp(pred, 1e-7, 1. - 1e-7)
-
+            # <!> computations are performed on the layout of dataset (padded or packed visits)
             if self.noise_model == 'bernoulli':
+                pred = self._compute_individual_tensorized_on_visits(data, param_ind, features, attribute_type=attribute_type)
+                # safety before taking logarithms
+                pred = torch.clamp(pred, 1e-7, 1. - 1e-7)
                 # Compute the simple cross-entropy loss
-                LL = data.values * torch.log(pred) + (1. - data.values) * torch.log(1. - pred)
-            elif self.noise_model == 'ordinal':
-                # Compute the simple multinomial loss
-                pdf = data.get_one_hot_encoding(sf=False, ordinal_infos=self.ordinal_infos)
-                LL = torch.log((pred * pdf).sum(dim=-1))
-            elif self.noise_model == 'ordinal_ranking':
-                # Compute the loss by cross-entropy of P(X>=k)
-                sf = data.get_one_hot_encoding(sf=True, ordinal_infos=self.ordinal_infos)
-                # <!> `sf` (survival function values) are already masked for the impossible levels
-                #     but we must do the same for their opposite (`cdf`, cumulative distribution values)
-                cdf = (1. - sf) * self.ordinal_infos['mask']
-                LL = (sf * torch.log(pred) + cdf * torch.log(1. - pred)).sum(dim=-1)
+                values = restrict_to_features(data.visits_values)
+                LL = values * torch.log(pred) + (1. - values) * torch.log(1. - pred)
+            elif self.noise_model in ('ordinal', 'ordinal_ranking'):
+                # multinomial loss or cross-entropy of P(X>=k), in the packed layout of ordinal levels
+                LL = self._compute_ordinal_log_likelihood_on_visits(data, param_ind, features, attribute_type=attribute_type)
             else:
                 raise LeaspyModelInputError(f'`noise_model` should be in {NoiseModel.VALID_NOISE_STRUCTS}')
 
-            attachment = -torch.sum(data.mask.float() * LL, dim=(1, 2))
+            attachment = -data.sum_visits_per_individual(restrict_to_features(data.visits_mask).float() * LL)
 
-        # 1D tensor of shape(n_individuals,)
-        return attachment.reshape((data.n_individuals,))
+        # 2D tensor of shape(n_individuals, n_features)
+        return attachment
+
+    def checkpoint_MCMC_toolbox(self) -> KwargsType:
+        """
+        Get a cheap snapshot of the attributes of the MCMC toolbox.
+
+        It is used by samplers to restore the MCMC toolbox when a proposal is rejected,
+        instead of re-computing the derived attributes (orthonormal basis, mixing matrix, ...).
+
+        Returns
+        -------
+        dict[str, Any]
+            cf. :meth:`.AbstractAttributes.checkpoint`
+        """
+        return self.MCMC_toolbox['attributes'].checkpoint()
+
+    def restore_MCMC_toolbox(self, checkpoint: KwargsType) -> None:
+        """
+        Restore the attributes of the MCMC toolbox from a snapshot taken with :meth:`.checkpoint_MCMC_toolbox`.
+
+        Parameters
+        ----------
+        checkpoint : dict[str, Any]
+        """
+        self.MCMC_toolbox['attributes'].restore(checkpoint)
 
     @abstractmethod
     def update_model_parameters_burn_in(self, data: Dataset, realizations: CollectionRealization) -> None:
@@ -569,6 +809,37 @@ class AbstractModel(ABC):
         suff_stats : dict[suff_stat: str, :class:`torch.Tensor`]
         """
 
+    def _compute_reconstruction_sufficient_statistics(self, data: Dataset, individual_parameters: DictParamsTorch) -> DictParamsTorch:
+        """
+        Compute the sufficient statistics related to the reconstruction of data by model (for Gaussian noise models).
+
+        They are summed over all visits of all individuals, by blocks of individuals (cf. :attr:`subjects_chunk_size`).
+
+        Parameters
+        ----------
+        data : :class:`.Dataset`
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` [n_individuals, n_dims_param]]
+
+        Returns
+        -------
+        dict[suff_stat: str, :class:`torch.Tensor` [dimension]]
+            * ``'obs_x_reconstruction'``: sum of the products of observations and model values, per feature
+            * ``'reconstruction_x_reconstruction'``: sum of the squared model values, per feature
+        """
+        obs_x_reconstruction, reconstruction_x_reconstruction = 0., 0.
+
+        for chunk, chunk_individual_parameters in self._iter_subjects_chunks(data, individual_parameters):
+            data_reconstruction = self._compute_individual_tensorized_on_visits(chunk, chunk_individual_parameters, attribute_type='MCMC')
+            data_reconstruction *= chunk.visits_mask.float()  # speed-up computations
+
+            obs_x_reconstruction += (chunk.visits_values * data_reconstruction).sum(dim=(0, 1))  # no sum on features...
+            reconstruction_x_reconstruction += (data_reconstruction * data_reconstruction).sum(dim=(0, 1))
+
+        return {
+            'obs_x_reconstruction': obs_x_reconstruction,
+            'reconstruction_x_reconstruction': reconstruction_x_reconstruction,
+        }
+
     @abstractmethod
     def compute_sufficient_statistics(self, data: Dataset, realizations: CollectionRealization) -> DictParamsTorch:
         """
@@ -77,7 +77,7 @@ class AbstractMultivariateModel(OrdinalModelMixin, AbstractModel):
         return realizations
     """
 
-    def initialize(self, dataset, method: str = 'default'):
+    def initialize(self, dataset, method: str = 'default', **init_kwargs):
 
         if dataset.dimension < 2:
             raise LeaspyModelInputError("A multivariate model should have at least 2 features but your dataset "
@@ -95,7 +95,7 @@ class AbstractMultivariateModel(OrdinalModelMixin, AbstractModel):
             raise LeaspyModelInputError(f"Sources dimension should be an integer in [0, dimension - 1[ "
                                         f"but you provided `source_dimension` = {self.source_dimension} whereas `dimension` = {self.dimension}")
 
-        self.parameters = initialize_parameters(self, dataset, method)
+        self.parameters = initialize_parameters(self, dataset, method, **init_kwargs)
 
         self.attributes = AttributesFactory.attributes(self.name, self.dimension, self.source_dimension,
                                                        **self._attributes_factory_ordinal_kws)
@@ -153,6 +153,8 @@ class AbstractMultivariateModel(OrdinalModelMixin, AbstractModel):
         # special hyperparameter(s) for ordinal model
         expected_hyperparameters += self._handle_ordinal_hyperparameters(hyperparameters)
 
+        expected_hyperparameters += self._handle_subjects_chunk_size_hyperparameter(hyperparameters)
+
         self._raise_if_unknown_hyperparameters(expected_hyperparameters, hyperparameters)
 
     def save(self, path: str, with_mixing_matrix: bool = True, **kwargs):
@@ -193,6 +195,7 @@ class AbstractMultivariateModel(OrdinalModelMixin, AbstractModel):
         }
 
         self._export_extra_ordinal_settings(model_settings)
+        self._export_subjects_chunk_size(model_settings)
 
         # Default json.dump kwargs:
         kwargs = {'indent': 2, **kwargs}
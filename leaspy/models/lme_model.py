@@ -126,10 +126,10 @@ class LMEModel(GenericModel): # TODO should inherit from AbstractModel?
         #assert 'random_intercept' in individual_parameters
         if not self.with_random_slope_age:
             # no random slope on ages (fixed effect only)
-            re_params = np.array([ individual_parameters['random_intercept'].item(), 0 ])
+            re_params = np.array([ float(individual_parameters['random_intercept']), 0 ])
         else:
             #assert 'random_slope_age' in individual_parameters
-            re_params = np.array([ individual_parameters['random_intercept'].item(), individual_parameters['random_slope_age'].item() ])
+            re_params = np.array([ float(individual_parameters['random_intercept']), float(individual_parameters['random_slope_age']) ])
 
         y = X @ (self.parameters['fe_params'] + re_params)
 
@@ -7,6 +7,7 @@ from leaspy.models.utils.noise_model import NoiseModel
 from leaspy.utils.docs import doc_with_super, doc_with_
 from leaspy.utils.subtypes import suffixed_method
 from leaspy.exceptions import LeaspyModelInputError
+from leaspy.utils.typing import Union
 
 # TODO refact? implement a single function
 # compute_individual_tensorized(..., with_jacobian: bool) -> returning either model values or model values + jacobians wrt individual parameters
@@ -77,10 +78,59 @@ class MultivariateModel(AbstractMultivariateModel):
     def compute_individual_tensorized(self, timepoints, individual_parameters, *, attribute_type=None):
         pass
 
-    def compute_individual_tensorized_linear(self, timepoints, individual_parameters, *, attribute_type=None):
+    def _compute_individual_tensorized_on_features(self, timepoints, individual_parameters, features, *, attribute_type=None, **kws):
+        if self.name not in ('linear', 'logistic'):
+            return super()._compute_individual_tensorized_on_features(timepoints, individual_parameters, features,
+                                                                      attribute_type=attribute_type, **kws)
+        # only the population attributes of the selected features are used
+        return self.compute_individual_tensorized(timepoints, individual_parameters, attribute_type=attribute_type,
+                                                  features=features, **kws)
+
+    def get_features_impacted_by_population_variable(self, var_name, idx):
+        if var_name.startswith('deltas_'):
+            # ordinal deltas of a single feature (not batched)
+            return [self.features.index(var_name[len('deltas_'):])]
+        if len(idx) == 0:
+            return None
+        if var_name == 'deltas':
+            # batched ordinal deltas: shape (dimension, max_level - 1)
+            return [idx[0]]
+        if var_name == 'g' and self.name == 'linear':
+            # positions are not involved in the orthonormal basis for linear model (Euclidean metric)
+            return [idx[0]]
+        if var_name in ('g', 'v0') and self.source_dimension == 0:
+            # no orthonormal basis nor mixing matrix to recompute
+            return [idx[0]]
+        return None
+
+    def compute_individual_tensorized_linear(self, timepoints, individual_parameters, *, attribute_type=None, features=None):
+        """
+        Compute the individual values at timepoints according to the model (linear).
+
+        Parameters
+        ----------
+        timepoints : :class:`torch.Tensor` of shape (n_individuals, n_timepoints)
+
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` of shape (n_individuals, n_dims_param)]
+
+        attribute_type : Any (default None)
+            Flag to ask for MCMC attributes instead of model's attributes.
+
+        features : list[int] (optional, default None)
+            Indices of the features to restrict computations to (all features if None).
+
+        Returns
+        -------
+        :class:`torch.Tensor` of shape (n_individuals, n_timepoints, n_features)
+            With `n_features = len(features)` when `features` is not None.
+        """
 
         # Population parameters
         positions, velocities, mixing_matrix = self._get_attributes(attribute_type)
+        if features is not None:
+            positions, velocities = positions[features], velocities[features]
+            if self.source_dimension != 0:
+                mixing_matrix = mixing_matrix[features]
         xi, tau = individual_parameters['xi'], individual_parameters['tau']
         reparametrized_time = self.time_reparametrization(timepoints, xi, tau)
 
@@ -97,10 +147,41 @@ class MultivariateModel(AbstractMultivariateModel):
 
         return model # (n_individuals, n_timepoints, n_features)
 
-    def compute_individual_tensorized_logistic(self, timepoints, individual_parameters, *, attribute_type=None):
+    def compute_individual_tensorized_logistic(self, timepoints, individual_parameters, *, attribute_type=None, features=None,
+                                               packed_levels=False):
+        """
+        Compute the individual values at timepoints according to the model (logistic).
+
+        Parameters
+        ----------
+        timepoints : :class:`torch.Tensor` of shape (n_individuals, n_timepoints)
+
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` of shape (n_individuals, n_dims_param)]
+
+        attribute_type : Any (default None)
+            Flag to ask for MCMC attributes instead of model's attributes.
+
+        features : list[int] (optional, default None)
+            Indices of the features to restrict computations to (all features if None).
+
+        packed_levels : bool (default False)
+            Only for ordinal models: return the values in the packed layout of ordinal levels
+            (cf. :class:`.OrdinalLevelsLayout`) instead of the padded one.
+
+        Returns
+        -------
+        :class:`torch.Tensor` of shape (n_individuals, n_timepoints, n_features [, extra_dim_ordinal_models])
+            With `n_features = len(features)` when `features` is not None.
+            For ordinal models, the extra dimension is the padded dimension of ordinal levels (max_level [+ 1 for pdf]),
+            or the flat axis of all ordinal levels of all features (instead of `n_features`) when `packed_levels` is True.
+        """
 
         # Population parameters
         g, v0, a_matrix = self._get_attributes(attribute_type)
+        if features is not None:
+            g, v0 = g[features], v0[features]
+            if self.source_dimension != 0:
+                a_matrix = a_matrix[features]
         g_plus_1 = 1. + g
         b = g_plus_1 * g_plus_1 / g
 
@@ -112,15 +193,11 @@ class MultivariateModel(AbstractMultivariateModel):
         reparametrized_time = reparametrized_time.unsqueeze(-1) # (n_individuals, n_timepoints, n_features)
 
         if self.is_ordinal:
-            # add an extra dimension for the levels of the ordinal item
-            reparametrized_time = reparametrized_time.unsqueeze(-1)
-            g = g.unsqueeze(-1)
-            b = b.unsqueeze(-1)
-            v0 = v0.unsqueeze(-1)
-            deltas = self._get_deltas(attribute_type)  # (features, max_level)
-            deltas = deltas.unsqueeze(0).unsqueeze(0)  # add (ind, timepoints) dimensions
-            # infinite deltas (impossible ordinal levels) will induce model = 0 which is intended
-            reparametrized_time = reparametrized_time - deltas.cumsum(dim=-1)
+            # packed layout of ordinal levels: the features dimension becomes the flat axis of all possible levels
+            levels = self._get_ordinal_levels_layout(features)
+            levels_features = levels.sf_feature_index
+            g, b, v0 = g[levels_features], b[levels_features], v0[levels_features]
+            reparametrized_time = reparametrized_time - self._get_cumulative_deltas(attribute_type, levels, features)
 
         LL = v0 * reparametrized_time
 
@@ -128,24 +205,43 @@ class MultivariateModel(AbstractMultivariateModel):
             sources = individual_parameters['sources']
             wi = sources.matmul(a_matrix.t()).unsqueeze(-2) # unsqueeze for (n_timepoints)
             if self.is_ordinal:
-                wi = wi.unsqueeze(-1)
+                wi = wi[..., levels_features]
             LL += wi
 
         # TODO? more efficient & accurate to compute `torch.exp(-t*b + log_g)` since we directly sample & stored log_g
         LL = 1. + g * torch.exp(-LL * b)
         model = 1. / LL
 
-        # For ordinal loss, compute pdf instead of survival function
-        if self.noise_model == 'ordinal':
-            model = self.compute_ordinal_pdf_from_ordinal_sf(model)
+        if self.is_ordinal:
+            # For ordinal loss, compute pdf instead of survival function
+            sf = self.noise_model != 'ordinal'
+            if not sf:
+                model = levels.pdf_from_sf(model)
+            if not packed_levels:
+                model = levels.unpack(model, sf=sf, max_level=self.ordinal_infos['max_level'])
 
-        return model # (n_individuals, n_timepoints, n_features [, extra_dim_ordinal_models])
+        return model # (n_individuals, n_timepoints, n_features [, extra_dim_ordinal_models]) or (..., n_levels) if packed
 
     @suffixed_method
     def compute_individual_ages_from_biomarker_values_tensorized(self, value: torch.Tensor,
                                                                  individual_parameters: dict, feature: str):
         pass
 
+    def compute_individual_ages_from_biomarker_values_tensorized_linear(self, value: torch.Tensor,
+                                                                        individual_parameters: dict, feature: str):
+        if value.dim() != 2:
+            raise LeaspyModelInputError(f"The biomarker value should be dim 2, not {value.dim()}!")
+
+        # 1/ get attributes of feature (all consistency checks were done in API layer)
+        feat_ind = self.features.index(feature)
+        positions, velocities, mixing_matrix = self._get_attributes(None)
+        positions, velocities = positions[feat_ind], velocities[feat_ind]
+        xi, tau = individual_parameters['xi'], individual_parameters['tau']  # (n_individuals, 1)
+        wi = self._get_space_shift_of_feature(individual_parameters, mixing_matrix, feat_ind)
+
+        # 2/ compute ages (closed-form inversion, all individuals at once)
+        return tau + torch.exp(-xi) * (value - positions - wi) / velocities
+
     def compute_individual_ages_from_biomarker_values_tensorized_logistic(self, value: torch.Tensor,
                                                                           individual_parameters: dict, feature: str):
         if value.dim() != 2:
@@ -157,23 +253,14 @@ class MultivariateModel(AbstractMultivariateModel):
         # avoid division by zero:
         value = value.masked_fill((value == 0) | (value == 1), float('nan'))
 
-        # 1/ get attributes
+        # 1/ get attributes of feature (all consistency checks were done in API layer)
+        feat_ind = self.features.index(feature)
         g, v0, a_matrix = self._get_attributes(None)
-        xi, tau = individual_parameters['xi'], individual_parameters['tau']
-        if self.source_dimension != 0:
-            sources = individual_parameters['sources']
-            wi = sources.matmul(a_matrix.t())
-        else:
-            wi = 0
-
-        # get feature value for g, v0 and wi
-        feat_ind = self.features.index(feature)  # all consistency checks were done in API layer
-        g = torch.tensor([g[feat_ind]])  # g and v0 were shape: (n_features in the multivariate model)
-        v0 = torch.tensor([v0[feat_ind]])
-        if self.source_dimension != 0:
-            wi = wi[0, feat_ind].item()  # wi was shape (1, n_features)
+        g, v0 = g[feat_ind], v0[feat_ind]  # g and v0 were shape: (n_features in the multivariate model)
+        xi, tau = individual_parameters['xi'], individual_parameters['tau']  # (n_individuals, 1)
+        wi = self._get_space_shift_of_feature(individual_parameters, a_matrix, feat_ind)
 
-        # 2/ compute age
+        # 2/ compute ages (closed-form inversion, all individuals at once)
         ages = tau + (torch.exp(-xi) / v0) * ((g / (g + 1) ** 2) * torch.log(g/(1 / value - 1)) - wi)
         # assert ages.shape == value.shape
 
@@ -182,19 +269,19 @@ class MultivariateModel(AbstractMultivariateModel):
     def _compute_individual_ages_from_biomarker_values_tensorized_logistic_ordinal(self, value: torch.Tensor,
                                                                           individual_parameters: dict, feature: str):
         """
-        For one individual, compute age(s) breakpoints at which the given features levels are the most likely (given the subject's
-        individual parameters).
+        For one or several individuals, compute age(s) breakpoints at which the given features levels are the most likely
+        (given the subjects' individual parameters).
 
         Consistency checks are done in the main API layer.
 
         Parameters
         ----------
-        value : :class:`torch.Tensor`
-            Contains the biomarker level value(s) of the subject.
+        value : :class:`torch.Tensor` of shape (n_individuals, n_values)
+            Contains the biomarker level value(s) of the subjects.
 
         individual_parameters : dict
             Contains the individual parameters.
-            Each individual parameter should be a scalar or array_like
+            Each individual parameter should be a :class:`torch.Tensor` of shape (n_individuals, n_dims_param)
 
         feature : str
             Name of the considered biomarker (optional for univariate models, compulsory for multivariate models).
@@ -202,43 +289,42 @@ class MultivariateModel(AbstractMultivariateModel):
         Returns
         -------
         :class:`torch.Tensor`
-            Contains the subject's ages computed at the given values(s)
-            Shape of tensor is (1, n_values)
-
-        Raises
-        ------
-        :exc:`.LeaspyModelInputError`
-            if computation is tried on more than 1 individual
+            Contains the subjects' ages computed at the given values(s)
+            Shape of tensor is (n_individuals, n_values)
         """
 
-        # 1/ get attributes
+        # 1/ get attributes of feature (all consistency checks were done in API layer)
+        feat_ind = self.features.index(feature)
         g, v0, a_matrix = self._get_attributes(None)
-        xi, tau = individual_parameters['xi'], individual_parameters['tau']
-        if self.source_dimension != 0:
-            sources = individual_parameters['sources']
-            wi = sources.matmul(a_matrix.t())
-        else:
-            wi = 0
-
-        # get feature value for g, v0 and wi
-        feat_ind = self.features.index(feature)  # all consistency checks were done in API layer
-        g = torch.tensor([g[feat_ind]])  # g and v0 were shape: (n_features in the multivariate model)
-        v0 = torch.tensor([v0[feat_ind]])
-        if self.source_dimension != 0:
-            wi = wi[0, feat_ind].item()  # wi was shape (1, n_features)
+        g, v0 = g[feat_ind], v0[feat_ind]  # g and v0 were shape: (n_features in the multivariate model)
+        xi, tau = individual_parameters['xi'], individual_parameters['tau']  # (n_individuals, 1)
+        wi = self._get_space_shift_of_feature(individual_parameters, a_matrix, feat_ind)
 
-        # 2/ compute age
+        # 2/ compute bounds of ages and search ages on a regular grid (all individuals at once)
         ages_0 = tau + (torch.exp(-xi) / v0) * ((g / (g + 1) ** 2) * torch.log(g) - wi)
         deltas_ft = self._get_deltas(None)[feat_ind]
         delta_max = deltas_ft[torch.isfinite(deltas_ft)].sum()
         ages_max = tau + (torch.exp(-xi) / v0) * ((g / (g + 1) ** 2) * torch.log(g) - wi + delta_max)
 
-        grid_timepoints = torch.linspace(ages_0.item(), ages_max.item(), 1000)
+        grid_timepoints = self._get_ordinal_grid_timepoints(ages_0, ages_max)
 
         return self._ordinal_grid_search_value(grid_timepoints, value,
                                                individual_parameters=individual_parameters,
                                                feat_index=feat_ind)
 
+    def _compute_ordinal_grid_model(self, grid_timepoints: torch.Tensor, individual_parameters: dict,
+                                    feat_index: int) -> torch.Tensor:
+        # only compute the model for the considered feature
+        return self.compute_individual_tensorized_logistic(grid_timepoints, individual_parameters,
+                                                           attribute_type=None, features=[feat_index])
+
+    def _get_space_shift_of_feature(self, individual_parameters: dict, mixing_matrix: torch.Tensor,
+                                    feat_index: int) -> Union[torch.Tensor, float]:
+        """Space-shifts of individuals for a single feature, shape (n_individuals, 1) (0 when there are no sources)."""
+        if self.source_dimension == 0:
+            return 0.
+        return individual_parameters['sources'].matmul(mixing_matrix[[feat_index]].t())
+
     @suffixed_method
     def compute_jacobian_tensorized(self, timepoints, individual_parameters, *, attribute_type=None):
         pass
@@ -408,17 +494,8 @@ class MultivariateModel(AbstractMultivariateModel):
 
         individual_parameters = self.get_param_from_real(realizations)
 
-        data_reconstruction = self.compute_individual_tensorized(data.timepoints, individual_parameters,
-                                                                 attribute_type='MCMC')
-
         if self.noise_model in ['gaussian_scalar', 'gaussian_diagonal']:
-            data_reconstruction *= data.mask.float()  # speed-up computations
-
-            norm_1 = data.values * data_reconstruction
-            norm_2 = data_reconstruction * data_reconstruction
-
-            sufficient_statistics['obs_x_reconstruction'] = norm_1  # .sum(dim=2) # no sum on features...
-            sufficient_statistics['reconstruction_x_reconstruction'] = norm_2  # .sum(dim=2) # no sum on features...
+            sufficient_statistics.update(self._compute_reconstruction_sufficient_statistics(data, individual_parameters))
 
         if self.noise_model in ['bernoulli', 'ordinal', 'ordinal_ranking']:
             sufficient_statistics['log-likelihood'] = self.compute_individual_attachment_tensorized(data, individual_parameters,
@@ -519,8 +596,8 @@ class MultivariateModel(AbstractMultivariateModel):
         else:
             # keep feature dependence on feature to update diagonal noise (1 free param per feature)
             S1 = data.L2_norm_per_ft
-            S2 = suff_stats['obs_x_reconstruction'].sum(dim=(0, 1))
-            S3 = suff_stats['reconstruction_x_reconstruction'].sum(dim=(0, 1))
+            S2 = suff_stats['obs_x_reconstruction']
+            S3 = suff_stats['reconstruction_x_reconstruction']
 
             # tensor 1D, shape (dimension,)
             noise_var = (S1 - 2. * S2 + S3) / data.n_observations_per_ft.float()
@@ -593,12 +670,6 @@ class MultivariateModel(AbstractMultivariateModel):
         return variables_infos
 
 # document some methods (we cannot decorate them at method creation since they are not yet decorated from `doc_with_super`)
-doc_with_(MultivariateModel.compute_individual_tensorized_linear,
-          MultivariateModel.compute_individual_tensorized,
-          mapping={'the model': 'the model (linear)'})
-doc_with_(MultivariateModel.compute_individual_tensorized_logistic,
-          MultivariateModel.compute_individual_tensorized,
-          mapping={'the model': 'the model (logistic)'})
 #doc_with_(MultivariateModel.compute_individual_tensorized_mixed,
 #          MultivariateModel.compute_individual_tensorized,
 #          mapping={'the model': 'the model (mixed logistic-linear)'})
@@ -613,9 +684,9 @@ doc_with_(MultivariateModel.compute_jacobian_tensorized_logistic,
 #          MultivariateModel.compute_jacobian_tensorized,
 #          mapping={'the model': 'the model (mixed logistic-linear)'})
 
-#doc_with_(MultivariateModel.compute_individual_ages_from_biomarker_values_tensorized_linear,
-#          MultivariateModel.compute_individual_ages_from_biomarker_values_tensorized,
-#          mapping={'the model': 'the model (linear)'})
+doc_with_(MultivariateModel.compute_individual_ages_from_biomarker_values_tensorized_linear,
+          MultivariateModel.compute_individual_ages_from_biomarker_values_tensorized,
+          mapping={'the model': 'the model (linear)'})
 doc_with_(MultivariateModel.compute_individual_ages_from_biomarker_values_tensorized_logistic,
           MultivariateModel.compute_individual_ages_from_biomarker_values_tensorized,
           mapping={'the model': 'the model (logistic)'})
@@ -141,16 +141,7 @@ class MultivariateParallelModel(AbstractMultivariateModel):
 
         individual_parameters = self.get_param_from_real(realizations)
 
-        data_reconstruction = self.compute_individual_tensorized(data.timepoints,
-                                                                 individual_parameters,
-                                                                 attribute_type='MCMC')
-        data_reconstruction *= data.mask.float() # speed-up computations
-
-        norm_1 = data.values * data_reconstruction #* data.mask.float()
-        norm_2 = data_reconstruction * data_reconstruction #* data.mask.float()
-
-        sufficient_statistics['obs_x_reconstruction'] = norm_1 #.sum(dim=2) # no sum on features...
-        sufficient_statistics['reconstruction_x_reconstruction'] = norm_2 #.sum(dim=2) # no sum on features...
+        sufficient_statistics.update(self._compute_reconstruction_sufficient_statistics(data, individual_parameters))
 
         if self.noise_model == 'bernoulli':
             sufficient_statistics['log-likelihood'] = self.compute_individual_attachment_tensorized(data, individual_parameters,
@@ -211,8 +202,8 @@ class MultivariateParallelModel(AbstractMultivariateModel):
         else:
             # keep feature dependence on feature to update diagonal noise (1 free param per feature)
             S1 = data.L2_norm_per_ft
-            S2 = suff_stats['obs_x_reconstruction'].sum(dim=(0, 1))
-            S3 = suff_stats['reconstruction_x_reconstruction'].sum(dim=(0, 1))
+            S2 = suff_stats['obs_x_reconstruction']
+            S3 = suff_stats['reconstruction_x_reconstruction']
 
             # tensor 1D, shape (dimension,)
             noise_var = (S1 - 2. * S2 + S3) / data.n_observations_per_ft.float()
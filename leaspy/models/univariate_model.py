@@ -100,6 +100,7 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
         }
 
         self._export_extra_ordinal_settings(model_settings)
+        self._export_subjects_chunk_size(model_settings)
 
         # TODO : in leaspy models there should be a method to only return the dict describing the model
         # and then another generic method (inherited) should save this dict
@@ -124,13 +125,15 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
         # special hyperparameter(s) for ordinal model
         expected_hyperparameters += self._handle_ordinal_hyperparameters(hyperparameters)
 
+        expected_hyperparameters += self._handle_subjects_chunk_size_hyperparameter(hyperparameters)
+
         self._raise_if_unknown_hyperparameters(expected_hyperparameters, hyperparameters)
 
-    def initialize(self, dataset, method="default"):
+    def initialize(self, dataset, method="default", **init_kwargs):
 
         self.features = dataset.headers
 
-        self.parameters = initialize_parameters(self, dataset, method)
+        self.parameters = initialize_parameters(self, dataset, method, **init_kwargs)
         self.attributes = AttributesFactory.attributes(self.name, dimension=1,
                                                        **self._attributes_factory_ordinal_kws)
 
@@ -235,7 +238,32 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
     def compute_individual_tensorized(self, timepoints, individual_parameters, *, attribute_type=None):
         pass
 
-    def compute_individual_tensorized_logistic(self, timepoints, individual_parameters, *, attribute_type=None):
+    def compute_individual_tensorized_logistic(self, timepoints, individual_parameters, *, attribute_type=None,
+                                               packed_levels=False):
+        """
+        Compute the individual values at timepoints according to the model (logistic).
+
+        Parameters
+        ----------
+        timepoints : :class:`torch.Tensor` of shape (n_individuals, n_timepoints)
+            Timepoints of individuals.
+
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` of shape (n_individuals, n_dims_param)]
+            Individual parameters.
+
+        attribute_type : Any (default None)
+            Flag to ask for MCMC attributes instead of model's attributes.
+
+        packed_levels : bool (default False)
+            Only for ordinal models: return the values in the packed layout of ordinal levels
+            (cf. :class:`.OrdinalLevelsLayout`) instead of the padded one.
+
+        Returns
+        -------
+        :class:`torch.Tensor` of shape (n_individuals, n_timepoints, n_features == 1 [, extra_dim_ordinal_models])
+            For ordinal models, the extra dimension is the padded dimension of ordinal levels (max_level [+ 1 for pdf]),
+            or the flat axis of all ordinal levels (instead of `n_features`) when `packed_levels` is True.
+        """
 
         # Population parameters
         g = self._get_attributes(attribute_type)
@@ -247,21 +275,22 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
         LL = reparametrized_time.unsqueeze(-1)
 
         if self.is_ordinal:
-            # add an extra dimension for the levels of the ordinal item
-            LL = LL.unsqueeze(-1)
-            g = g.unsqueeze(-1)
-            deltas = self._get_deltas(attribute_type) # (features, max_level)
-            deltas = deltas.unsqueeze(0).unsqueeze(0)  # add (ind, timepoints) dimensions
-            LL = LL - deltas.cumsum(dim=-1)
+            # packed layout of ordinal levels: the features dimension becomes the flat axis of all possible levels
+            levels = self._get_ordinal_levels_layout()
+            LL = LL - self._get_cumulative_deltas(attribute_type, levels)
 
         # TODO? more efficient & accurate to compute `torch.exp(-LL + log_g)` since we directly sample & stored log_g
         model = 1. / (1. + g * torch.exp(-LL))
 
-        # Compute the pdf and not the sf
-        if self.noise_model == 'ordinal':
-            model = self.compute_ordinal_pdf_from_ordinal_sf(model)
+        if self.is_ordinal:
+            # Compute the pdf and not the sf
+            sf = self.noise_model != 'ordinal'
+            if not sf:
+                model = levels.pdf_from_sf(model)
+            if not packed_levels:
+                model = levels.unpack(model, sf=sf, max_level=self.ordinal_infos['max_level'])
 
-        return model # (n_individuals, n_timepoints, n_features == 1 [, extra_dim_ordinal_models])
+        return model # (n_individuals, n_timepoints, n_features == 1 [, extra_dim_ordinal_models]) or (..., n_levels) if packed
 
     def compute_individual_tensorized_linear(self, timepoints, individual_parameters, *, attribute_type=None):
 
@@ -279,6 +308,22 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
                                                                  individual_parameters: dict, feature: str):
         pass
 
+    def compute_individual_ages_from_biomarker_values_tensorized_linear(self, value: torch.Tensor,
+                                                                        individual_parameters: dict, feature: str):
+
+        if value.dim() != 2:
+            raise LeaspyModelInputError(f"The biomarker value should be dim 2, not {value.dim()}!")
+
+        # get tensorized attributes
+        positions = self._get_attributes(None)
+        xi, tau = individual_parameters['xi'], individual_parameters['tau']
+
+        # compute ages (closed-form inversion, all individuals at once)
+        ages = torch.exp(-xi) * (value - positions) + tau
+        assert ages.shape == value.shape
+
+        return ages
+
     def compute_individual_ages_from_biomarker_values_tensorized_logistic(self, value: torch.Tensor,
                                                                           individual_parameters: dict, feature: str):
 
@@ -295,7 +340,7 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
         g = self._get_attributes(None)
         xi, tau = individual_parameters['xi'], individual_parameters['tau']
 
-        # compute age
+        # compute ages (closed-form inversion, all individuals at once)
         ages = torch.exp(-xi) * torch.log(g/(1 / value - 1)) + tau
         assert ages.shape == value.shape
 
@@ -304,47 +349,42 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
     def _compute_individual_ages_from_biomarker_values_tensorized_logistic_ordinal(self, value: torch.Tensor,
                                                                           individual_parameters: dict):
         """
-        For one individual, compute age(s) breakpoints at which the given features levels are the most likely (given the subject's
-        individual parameters).
+        For one or several individuals, compute age(s) breakpoints at which the given features levels are the most likely
+        (given the subjects' individual parameters).
 
         Consistency checks are done in the main API layer.
 
         Parameters
         ----------
-        value : :class:`torch.Tensor`
-            Contains the biomarker level value(s) of the subject.
+        value : :class:`torch.Tensor` of shape (n_individuals, n_values)
+            Contains the biomarker level value(s) of the subjects.
 
         individual_parameters : dict
             Contains the individual parameters.
-            Each individual parameter should be a scalar or array_like
+            Each individual parameter should be a :class:`torch.Tensor` of shape (n_individuals, n_dims_param)
 
         Returns
         -------
         :class:`torch.Tensor`
-            Contains the subject's ages computed at the given values(s)
-            Shape of tensor is (1, n_values)
-
-        Raises
-        ------
-        :exc:`.LeaspyModelInputError`
-            if computation is tried on more than 1 individual
+            Contains the subjects' ages computed at the given values(s)
+            Shape of tensor is (n_individuals, n_values)
         """
 
         # 1/ get attributes
         g = self._get_attributes(None)
-        xi, tau = individual_parameters['xi'], individual_parameters['tau']
+        xi, tau = individual_parameters['xi'], individual_parameters['tau']  # (n_individuals, 1)
 
-        # get feature value for g, v0 and wi
+        # get feature value for g
         feat_ind = 0  # univariate model
-        g = torch.tensor([g[feat_ind]])  # g and v0 were shape: (n_features in the multivariate model)
+        g = g[feat_ind]  # g was shape: (n_features in the multivariate model)
 
-        # 2/ compute age
+        # 2/ compute bounds of ages and search ages on a regular grid (all individuals at once)
         ages_0 = tau + (torch.exp(-xi)) * ((g / (g + 1) ** 2) * torch.log(g))
         deltas_ft = self._get_deltas(None)[feat_ind]
         delta_max = deltas_ft[torch.isfinite(deltas_ft)].sum()
         ages_max = tau + (torch.exp(-xi)) * ((g / (g + 1) ** 2) * torch.log(g) + delta_max)
 
-        grid_timepoints = torch.linspace(ages_0.item(), ages_max.item(), 1000)
+        grid_timepoints = self._get_ordinal_grid_timepoints(ages_0, ages_max)
 
         return self._ordinal_grid_search_value(grid_timepoints, value,
                                                individual_parameters=individual_parameters,
@@ -432,18 +472,10 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
 
         self._add_ordinal_tensor_realizations(realizations, sufficient_statistics)
 
-        # TODO : Optimize to compute the matrix multiplication only once for the reconstruction
         individual_parameters = self.get_param_from_real(realizations)
-        data_reconstruction = self.compute_individual_tensorized(data.timepoints, individual_parameters, attribute_type='MCMC')
 
         if self.noise_model in ['gaussian_scalar', 'gaussian_diagonal']:
-            data_reconstruction *= data.mask.float() # speed-up computations
-
-            norm_1 = data.values * data_reconstruction #* data.mask.float()
-            norm_2 = data_reconstruction * data_reconstruction #* data.mask.float()
-
-            sufficient_statistics['obs_x_reconstruction'] = norm_1 #.sum(dim=2)
-            sufficient_statistics['reconstruction_x_reconstruction'] = norm_2 #.sum(dim=2)
+            sufficient_statistics.update(self._compute_reconstruction_sufficient_statistics(data, individual_parameters))
 
         if self.noise_model in ['bernoulli', 'ordinal', 'ordinal_ranking']:
             sufficient_statistics['log-likelihood'] = self.compute_individual_attachment_tensorized(data, individual_parameters,
@@ -506,8 +538,8 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
         else:
             # keep feature dependence on feature to update diagonal noise (1 free param per feature)
             S1 = data.L2_norm_per_ft
-            S2 = suff_stats['obs_x_reconstruction'].sum(dim=(0, 1))
-            S3 = suff_stats['reconstruction_x_reconstruction'].sum(dim=(0, 1))
+            S2 = suff_stats['obs_x_reconstruction']
+            S3 = suff_stats['reconstruction_x_reconstruction']
 
             # tensor 1D, shape (dimension,)
             noise_var = (S1 - 2. * S2 + S3) / data.n_observations_per_ft.float()
@@ -553,9 +585,6 @@ class UnivariateModel(AbstractModel, OrdinalModelMixin):
 doc_with_(UnivariateModel.compute_individual_tensorized_linear,
           UnivariateModel.compute_individual_tensorized,
           mapping={'the model': 'the model (linear)'})
-doc_with_(UnivariateModel.compute_individual_tensorized_logistic,
-          UnivariateModel.compute_individual_tensorized,
-          mapping={'the model': 'the model (logistic)'})
 
 doc_with_(UnivariateModel.compute_jacobian_tensorized_linear,
           UnivariateModel.compute_jacobian_tensorized,
@@ -564,6 +593,9 @@ doc_with_(UnivariateModel.compute_jacobian_tensorized_logistic,
           UnivariateModel.compute_jacobian_tensorized,
           mapping={'the model': 'the model (logistic)'})
 
+doc_with_(UnivariateModel.compute_individual_ages_from_biomarker_values_tensorized_linear,
+          UnivariateModel.compute_individual_ages_from_biomarker_values_tensorized,
+          mapping={'the model': 'the model (linear)'})
 doc_with_(UnivariateModel.compute_individual_ages_from_biomarker_values_tensorized_logistic,
           UnivariateModel.compute_individual_ages_from_biomarker_values_tensorized,
           mapping={'the model': 'the model (logistic)'})
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 import torch
 
 from leaspy.exceptions import LeaspyModelInputError
-from leaspy.utils.typing import DictParamsTorch, ParamType, Tuple
+from leaspy.utils.typing import DictParamsTorch, KwargsType, ParamType, Tuple
 
 
 class AbstractAttributes(ABC):
@@ -89,6 +89,36 @@ class AbstractAttributes(ABC):
             If `names_of_changed_values` contains unknown values to update.
         """
 
+    def checkpoint(self) -> KwargsType:
+        """
+        Get a cheap snapshot of the current attributes, to be able to restore them later on with :meth:`.restore`.
+
+        <!> No tensor is copied: this relies on the fact that attributes are always re-assigned (never modified in-place)
+        when they are updated (only dictionaries of tensors are shallow-copied).
+
+        Returns
+        -------
+        dict[str, Any]
+            The snapshot of attributes.
+        """
+        return {
+            attribute_name: dict(attribute) if isinstance(attribute, dict) else attribute
+            for attribute_name, attribute in vars(self).items()
+            if attribute is None or isinstance(attribute, (torch.Tensor, dict))
+        }
+
+    def restore(self, checkpoint: KwargsType) -> None:
+        """
+        Restore the attributes from a snapshot that was previously taken with :meth:`.checkpoint`.
+
+        Parameters
+        ----------
+        checkpoint : dict[str, Any]
+            The snapshot of attributes.
+        """
+        for attribute_name, attribute in checkpoint.items():
+            setattr(self, attribute_name, dict(attribute) if isinstance(attribute, dict) else attribute)
+
     def move_to_device(self, device: torch.device):
         """
         Move the tensor attributes of this class to the specified device.
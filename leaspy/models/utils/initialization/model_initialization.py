@@ -1,16 +1,21 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 import warnings
 from operator import itemgetter
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import torch
-from scipy import stats
 import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
 
 # <!> circular imports
 import leaspy
 from leaspy.exceptions import LeaspyInputError, LeaspyModelInputError
 
-#from joblib import Parallel, delayed
+if TYPE_CHECKING:
+    from leaspy.io.data.dataset import Dataset
 
 xi_std = .5
 tau_std = 5.
@@ -21,7 +26,7 @@ def _torch_round(t: torch.FloatTensor, *, tol: float = 1 << 16) -> torch.FloatTe
     # Round values to ~ 10**-4.8
     return (t * tol).round() * (1./tol)
 
-def initialize_parameters(model, dataset, method="default"):
+def initialize_parameters(model, dataset, method="default", **init_kwargs):
     """
     Initialize the model's group parameters given its name & the scores of all subjects.
 
@@ -42,6 +47,10 @@ def initialize_parameters(model, dataset, method="default"):
         Must be one of:
             * ``'default'``: initialize at mean.
             * ``'random'``:  initialize with a gaussian realization with same mean and variance.
+            * ``'lme'``: initialize from linear mixed-effects models fitted per feature (cf. :func:`.lme_init`).
+    **init_kwargs
+        Additional keyword arguments for the initialization method
+        (only supported by ``'lme'`` method, passed to :func:`.lme_init`, e.g. `n_jobs`).
 
     Returns
     -------
@@ -54,23 +63,21 @@ def initialize_parameters(model, dataset, method="default"):
         If no initialization method is known for model type / method
     """
 
-    # we convert once for all dataset to pandas dataframe for convenience
-    df = dataset.to_pandas().dropna(how='all').set_index(['ID', 'TIME']).sort_index()
-    assert df.index.is_unique
-    assert df.index.to_frame().notnull().all(axis=None)
-    if model.features != df.columns.tolist():
-        raise LeaspyInputError(f"Features mismatch between model and dataset: {model.features} != {df.columns}")
-
-    if method == 'lme':
-        return lme_init(model, df) # support kwargs?
+    if model.features != dataset.headers:
+        raise LeaspyInputError(f"Features mismatch between model and dataset: {model.features} != {dataset.headers}")
 
     name = model.name
-    if name in ['logistic', 'univariate_logistic']:
-        parameters = initialize_logistic(model, df, method)
+    if method == 'lme':
+        parameters = lme_init(model, dataset, **init_kwargs)
+    elif init_kwargs:
+        raise LeaspyInputError(f"The initialization method '{method}' does not support any keyword argument, "
+                               f"but {set(init_kwargs)} were given.")
+    elif name in ['logistic', 'univariate_logistic']:
+        parameters = initialize_logistic(model, dataset, method)
     elif name == 'logistic_parallel':
-        parameters = initialize_logistic_parallel(model, df, method)
+        parameters = initialize_logistic_parallel(model, dataset, method)
     elif name in ['linear', 'univariate_linear']:
-        parameters = initialize_linear(model, df, method)
+        parameters = initialize_linear(model, dataset, method)
     #elif name == 'univariate':
     #    parameters = initialize_univariate(df, method)
     elif name == 'mixed_linear-logistic':
@@ -88,18 +95,56 @@ def initialize_parameters(model, dataset, method="default"):
     return rounded_parameters
 
 
-def get_lme_results(df: pd.DataFrame, n_jobs=-1, *,
+def get_dataframe_from_dataset(dataset: Dataset) -> pd.DataFrame:
+    """
+    Get the scores of all subjects as a dataframe indexed by sorted ('ID', 'TIME'), without visits with only nans.
+
+    It is only used by initializations that rely on pandas (ordinal deltas initialization).
+
+    Parameters
+    ----------
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
+
+    Returns
+    -------
+    :class:`pd.DataFrame`
+    """
+    # <!> `Dataset` was built from a validated `Data` object (unique & not null index): no need to re-validate it
+    df = dataset.to_pandas().set_index(['ID', 'TIME'])
+    if dataset.mask.bool().any(dim=-1).sum().item() < dataset.n_visits:
+        df.dropna(how='all', inplace=True)
+    # visits are already sorted by time (per individual) so no sort is needed unless individuals are not sorted
+    if not df.index.is_monotonic_increasing:
+        df.sort_index(inplace=True)
+    return df
+
+
+def _fit_lme_one_ft(algo, ages: np.ndarray, values: np.ndarray, subjects: np.ndarray, ft_index: int, *,
+                    with_random_slope_age: bool) -> dict:
+    # <!> slicing of observed values is done here (in worker) so that only the (shared) full arrays are sent to workers
+    observed = ~np.isnan(values[:, ft_index])
+    return algo.fit_lme(ages[observed], values[observed, ft_index], subjects[observed],
+                        with_random_slope_age=with_random_slope_age)
+
+
+def get_lme_results(dataset: Dataset, n_jobs=1, *,
                     with_random_slope_age=True, **lme_fit_kwargs):
     r"""
     Fit a LME on univariate (per feature) time-series (feature vs. patients' ages with varying intercept & slope)
 
+    The long-format data is extracted once from dataset and the LME of the different features
+    may be fitted in parallel (one process per feature, with :mod:`joblib`). Data arrays are then shared
+    with workers (memory-mapped by :mod:`joblib` when they are large) instead of being copied for each feature.
+
     Parameters
     ----------
-    df : :class:`pd.DataFrame`
+    dataset : :class:`.Dataset`
         Contains all the data (with nans)
-    n_jobs : int
-        Number of jobs in parallel when multiple features to init
-        Not used for now, buggy
+    n_jobs : int (default 1)
+        Number of jobs in parallel when multiple features to init (same convention as :mod:`joblib`).
+        Features are fitted sequentially by default (in current process), since starting a pool of processes
+        is only worth it for a large number of features and/or individuals.
     with_random_slope_age : bool (default True)
         Has LME model a random slope per age (otherwise only a random intercept).
     **lme_fit_kwargs
@@ -110,25 +155,27 @@ def get_lme_results(df: pd.DataFrame, n_jobs=-1, *,
     dict
         {param: str -> param_values_for_ft: torch.Tensor(nb_fts, \*shape_param)}
     """
+    # <!> circular imports
+    from leaspy.algo.others.lme_fit import LMEFitAlgorithm
 
     # defaults for LME Fit algorithm settings
     lme_fit_kwargs = {
         'force_independent_random_effects': True,
         **lme_fit_kwargs
     }
+    algo = LMEFitAlgorithm(leaspy.AlgorithmSettings('lme_fit', **lme_fit_kwargs))
 
-    #@delayed
-    def fit_one_ft(df_ft):
-        data_ft = leaspy.Data.from_dataframe(df_ft)
-        lsp_lme_ft = leaspy.Leaspy('lme', with_random_slope_age=with_random_slope_age)
-        algo = leaspy.AlgorithmSettings('lme_fit', **lme_fit_kwargs) # seed=seed
+    df = dataset.to_pandas()
+    ages = df['TIME'].to_numpy()
+    values = df[dataset.headers].to_numpy()
+    # integer codes of individuals (sorted as identifiers so that statsmodels groups are in the same order)
+    subjects, _ = pd.factorize(df['ID'], sort=True)
 
-        lsp_lme_ft.fit(data_ft, algo)
-
-        return lsp_lme_ft.model.parameters
-
-    #res = Parallel(n_jobs=n_jobs)(delayed(fit_one_ft)(s.dropna().to_frame()) for ft, s in df.items())
-    res = list(fit_one_ft(s.dropna().to_frame()) for ft, s in df.items())
+    n_jobs = min(effective_n_jobs(n_jobs), dataset.dimension)
+    res = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_lme_one_ft)(algo, ages, values, subjects, ft_index, with_random_slope_age=with_random_slope_age)
+        for ft_index in range(dataset.dimension)
+    )
 
     # output a dict of tensor stacked by feature, indexed by param
     param_names = next(iter(res)).keys()
@@ -139,7 +186,7 @@ def get_lme_results(df: pd.DataFrame, n_jobs=-1, *,
         for param_name in param_names
     }
 
-def lme_init(model, df: pd.DataFrame, fact_std=1., **kwargs):
+def lme_init(model, dataset: Dataset, fact_std=1., **kwargs):
     """
     Initialize the model's group parameters.
 
@@ -147,7 +194,7 @@ def lme_init(model, df: pd.DataFrame, fact_std=1., **kwargs):
     ----------
     model : :class:`.AbstractModel`
         The model to initialize (must be an univariate or multivariate linear or logistic manifold model).
-    df : :class:`pd.DataFrame`
+    dataset : :class:`.Dataset`
         Contains the individual scores (with nans).
     fact_std : float
         Multiplicative factor to apply on std-dev (tau, xi, noise) found naively with LME
@@ -174,7 +221,7 @@ def lme_init(model, df: pd.DataFrame, fact_std=1., **kwargs):
     multiv = 'univariate' not in name
 
     #print('Initialization with linear mixed-effects model...')
-    lme = get_lme_results(df, **kwargs)
+    lme = get_lme_results(dataset, **kwargs)
     #print()
 
     # init
@@ -308,14 +355,6 @@ def initialize_deltas_ordinal(model, df: pd.DataFrame, parameters):
 
     return parameters
 
-def linregress_against_time(s: pd.Series) -> Dict[str, float]:
-    """Return intercept & slope of a linear regression of series values against time (present in series index)."""
-    y = s.values
-    t = s.index.get_level_values('TIME').values
-    # Linear regression
-    slope, intercept, r_value, p_value, std_err = stats.linregress(t, y)
-    return {'intercept': intercept, 'slope': slope}
-
 def get_log_velocities(velocities: torch.Tensor, features: List[str], *, min: float = 1e-2) -> torch.Tensor:
     """Warn if some negative velocities are provided, clamp them to `min` and return their log."""
     neg_velocities = velocities <= 0
@@ -324,7 +363,7 @@ def get_log_velocities(velocities: torch.Tensor, features: List[str], *, min: fl
                       f"{[f for f, vel in zip(features, velocities) if vel <= 0]}: not properly handled in model...")
     return velocities.clamp(min=min).log()
 
-def initialize_logistic(model, df: pd.DataFrame, method):
+def initialize_logistic(model, dataset: Dataset, method):
     """
     Initialize the logistic model's group parameters.
 
@@ -332,8 +371,8 @@ def initialize_logistic(model, df: pd.DataFrame, method):
     ----------
     model : :class:`.AbstractModel`
         The model to initialize.
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
     method : str
         Must be one of:
             * ``'default'``: initialize at mean.
@@ -353,9 +392,9 @@ def initialize_logistic(model, df: pd.DataFrame, method):
     """
 
     # Get the slopes / values / times mu and sigma
-    slopes_mu, slopes_sigma = compute_patient_slopes_distribution(df)
-    values_mu, values_sigma = compute_patient_values_distribution(df)
-    time_mu, time_sigma = compute_patient_time_distribution(df)
+    slopes_mu, slopes_sigma = compute_patient_slopes_distribution(dataset)
+    values_mu, values_sigma = compute_patient_values_distribution(dataset)
+    time_mu, time_sigma = compute_patient_time_distribution(dataset)
 
     # Method
     if method == "default":
@@ -402,7 +441,7 @@ def initialize_logistic(model, df: pd.DataFrame, method):
         }
 
     if model.is_ordinal:
-        parameters = initialize_deltas_ordinal(model, df, parameters)
+        parameters = initialize_deltas_ordinal(model, get_dataframe_from_dataset(dataset), parameters)
 
     if not (model.is_ordinal or model.noise_model == 'bernoulli'):
         # do not initialize `noise_std` unless needed
@@ -411,7 +450,7 @@ def initialize_logistic(model, df: pd.DataFrame, method):
     return parameters
 
 
-def initialize_logistic_parallel(model, df, method):
+def initialize_logistic_parallel(model, dataset: Dataset, method):
     """
     Initialize the logistic parallel model's group parameters.
 
@@ -419,8 +458,8 @@ def initialize_logistic_parallel(model, df, method):
     ----------
     model : :class:`.AbstractModel`
         The model to initialize.
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
     method : str
         Must be one of:
             * ``'default'``: initialize at mean.
@@ -439,9 +478,9 @@ def initialize_logistic_parallel(model, df, method):
     """
 
     # Get the slopes / values / times mu and sigma
-    slopes_mu, slopes_sigma = compute_patient_slopes_distribution(df)
-    values_mu, values_sigma = compute_patient_values_distribution(df)
-    time_mu, time_sigma = compute_patient_time_distribution(df)
+    slopes_mu, slopes_sigma = compute_patient_slopes_distribution(dataset)
+    values_mu, values_sigma = compute_patient_values_distribution(dataset)
+    time_mu, time_sigma = compute_patient_time_distribution(dataset)
 
     if method == 'default':
         slopes = slopes_mu
@@ -480,7 +519,7 @@ def initialize_logistic_parallel(model, df, method):
         'noise_std': torch.tensor([noise_std]),
     }
 
-def initialize_linear(model, df: pd.DataFrame, method):
+def initialize_linear(model, dataset: Dataset, method):
     """
     Initialize the linear model's group parameters.
 
@@ -488,8 +527,8 @@ def initialize_linear(model, df: pd.DataFrame, method):
     ----------
     model : :class:`.AbstractModel`
         The model to initialize.
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
     method : str
         not used for now
 
@@ -499,16 +538,11 @@ def initialize_linear(model, df: pd.DataFrame, method):
         Contains the initialized model's group parameters. The parameters' keys are 'g', 'v0', 'betas', 'tau_mean',
         'tau_std', 'xi_mean', 'xi_std', 'sources_mean', 'sources_std' and 'noise_std'.
     """
-    times = df.index.get_level_values('TIME').values
-    t0 = times.mean()
-
-    d_regress_params = compute_linregress_subjects(df, max_inds=None)
-    df_all_regress_params = pd.concat(d_regress_params, names=['feature'])
-    df_all_regress_params['position'] = df_all_regress_params['intercept'] + t0 * df_all_regress_params['slope']
+    t0, _ = compute_patient_time_distribution(dataset)
 
-    df_grp = df_all_regress_params.groupby('feature', sort=False)
-    positions = torch.tensor(df_grp['position'].mean().values)
-    velocities = torch.tensor(df_grp['slope'].mean().values)
+    regress_params = compute_linregress_subjects(dataset)
+    positions, _ = _nan_mean_std(regress_params['intercept'] + t0 * regress_params['slope'])
+    velocities, _ = _nan_mean_std(regress_params['slope'])
 
     # always take the log (even in non univariate model!)
     velocities = get_log_velocities(velocities, model.features)
@@ -518,7 +552,7 @@ def initialize_linear(model, df: pd.DataFrame, method):
 
         parameters = {
             'g': positions.squeeze(),
-            'tau_mean': torch.tensor(t0),
+            'tau_mean': t0,
             'tau_std': torch.tensor(tau_std),
             'xi_mean': xi_mean,
             'xi_std': torch.tensor(xi_std),
@@ -529,7 +563,7 @@ def initialize_linear(model, df: pd.DataFrame, method):
             'g': positions,
             'v0': velocities,
             'betas': torch.zeros((model.dimension - 1, model.source_dimension)),
-            'tau_mean': torch.tensor(t0),
+            'tau_mean': t0,
             'tau_std': torch.tensor(tau_std),
             'xi_mean': torch.tensor(0.),
             'xi_std': torch.tensor(xi_std),
@@ -545,44 +579,69 @@ def initialize_linear(model, df: pd.DataFrame, method):
 #    # TODO?
 #    return 0
 
-def compute_linregress_subjects(df: pd.DataFrame, *, max_inds: int = None) -> Dict[str, pd.DataFrame]:
+def _nan_mean_std(x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Mean & (unbiased) standard deviation of tensor along its first dimension, ignoring nans."""
+    mask = ~torch.isnan(x)
+    n = mask.sum(dim=0)
+    x = torch.where(mask, x, torch.zeros_like(x))
+    mean = x.sum(dim=0) / n
+    var = ((x - mean) * mask).pow(2).sum(dim=0) / (n - 1)
+    return mean, var.sqrt()
+
+
+def compute_linregress_subjects(dataset: Dataset, *, max_inds: int = None) -> Dict[str, torch.Tensor]:
     """
-    Linear Regression on each feature to get intercept & slopes
+    Linear regression of values against time for each subject and each feature.
+
+    Regressions are performed at once for all subjects and features, in closed-form, with masked sums on dataset tensors.
+    Only subjects with at least 2 observations of a feature are regressed on this feature.
 
     Parameters
     ----------
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
     max_inds : int, optional (default None)
-        Restrict computation to first `max_inds` individuals.
+        Restrict computation to first `max_inds` individuals (among the ones that can be regressed on each feature).
 
     Returns
     -------
-    dict[feat_name: str, regress_params_per_subj: pandas.DataFrame]
+    dict[param_name: str, :class:`torch.Tensor` [n_individuals, n_features]]
+        The 'intercept' and 'slope' of regressions (nan when subject was not regressed on feature).
     """
-
-    d_regress_params = {}
-
-    for ft, s in df.items():
-        s = s.dropna()
-        nvis = s.groupby('ID').size()
-        inds_train = nvis[nvis >= 2].index
-        if max_inds is not None:
-            inds_train = inds_train[:max_inds]
-        s_train = s.loc[inds_train]
-        d_regress_params[ft] = s_train.groupby('ID').apply(linregress_against_time).unstack(-1)
-
-    return d_regress_params
+    # float64 for the numerical stability of the (centered) sums
+    t = dataset.timepoints.double().unsqueeze(-1)  # (n_individuals, n_visits_max, 1)
+    y = dataset.values.double()  # (n_individuals, n_visits_max, n_features)
+    mask = dataset.mask.double()
+
+    n_obs = mask.sum(dim=1)
+    regressed = n_obs >= 2
+    if max_inds is not None:
+        regressed &= regressed.cumsum(dim=0) <= max_inds
+    n_obs = n_obs.clamp(min=1)
+
+    t_mean = (mask * t).sum(dim=1) / n_obs
+    y_mean = (mask * y).sum(dim=1) / n_obs
+    t_centered = mask * (t - t_mean.unsqueeze(1))
+    y_centered = mask * (y - y_mean.unsqueeze(1))
+
+    slope = (t_centered * y_centered).sum(dim=1) / (t_centered * t_centered).sum(dim=1)
+    intercept = y_mean - slope * t_mean
+
+    nan = torch.tensor(float('nan'), dtype=slope.dtype)
+    return {
+        'intercept': torch.where(regressed, intercept, nan),
+        'slope': torch.where(regressed, slope, nan),
+    }
 
 
-def compute_patient_slopes_distribution(df: pd.DataFrame, *, max_inds: int = None):
+def compute_patient_slopes_distribution(dataset: Dataset, *, max_inds: int = None):
     """
     Linear Regression on each feature to get slopes
 
     Parameters
     ----------
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
     max_inds : int, optional (default None)
         Restrict computation to first `max_inds` individuals.
 
@@ -591,25 +650,17 @@ def compute_patient_slopes_distribution(df: pd.DataFrame, *, max_inds: int = Non
     slopes_mu : :class:`torch.Tensor` [n_features,]
     slopes_sigma : :class:`torch.Tensor` [n_features,]
     """
-
-    d_regress_params = compute_linregress_subjects(df, max_inds=max_inds)
-    slopes_mu, slopes_sigma = [], []
-
-    for ft, df_regress_ft in d_regress_params.items():
-        slopes_mu.append(df_regress_ft['slope'].mean())
-        slopes_sigma.append(df_regress_ft['slope'].std())
-
-    return torch.tensor(slopes_mu), torch.tensor(slopes_sigma)
+    return _nan_mean_std(compute_linregress_subjects(dataset, max_inds=max_inds)['slope'])
 
 
-def compute_patient_values_distribution(df: pd.DataFrame):
+def compute_patient_values_distribution(dataset: Dataset):
     """
     Returns means and standard deviations for the features of the given dataset values.
 
     Parameters
     ----------
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
 
     Returns
     -------
@@ -618,22 +669,24 @@ def compute_patient_values_distribution(df: pd.DataFrame):
     std : :class:`torch.Tensor` [n_features,]
         One standard deviation per feature.
     """
-    return torch.tensor(df.mean().values), torch.tensor(df.std().values)
+    values = torch.where(dataset.mask.bool(), dataset.values.double(), torch.tensor(float('nan'), dtype=torch.float64))
+    return _nan_mean_std(values.reshape(-1, dataset.dimension))
 
 
-def compute_patient_time_distribution(df: pd.DataFrame):
+def compute_patient_time_distribution(dataset: Dataset):
     """
     Returns mu / sigma of given dataset times.
 
     Parameters
     ----------
-    df : :class:`pd.DataFrame`
-        Contains the individual scores (with nans).
+    dataset : :class:`.Dataset`
+        Contains the individual scores.
 
     Returns
     -------
     mean : :class:`torch.Tensor` scalar
     sigma : :class:`torch.Tensor` scalar
     """
-    times = df.index.get_level_values('TIME').values
-    return torch.tensor(times.mean()), torch.tensor(times.std())
+    # times of visits with at least one observation
+    times = dataset.timepoints.double()[dataset.mask.bool().any(dim=-1)]
+    return times.mean(), times.std(unbiased=False)
@@ -1,9 +1,177 @@
-from typing import Dict, Hashable, Union
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Optional, Union
 
 import numpy as np
 import torch
 
 from leaspy.exceptions import LeaspyInputError, LeaspyModelInputError
+from leaspy.utils.typing import KwargsType
+
+
+class OrdinalLevelsLayout:
+    """
+    Packed (non-padded) layout of the ordinal levels of some features, along a single flat axis.
+
+    The levels of each feature are contiguous (features being in order), so that tensors in this layout
+    have a size proportional to the total number of levels, instead of `n_features * max_level` (padded layout).
+
+    Parameters
+    ----------
+    max_levels : list[int]
+        Maximum level of each feature.
+    device : :class:`torch.device`, optional
+        Device of the indexing tensors.
+
+    Attributes
+    ----------
+    n_features : int
+        Number of features.
+    max_levels : :class:`torch.LongTensor` [n_features]
+        Maximum level of each feature.
+    sf_feature_index : :class:`torch.LongTensor` [n_levels_sf]
+        Feature of each level of the survival function [P(X >= l), l=1..max_level] (packed).
+    sf_levels : :class:`torch.LongTensor` [n_levels_sf]
+        Level `l` of each level of the survival function (packed).
+    sf_offsets : :class:`torch.LongTensor` [n_features + 1]
+        Levels of the survival function of the `k`-th feature are in `sf_offsets[k]:sf_offsets[k+1]`.
+    pdf_feature_index : :class:`torch.LongTensor` [n_levels_pdf]
+        Feature of each level of the probability density function [P(X = l), l=0..max_level] (packed).
+    pdf_levels : :class:`torch.LongTensor` [n_levels_pdf]
+        Level `l` of each level of the probability density function (packed).
+    pdf_offsets : :class:`torch.LongTensor` [n_features + 1]
+        Levels of the probability density function of the `k`-th feature are in `pdf_offsets[k]:pdf_offsets[k+1]`.
+    """
+
+    def __init__(self, max_levels: List[int], *, device: torch.device = None):
+        self.n_features = len(max_levels)
+        self.max_levels = torch.tensor(max_levels, dtype=torch.long, device=device)
+        features = torch.arange(self.n_features, device=device)
+
+        # survival function: levels l=1..max_level of each feature
+        self.sf_feature_index = torch.repeat_interleave(features, self.max_levels)
+        self.sf_offsets = torch.cat([self.max_levels.new_zeros(1), self.max_levels.cumsum(0)])
+        self.sf_levels = torch.arange(len(self.sf_feature_index), device=device) - self.sf_offsets[self.sf_feature_index] + 1
+
+        # probability density function: levels l=0..max_level of each feature
+        self.pdf_feature_index = torch.repeat_interleave(features, self.max_levels + 1)
+        self.pdf_offsets = torch.cat([self.max_levels.new_zeros(1), (self.max_levels + 1).cumsum(0)])
+        self.pdf_levels = torch.arange(len(self.pdf_feature_index), device=device) - self.pdf_offsets[self.pdf_feature_index]
+
+        # P(X = l) = P(X >= l) - P(X >= l+1), with P(X >= 0) = 1 and P(X >= max_level + 1) = 0:
+        # positions of these terms in the packed survival function extended with [1, 0]
+        n_levels_sf = len(self.sf_feature_index)
+        sf_position = self.sf_offsets[self.pdf_feature_index] + self.pdf_levels - 1
+        self._pdf_sf_sup_index = torch.where(self.pdf_levels == 0, n_levels_sf, sf_position)
+        self._pdf_sf_inf_index = torch.where(self.pdf_levels == self.max_levels[self.pdf_feature_index],
+                                             n_levels_sf + 1, sf_position + 1)
+
+    @classmethod
+    def from_ordinal_infos(cls, ordinal_infos: KwargsType, features: Optional[List[int]] = None, *,
+                           device: torch.device = None) -> OrdinalLevelsLayout:
+        """
+        Layout of the ordinal levels of (some of) the features of an ordinal model.
+
+        Parameters
+        ----------
+        ordinal_infos : dict[str, Any]
+            Ordinal infos of model (in particular maximum level per features).
+        features : list[int], optional
+            Indices of the features to restrict the layout to (all features if None).
+        device : :class:`torch.device`, optional
+
+        Returns
+        -------
+        :class:`.OrdinalLevelsLayout`
+        """
+        max_levels = [feat['max_level'] for feat in ordinal_infos['features']]
+        if features is not None:
+            max_levels = [max_levels[i] for i in features]
+        return cls(max_levels, device=device)
+
+    def get_levels_index(self, features: List[int], *, sf: bool) -> torch.LongTensor:
+        """
+        Positions, in this layout, of the levels of the given features (e.g. to restrict a packed tensor to them).
+
+        Parameters
+        ----------
+        features : list[int]
+            Indices of the features.
+        sf : bool
+            Levels of the survival function (or of the probability density function)?
+
+        Returns
+        -------
+        :class:`torch.LongTensor` [n_levels_of_features]
+        """
+        offsets = self.sf_offsets if sf else self.pdf_offsets
+        return torch.cat([torch.arange(offsets[i], offsets[i + 1], device=offsets.device) for i in features])
+
+    def sum_per_feature(self, t: torch.Tensor, *, sf: bool) -> torch.Tensor:
+        """
+        Sum the values of a packed tensor over the levels of each feature.
+
+        Parameters
+        ----------
+        t : :class:`torch.Tensor` [..., n_levels]
+            Packed tensor (levels in last dimension).
+        sf : bool
+            Levels of the survival function (or of the probability density function)?
+
+        Returns
+        -------
+        :class:`torch.Tensor` [..., n_features]
+        """
+        feature_index = self.sf_feature_index if sf else self.pdf_feature_index
+        return t.new_zeros((*t.shape[:-1], self.n_features)).index_add_(-1, feature_index, t)
+
+    def pdf_from_sf(self, ordinal_sf: torch.Tensor) -> torch.Tensor:
+        """
+        Probability density function [P(X = l), l=0..L] from the survival function [P(X > l), l=0..L-1], both packed.
+
+        Packed counterpart of :meth:`.OrdinalModelMixin.compute_ordinal_pdf_from_ordinal_sf`.
+
+        Parameters
+        ----------
+        ordinal_sf : :class:`torch.Tensor` [..., n_levels_sf]
+            Survival function values (levels in last dimension).
+
+        Returns
+        -------
+        ordinal_pdf : :class:`torch.Tensor` [..., n_levels_pdf]
+        """
+        extended_sf = torch.cat([ordinal_sf, ordinal_sf.new_ones((*ordinal_sf.shape[:-1], 1)),
+                                 ordinal_sf.new_zeros((*ordinal_sf.shape[:-1], 1))], dim=-1)
+        return extended_sf[..., self._pdf_sf_sup_index] - extended_sf[..., self._pdf_sf_inf_index]
+
+    def unpack(self, t: torch.Tensor, *, sf: bool, max_level: int = None) -> torch.Tensor:
+        """
+        Convert a packed tensor to the padded layout of ordinal levels.
+
+        Values of impossible levels are 0 in the padded layout.
+
+        Parameters
+        ----------
+        t : :class:`torch.Tensor` [..., n_levels]
+            Packed tensor (levels in last dimension).
+        sf : bool
+            Levels of the survival function (or of the probability density function)?
+        max_level : int, optional
+            Maximum level of padded layout (maximum level of features of layout by default).
+
+        Returns
+        -------
+        :class:`torch.Tensor` [..., n_features, max_level [+ 1 for pdf]]
+        """
+        if max_level is None:
+            max_level = self.max_levels.max().item() if self.n_features else 0
+        if sf:
+            n_levels_padded, feature_index, levels_index = max_level, self.sf_feature_index, self.sf_levels - 1
+        else:
+            n_levels_padded, feature_index, levels_index = max_level + 1, self.pdf_feature_index, self.pdf_levels
+        padded = t.new_zeros((*t.shape[:-1], self.n_features * n_levels_padded))
+        padded[..., feature_index * n_levels_padded + levels_index] = t
+        return padded.reshape((*t.shape[:-1], self.n_features, n_levels_padded))
 
 
 class OrdinalModelMixin:
@@ -110,21 +278,62 @@ class OrdinalModelMixin:
 
     ## PRIVATE
 
+    # number of points of the grid of timepoints used to estimate ages from ordinal levels
+    _ordinal_grid_search_n_points: int = 1000
+    # number of individuals processed at once during the grid search (bounds memory usage)
+    _ordinal_grid_search_batch_size: int = 1000
+
     def _ordinal_grid_search_value(self, grid_timepoints: torch.Tensor, values: torch.Tensor, *,
                                    individual_parameters: Dict[str, torch.Tensor], feat_index: int) -> torch.Tensor:
-        """Search first timepoint where ordinal MLE is >= provided values."""
-        grid_model = self.compute_individual_tensorized_logistic(grid_timepoints.unsqueeze(0), individual_parameters,
-                                                                 attribute_type=None)[:,:,[feat_index],:]
+        """
+        Search first timepoint where ordinal MLE is >= provided values.
 
-        if self.noise_model == 'ordinal_ranking':
-            grid_model = self.compute_ordinal_pdf_from_ordinal_sf(grid_model)
+        All individuals are processed with broadcasted operations (by batches of individuals).
+
+        Parameters
+        ----------
+        grid_timepoints : :class:`torch.Tensor` of shape (n_individuals, n_grid_points)
+            Grid of timepoints of each individual (sorted).
+        values : :class:`torch.Tensor` of shape (n_individuals, n_values)
+            Ordinal levels to search for each individual (nan for padding values, whose ages are nan).
+        individual_parameters : dict[str, :class:`torch.Tensor` of shape (n_individuals, n_dims_param)]
+        feat_index : int
+            Index of the considered feature.
+
+        Returns
+        -------
+        :class:`torch.Tensor` of shape (n_individuals, n_values)
+        """
+        ages = torch.empty(values.shape, dtype=grid_timepoints.dtype)
+
+        for start in range(0, len(grid_timepoints), self._ordinal_grid_search_batch_size):
+            batch = slice(start, start + self._ordinal_grid_search_batch_size)
+            batch_ips = {k: v[batch] for k, v in individual_parameters.items()}
+
+            grid_model = self._compute_ordinal_grid_model(grid_timepoints[batch], batch_ips, feat_index)
+
+            if self.noise_model == 'ordinal_ranking':
+                grid_model = self.compute_ordinal_pdf_from_ordinal_sf(grid_model)
+
+            # we search for the very first timepoint of grid where ordinal MLE was >= provided value
+            # TODO? shouldn't we return the timepoint where P(X = value) is highest instead?
+            MLE = grid_model.squeeze(dim=2).argmax(dim=-1)  # squeeze feature (after computing pdf when needed)
+            index_cross = (MLE.unsqueeze(1) >= values[batch].unsqueeze(-1)).int().argmax(dim=-1)
+
+            ages[batch] = torch.gather(grid_timepoints[batch], 1, index_cross)
 
-        # we search for the very first timepoint of grid where ordinal MLE was >= provided value
-        # TODO? shouldn't we return the timepoint where P(X = value) is highest instead?
-        MLE = grid_model.squeeze(dim=2).argmax(dim=-1) # squeeze feat_index (after computing pdf when needed)
-        index_cross = (MLE.unsqueeze(1) >= values.unsqueeze(-1)).int().argmax(dim=-1)
+        # padding values (nan) have no age (argmax of an all-false mask would be the first timepoint of grid)
+        return ages.masked_fill(torch.isnan(values), float('nan'))
 
-        return grid_timepoints[index_cross]
+    def _compute_ordinal_grid_model(self, grid_timepoints: torch.Tensor, individual_parameters: Dict[str, torch.Tensor],
+                                    feat_index: int) -> torch.Tensor:
+        """Ordinal model values of a single feature on grids of timepoints, shape (n_individuals, n_grid_points, 1, n_levels)."""
+        return self.compute_individual_tensorized_logistic(grid_timepoints, individual_parameters,
+                                                           attribute_type=None)[:, :, [feat_index], :]
+
+    def _get_ordinal_grid_timepoints(self, ages_0: torch.Tensor, ages_max: torch.Tensor) -> torch.Tensor:
+        """Regular grids of timepoints between `ages_0` and `ages_max` (shape (n_individuals, 1)), shape (n_individuals, n_grid_points)."""
+        return ages_0 + (ages_max - ages_0) * torch.linspace(0., 1., self._ordinal_grid_search_n_points)
 
 
     @property
@@ -260,6 +469,76 @@ class OrdinalModelMixin:
         """
         return self._call_method_from_attributes('get_deltas', attribute_type)
 
+    def _get_ordinal_levels_layout(self, features: Optional[List[int]] = None) -> OrdinalLevelsLayout:
+        """Packed layout of the ordinal levels of (some of) the features of model (cf. :class:`.OrdinalLevelsLayout`)."""
+        return OrdinalLevelsLayout.from_ordinal_infos(self.ordinal_infos, features, device=self.ordinal_infos['mask'].device)
+
+    def _get_cumulative_deltas(self, attribute_type: str, levels: OrdinalLevelsLayout,
+                               features: Optional[List[int]] = None) -> torch.Tensor:
+        """
+        Get the cumulative deltas of all possible ordinal levels (including the anchor curve), in the packed layout of levels.
+
+        Parameters
+        ----------
+        attribute_type: None or 'MCMC'
+        levels : :class:`.OrdinalLevelsLayout`
+            Packed layout of the ordinal levels of the selected features.
+        features : list[int], optional
+            Indices of the features to restrict to (all features if None).
+
+        Returns
+        -------
+        :class:`torch.Tensor` [n_levels_sf]
+        """
+        # deltas are only parameters (not a data-sized tensor): we gather the possible levels from their padded layout
+        cumulative_deltas = self._get_deltas(attribute_type).cumsum(dim=-1)  # (features, max_level)
+        if features is not None:
+            cumulative_deltas = cumulative_deltas[features]
+        return cumulative_deltas[levels.sf_feature_index, levels.sf_levels - 1]
+
+    def _compute_ordinal_log_likelihood_on_visits(self, data, individual_parameters: Dict[str, torch.Tensor],
+                                                  features: Optional[List[int]] = None, *, attribute_type=None) -> torch.Tensor:
+        """
+        Compute the log-likelihood of the ordinal observations at the visits of dataset, per feature.
+
+        Model values and observations are in the packed layout of ordinal levels (cf. :class:`.OrdinalLevelsLayout`),
+        so that memory and computations scale with the total number of levels and not with `n_features * max_level`.
+
+        Parameters
+        ----------
+        data : :class:`.Dataset`
+        individual_parameters : dict[param_name: str, :class:`torch.Tensor` [n_individuals, n_dims_param]]
+        features : list[int] or None (default)
+            Indices of the features to restrict computations to (all features if None).
+        attribute_type : Any (default None)
+            Flag to ask for MCMC attributes instead of model's attributes.
+
+        Returns
+        -------
+        :class:`torch.Tensor` [n_individuals, n_visits_max, n_selected_features]
+        or [n_visits, 1, n_selected_features] for packed dataset
+        """
+        if self.dimension == 1:
+            features = None  # no restriction for univariate models
+        sf = self.noise_model == 'ordinal_ranking'
+        levels = self._get_ordinal_levels_layout(features)
+
+        pred = self._compute_individual_tensorized_on_visits(data, individual_parameters, features,
+                                                             attribute_type=attribute_type, packed_levels=True)
+        # safety before taking logarithms
+        pred = torch.clamp(pred, 1e-7, 1. - 1e-7)
+
+        obs = data.get_visits_one_hot_encoding(sf=sf, ordinal_infos=self.ordinal_infos, packed_levels=True)
+        if features is not None:
+            obs = obs[..., self._get_ordinal_levels_layout().get_levels_index(features, sf=sf)]
+
+        if self.noise_model == 'ordinal':
+            # Compute the simple multinomial loss
+            return torch.log(levels.sum_per_feature(pred * obs, sf=False))
+
+        # Compute the loss by cross-entropy of P(X>=k) (only the possible levels are in the packed layout: no mask needed)
+        return levels.sum_per_feature(obs * torch.log(pred) + (1. - obs) * torch.log(1. - pred), sf=True)
+
     def _add_ordinal_random_variables(self, variables_infos: dict) -> None:
 
         if not self.is_ordinal:
@@ -191,3 +191,32 @@ class LeaspyEstimateTest(LeaspyEstimateTest_Mixin):
         }
 
         self.batch_checks(ip, timepoints, models, expected_ests)
+
+    def test_estimate_batched_vs_individual_trajectories(self):
+
+        lsp = self.get_hardcoded_model('logistic_scalar_noise')
+        ip = self.get_hardcoded_individual_params('ip_save.json')
+
+        # unsorted visits with an extra index level & an individual without any visit
+        timepoints = pd.MultiIndex.from_frame(pd.DataFrame({
+            'ID':    ['idx2', 'idx1', 'idx2', 'idx1'],
+            'TIME':  [75,      81,     71,     78],
+            'EXTRA': ['a',     'b',    'c',    'd'],
+        }))
+        df_ests = lsp.estimate(timepoints, ip)
+        self.assertTrue(df_ests.index.equals(timepoints))
+
+        timepoints_dict = {'idx1': [78, 81], 'idx3': [], 'idx2': [75, 71]}
+        ests = lsp.estimate(timepoints_dict, ip)
+        self.assertEqual(list(ests.keys()), ['idx1', 'idx3', 'idx2'])
+        self.assertEqual(ests['idx3'].shape, (0, lsp.model.dimension))
+
+        for subj_id, tpts in timepoints_dict.items():
+            expected_ests = lsp.model.compute_individual_trajectory(tpts, ip[subj_id])[0]
+            self.assertAllClose(ests[subj_id], expected_ests, atol=1e-6, what=subj_id)
+            for tpt, expected_est in zip(tpts, expected_ests):
+                self.assertAllClose(df_ests.xs((subj_id, tpt), level=['ID', 'TIME']).values[0], expected_est,
+                                    atol=1e-6, what=subj_id)
+
+        # as well as with a `pandas.MultiIndex`, as a dictionary (individuals sorted)
+        self.assertEqual(list(lsp.estimate(timepoints, ip, to_dataframe=False).keys()), ['idx1', 'idx2'])
@@ -1,4 +1,7 @@
 import numpy as np
+import torch
+
+from leaspy.exceptions import LeaspyInputError, LeaspyTypeError
 
 # never import a real test case at top-level so to not duplicate tests, only tests MIXINS!
 from .test_api_estimate import LeaspyEstimateTest_Mixin
@@ -188,3 +191,70 @@ class LeaspyEstimateInverseTest(LeaspyEstimateTest_Mixin):
                                                                                 biomarker_values=feat_estimations,
                                                                                 feature=feature)
                     self.check_almost_equal_for_all_ind_tpts(estimated_ages, timepoints[feature], tol=1e-3)
+
+    def test_estimate_ages_from_biomarker_values_tensorized(self):
+        # all individuals at once vs. one individual at a time
+        for hardcoded_model, ip_model, values in [
+            ('univariate_logistic', 'ip_univariate_save.json', [[0.2, 0.4, 0.5], [0.3, 0.35, 0.9], [0.6, 0.7, 0.8]]),
+            ('univariate_linear', 'ip_univariate_save.json', [[-0.2, 0.4, 1.5], [0.3, 0.35, 2.9], [0.6, 0.7, 0.8]]),
+            ('logistic_scalar_noise', 'ip_save.json', [[0.2, 0.4, 0.5], [0.3, 0.35, 0.9], [0.6, 0.7, 0.8]]),
+            ('linear_scalar_noise', 'ip_save.json', [[-0.2, 0.4, 1.5], [0.3, 0.35, 2.9], [0.6, 0.7, 0.8]]),
+            ('logistic_ordinal', 'ip_save.json', [[1, 2, 3], [0, 1, 2], [2, 2, 1]]),
+            ('logistic_ordinal_ranking_same', 'ip_save.json', [[1, 2, 3], [0, 1, 2], [2, 2, 1]]),
+        ]:
+            with self.subTest(hardcoded_model=hardcoded_model):
+                leaspy = self.get_hardcoded_model(hardcoded_model)
+                indices = ['idx1', 'idx2', 'idx3']
+                ip_ = self.get_hardcoded_individual_params(ip_model).subset(indices)
+                feature = leaspy.model.features[-1]
+
+                estimated_ages = leaspy.estimate_ages_from_biomarker_values_tensorized(ip_, torch.tensor(values), feature)
+                self.assertEqual(estimated_ages.shape, (len(indices), 3))
+
+                for i, idx in enumerate(indices):
+                    expected_ages = leaspy.model.compute_individual_ages_from_biomarker_values(values[i], ip_[idx], feature)
+                    self.assertAllClose(estimated_ages[i], expected_ages.reshape(-1), atol=1e-4, equal_nan=True,
+                                        what=f'{idx}')
+
+                # same results with the main API (with individuals having different numbers of values)
+                estimated_ages_dict = leaspy.estimate_ages_from_biomarker_values(
+                    ip_, {idx: values[i][:i+1] for i, idx in enumerate(indices)}, feature=feature
+                )
+                self.assertDictAlmostEqual(estimated_ages_dict,
+                                           {idx: estimated_ages[i, :i+1].tolist() for i, idx in enumerate(indices)},
+                                           atol=1e-4, equal_nan=True)
+
+        leaspy = self.get_hardcoded_model('logistic_scalar_noise')
+        ip = self.get_hardcoded_individual_params('ip_save.json')
+        with self.assertRaises(ValueError):
+            leaspy.estimate_ages_from_biomarker_values_tensorized(ip, torch.tensor([[0.2], [0.3]]), 'Y0')
+
+    def test_estimate_ages_from_biomarker_values_tensorized_checks_feature(self):
+        leaspy = self.get_hardcoded_model('logistic_scalar_noise')
+        ip = self.get_hardcoded_individual_params('ip_save.json').subset(['idx1', 'idx2'])
+        values = torch.tensor([[0.2], [0.3]])
+
+        for feature in (None, 'unknown_feature'):
+            with self.subTest(feature=feature):
+                with self.assertRaises(LeaspyInputError):
+                    leaspy.estimate_ages_from_biomarker_values_tensorized(ip, values, feature)
+
+        with self.assertRaises(LeaspyTypeError):
+            leaspy.estimate_ages_from_biomarker_values_tensorized(ip, values, 0)
+
+    def test_estimate_ages_from_biomarker_values_tensorized_padded_rows(self):
+        nan = float('nan')
+        for hardcoded_model, ip_model, values in [
+            ('logistic_scalar_noise', 'ip_save.json', [[0.2, nan, nan], [0.3, 0.35, nan], [nan, nan, nan]]),
+            ('linear_scalar_noise', 'ip_save.json', [[-0.2, nan, nan], [0.3, 0.35, nan], [nan, nan, nan]]),
+            ('logistic_ordinal', 'ip_save.json', [[1, nan, nan], [0, 1, nan], [nan, nan, nan]]),
+            ('logistic_ordinal_ranking_same', 'ip_save.json', [[1, nan, nan], [0, 1, nan], [nan, nan, nan]]),
+        ]:
+            with self.subTest(hardcoded_model=hardcoded_model):
+                leaspy = self.get_hardcoded_model(hardcoded_model)
+                ip = self.get_hardcoded_individual_params(ip_model).subset(['idx1', 'idx2', 'idx3'])
+                values = torch.tensor(values)
+
+                estimated_ages = leaspy.estimate_ages_from_biomarker_values_tensorized(ip, values,
+                                                                                     leaspy.model.features[-1])
+                self.assertTrue(torch.equal(torch.isnan(estimated_ages), torch.isnan(values)))
@@ -5,6 +5,7 @@ import unittest
 import torch
 
 from leaspy import Leaspy
+from leaspy.exceptions import LeaspyAlgoInputError
 
 from tests.unit_tests.plots.test_plotter import MatplotlibTestCase
 
@@ -122,6 +123,51 @@ class LeaspyFitTest(LeaspyFitTest_Mixin):
                                      algo_params=dict(n_iter=100, seed=0, sampler_pop='Metropolis-Hastings'),
                                      check_model=True)
 
+    def test_fit_logistic_diag_noise_no_source_block_metropolis(self):
+
+        leaspy, _ = self.generic_fit('logistic', 'logistic_diag_noise_no_source_block_metropolis',
+                                     noise_model='gaussian_diagonal', source_dimension=0,
+                                     algo_params=dict(n_iter=100, seed=0, sampler_pop='BlockMetropolis'),
+                                     check_model=True)
+
+    def test_fit_logistic_diag_noise_multi_chains(self):
+
+        leaspy, _ = self.generic_fit('logistic', 'logistic_diag_noise_multi_chains',
+                                     noise_model='gaussian_diagonal', source_dimension=2,
+                                     algo_params=dict(n_iter=100, seed=0, n_chains=3),
+                                     check_model=True)
+
+    def test_fit_resume_from_checkpoint(self):
+
+        for model_codename, model_hyperparams, algo_params in [
+            ('logistic_scalar_noise', dict(noise_model='gaussian_scalar', source_dimension=2), {}),
+            ('logistic_diag_noise', dict(noise_model='gaussian_diagonal', source_dimension=2),
+             dict(n_chains=2, sampler_pop='BlockMetropolis', annealing=dict(do_annealing=True, n_plateau=3))),
+            ('logistic_ordinal', dict(noise_model='ordinal', source_dimension=1), {}),
+        ]:
+            with self.subTest(model_codename=model_codename, **algo_params):
+                data = self.get_suited_test_data_for_model(model_codename)
+                path_checkpoint = self.get_test_tmp_path(f'{model_codename}-checkpoint.pt')
+                get_algo_settings = lambda **kws: self.get_algo_settings(name='mcmc_saem', n_iter=80, n_burn_in_iter_frac=0.5,
+                                                                          seed=0, progress_bar=False, **algo_params, **kws)
+
+                # uninterrupted run, saving checkpoints (last one at iteration 75, after burn-in)
+                leaspy = Leaspy('logistic', **model_hyperparams)
+                leaspy.fit(data, get_algo_settings(checkpoint=dict(path=path_checkpoint, periodicity=25)))
+
+                # run resumed from last checkpoint is exactly the same
+                leaspy_resumed = Leaspy('logistic', **model_hyperparams)
+                leaspy_resumed.fit(data, get_algo_settings(), resume_from=path_checkpoint)
+
+                os.remove(path_checkpoint)
+
+                self.assertDictAlmostEqual(leaspy_resumed.model.parameters, leaspy.model.parameters, atol=0, rtol=0)
+
+        with self.assertRaisesRegex(LeaspyAlgoInputError, 'No checkpoint'):
+            Leaspy('logistic').fit(self.get_suited_test_data_for_model('logistic_scalar_noise'),
+                                   self.get_algo_settings(name='mcmc_saem', n_iter=10, seed=0, progress_bar=False),
+                                   resume_from=self.get_test_tmp_path('unknown-checkpoint.pt'))
+
     def test_fit_logistic_diag_noise_with_custom_tuning_no_sources(self):
 
         leaspy, _ = self.generic_fit('logistic', 'logistic_diag_noise_custom',
@@ -90,6 +90,7 @@ class LeaspyPersonalizeTest(LeaspyPersonalizeTest_Mixin):
             # multivariate logistic models
             ('logistic_scalar_noise', 'scipy_minimize', dict(use_jacobian=False),          0.1189),
             ('logistic_scalar_noise', 'scipy_minimize', dict(use_jacobian=True),           0.1188),
+            ('logistic_scalar_noise', 'scipy_minimize', dict(batched=True),                0.1188),
             ('logistic_scalar_noise', 'mode_real', mode_real_kws,                          0.1191),
             ('logistic_scalar_noise', 'mean_real', mean_real_kws,                          0.1200),
 
@@ -100,6 +101,7 @@ class LeaspyPersonalizeTest(LeaspyPersonalizeTest_Mixin):
 
             ('logistic_diag_noise', 'scipy_minimize', dict(use_jacobian=False),           [0.1543, 0.0597, 0.0827, 0.1509]),
             ('logistic_diag_noise', 'scipy_minimize', dict(use_jacobian=True),            [0.1543, 0.0597, 0.0827, 0.1509]),
+            ('logistic_diag_noise', 'scipy_minimize', dict(batched=True),                 [0.1543, 0.0597, 0.0827, 0.1509]),
             ('logistic_diag_noise', 'mode_real', mode_real_kws,                           [0.1596, 0.0598, 0.0824, 0.1507]),
             ('logistic_diag_noise', 'mean_real', mean_real_kws,                           [0.1565, 0.0587, 0.0833, 0.1511]),
 
@@ -123,6 +125,7 @@ class LeaspyPersonalizeTest(LeaspyPersonalizeTest_Mixin):
             # univariate models
             ('univariate_logistic', 'scipy_minimize', dict(use_jacobian=False),            0.1341),
             ('univariate_logistic', 'scipy_minimize', dict(use_jacobian=True),             0.1341),
+            ('univariate_logistic', 'scipy_minimize', dict(batched=True),                  0.1341),
             ('univariate_logistic', 'mode_real', mode_real_kws,                            0.1346),
             ('univariate_logistic', 'mean_real', mean_real_kws,                            0.1351),
 
@@ -145,6 +148,7 @@ class LeaspyPersonalizeTest(LeaspyPersonalizeTest_Mixin):
             # multivariate binary model
             ('logistic_binary', 'scipy_minimize', dict(use_jacobian=False),               [103.7]),
             ('logistic_binary', 'scipy_minimize', dict(use_jacobian=True),                [103.67]),
+            ('logistic_binary', 'scipy_minimize', dict(batched=True),                     [103.67]),
             ('logistic_binary', 'mode_real', mode_real_kws,                               [103.96]),
             ('logistic_binary', 'mean_real', mean_real_kws,                               [101.95]),
 
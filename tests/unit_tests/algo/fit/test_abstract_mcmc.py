@@ -0,0 +1,67 @@
+import torch
+
+from leaspy import Leaspy
+from leaspy.algo.algo_factory import AlgoFactory
+from leaspy.io.data.dataset import Dataset
+
+from tests import LeaspyTestCase
+
+
+class TestAbstractFitMCMC(LeaspyTestCase):
+
+    def test_multi_chains_realizations(self):
+        data = self.get_suited_test_data_for_model('logistic_scalar_noise')
+        leaspy = Leaspy('logistic', noise_model='gaussian_scalar', source_dimension=2)
+        algo_settings = self.get_algo_settings(name='mcmc_saem', n_iter=20, n_burn_in_iter=10, seed=0,
+                                               progress_bar=False, n_chains=3)
+        algo = AlgoFactory.algo('fit', algo_settings)
+        dataset = Dataset(data, algo=algo, model=leaspy.model)
+        leaspy.model.initialize(dataset, algo_settings.model_initialization_method)
+
+        realizations = algo.run(leaspy.model, dataset)
+
+        # only the realizations of the individuals of dataset (first chain) are returned
+        for var_name in realizations.reals_ind_variable_names:
+            self.assertEqual(realizations[var_name].tensor_realizations.shape[0], dataset.n_individuals)
+        for var_name in realizations.reals_pop_variable_names:
+            self.assertEqual(realizations[var_name].tensor_realizations.shape, realizations[var_name].shape)
+
+        # diagnostics are computed for individuals of dataset
+        for diag_name in ('r_hat', 'ess'):
+            for var_name, diag in algo.diagnostics[diag_name].items():
+                self.assertEqual(diag.shape[0], dataset.n_individuals)
+                self.assertFalse(torch.isnan(diag).any(), f'{diag_name}: {var_name}')
+
+    def test_multi_chains_log_likelihood(self):
+        data = self.get_suited_test_data_for_model('logistic_binary')
+
+        log_likelihoods = {}
+        for n_chains in (1, 3):
+            leaspy = Leaspy('logistic', noise_model='bernoulli', source_dimension=1)
+            algo_settings = self.get_algo_settings(name='mcmc_saem', n_iter=200, n_burn_in_iter=150, seed=0,
+                                                   progress_bar=False, n_chains=n_chains)
+            algo = AlgoFactory.algo('fit', algo_settings)
+            dataset = Dataset(data, algo=algo, model=leaspy.model)
+            leaspy.model.initialize(dataset, algo_settings.model_initialization_method)
+            algo.run(leaspy.model, dataset)
+            log_likelihoods[n_chains] = leaspy.model.parameters['log-likelihood'].item()
+
+        # log-likelihood is not summed over chains
+        self.assertAlmostEqual(log_likelihoods[3], log_likelihoods[1], delta=.15 * abs(log_likelihoods[1]))
+
+    def test_chains_diagnostics_constant_chains(self):
+        algo = AlgoFactory.algo('fit', self.get_algo_settings(name='mcmc_saem', n_chains=2))
+
+        # 3 individuals: (i) constant chains at same value, (ii) constant chains at different values, (iii) regular
+        algo._chains_n_samples = 10
+        algo._chains_mean = {'xi': torch.tensor([[[0.], [0.], [0.]], [[0.], [1.], [0.1]]])}
+        algo._chains_m2 = {'xi': torch.tensor([[[0.], [0.], [9.]], [[0.], [0.], [9.]]])}
+
+        diagnostics = algo._compute_chains_diagnostics()
+        r_hat, ess = diagnostics['r_hat']['xi'][:, 0], diagnostics['ess']['xi'][:, 0]
+
+        self.assertEqual(r_hat[0].item(), 1.)
+        self.assertEqual(r_hat[1].item(), float('inf'))
+        self.assertTrue(torch.isfinite(r_hat[2]) and r_hat[2] > 0.)
+        self.assertEqual(ess[0].item(), 20.)
+        self.assertFalse(torch.isnan(ess).any())
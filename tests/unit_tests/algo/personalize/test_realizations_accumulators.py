@@ -0,0 +1,88 @@
+import torch
+
+from leaspy.algo.personalize.realizations_accumulators import MeanRealizationsAccumulator, ModeRealizationsAccumulator
+from leaspy.exceptions import LeaspyAlgoInputError
+from leaspy.io.realizations.collection_realization import CollectionRealization
+from leaspy.io.realizations.realization import Realization
+
+from tests import LeaspyTestCase
+
+
+class RealizationsAccumulatorsTest(LeaspyTestCase):
+
+    n_iter = 20
+    n_individuals = 7
+    shapes = {'tau': (1,), 'xi': (1,), 'sources': (2,)}
+
+    def setUp(self):
+        torch.manual_seed(42)
+        self.history = [
+            {ind_var_name: torch.randn((self.n_individuals, *shape)) for ind_var_name, shape in self.shapes.items()}
+            for _ in range(self.n_iter)
+        ]
+        self.attachments = torch.randn((self.n_iter, self.n_individuals))
+        self.regularities = torch.randn((self.n_iter, self.n_individuals))
+        # some ties on loss, to check that the first iteration is kept
+        self.attachments[5, :3] = self.attachments[2, :3] + self.regularities[2, :3] - self.regularities[5, :3]
+
+    def _accumulate(self, accumulator):
+        realizations = CollectionRealization()
+        for ind_var_name, shape in self.shapes.items():
+            realizations.realizations[ind_var_name] = Realization(ind_var_name, shape, 'individual')
+        realizations.reals_ind_variable_names = list(self.shapes)
+
+        for reals_iter, attachments_iter, regularities_iter in zip(self.history, self.attachments, self.regularities):
+            for ind_var_name, reals_var in reals_iter.items():
+                # realizations are modified in-place in samplers
+                if realizations[ind_var_name].tensor_realizations is None:
+                    realizations[ind_var_name].tensor_realizations = reals_var.clone()
+                else:
+                    realizations[ind_var_name].tensor_realizations.copy_(reals_var)
+            accumulator.update(realizations, attachments_iter, regularities_iter)
+
+        self.assertEqual(accumulator.n_samples, self.n_iter)
+        return accumulator.get_individual_parameters()
+
+    def test_mean(self):
+        ips = self._accumulate(MeanRealizationsAccumulator(list(self.shapes)))
+
+        expected_ips = {
+            ind_var_name: torch.stack([reals[ind_var_name] for reals in self.history]).mean(dim=0)
+            for ind_var_name in self.shapes
+        }
+        self.assertDictAlmostEqual(ips, expected_ips, atol=1e-6)
+
+    def test_mean_precision(self):
+        # many iterations of realizations of large magnitude (e.g. `tau`)
+        self.n_iter = 10_000
+        self.history = [{ind_var_name: 70. + torch.randn((self.n_individuals, *shape))
+                         for ind_var_name, shape in self.shapes.items()}
+                        for _ in range(self.n_iter)]
+        self.attachments = self.regularities = torch.zeros((self.n_iter, self.n_individuals))
+
+        ips = self._accumulate(MeanRealizationsAccumulator(list(self.shapes)))
+
+        expected_ips = {
+            ind_var_name: torch.stack([reals[ind_var_name] for reals in self.history]).double().mean(dim=0)
+            for ind_var_name in self.shapes
+        }
+        for ind_var_name, ip in ips.items():
+            self.assertEqual(ip.dtype, torch.float32)
+            self.assertAllClose(ip.double(), expected_ips[ind_var_name], atol=1e-5, rtol=0, what=ind_var_name)
+
+    def test_mode(self):
+        ips = self._accumulate(ModeRealizationsAccumulator(list(self.shapes)))
+
+        indices_iter_best = torch.argmin(self.attachments + self.regularities, dim=0)
+        expected_ips = {
+            ind_var_name: torch.stack([self.history[ind_best_iter][ind_var_name][ind]
+                                       for ind, ind_best_iter in enumerate(indices_iter_best)])
+            for ind_var_name in self.shapes
+        }
+        self.assertDictAlmostEqual(ips, expected_ips, atol=0)
+
+    def test_empty(self):
+        for accumulator_cls in (MeanRealizationsAccumulator, ModeRealizationsAccumulator):
+            with self.subTest(accumulator_cls=accumulator_cls.__name__):
+                with self.assertRaises(LeaspyAlgoInputError):
+                    accumulator_cls(list(self.shapes)).get_individual_parameters()
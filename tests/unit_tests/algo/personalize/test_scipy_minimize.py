@@ -34,6 +34,7 @@ class ScipyMinimizeTest(LeaspyTestCase):
         self.assertEqual(settings.parameters, {
             'use_jacobian': True,
             'n_jobs': 1,
+            'batched': False,
             'progress_bar': True,
             'custom_scipy_minimize_params': None,
             'custom_format_convergence_issues': None,
@@ -53,6 +54,7 @@ class ScipyMinimizeTest(LeaspyTestCase):
         self.assertEqual(settings.parameters, {
             'use_jacobian': False,
             'n_jobs': 1,
+            'batched': False,
             'progress_bar': True,
             'custom_scipy_minimize_params': None,
             'custom_format_convergence_issues': None,
@@ -130,6 +132,41 @@ class ScipyMinimizeTest(LeaspyTestCase):
         with self.assertWarnsRegex(UserWarning, r'`use_jacobian\s?=\s?False`'):
             algo._get_individual_parameters(model, mini_dataset)
 
+    def test_batched_vs_patient_by_patient(self):
+
+        for model_name, same_optimum in {
+            'univariate_logistic': True,
+            'logistic_scalar_noise': True,
+            'logistic_diag_noise': True,
+            'logistic_binary': True,
+            'linear_scalar_noise': True,
+            'logistic_ordinal_ranking': True,
+            # scipy BFGS stops prematurely ("precision loss") for some subjects with this model
+            'logistic_ordinal': False,
+        }.items():
+
+            with self.subTest(model_name=model_name):
+                model = self.get_hardcoded_model(model_name).model
+                dataset = Dataset(self.get_suited_test_data_for_model(model_name))
+
+                ips, objectives = {}, {}
+                for batched in (False, True):
+                    settings = AlgorithmSettings('scipy_minimize', batched=batched, progress_bar=False)
+                    settings.logger = None
+                    algo = ScipyMinimize(settings)
+                    ids, ips[batched] = algo._get_individual_parameters(model, dataset).to_pytorch()
+                    self.assertEqual(ids, [str(id_) for id_ in dataset.indices])
+
+                    times, values = algo._get_batched_times_and_values(model, dataset)
+                    objectives[batched], _ = algo._get_objective_tensorized(model, times, values, ips[batched],
+                                                                            with_gradient=False)
+
+                # batched personalization should never be worse than patient-by-patient personalization
+                self.assertTrue((objectives[True] <= objectives[False] + 1e-3).all())
+
+                if same_optimum:
+                    self.assertAllClose(ips[True], ips[False], atol=2e-2, what='individual_parameters')
+
     def test_get_reconstruction_error(self):
         leaspy = self.get_hardcoded_model('logistic_scalar_noise')
 
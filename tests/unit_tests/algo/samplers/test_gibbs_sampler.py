@@ -58,7 +58,7 @@ class SamplerTest(LeaspyTestCase):
 
         # Test with g (1D population parameter)
         var_name = 'g'
-        for sampler in ['Gibbs', 'FastGibbs', 'Metropolis-Hastings']:
+        for sampler in ['Gibbs', 'FastGibbs', 'Metropolis-Hastings', 'BlockMetropolis']:
             gsampler = GibbsSampler(self.leaspy.model.random_variable_informations()[var_name], n_patients,
                                     scale=self.scale_pop, sampler_type=sampler)
             # a valid model MCMC toolbox is needed for sampling a population variable (update in-place)
@@ -77,7 +77,7 @@ class SamplerTest(LeaspyTestCase):
 
         # Test with betas (2 dimensional population parameter)
         var_name = 'betas'
-        for sampler in ['Gibbs', 'FastGibbs', 'Metropolis-Hastings']:
+        for sampler in ['Gibbs', 'FastGibbs', 'Metropolis-Hastings', 'BlockMetropolis']:
             gsampler = GibbsSampler(self.leaspy.model.random_variable_informations()[var_name], n_patients,
                                     scale=self.scale_pop, sampler_type=sampler)
             # a valid model MCMC toolbox is needed for sampling a population variable (update in-place)
@@ -95,6 +95,47 @@ class SamplerTest(LeaspyTestCase):
             self.assertAlmostEqual(stack_random_draws_mean.mean(), 4.2792e-05, delta=0.05)
             self.assertAlmostEqual(stack_random_draws_std.mean(), 0.0045, delta=0.05)
 
+    def test_sample_block_metropolis(self):
+        n_patients = 17
+        n_draw = 20
+        temperature_inv = 1.0
+
+        for model_name, var_name, expected_independent_blocks in [
+            ('logistic_scalar_noise', 'g', False),  # orthonormal basis depends on all coordinates of g
+            ('logistic_diag_noise_no_source', 'g', True),
+            ('logistic_diag_noise_no_source', 'v0', True),
+            ('logistic_ordinal_b', 'deltas', True),
+        ]:
+            with self.subTest(model_name=model_name, var_name=var_name):
+                model = self.get_hardcoded_model(model_name).model
+                dataset = Dataset(self.get_suited_test_data_for_model(model_name))
+                realizations = model.initialize_realizations_for_model(dataset.n_individuals)
+                model.initialize_MCMC_toolbox()
+
+                var_info = model.random_variable_informations()[var_name]
+                gsampler = GibbsSampler(var_info, dataset.n_individuals, scale=self.scale_pop, sampler_type='BlockMetropolis')
+                self.assertEqual(gsampler.std.shape, (var_info['shape'][0],))
+
+                initial_reals = realizations[var_name].tensor_realizations.clone()
+                for i in range(n_draw):
+                    attachment, regularity = gsampler.sample(dataset, model, realizations, temperature_inv)
+
+                self.assertEqual(gsampler._independent_blocks, expected_independent_blocks)
+
+                # returned attachment is consistent with final state of MCMC toolbox
+                ind_params = model.get_param_from_real(realizations)
+                expected_attachment = model.compute_individual_attachment_tensorized(dataset, ind_params, attribute_type='MCMC').sum()
+                self.assertAllClose(attachment, expected_attachment, rtol=1e-4, what='attachment')
+
+                new_reals = realizations[var_name].tensor_realizations
+                # masked values (impossible ordinal levels) are never changed
+                if var_info.get('mask', None) is not None:
+                    masked = ~var_info['mask'].to(bool)
+                    self.assertTrue(torch.equal(new_reals[masked], initial_reals[masked]))
+                    new_reals, initial_reals = new_reals[~masked], initial_reals[~masked]
+                self.assertTrue(torch.isfinite(new_reals).all())
+                self.assertFalse(torch.equal(new_reals, initial_reals))
+
     def test_acceptation(self):
         n_patients = 17
         n_draw = 200
@@ -191,3 +232,25 @@ class SamplerTest(LeaspyTestCase):
 
         self.assertAlmostEqual(gsampler.std[:10].mean(), 9.8880e-04, delta=0.05)
         self.assertAlmostEqual(gsampler.std[10:].mean(), 3.0277, delta=0.05)
+
+    def test_state_dict(self):
+        n_patients = 17
+        var_info = self.leaspy.model.random_variable_informations()['tau']
+
+        gsampler = GibbsSampler(var_info, n_patients, scale=self.scale_ind)
+        for i in range(30):
+            gsampler._update_acceptation_rate(torch.tensor([1.0]*10+[0.0]*7, dtype=torch.float32))
+            gsampler._update_std()
+        state = gsampler.state_dict()
+
+        new_gsampler = GibbsSampler(var_info, n_patients, scale=self.scale_ind)
+        new_gsampler.load_state_dict(state)
+        self.assertAllClose(new_gsampler.std, gsampler.std, atol=0, rtol=0)
+        self.assertAllClose(new_gsampler.acceptation_history, gsampler.acceptation_history, atol=0, rtol=0)
+        self.assertEqual(new_gsampler._counter, 30)
+
+        # the proposal distribution relies on the restored std
+        self.assertIs(new_gsampler._distribution.scale, new_gsampler.std)
+        # the state is a copy
+        state['std'] *= 2
+        self.assertAllClose(new_gsampler.std, gsampler.std, atol=0, rtol=0)
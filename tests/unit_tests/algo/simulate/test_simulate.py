@@ -7,6 +7,7 @@ import pandas as pd
 import torch
 
 from leaspy import AlgorithmSettings, Data
+from leaspy.exceptions import LeaspyAlgoInputError
 from leaspy.algo.simulate.simulate import SimulationAlgorithm
 from leaspy.io.outputs.result import Result
 from leaspy.io.settings import algo_default_data_dir
@@ -115,6 +116,29 @@ class SimulationAlgorithmTest(LeaspyTestCase):
         t_cov = 1. / (t_cov.size(0) - 1) * t_cov.t() @ t_cov
         self.assertAllClose(np.cov(values.T), t_cov, what='matrix.cov')
 
+    def test_sample_sources(self):
+        """
+        Test the batched sampling of sources from the Gaussian distribution conditioned on (bl, tau, xi).
+        """
+        torch.manual_seed(0)
+        df_mean = torch.tensor([70., 75., 0., 0., 1.], dtype=torch.float64)
+        a = torch.tensor([[1., .5, .2, .3, 0.], [0., 1., .1, -.4, .2], [0., 0., .5, .1, .3],
+                          [0., 0., 0., 1., .1], [0., 0., 0., 0., .8]], dtype=torch.float64)
+        df_cov = a.t() @ a
+
+        # conditional mean of sources for 2 different subjects
+        x = torch.tensor([[68., 73., .2], [72., 80., -.3]], dtype=torch.float64)
+        expected_means = df_mean[3:] + (x - df_mean[:3]) @ torch.linalg.solve(df_cov[:3, :3], df_cov[:3, 3:])
+
+        n = 20000
+        bl, tau, xi = x.repeat_interleave(n, dim=0).unbind(dim=1)
+        sources = self.algo._sample_sources(bl.numpy(), tau.numpy(), xi.numpy(), 2, df_mean, df_cov)
+        self.assertEqual(sources.shape, (2*n, 2))
+        self.assertAllClose(sources.view(2, n, 2).mean(dim=1), expected_means, atol=.05, what='mean_cond')
+
+        # one subject
+        self.assertEqual(self.algo._sample_sources(70., 75., 0., 2, df_mean, df_cov).shape, (2,))
+
     def test_check_cofactors(self):
         """
         Test Leaspy.simulate return a ``ValueError`` if the ``cofactor`` and ``cofactor_state`` parameters given
@@ -145,6 +169,40 @@ class SimulationAlgorithmTest(LeaspyTestCase):
         settings = AlgorithmSettings('simulation', cofactor=["Treatments"], cofactor_state=["dummy"])
         self.assertRaises(ValueError, lsp.simulate, individual_parameters, data, settings)
 
+    def test_simulate_subjects_values(self):
+        from leaspy.algo.simulate.simulate import _SimulatedSubjects
+        from leaspy.models.utils.noise_model import NoiseModel
+
+        model = self.lsp.model
+        ips = {
+            'tau': torch.tensor([[70.], [75.], [80.]], dtype=torch.float64),
+            'xi': torch.tensor([[0.], [-.5], [.3]], dtype=torch.float64),
+            'sources': torch.tensor([[0.], [1.], [-1.]], dtype=torch.float64).expand(-1, model.source_dimension),
+        }
+        timepoints = [[68., 70., 73.5], [], [80.]]
+        subjects = _SimulatedSubjects(ips, timepoints)
+
+        # without noise: same values as trajectories of each individual
+        values = self.algo._simulate_subjects_values(subjects, model, NoiseModel(None))
+        self.assertEqual([v.shape for v in values], [(3, model.dimension), (0, model.dimension), (1, model.dimension)])
+        for i in (0, 2):
+            expected = model.compute_individual_trajectory(timepoints[i], {k: v[[i]] for k, v in ips.items()})
+            self.assertAllClose(values[i], expected[0], what=i)
+
+        # with noise: values are clipped for logistic model
+        values = self.algo._simulate_subjects_values(subjects, model, NoiseModel.from_model(model, 'gaussian_scalar', scale=1.))
+        self.assertTrue(all(((v >= 0) & (v <= 1)).all() for v in values))
+
+        # with noise: random stream is drawn in the same order as if each subject was simulated separately
+        noise_model = NoiseModel.from_model(model, 'gaussian_scalar', scale=.1)
+        torch.manual_seed(42)
+        values = self.algo._simulate_subjects_values(subjects, model, noise_model)
+        torch.manual_seed(42)
+        for i, tpts in enumerate(timepoints):
+            mean_values = model.compute_individual_trajectory(tpts, {k: v[[i]] for k, v in ips.items()})
+            expected = noise_model.sample_around(mean_values).clamp(0, 1)
+            self.assertAllClose(values[i], expected[0], what=i)
+
     def _check_bin_values(self, result):
         vals = [set(np.unique(np.around(idata.observations, 6)))
                 for idata in result.data.individuals.values()]
@@ -284,6 +342,19 @@ class SimulationAlgorithmTest(LeaspyTestCase):
         nb_visits = self._get_nb_visits(new_results)
         self.assertEqual(set(nb_visits), {3}) # deterministic
 
+        # extra subjects are simulated when not enough subjects are in bounds at first
+        settings = AlgorithmSettings('simulation', seed=0, number_of_subjects=200, mean_number_of_visits=3,
+                                     std_number_of_visits=0, sources_method="normal_sources", bandwidth_method=.2,
+                                     features_bounds=bounds, features_bounds_nb_subjects_factor=1.01)
+        new_results = self._bounds_behaviour(lsp, individual_parameters, data, settings)
+        self.assertEqual(new_results.data.n_individuals, 200)
+
+        # no subject at all in bounds
+        settings = AlgorithmSettings('simulation', seed=0, number_of_subjects=200,
+                                     features_bounds=dict.fromkeys(self.lsp.model.features, (2., 3.)))
+        with self.assertRaisesRegex(LeaspyAlgoInputError, 'too stringent'):
+            lsp.simulate(individual_parameters, data, settings)
+
         # reparametrized_age_bounds
         settings = AlgorithmSettings('simulation', seed=0, number_of_subjects=200, mean_number_of_visits=4,
                                      std_number_of_visits=0, sources_method="full_kde", bandwidth_method=.2,
@@ -309,6 +380,41 @@ class SimulationAlgorithmTest(LeaspyTestCase):
                                      cofactor=['Treatments'], cofactor_state=['Treatment_A'])
         lsp.simulate(individual_parameters, data, settings)  # just test if run without error
 
+    def test_simulation_streaming(self):
+        """
+        Test the simulation in streaming mode (subjects written on disk by chunks).
+        """
+        lsp, individual_parameters, data = self.lsp, self.individual_parameters, self.data
+        output_path = self.get_test_tmp_path('streaming')
+        sim_kws = dict(seed=0, number_of_subjects=100, sources_method="normal_sources", features_bounds=True)
+
+        # same subjects as in memory when there is a single chunk
+        r = lsp.simulate(individual_parameters, data, AlgorithmSettings('simulation', **sim_kws))
+        r_stream = lsp.simulate(individual_parameters, data, AlgorithmSettings('simulation', **sim_kws, output_path=output_path))
+        self.assertIsNone(r_stream)
+
+        df_data = pd.read_csv(os.path.join(output_path, 'simulated_data.csv'), dtype={'ID': str})
+        pd.testing.assert_frame_equal(df_data, r.data.to_dataframe(), check_dtype=False, atol=1e-5)
+        df_ips = pd.read_csv(os.path.join(output_path, 'simulated_individual_parameters.csv'), dtype={'ID': str}, index_col='ID')
+        pd.testing.assert_frame_equal(df_ips, r.get_dataframe_individual_parameters())
+
+        # several chunks (previous outputs are overwritten)
+        lsp.simulate(individual_parameters, data, AlgorithmSettings('simulation', **sim_kws, output_path=output_path,
+                                                                    output_chunk_size=30))
+        df_data = pd.read_csv(os.path.join(output_path, 'simulated_data.csv'), dtype={'ID': str})
+        df_ips = pd.read_csv(os.path.join(output_path, 'simulated_individual_parameters.csv'), dtype={'ID': str}, index_col='ID')
+        expected_ids = [f'Generated_subject_{i:03}' for i in range(1, 101)]
+        self.assertEqual(df_ips.index.tolist(), expected_ids)
+        self.assertEqual(df_data['ID'].unique().tolist(), expected_ids)
+        data_bl = data.to_dataframe().groupby('ID').first().iloc[:, 1:]
+        simulated_data_bl = df_data.groupby('ID').first().iloc[:, 1:]
+        self.assertTrue(((simulated_data_bl.min() >= data_bl.min() - 1e-4) & (simulated_data_bl.max() <= data_bl.max() + 1e-4)).all())
+
+        # bad output parameters
+        for bad_kws in [dict(output_chunk_size=0), dict(output_format='xlsx')]:
+            with self.assertRaises(LeaspyAlgoInputError):
+                SimulationAlgorithm(AlgorithmSettings('simulation', output_path=output_path, **bad_kws))
+
 
     def _bounds_behaviour(self, lsp, individual_parameters, data, settings, *, tol=1e-4):
         """
@@ -0,0 +1,115 @@
+import contextlib
+import io
+
+import torch
+
+from leaspy import Leaspy
+from leaspy.algo.algo_factory import AlgoFactory
+from leaspy.algo.utils.algo_with_convergence import (
+    GewekeConvergenceCriterion,
+    RelativeChangeConvergenceCriterion,
+)
+from leaspy.exceptions import LeaspyAlgoInputError
+from leaspy.io.data.dataset import Dataset
+
+from tests import LeaspyTestCase
+
+
+class ConvergenceCriteriaTest(LeaspyTestCase):
+
+    @staticmethod
+    def _update_with_traces(criterion, traces):
+        return [criterion.update({'a': t[:2], 'b': t[2]}) for t in traces]
+
+    def test_relative_change(self):
+        torch.manual_seed(0)
+        criterion = RelativeChangeConvergenceCriterion(window=100, rtol=1e-2, atol=1e-5)
+
+        # converged only once window is complete
+        stationary = 10. + 1e-3 * torch.randn((150, 3))
+        converged = self._update_with_traces(criterion, stationary)
+        self.assertEqual(converged[:99], [False] * 99)
+        self.assertTrue(all(converged[99:]))
+
+        # reset forgets about traces
+        criterion.reset()
+        self.assertFalse(any(self._update_with_traces(criterion, stationary[:99])))
+
+        # parameters still moving
+        criterion.reset()
+        trending = torch.linspace(1., 2., 200)[:, None].expand(-1, 3)
+        self.assertFalse(any(self._update_with_traces(criterion, trending)))
+
+        # constant parameters (including zeros) are converged
+        criterion.reset()
+        self.assertTrue(self._update_with_traces(criterion, torch.zeros((100, 3)))[-1])
+
+    def test_geweke(self):
+        torch.manual_seed(0)
+        criterion = GewekeConvergenceCriterion(window=200, z_threshold=3.)
+
+        stationary = torch.randn((200, 3))
+        self.assertTrue(self._update_with_traces(criterion, stationary)[-1])
+
+        # same noise but on a trend
+        criterion.reset()
+        trending = stationary + torch.linspace(0., 5., 200)[:, None]
+        self.assertFalse(any(self._update_with_traces(criterion, trending)))
+
+        # constant traces
+        criterion.reset()
+        self.assertTrue(self._update_with_traces(criterion, torch.ones((200, 3)))[-1])
+        criterion.reset()
+        steps = torch.cat([torch.zeros((100, 3)), torch.ones((100, 3))])
+        self.assertFalse(self._update_with_traces(criterion, steps)[-1])
+
+    def test_bad_parameters(self):
+        for criterion_cls, kws in [
+            (RelativeChangeConvergenceCriterion, dict(window=1)),
+            (RelativeChangeConvergenceCriterion, dict(window=10.)),
+            (RelativeChangeConvergenceCriterion, dict(window=100, rtol=-1.)),
+            (GewekeConvergenceCriterion, dict(window=100, z_threshold=0.)),
+            (GewekeConvergenceCriterion, dict(window=50)),  # too small for batch means
+            (GewekeConvergenceCriterion, dict(window=200, first_frac=.6, last_frac=.5)),
+        ]:
+            with self.subTest(criterion=criterion_cls.name, **kws):
+                with self.assertRaises(LeaspyAlgoInputError):
+                    criterion_cls(**kws)
+
+
+class AlgoWithConvergenceTest(LeaspyTestCase):
+
+    def test_fit_with_convergence(self):
+        data = self.get_suited_test_data_for_model('logistic_scalar_noise')
+        n_iter_max = 400
+
+        # small windows & loose tolerances so that convergence is quickly reached
+        for criterion, criterion_kws, progress_bar in [
+            ('relative_change', dict(window=20, rtol=.5), False),
+            ('geweke', dict(window=100, z_threshold=10.), True),
+        ]:
+            with self.subTest(criterion=criterion, progress_bar=progress_bar):
+                leaspy = Leaspy('logistic', noise_model='gaussian_scalar', source_dimension=2)
+                algo_settings = self.get_algo_settings(name='mcmc_saem', n_iter=n_iter_max, seed=0,
+                                                       progress_bar=progress_bar,
+                                                       convergence=dict(criterion=criterion,
+                                                                        parameters=['noise_std', 'tau_mean', 'xi_std'],
+                                                                        **criterion_kws))
+                algo = AlgoFactory.algo('fit', algo_settings)
+                dataset = Dataset(data, algo=algo, model=leaspy.model)
+                leaspy.model.initialize(dataset, algo_settings.model_initialization_method)
+                with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                    algo.run(leaspy.model, dataset)
+
+                # burn-in phase was ended early, and algorithm stopped before `n_iter` iterations
+                n_burn_in_iter = algo.convergence_iterations['burn_in']
+                n_iter = algo.convergence_iterations['stop']
+                self.assertIsNotNone(n_burn_in_iter)
+                self.assertIsNotNone(n_iter)
+                self.assertEqual(algo.algo_parameters['n_burn_in_iter'], n_burn_in_iter)
+                self.assertEqual(algo.current_iteration, n_iter)
+                self.assertLess(n_burn_in_iter, n_iter)
+                self.assertLess(n_iter, n_iter_max)
+
+                # convergence messages are only displayed with progress bar
+                self.assertEqual('Convergence reached' in stdout.getvalue(), progress_bar)
@@ -1,8 +1,10 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
 from leaspy.io.data.data import Data
+from leaspy.io.data.individual_data import IndividualData
 from leaspy.exceptions import LeaspyDataInputError, LeaspyTypeError
 
 from tests import LeaspyTestCase
@@ -117,6 +119,74 @@ class DataTest(LeaspyTestCase):
             if iter > 4:
                 break
 
+    def test_data_to_columnar(self):
+        data = self.load_multivariate_data()
+        subject_codes, timepoints, values = data.to_columnar()
+
+        self.assertEqual(subject_codes.tolist(), [0]*1 + [1]*5 + [2]*7 + [3]*2 + [4]*3)
+        self.assertEqual(timepoints.shape, (18,))
+        self.assertEqual(values.shape, (18, 3))
+        self.assertTrue(values.flags['C_CONTIGUOUS'])
+
+        for i, individual in enumerate(data):
+            self.assertEqual(individual.timepoints.tolist(), timepoints[subject_codes == i].tolist())
+            self.assertEqual(individual.observations.tolist(), values[subject_codes == i].tolist())
+            # individuals' data are views on columnar arrays (no copy)
+            self.assertTrue(np.shares_memory(individual.observations, values))
+
+        # columnar arrays are built on demand for data not read from a dataframe
+        sub_data = data[[3, 1]]
+        sub_subject_codes, sub_timepoints, sub_values = sub_data.to_columnar()
+        self.assertEqual(sub_subject_codes.tolist(), [0]*2 + [1]*5)
+        self.assertEqual(sub_timepoints.tolist(), data[3].timepoints.tolist() + data[1].timepoints.tolist())
+        self.assertEqual(sub_values.tolist(), data[3].observations.tolist() + data[1].observations.tolist())
+
+    def test_data_to_columnar_invalidated(self):
+        data = self.load_multivariate_data()
+        subject_codes, timepoints, values = data.to_columnar()
+        # cached
+        self.assertIs(data.to_columnar()[2], values)
+
+        # replace observations & timepoints of an individual, with the same number of visits
+        new_observations = data[1].observations + 1.
+        new_timepoints = data[1].timepoints - 10.
+        data[1].observations = new_observations
+        data[1].timepoints = new_timepoints
+
+        new_subject_codes, new_timepoints_columnar, new_values = data.to_columnar()
+        self.assertEqual(new_subject_codes.tolist(), subject_codes.tolist())
+        self.assertEqual(new_values[subject_codes == 1].tolist(), new_observations.tolist())
+        self.assertEqual(new_timepoints_columnar[subject_codes == 1].tolist(), new_timepoints.tolist())
+        self.assertEqual(new_values[subject_codes != 1].tolist(), values[subject_codes != 1].tolist())
+
+        # same for data not read from a dataframe, and with new observations
+        sub_data = data[[3, 1]]
+        sub_data.to_columnar()
+        sub_data[0].add_observations([100.], [[0.1, 0.2, 0.3]])
+        sub_subject_codes, sub_timepoints, sub_values = sub_data.to_columnar()
+        self.assertEqual(sub_subject_codes.tolist(), [0]*3 + [1]*5)
+        self.assertEqual(sub_timepoints[2], 100.)
+        self.assertEqual(sub_values[2].tolist(), [0.1, 0.2, 0.3])
+
+        # replace an individual by another one with the same number of visits
+        other = IndividualData(data[3].idx)
+        other.add_observations(data[3].timepoints + 1., data[3].observations)
+        sub_data.individuals[other.idx] = other
+        self.assertEqual(sub_data.to_columnar()[1][:3].tolist(), other.timepoints.tolist())
+
+    def test_data_visits_sorted_by_time(self):
+        df = pd.DataFrame({
+            'ID': ['b', 'a', 'b', 'c', 'a', 'b'],
+            'TIME': [3., 1., 2., 5., 0., 2.5],
+            'X': [1., 2., np.nan, 4., 5., 6.],
+            'Y': [0., 0., 1., 0., 0., 0.],
+        })
+        data = Data.from_dataframe(df)
+        self.assertEqual([indiv.idx for indiv in data], ['b', 'a', 'c'])
+        self.assertEqual(data['b'].timepoints.tolist(), [2., 2.5, 3.])
+        self.assertEqual(data['a'].timepoints.tolist(), [0., 1.])
+        np.testing.assert_equal(data['b'].observations, [[np.nan, 1.], [6., 0.], [1., 0.]])
+
     def test_data_cofactors_and_dataframe(self):
         data = self.load_multivariate_data()
         individual_key = 3
@@ -171,3 +241,43 @@ class DataTest(LeaspyTestCase):
         
         with pytest.raises(LeaspyDataInputError):
             _ = data.to_dataframe(cofactors=["Wrong_cofactor"])
+
+    def test_data_save_load_columnar(self):
+        data = Data.from_csv_file(self.example_data_path)
+        cofactors_df = pd.DataFrame(
+            index=list(data.individuals.keys()),
+            data=[(idx[0], i) for i, idx in enumerate(data.individuals.keys())],
+            columns=["Cofactor_1", "Cofactor_2"]
+        )
+        cofactors_df.index.name = "ID"
+        data.load_cofactors(cofactors_df, cofactors=None)
+
+        path = self.get_test_tmp_path('data_columnar')
+        data.save_columnar(path)
+
+        for mmap in (True, False):
+            loaded = Data.load_columnar(path, mmap=mmap)
+            self.assertEqual(loaded.headers, data.headers)
+            self.assertEqual(loaded.cofactors, data.cofactors)
+            self.assertEqual(loaded.iter_to_idx, data.iter_to_idx)
+            self.assertEqual(loaded.n_visits, data.n_visits)
+            for idx, individual in data.individuals.items():
+                loaded_individual = loaded.individuals[idx]
+                self.assertAllClose(loaded_individual.timepoints, individual.timepoints)
+                self.assertAllClose(loaded_individual.observations, individual.observations, equal_nan=True)
+                self.assertEqual(loaded_individual.cofactors, individual.cofactors)
+
+            # individuals' data are views on the (read-only) columnar arrays
+            _, _, values = loaded.to_columnar()
+            self.assertTrue(np.shares_memory(loaded[0].observations, values))
+            self.assertEqual(values.flags.writeable, not mmap)
+
+            pd.testing.assert_frame_equal(loaded.to_dataframe(cofactors="all"), data.to_dataframe(cofactors="all"))
+
+        # no headers
+        with pytest.raises(LeaspyDataInputError):
+            Data().save_columnar(self.get_test_tmp_path('data_columnar_empty'))
+
+        # missing bundle
+        with pytest.raises(LeaspyDataInputError):
+            Data.load_columnar(self.get_test_tmp_path('data_columnar_missing'))
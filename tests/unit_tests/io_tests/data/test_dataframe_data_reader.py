@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from leaspy.io.data.dataframe_data_reader import DataframeDataReader
@@ -150,3 +151,37 @@ class DataframeDataReaderTest(LeaspyTestCase):
         self.assertEqual(reader.n_visits, 6)
         self.assertEqual(list(reader.individuals.keys()), ['S1', 'S2', 'S3'])  # re-ordered
         self.assertEqual(reader.individuals['S3'].timepoints.tolist(), [75., 76.])
+
+    def test_trusted(self):
+        df = self.df.assign(TIME=[75, 75.001, 76, 75.5, 65, 87])
+        reader = DataframeDataReader(df)
+        reader_trusted = DataframeDataReader(df, trusted=True)
+
+        self.assertEqual(reader_trusted.iter_to_idx, reader.iter_to_idx)
+        self.assertEqual(reader_trusted.headers, reader.headers)
+        self.assertEqual(reader_trusted.n_visits, reader.n_visits)
+        self.assertEqual(reader_trusted.individuals['S3'].timepoints.tolist(), [75.5, 76.])
+        for arr_name in ('subject_codes', 'timepoints', 'values'):
+            self.assertTrue(np.array_equal(getattr(reader_trusted, arr_name), getattr(reader, arr_name), equal_nan=True))
+
+        # input dataframe is not modified even if not copied
+        df_copy = df.copy(deep=True)
+        DataframeDataReader(df.set_index(['ID', 'TIME']), trusted=True)
+        pd.testing.assert_frame_equal(df, df_copy)
+
+        # duplicates are not checked
+        DataframeDataReader(self.df.assign(TIME=[75]*6), trusted=True)
+        with self.assertRaisesRegex(ValueError, 'duplicated'):
+            DataframeDataReader(self.df.assign(TIME=[75]*6))
+
+    def test_individuals_only_with_visits_full_of_nans(self):
+        df = pd.DataFrame({
+            'ID': ['S3', 'S1', 'S2', 'S1', 'S2'],
+            'TIME': [70., 71., 72., 70., 73.],
+            'Y0': [float('nan'), .1, float('nan'), .2, .3],
+        })
+        reader = DataframeDataReader(df)
+        self.assertEqual(reader.iter_to_idx, {0: 'S1', 1: 'S2'})
+        self.assertEqual(reader.subject_codes.tolist(), [0, 0, 1])
+        self.assertEqual(reader.timepoints.tolist(), [70., 71., 73.])
+        self.assertEqual(reader.values[:, 0].tolist(), [.2, .1, .3])
@@ -7,6 +7,7 @@ from numpy import nan
 
 from leaspy.io.data.data import Data
 from leaspy.io.data.dataset import Dataset
+from leaspy.exceptions import LeaspyInputError
 
 from tests import LeaspyTestCase
 
@@ -96,6 +97,150 @@ class DatasetTest(LeaspyTestCase):
         self.assertTrue(torch.equal(dataset.mask, mask))
         self.assertAllClose(dataset.timepoints, timepoints)
 
+    def test_repeat(self):
+
+        path_to_data = self.get_test_data_path('data_mock', 'multivariate_data_for_dataset_with_nans.csv')
+        data = Data.from_csv_file(path_to_data)
+        dataset = Dataset(data)
+
+        with self.assertRaises(Exception):
+            dataset.repeat(0)
+
+        repeated = dataset.repeat(3)
+
+        # the current dataset is unchanged
+        self.assertEqual(dataset.n_individuals, 3)
+        self.assertEqual(dataset.values.shape, (3, 4, 2))
+
+        self.assertEqual(repeated.n_individuals, 9)
+        self.assertEqual(repeated.n_visits, 3*8)
+        self.assertEqual(repeated.n_visits_max, 4)
+        self.assertEqual(repeated.indices, 3*dataset.indices)
+        self.assertEqual(repeated.n_visits_per_individual, 3*dataset.n_visits_per_individual)
+        self.assertEqual(repeated.n_observations, 3*(2*8-3))
+        self.assertTrue(torch.equal(repeated.n_observations_per_ft, 3*dataset.n_observations_per_ft))
+        self.assertAllClose(repeated.L2_norm_per_ft, 3*dataset.L2_norm_per_ft)
+        self.assertAllClose(repeated.L2_norm, 3*dataset.L2_norm)
+
+        # chain-major order: k-th copy of individual i is at index k*n_individuals + i
+        for k in range(3):
+            sl = slice(3*k, 3*(k+1))
+            self.assertTrue(torch.equal(repeated.values[sl], dataset.values))
+            self.assertTrue(torch.equal(repeated.mask[sl], dataset.mask))
+            self.assertTrue(torch.equal(repeated.timepoints[sl], dataset.timepoints))
+            self.assertTrue(torch.equal(repeated.n_observations_per_ind_per_ft[sl], dataset.n_observations_per_ind_per_ft))
+
+        self.assertAllClose(repeated.get_values_patient(7), dataset.get_values_patient(1), equal_nan=True)
+
+    def test_packed_layout(self):
+
+        path_to_data = self.get_test_data_path('data_mock', 'multivariate_data_for_dataset_with_nans.csv')
+        data = Data.from_csv_file(path_to_data)
+
+        # padded layout by default
+        dataset = Dataset(data)
+        self.assertFalse(dataset.packed)
+        self.assertIsNone(dataset.visits_subject_index)
+        self.assertIs(dataset.visits_values, dataset.values)
+        self.assertIs(dataset.visits_mask, dataset.mask)
+        self.assertIs(dataset.visits_timepoints, dataset.timepoints)
+
+        ips = {'tau': torch.tensor([[70.], [71.], [72.]])}
+        self.assertIs(dataset.get_visits_individual_parameters(ips), ips)
+
+        # packed layout
+        dataset = Dataset(data, packed=True)
+        self.assertTrue(dataset.packed)
+        self.assertEqual(dataset.visits_subject_index.tolist(), [0, 0, 1, 1, 2, 2, 2, 2])
+        self.assertAllClose(dataset.visits_timepoints, torch.tensor([[1.], [3.], [1.], [2.], [1.], [2.], [4.], [5.]]))
+        self.assertEqual(dataset.visits_values.shape, (8, 1, 2))
+        self.assertAllClose(dataset.visits_values[:, 0], torch.tensor([[1., 1.], [2., 3.], [1., 1.], [0., 8.],
+                                                                       [0., 4.], [8., 0.], [1., 1.], [3., 2.]]))
+        self.assertAllClose(dataset.visits_mask[:, 0], torch.tensor([[1., 1.], [1., 1.], [1., 1.], [0., 1.],
+                                                                     [0., 1.], [1., 0.], [1., 1.], [1., 1.]]))
+
+        self.assertAllClose(dataset.get_visits_individual_parameters(ips)['tau'],
+                            torch.tensor([[70.], [70.], [71.], [71.], [72.], [72.], [72.], [72.]]))
+
+        # per-individual aggregation is consistent with padded layout
+        self.assertTrue(torch.equal(dataset.sum_visits_per_individual(dataset.visits_mask).int(),
+                                    dataset.n_observations_per_ind_per_ft))
+        self.assertAllClose(dataset.sum_visits_per_individual(dataset.visits_values ** 2).sum(dim=0), dataset.L2_norm_per_ft)
+
+        # layout is kept when repeating dataset
+        repeated = dataset.repeat(2)
+        self.assertTrue(repeated.packed)
+        self.assertEqual(repeated.visits_subject_index.tolist(), [0, 0, 1, 1, 2, 2, 2, 2, 3, 3, 4, 4, 5, 5, 5, 5])
+        self.assertTrue(torch.equal(repeated.visits_values[8:], dataset.visits_values))
+
+        # padded tensors are only built on demand, and are the same as in padded layout
+        for ds in (dataset, repeated):
+            self.assertIsNone(ds._values)
+            self.assertIsNone(ds._mask)
+            self.assertIsNone(ds._timepoints)
+        dataset_padded = Dataset(data)
+        self.assertTrue(torch.equal(dataset.values, dataset_padded.values))
+        self.assertTrue(torch.equal(dataset.mask, dataset_padded.mask))
+        self.assertTrue(torch.equal(dataset.timepoints, dataset_padded.timepoints))
+        self.assertTrue(torch.equal(dataset.n_observations_per_ind_per_ft, dataset_padded.n_observations_per_ind_per_ft))
+        self.assertAllClose(dataset.L2_norm_per_ft, dataset_padded.L2_norm_per_ft)
+
+        # packed layout is opt-in, even for a sparse dataset
+        df = pd.DataFrame({
+            'ID': ['S1'] * 10 + ['S2', 'S3', 'S4'],
+            'TIME': [50. + i for i in range(10)] + [60., 61., 62.],
+            'FT': [float(i) for i in range(13)],
+        })
+        self.assertFalse(Dataset(Data.from_dataframe(df)).packed)
+
+    def test_iter_subjects_chunks(self):
+
+        path_to_data = self.get_test_data_path('data_mock', 'multivariate_data_for_dataset_with_nans.csv')
+        data = Data.from_csv_file(path_to_data)
+
+        for packed in (False, True):
+            dataset = Dataset(data, packed=packed)
+            chunks = list(dataset.iter_subjects_chunks(2))
+            self.assertEqual([sl for sl, _ in chunks], [slice(0, 2), slice(2, 3)])
+
+            for sl, chunk in chunks:
+                self.assertEqual(chunk.packed, packed)
+                self.assertEqual(chunk.indices, dataset.indices[sl])
+                self.assertEqual(chunk.n_visits, sum(dataset.n_visits_per_individual[sl]))
+                # views on tensors of dataset
+                if packed:
+                    self.assertEqual(chunk.visits_values.data_ptr(), dataset.visits_values[sum(dataset.n_visits_per_individual[:sl.start]):].data_ptr())
+                    self.assertIsNone(chunk._values)
+                else:
+                    self.assertEqual(chunk.values.data_ptr(), dataset.values[sl].data_ptr())
+                self.assertAllClose(chunk.L2_norm_per_ft, (chunk.visits_mask * chunk.visits_values ** 2).sum(dim=(0, 1)))
+                self.assertTrue(torch.equal(chunk.n_observations_per_ind_per_ft, dataset.n_observations_per_ind_per_ft[sl]))
+                self.assertTrue(torch.equal(chunk.sum_visits_per_individual(chunk.visits_mask).int(),
+                                            chunk.n_observations_per_ind_per_ft))
+
+            if packed:
+                self.assertEqual(chunks[1][1].visits_subject_index.tolist(), [0, 0, 0, 0])
+
+        with self.assertRaises(LeaspyInputError):
+            next(dataset.iter_subjects_chunks(0))
+
+    def test_to_pandas(self):
+
+        path_to_data = self.get_test_data_path('data_mock', 'multivariate_data_for_dataset_with_nans.csv')
+        data = Data.from_csv_file(path_to_data)
+
+        df_expected = pd.DataFrame({
+            'TIME': [1., 3., 1., 2., 1., 2., 4., 5.],
+            data.headers[0]: [1., 2., 1., nan, nan, 8., 1., 3.],
+            data.headers[1]: [1., 3., 1., 8., 4., nan, 1., 2.],
+            'ID': pd.Series(['1', '1', '2', '2', '4', '4', '4', '4'], dtype=object),
+        })
+
+        for packed in (False, True):
+            df = Dataset(data, packed=packed).to_pandas()
+            self.assertEqual(df.columns.tolist(), ['TIME', *data.headers, 'ID'])
+            pd.testing.assert_frame_equal(df, df_expected, check_dtype=False)
+
     def test_dataset_device_management_cpu_only(self):
         path_to_data = self.get_test_data_path('data_mock', 'multivariate_data_for_dataset_with_nans.csv')
         data = Data.from_csv_file(path_to_data)
@@ -242,6 +387,15 @@ class DatasetTest(LeaspyTestCase):
                 self.assertAllClose(pdf, expected_pdf)
                 self.assertAllClose(sf, expected_sf)
 
+                # packed layout of ordinal levels: only the possible levels of each feature
+                max_levels = [ft['max_level'] for ft in ordinal_infos['features']]
+                expected_pdf_packed = torch.cat([expected_pdf[:, :, i, :max_lvl + 1] for i, max_lvl in enumerate(max_levels)], dim=-1)
+                expected_sf_packed = torch.cat([expected_sf[:, :, i, :max_lvl] for i, max_lvl in enumerate(max_levels)], dim=-1)
+                self.assertAllClose(dataset.get_one_hot_encoding(sf=False, ordinal_infos=ordinal_infos, packed_levels=True),
+                                    expected_pdf_packed.float())
+                self.assertAllClose(dataset.get_one_hot_encoding(sf=True, ordinal_infos=ordinal_infos, packed_levels=True),
+                                    expected_sf_packed.float())
+
                 ws_second = [str(w.message) for w in ws_second]
                 self.assertEqual(ws_second, [])
 
@@ -38,6 +38,12 @@ class IndividualDataTest(LeaspyTestCase):
         with pytest.raises(LeaspyDataInputError):
             data.add_observations([70], [[40]])
 
+        # no partial insertion when some of new observations are duplicated
+        with pytest.raises(LeaspyDataInputError):
+            data.add_observations([90, 85, 90], [[50], [45], [50]])
+        self.assertEqual(data.timepoints.tolist(), [70, 75, 80])
+        self.assertEqual(data.observations.tolist(), [[30], [35], [40]])
+
     def test_add_cofactors(self):
         data = IndividualData("test")
         cofactors_dict = {
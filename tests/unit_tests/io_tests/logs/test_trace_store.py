@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import torch
+
+from leaspy.exceptions import LeaspyInputError
+from leaspy.io.logs.trace_store import TraceReader, TraceWriter
+
+from tests import LeaspyTestCase
+
+
+class TraceStoreTest(LeaspyTestCase):
+
+    n_iter = 50
+
+    def setUp(self):
+        torch.manual_seed(42)
+        self.traces = {
+            'g': torch.randn((self.n_iter, 4)),
+            'betas': torch.randn((self.n_iter, 3, 2)),
+            'tau_mean': torch.randn((self.n_iter,)),
+            'noise_std': torch.rand((self.n_iter, 1)).double(),
+        }
+
+    def _write(self, path: str, **writer_kws) -> TraceWriter:
+        writer = TraceWriter(path, **writer_kws)
+        for it in range(self.n_iter):
+            values = {name: trace[it].clone() for name, trace in self.traces.items()}
+            if it < 10:
+                # trace that appears later (e.g. log-likelihood)
+                values.pop('tau_mean')
+            writer.append(2 * it + 1, values)
+            # values are copied
+            values['g'].zero_()
+        return writer
+
+    def _check(self, path: str):
+        reader = TraceReader(path)
+        self.assertEqual(set(reader.names), set(self.traces))
+
+        for name, trace in self.traces.items():
+            iterations, values = reader.get(name)
+            start = 10 if name == 'tau_mean' else 0
+            self.assertEqual(iterations.tolist(), list(range(2 * start + 1, 2 * self.n_iter, 2)))
+            self.assertEqual(values.dtype, trace.numpy().dtype)
+            self.assertAllClose(torch.tensor(np.array(values)), trace[start:], atol=0, what=name)
+
+        df = reader.to_dataframe('betas')
+        self.assertEqual(df.index.name, 'iter')
+        self.assertEqual(df.columns.tolist(), [f'betas_{i}_{j}' for i in range(3) for j in range(2)])
+        self.assertEqual(reader.to_dataframe('tau_mean').columns.tolist(), ['tau_mean'])
+
+    def test_write_and_read(self):
+        for buffer_size in (1, 100, 2**20):
+            with self.subTest(buffer_size=buffer_size):
+                path = self.get_test_tmp_path(f'traces_{buffer_size}')
+                writer = self._write(path, buffer_size=buffer_size)
+                writer.close()
+                self._check(path)
+
+    def test_read_while_writing(self):
+        path = self.get_test_tmp_path('traces_partial')
+        writer = self._write(path)
+
+        # nothing written yet (buffered)
+        self.assertEqual(len(TraceReader(path).get('g')[0]), 0)
+
+        writer.flush(wait=True)
+        self._check(path)
+
+        # more records after a close
+        writer.close()
+        writer.append(1000, {'g': torch.zeros(4)})
+        writer.close()
+        self.assertEqual(TraceReader(path).get('g')[0][-1], 1000)
+
+        # incomplete last record (being written) is ignored
+        with open(os.path.join(path, 'g.bin'), 'ab') as fp:
+            fp.write(b'\x00' * 5)
+        self.assertEqual(len(TraceReader(path).get('g')[0]), self.n_iter + 1)
+
+    def test_errors(self):
+        with self.assertRaises(LeaspyInputError):
+            TraceWriter(self.get_test_tmp_path('traces_err'), buffer_size=0)
+
+        writer = TraceWriter(self.get_test_tmp_path('traces_err'))
+        writer.append(1, {'g': torch.zeros(4)})
+        with self.assertRaisesRegex(LeaspyInputError, "'g'"):
+            writer.append(2, {'g': torch.zeros(3)})
+        writer.close()
+
+        reader = TraceReader(writer.path)
+        with self.assertRaises(LeaspyInputError):
+            reader.get('unknown')
+
+        with self.assertRaises(LeaspyInputError):
+            TraceReader(self.get_test_tmp_path('not_a_trace_store'))
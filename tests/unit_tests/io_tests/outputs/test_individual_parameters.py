@@ -103,6 +103,35 @@ class IndividualParametersTest(LeaspyTestCase):
         # previously one would get a column named "sources", with a string encoded list of 1 element at each row...
         self.assertTrue(all(map(pd.api.types.is_numeric_dtype, ip1.to_dataframe().dtypes)))
 
+    def test_columnar_storage(self):
+        ip = IndividualParameters()
+        # more individuals than initial capacity of arrays
+        n = 3 * IndividualParameters._initial_capacity + 1
+        for i in range(n):
+            ip.add_individual_parameters(f'idx{i}', {'tau': 70 + i, 'xi': .1 * i, 'sources': [i, -i]})
+
+        self.assertEqual(ip['idx0'], {'tau': 70, 'xi': 0., 'sources': [0, 0]})
+        self.assertEqual(ip[f'idx{n-1}'], {'tau': 70 + n - 1, 'xi': .1 * (n - 1), 'sources': [n - 1, 1 - n]})
+        self.assertEqual(ip.to_dataframe()['tau'].dtype, np.int64)
+
+        # integer parameter is upcast as soon as a real value is added
+        ip.add_individual_parameters('idx_real', {'tau': 70.5, 'xi': 0, 'sources': [0., 0.]})
+        self.assertEqual(ip['idx0']['tau'], 70)
+        self.assertEqual(ip['idx_real'], {'tau': 70.5, 'xi': 0., 'sources': [0., 0.]})
+        self.assertAlmostEqual(ip.get_mean('tau'), (sum(range(70, 70 + n)) + 70.5) / (n + 1), delta=1e-10)
+
+        # bulk constructors
+        ip_pt = IndividualParameters.from_pytorch(['a', 'b'], {'tau': torch.tensor([70., 80.]), 'sources': torch.tensor([[0.], [1.]])})
+        self.assertEqual(ip_pt._parameters_shape, {'tau': (), 'sources': (1,)})
+        self.assertEqual(ip_pt['b'], {'tau': 80., 'sources': [1.]})
+
+        with self.assertRaises(ValueError):
+            IndividualParameters.from_pytorch(['a', 'a'], {'tau': torch.tensor([70., 80.])})
+        with self.assertRaises(ValueError):
+            IndividualParameters.from_dataframe(pd.DataFrame({'tau': ['70', '80']}, index=['a', 'b']))
+        with self.assertRaises(ValueError):
+            IndividualParameters.from_dataframe(pd.DataFrame({'tau': [70., 80.]}, index=[1, 2]))
+
     def test_get_item(self):
         ip = IndividualParameters()
 
@@ -115,6 +144,10 @@ class IndividualParametersTest(LeaspyTestCase):
         self.assertDictEqual(ip['idx1'], p1)
         self.assertDictEqual(ip['idx2'], p2)
 
+        # python objects (not numpy ones) are returned
+        self.assertEqual({k: type(v) for k, v in ip['idx1'].items()}, {'xi': float, 'tau': int, 'sources': list})
+        self.assertEqual({type(v) for v in ip['idx1']['sources']}, {float})
+
 
     def test_subset(self):
 
@@ -124,6 +157,12 @@ class IndividualParametersTest(LeaspyTestCase):
         self.assertEqual(ip2._individual_parameters, {"idx1": self.p1, "idx3": self.p3})
         self.assertEqual(ip2._parameters_shape, self.parameters_shape)
 
+        # deprecated (and ignored) `copy` argument
+        for copy in (True, False):
+            with self.assertWarns(DeprecationWarning):
+                ip3 = self.ip.subset(["idx1", "idx3"], copy=copy)
+            self.assertEqual(ip3._individual_parameters, {"idx1": self.p1, "idx3": self.p3})
+
 
     def test_get_mean(self):
 
@@ -292,6 +331,28 @@ class IndividualParametersTest(LeaspyTestCase):
         self.assertEqual(ip._individual_parameters, self.individual_parameters)
         self.assertEqual(ip._parameters_shape, self.parameters_shape)
 
+    def test_save_load_columnar(self):
+        path = self.get_test_tmp_path('ip_save_columnar')
+        self.ip.save_columnar(path)
+
+        for mmap in (True, False):
+            ip = IndividualParameters.load_columnar(path, mmap=mmap)
+            self.assertEqual(ip._indices, self.indices)
+            self.assertEqual(ip._individual_parameters, self.individual_parameters)
+            self.assertEqual(ip._parameters_shape, self.parameters_shape)
+            self.assertEqual(ip.to_dataframe()['tau'].dtype, np.int64)
+            self.assertEqual(ip.subset(['idx3'])._individual_parameters, {'idx3': self.p3})
+
+            # read-only arrays when memory-mapped, but individuals can still be added
+            self.assertEqual(ip._parameters_values['tau'].flags.writeable, not mmap)
+            ip.add_individual_parameters('idx4', {"xi": 0.4, "tau": 60, "sources": [0., 0.]})
+            self.assertEqual(ip['idx4'], {"xi": 0.4, "tau": 60, "sources": [0., 0.]})
+
+        with self.assertRaises(ValueError):
+            IndividualParameters.load_columnar(self.get_test_tmp_path('no_ip_here'))
+        with self.assertRaises(ValueError):
+            IndividualParameters().save_columnar(path)
+
     def test_load_individual_parameters(self):
 
         # Test json
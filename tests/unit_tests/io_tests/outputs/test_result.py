@@ -107,6 +107,26 @@ class ResultTest(LeaspyTestCase):
                 with self.assertRaises(ValueError, msg=dict(idx=idx, path=fake_path)):
                     saving_method(self.get_test_tmp_path(fake_path), idx=idx)
 
+    def test_save_load_individual_parameters_columnar(self):
+        path = self.get_test_tmp_path('data_tiny-individual_parameters-columnar')
+
+        self.results.save_individual_parameters_columnar(path)
+        ind_param = Result.load_individual_parameters(path, verbose=False)
+        self.generic_check_individual_parameters(ind_param, nb_individuals=17)
+        for k, v in self.results.individual_parameters.items():
+            self.assertAllClose(ind_param[k], v, atol=0, what=k)
+
+        # subset of subjects
+        self.results.save_individual_parameters_columnar(path, self.idx_sub)
+        ind_param = Result.load_individual_parameters_from_columnar(path, verbose=False)
+        self.generic_check_individual_parameters(ind_param, nb_individuals=3)
+        expected = self.results.get_torch_individual_parameters(self.idx_sub)
+        for k, v in expected.items():
+            self.assertAllClose(ind_param[k], v, atol=0, what=k)
+
+        with self.assertRaises(ValueError):
+            self.results.save_individual_parameters_columnar(path, '116')
+
     def generic_check_individual_parameters(self, ind_param, *, nb_individuals: int):
         self.assertEqual(type(ind_param), dict)
         self.assertEqual(list(ind_param.keys()), ['tau', 'xi', 'sources'])
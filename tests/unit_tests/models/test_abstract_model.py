@@ -1,9 +1,11 @@
+import json
 import unittest
 import torch
 
 from leaspy import AlgorithmSettings, Leaspy
 from leaspy.models.abstract_model import AbstractModel
 from leaspy.models.model_factory import ModelFactory
+from leaspy.exceptions import LeaspyModelInputError
 
 from tests import LeaspyTestCase
 
@@ -169,10 +171,17 @@ class AbstractModelTest(LeaspyTestCase):
                 if (not valid) or (not src_compat(src_dim)):
                     with self.assertRaises(ValueError, ):
                         ips_info = m._audit_individual_parameters(ips)
+                    with self.assertRaises(ValueError, ):
+                        m.tensorize_individual_parameters(ips)
                     continue
 
                 ips_info = m._audit_individual_parameters(ips)
 
+                # public helper
+                t_ips_pub = m.tensorize_individual_parameters(ips)
+                self.assertEqual(t_ips_pub.keys(), ips_info['tensorized_ips'].keys())
+                self.assertTrue(all(torch.equal(v, ips_info['tensorized_ips'][k]) for k, v in t_ips_pub.items()))
+
                 keys = set(ips_info.keys()).symmetric_difference({'nb_inds','tensorized_ips','tensorized_ips_gen'})
                 self.assertEqual(len(keys), 0)
 
@@ -201,6 +210,112 @@ class AbstractModelTest(LeaspyTestCase):
                             self.assertEqual(v.dim(), 2)
                             self.assertEqual(v.shape, (1, src_dim if (k == 'sources') else 1))
 
+    def test_attachment_packed_vs_padded_dataset(self):
+
+        from leaspy.io.data.dataset import Dataset
+
+        for model_name in ('univariate_logistic', 'logistic_scalar_noise', 'logistic_diag_noise', 'logistic_binary',
+                           'logistic_parallel_diag_noise', 'linear_scalar_noise',
+                           'logistic_ordinal', 'logistic_ordinal_ranking'):
+
+            with self.subTest(model_name=model_name):
+                model = self.get_hardcoded_model(model_name).model
+                data = self.get_suited_test_data_for_model(model_name)
+                dataset_padded, dataset_packed = Dataset(data, packed=False), Dataset(data, packed=True)
+
+                torch.manual_seed(42)
+                n_inds = dataset_padded.n_individuals
+                ips = {'tau': 75. + torch.randn((n_inds, 1)), 'xi': .1 * torch.randn((n_inds, 1))}
+                if getattr(model, 'source_dimension', 0):
+                    ips['sources'] = torch.randn((n_inds, model.source_dimension))
+
+                attachment_padded = model.compute_individual_attachment_per_ft_tensorized(dataset_padded, ips, attribute_type=None)
+                attachment_packed = model.compute_individual_attachment_per_ft_tensorized(dataset_packed, ips, attribute_type=None)
+                self.assertEqual(attachment_packed.shape, (n_inds, model.dimension))
+                self.assertAllClose(attachment_packed, attachment_padded, rtol=1e-5, atol=1e-4)
+
+                if 'noise' in model_name:
+                    self.assertAllClose(model.compute_sum_squared_tensorized(dataset_packed, ips),
+                                        model.compute_sum_squared_tensorized(dataset_padded, ips), rtol=1e-5, atol=1e-4)
+
+                # sufficient statistics (incl. log-likelihood for non-gaussian models) are the same
+                model.initialize_MCMC_toolbox()
+                realizations = model.initialize_realizations_for_model(n_inds)
+                suff_stats_padded = model.compute_sufficient_statistics(dataset_padded, realizations)
+                suff_stats_packed = model.compute_sufficient_statistics(dataset_packed, realizations)
+                self.assertEqual(suff_stats_packed.keys(), suff_stats_padded.keys())
+                if model.noise_model in ('bernoulli', 'ordinal', 'ordinal_ranking'):
+                    self.assertIn('log-likelihood', suff_stats_packed)
+                for k, v in suff_stats_packed.items():
+                    self.assertAllClose(v, suff_stats_padded[k], rtol=1e-5, atol=1e-4, what=k)
+
+                # no padded tensor was needed for computations on packed dataset
+                self.assertIsNone(dataset_packed._values)
+                self.assertIsNone(dataset_packed._mask)
+                self.assertIsNone(dataset_packed._timepoints)
+
+    def test_attachment_subjects_chunks(self):
+
+        from leaspy.io.data.dataset import Dataset
+
+        for model_name in ('univariate_logistic', 'logistic_scalar_noise', 'logistic_diag_noise', 'logistic_binary',
+                           'logistic_parallel_diag_noise', 'logistic_ordinal', 'logistic_ordinal_ranking'):
+
+            with self.subTest(model_name=model_name):
+                model = self.get_hardcoded_model(model_name).model
+                data = self.get_suited_test_data_for_model(model_name)
+
+                torch.manual_seed(42)
+                n_inds = data.n_individuals
+                ips = {'tau': 75. + torch.randn((n_inds, 1)), 'xi': .1 * torch.randn((n_inds, 1))}
+                if getattr(model, 'source_dimension', 0):
+                    ips['sources'] = torch.randn((n_inds, model.source_dimension))
+
+                for packed in (False, True):
+                    model.subjects_chunk_size = None
+                    dataset = Dataset(data, packed=packed)
+                    expected_attachment = model.compute_individual_attachment_tensorized(dataset, ips, attribute_type=None)
+
+                    model.subjects_chunk_size = 3
+                    dataset = Dataset(data, packed=packed)
+                    attachment = model.compute_individual_attachment_tensorized(dataset, ips, attribute_type=None)
+                    self.assertAllClose(attachment, expected_attachment, rtol=1e-6, atol=1e-5)
+                    # one-hot encoding of ordinal values is never built for all individuals at once
+                    self.assertIsNone(dataset._one_hot_encoding)
+
+                    if 'noise' in model_name:
+                        model.subjects_chunk_size = None
+                        expected_sum_squared = model.compute_sum_squared_per_ft_tensorized(dataset, ips)
+                        model.subjects_chunk_size = 3
+                        self.assertAllClose(model.compute_sum_squared_per_ft_tensorized(dataset, ips),
+                                            expected_sum_squared, rtol=1e-6, atol=1e-5)
+
+                model.subjects_chunk_size = None
+
+        with self.assertRaises(LeaspyModelInputError):
+            model.subjects_chunk_size = 0
+
+    def test_subjects_chunk_size_hyperparameter(self):
+
+        # as any hyperparameter
+        self.assertEqual(Leaspy('logistic', subjects_chunk_size=3).model.subjects_chunk_size, 3)
+        with self.assertRaises(LeaspyModelInputError):
+            Leaspy('univariate_logistic', subjects_chunk_size=0)
+
+        for model_name in ('univariate_logistic', 'logistic_scalar_noise', 'logistic_ordinal'):
+            for chunk_size in (None, 3):
+                with self.subTest(model_name=model_name, chunk_size=chunk_size):
+                    leaspy = self.get_hardcoded_model(model_name)
+                    leaspy.model.subjects_chunk_size = chunk_size
+
+                    path = self.get_test_tmp_path(f'{model_name}_subjects_chunk_size_{chunk_size}.json')
+                    leaspy.save(path)
+                    with open(path, 'r') as fp:
+                        # not exported when not set
+                        self.assertEqual('subjects_chunk_size' in json.load(fp), chunk_size is not None)
+
+                    self.assertEqual(Leaspy.load(path).model.subjects_chunk_size, chunk_size)
+
     def test_model_device_management_cpu_only(self):
         model_name = 'logistic'
 
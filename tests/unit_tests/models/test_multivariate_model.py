@@ -1,3 +1,6 @@
+import torch
+
+from leaspy.io.data.dataset import Dataset
 from leaspy.models.multivariate_model import MultivariateModel
 
 from tests import LeaspyTestCase
@@ -9,3 +12,72 @@ class TestMultivariateModel(LeaspyTestCase):
 
         with self.assertRaises(ValueError):
             MultivariateModel('unknown-suffix')
+
+    @staticmethod
+    def _get_individual_parameters(model, n_individuals: int):
+        torch.manual_seed(42)
+        ips = {
+            'xi': model.parameters['xi_mean'] + model.parameters['xi_std'] * torch.randn((n_individuals, 1)),
+            'tau': model.parameters['tau_mean'] + model.parameters['tau_std'] * torch.randn((n_individuals, 1)),
+        }
+        if model.source_dimension:
+            ips['sources'] = torch.randn((n_individuals, model.source_dimension))
+        return ips
+
+    def test_attachment_per_ft_on_features(self):
+
+        for model_name in ('logistic_scalar_noise', 'logistic_diag_noise_no_source', 'linear_diag_noise',
+                           'logistic_binary', 'logistic_ordinal', 'logistic_ordinal_b', 'logistic_ordinal_ranking',
+                           'logistic_parallel_diag_noise'):
+
+            with self.subTest(model_name=model_name):
+                model = self.get_hardcoded_model(model_name).model
+                dataset = Dataset(self.get_suited_test_data_for_model(model_name))
+                ips = self._get_individual_parameters(model, dataset.n_individuals)
+
+                attachment = model.compute_individual_attachment_tensorized(dataset, ips, attribute_type=None)
+                attachment_per_ft = model.compute_individual_attachment_per_ft_tensorized(dataset, ips, attribute_type=None)
+                self.assertShapeEqual(attachment_per_ft, (dataset.n_individuals, dataset.dimension))
+                self.assertAllClose(attachment_per_ft.sum(dim=1), attachment, what='attachment')
+
+                features = [2, 0]
+                attachment_on_fts = model.compute_individual_attachment_per_ft_tensorized(dataset, ips, attribute_type=None,
+                                                                                          features=features)
+                self.assertAllClose(attachment_on_fts, attachment_per_ft[:, features], what='attachment_on_fts')
+
+    def test_features_impacted_by_population_variable(self):
+
+        for model_name, var_name, idx, expected_fts in [
+            ('logistic_scalar_noise', 'g', (1,), None),
+            ('logistic_scalar_noise', 'v0', (1,), None),
+            ('logistic_scalar_noise', 'betas', (1, 0), None),
+            ('logistic_diag_noise_no_source', 'g', (1,), [1]),
+            ('logistic_diag_noise_no_source', 'v0', (2,), [2]),
+            ('logistic_diag_noise_no_source', 'g', (), None),
+            ('linear_diag_noise', 'g', (3,), [3]),
+            ('linear_diag_noise', 'v0', (3,), None),
+            ('logistic_ordinal_b', 'deltas', (1, 2), [1]),
+            ('logistic_ordinal_b', 'deltas', (3,), [3]),
+            ('logistic_ordinal', 'deltas_Y2', (0,), [2]),
+            ('logistic_parallel_diag_noise', 'deltas', (1,), None),
+        ]:
+            with self.subTest(model_name=model_name, var_name=var_name, idx=idx):
+                model = self.get_hardcoded_model(model_name).model
+                self.assertEqual(model.get_features_impacted_by_population_variable(var_name, idx), expected_fts)
+
+                if expected_fts is None or var_name.startswith('deltas'):
+                    continue
+
+                # check that other features are really left unchanged
+                dataset = Dataset(self.get_suited_test_data_for_model(model_name))
+                ips = self._get_individual_parameters(model, dataset.n_individuals)
+                attachment_per_ft = model.compute_individual_attachment_per_ft_tensorized(dataset, ips, attribute_type=None)
+
+                model.parameters[var_name][idx] += .1
+                model.attributes.update([var_name], model.parameters)
+                new_attachment_per_ft = model.compute_individual_attachment_per_ft_tensorized(dataset, ips, attribute_type=None)
+
+                not_impacted_fts = [ft for ft in range(model.dimension) if ft not in expected_fts]
+                self.assertAllClose(new_attachment_per_ft[:, not_impacted_fts], attachment_per_ft[:, not_impacted_fts],
+                                    what='attachment_not_impacted_fts')
+                self.assertFalse(torch.allclose(new_attachment_per_ft[:, expected_fts], attachment_per_ft[:, expected_fts]))
@@ -52,3 +52,41 @@ class TestMultivariateModelOrdinal(LeaspyTestCase):
             [1., 1., 1., 1., 1., 1., 1., 1., 1., 1.]
         ]]])
         self.assertTrue(torch.eq(ordinal_mask, expected_mask).all())  # not approximate
+
+    def test_packed_levels(self):
+
+        timepoints = torch.tensor([[70., 75., 80.], [60., 72., 90.]])
+        ips = {'xi': torch.tensor([[0.1], [-0.2]]), 'tau': torch.tensor([[70.], [73.]]),
+               'sources': torch.tensor([[0.1, -0.3], [-0.4, 0.1]])}
+
+        for model_name in ('logistic_ordinal', 'logistic_ordinal_b', 'logistic_ordinal_ranking_same'):
+            with self.subTest(model_name=model_name):
+                model = self.get_hardcoded_model(model_name).model
+                sf = model.noise_model == 'ordinal_ranking'
+
+                levels = model._get_ordinal_levels_layout()
+                self.assertEqual(levels.sf_offsets.tolist(), [0, 3, 7, 13, 23])
+                self.assertEqual(levels.pdf_offsets.tolist(), [0, 4, 9, 16, 27])
+                self.assertEqual(levels.sf_levels[:7].tolist(), [1, 2, 3, 1, 2, 3, 4])
+                self.assertEqual(levels.pdf_levels[:9].tolist(), [0, 1, 2, 3, 0, 1, 2, 3, 4])
+
+                padded = model.compute_individual_tensorized(timepoints, ips)
+                packed = model.compute_individual_tensorized(timepoints, ips, packed_levels=True)
+                self.assertEqual(padded.shape, (2, 3, 4, 10 + (not sf)))
+                self.assertEqual(packed.shape, (2, 3, 23 if sf else 27))
+                self.assertAllClose(levels.unpack(packed, sf=sf, max_level=10), padded)
+
+                # restriction to some features
+                packed_fts = model.compute_individual_tensorized(timepoints, ips, features=[1, 3], packed_levels=True)
+                self.assertAllClose(packed_fts, packed[..., levels.get_levels_index([1, 3], sf=sf)])
+
+                # conversion from survival function to probability density function
+                sf_packed = model.compute_individual_tensorized(timepoints, ips, packed_levels=True)
+                if not sf:
+                    model.noise_model = 'ordinal_ranking'
+                    sf_packed = model.compute_individual_tensorized(timepoints, ips, packed_levels=True)
+                    model.noise_model = 'ordinal'
+                pdf_packed = levels.pdf_from_sf(sf_packed)
+                self.assertAllClose(levels.sum_per_feature(pdf_packed, sf=False), torch.ones((2, 3, 4)))
+                self.assertAllClose(levels.unpack(pdf_packed, sf=False),
+                                    model.compute_ordinal_pdf_from_ordinal_sf(levels.unpack(sf_packed, sf=True)))
@@ -0,0 +1,130 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import torch
+from scipy import stats
+
+from leaspy import Leaspy, AlgorithmSettings
+from leaspy.exceptions import LeaspyInputError
+from leaspy.io.data.data import Data
+from leaspy.io.data.dataset import Dataset
+from leaspy.models.utils.initialization import model_initialization
+from leaspy.models.utils.initialization.model_initialization import (
+    compute_linregress_subjects,
+    compute_patient_slopes_distribution,
+    compute_patient_time_distribution,
+    compute_patient_values_distribution,
+    get_dataframe_from_dataset,
+    get_lme_results,
+)
+
+from tests import LeaspyTestCase
+
+
+class ModelInitializationTest(LeaspyTestCase):
+
+    def test_compute_linregress_subjects(self):
+
+        data = Data.from_csv_file(self.example_data_path)
+        dataset = Dataset(data)
+        df = get_dataframe_from_dataset(dataset)
+
+        regress_params = compute_linregress_subjects(dataset)
+        self.assertEqual(regress_params['slope'].shape, (dataset.n_individuals, dataset.dimension))
+
+        for ft_i, (ft, s) in enumerate(df.items()):
+            s = s.dropna()
+            for i, idx in enumerate(dataset.indices):
+                if idx not in s.index.get_level_values('ID'):
+                    self.assertTrue(torch.isnan(regress_params['slope'][i, ft_i]))
+                    continue
+                s_idx = s.xs(idx, level='ID')
+                if len(s_idx) < 2:
+                    self.assertTrue(torch.isnan(regress_params['slope'][i, ft_i]))
+                    continue
+                expected = stats.linregress(s_idx.index.values, s_idx.values)
+                self.assertAllClose(regress_params['slope'][i, ft_i], expected.slope, rtol=1e-5, atol=1e-6, what=(ft, idx))
+                self.assertAllClose(regress_params['intercept'][i, ft_i], expected.intercept, rtol=1e-5, atol=1e-4, what=(ft, idx))
+
+        # restriction to first individuals
+        regress_params = compute_linregress_subjects(dataset, max_inds=2)
+        self.assertTrue(((~torch.isnan(regress_params['slope'])).sum(dim=0) <= 2).all())
+
+    def test_compute_patient_distributions(self):
+
+        data = Data.from_csv_file(self.example_data_path)
+        dataset = Dataset(data)
+        df = get_dataframe_from_dataset(dataset)
+
+        values_mu, values_sigma = compute_patient_values_distribution(dataset)
+        self.assertAllClose(values_mu, df.mean().values, rtol=1e-5)
+        self.assertAllClose(values_sigma, df.std().values, rtol=1e-5)
+
+        time_mu, time_sigma = compute_patient_time_distribution(dataset)
+        times = df.index.get_level_values('TIME').values.astype(np.float64)
+        self.assertAllClose(time_mu, times.mean(), rtol=1e-6)
+        self.assertAllClose(time_sigma, times.std(), rtol=1e-5)
+
+        slopes_mu, slopes_sigma = compute_patient_slopes_distribution(dataset)
+        self.assertEqual(slopes_mu.shape, (dataset.dimension,))
+        self.assertEqual(slopes_sigma.shape, (dataset.dimension,))
+
+    def test_get_lme_results(self):
+
+        # noisy linear trajectories with random intercepts
+        rng = np.random.default_rng(0)
+        n_individuals, n_visits = 20, 5
+        ages = 70. + rng.normal(0, 3, size=(n_individuals, 1)) + np.arange(n_visits)
+        values = .1 * (ages[..., None] - 70.) + rng.normal(0, .3, size=(n_individuals, 1, 2)) \
+                 + rng.normal(0, .05, size=(n_individuals, n_visits, 2))
+        values[rng.uniform(size=values.shape) < .1] = np.nan
+        df = pd.DataFrame({
+            'ID': np.repeat([f'S{i}' for i in range(n_individuals)], n_visits),
+            'TIME': ages.reshape(-1),
+            'Y0': values[..., 0].reshape(-1),
+            'Y1': values[..., 1].reshape(-1),
+        })
+        dataset = Dataset(Data.from_dataframe(df))
+        df = get_dataframe_from_dataset(dataset)
+
+        lme_results = get_lme_results(dataset, with_random_slope_age=False)
+        self.assertEqual(lme_results['fe_params'].shape, (dataset.dimension, 2))
+
+        # same results when features are fitted in parallel
+        lme_results_parallel = get_lme_results(dataset, n_jobs=2, with_random_slope_age=False)
+        self.assertDictAlmostEqual(lme_results_parallel, lme_results, rtol=0, atol=0)
+
+        # same results as a LME fitted separately on each feature
+        for ft_i, (ft, s) in enumerate(df.items()):
+            lsp_lme_ft = Leaspy('lme', with_random_slope_age=False)
+            lsp_lme_ft.fit(Data.from_dataframe(s.dropna().to_frame()),
+                           AlgorithmSettings('lme_fit', force_independent_random_effects=True))
+            for param_name, param_ft in lsp_lme_ft.model.parameters.items():
+                self.assertAllClose(lme_results[param_name][ft_i], param_ft, rtol=1e-5, atol=1e-5, what=(ft, param_name))
+
+    def test_lme_initialization_n_jobs(self):
+
+        data = self.get_suited_test_data_for_model('linear_scalar_noise')
+        dataset = Dataset(data)
+
+        lsp_seq = Leaspy('linear', noise_model='gaussian_scalar', source_dimension=1)
+        lsp_seq.model.initialize(dataset, 'lme')
+
+        # `n_jobs` of fit algorithm is passed down to the LME fits of initialization
+        lsp = Leaspy('linear', noise_model='gaussian_scalar', source_dimension=1)
+        with mock.patch.object(model_initialization, 'get_lme_results',
+                               wraps=model_initialization.get_lme_results) as mock_get_lme_results:
+            lsp.fit(data, AlgorithmSettings('mcmc_saem', n_iter=1, seed=0, progress_bar=False,
+                                            model_initialization_method='lme', n_jobs=2))
+        mock_get_lme_results.assert_called_once()
+        self.assertEqual(mock_get_lme_results.call_args.kwargs['n_jobs'], 2)
+
+        # same initial parameters as when LME are fitted sequentially
+        lsp_par = Leaspy('linear', noise_model='gaussian_scalar', source_dimension=1)
+        lsp_par.model.initialize(dataset, 'lme', n_jobs=2)
+        self.assertDictAlmostEqual(lsp_par.model.parameters, lsp_seq.model.parameters, rtol=0, atol=0)
+
+        # other initialization methods have no keyword arguments
+        with self.assertRaises(LeaspyInputError):
+            Leaspy('linear', source_dimension=1).model.initialize(dataset, 'default', n_jobs=2)
@@ -168,3 +168,33 @@ class AttributesLogisticTest(LeaspyTestCase):
         attributes.update(['betas'], {'betas': values['betas']+0.1})
         self.assertEqual(id(old_BON), id(attributes.orthonormal_basis))  # not recomputed BON
         self.assertFalse(torch.allclose(old_A, attributes.mixing_matrix))
+
+    def test_checkpoint_restore(self):
+
+        values = {
+            'g': torch.tensor([-1.1, 2.2, 0.0, 3.3], dtype=torch.float32),
+            'betas': torch.tensor([[0.1, 0.2, 0.3], [-0.1, 0.2, 0.3], [-0.1, 0.2, -0.3]], dtype=torch.float32),
+            'v0': torch.tensor([-4.0, -2.8, -4.5, -3.5], dtype=torch.float32)
+        }
+        dimension, source_dimension = self.check_values_and_get_dimensions(values)
+
+        attributes = LogisticAttributes('logistic', dimension, source_dimension)
+        attributes.update(['all'], values)
+        old_attributes = attributes.get_attributes()
+        old_BON = attributes.orthonormal_basis
+
+        checkpoint = attributes.checkpoint()
+
+        attributes.update(['g'], {'g': values['g'] + 0.1})
+        attributes.update(['betas'], {'betas': values['betas'] + 0.1})
+        self.assertFalse(torch.allclose(old_BON, attributes.orthonormal_basis))
+
+        attributes.restore(checkpoint)
+
+        # all attributes are back to their previous values, without any copy nor re-computation
+        for old_attr, restored_attr in zip(old_attributes, attributes.get_attributes()):
+            self.assertIs(old_attr, restored_attr)
+        self.assertIs(old_BON, attributes.orthonormal_basis)
+        self.assertIs(attributes.betas, checkpoint['betas'])
+        # non-tensor attributes are untouched
+        self.assertEqual(attributes.update_possibilities, ('all', 'g', 'v0', 'v0_collinear', 'betas'))